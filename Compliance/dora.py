@@ -4,14 +4,80 @@ DORA (Digital Operational Resilience Act) Compliance-Framework.
 
 from typing import Dict, Any, Optional, List
 from .base import ComplianceFramework, ComplianceRequirement, ComplianceResult, ComplianceStandard
-from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
+from pydantic import BaseModel, ConfigDict
+from utils.llm_provider import create_chat_model
+from utils.structured_output import JsonChain, parse_structured
 import os
 from dotenv import load_dotenv
+from utils.cancellation import OperationCancelled, check_cancelled
 
 load_dotenv()
 
 
+# Statischer System-Prompt inkl. Antwort-Format (stabiles Präfix für das Prompt-Caching des Providers)
+DORA_SYSTEM_PROMPT = """Du bist ein Compliance-Experte für DORA (Digital Operational Resilience Act).
+Deine Aufgabe ist es, Injects auf DORA Article 25 Konformität zu prüfen.
+
+DORA Article 25 Anforderungen:
+1. Risk Management Framework Testing
+2. Business Continuity Policy Testing
+3. Incident Response Plan Testing
+4. Recovery Plan Testing (optional)
+5. Critical Functions Coverage
+6. Realistic Scenario
+7. Documentation Adequacy (optional)
+
+Prüfe den Inject auf diese Anforderungen und gib eine strukturierte Bewertung zurück.
+
+ANTWORT-FORMAT (JSON):
+{{
+    "requirements_met": ["DORA_Art25_IncidentResponse", ...],
+    "requirements_missing": ["DORA_Art25_BusinessContinuity", ...],
+    "warnings": ["Business Continuity könnte stärker betont werden", ...],
+    "compliance_score": 0.85,
+    "details": {{
+        "risk_management": true,
+        "business_continuity": false,
+        "incident_response": true,
+        ...
+    }}
+}}"""
+
+DORA_HUMAN_PROMPT = """Prüfe folgenden Inject auf DORA Article 25 Konformität:
+
+**Phase:** {phase}
+**Content:** {content}
+**Metadata:** {metadata}
+
+**Vorherige Injects:** {previous_injects}
+
+Bewerte jede Anforderung und gib zurück:
+- Welche Anforderungen werden erfüllt?
+- Welche Anforderungen fehlen?
+- Gibt es Warnungen?
+
+Antworte im JSON-Format (siehe ANTWORT-FORMAT)."""
+
+# Einmal kompilierte Vorlage für validate_inject
+DORA_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", DORA_SYSTEM_PROMPT),
+    ("human", DORA_HUMAN_PROMPT)
+])
+
+
+class DORAComplianceResponse(BaseModel):
+    """Antwortschema der DORA-Compliance-Prüfung."""
+
+    model_config = ConfigDict(extra="allow")
+
+    requirements_met: List[str] = []
+    requirements_missing: List[str] = []
+    warnings: List[str] = []
+    compliance_score: Optional[float] = None
+    details: Dict[str, Any] = {}
+
+
 class DORAComplianceFramework(ComplianceFramework):
     """
     DORA Compliance-Framework Implementation.
@@ -21,11 +87,8 @@ class DORAComplianceFramework(ComplianceFramework):
     
     def __init__(self):
         super().__init__(ComplianceStandard.DORA)
-        self.llm = ChatOpenAI(
-            model="gpt-4o",
-            temperature=0.3,
-            api_key=os.getenv("OPENAI_API_KEY")
-        )
+        self.llm = create_chat_model("compliance_dora", model_name="gpt-4o", temperature=0.3)
+        self._validation_chain = JsonChain(DORA_PROMPT)
     
     def _load_requirements(self) -> List[ComplianceRequirement]:
         """Lädt DORA-spezifische Anforderungen."""
@@ -128,50 +191,6 @@ class DORAComplianceFramework(ComplianceFramework):
         
         Verwendet LLM für semantische Validierung.
         """
-        # Erstelle Prompt für LLM-Validierung
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", """Du bist ein Compliance-Experte für DORA (Digital Operational Resilience Act).
-Deine Aufgabe ist es, Injects auf DORA Article 25 Konformität zu prüfen.
-
-DORA Article 25 Anforderungen:
-1. Risk Management Framework Testing
-2. Business Continuity Policy Testing
-3. Incident Response Plan Testing
-4. Recovery Plan Testing (optional)
-5. Critical Functions Coverage
-6. Realistic Scenario
-7. Documentation Adequacy (optional)
-
-Prüfe den Inject auf diese Anforderungen und gib eine strukturierte Bewertung zurück."""),
-            
-            ("human", """Prüfe folgenden Inject auf DORA Article 25 Konformität:
-
-**Phase:** {phase}
-**Content:** {content}
-**Metadata:** {metadata}
-
-**Vorherige Injects:** {previous_injects}
-
-Bewerte jede Anforderung und gib zurück:
-- Welche Anforderungen werden erfüllt?
-- Welche Anforderungen fehlen?
-- Gibt es Warnungen?
-
-Antworte im JSON-Format:
-{{
-    "requirements_met": ["DORA_Art25_IncidentResponse", ...],
-    "requirements_missing": ["DORA_Art25_BusinessContinuity", ...],
-    "warnings": ["Business Continuity könnte stärker betont werden", ...],
-    "compliance_score": 0.85,
-    "details": {{
-        "risk_management": true,
-        "business_continuity": false,
-        "incident_response": true,
-        ...
-    }}
-}}""")
-        ])
-        
         # Formatierung für Prompt
         previous_injects_str = ""
         if context and "previous_injects" in context:
@@ -182,9 +201,10 @@ Antworte im JSON-Format:
                     for inj in prev_injects[:3]  # Nur letzte 3
                 ])
         
-        chain = prompt | self.llm
+        chain = self._validation_chain.for_llm(self.llm)
         
         try:
+            check_cancelled()
             response = chain.invoke({
                 "phase": inject_phase,
                 "content": inject_content,
@@ -192,20 +212,13 @@ Antworte im JSON-Format:
                 "previous_injects": previous_injects_str or "Keine"
             })
             
-            # Parse JSON aus Response
-            import json
-            import re
+            result_data = parse_structured(response.content, DORAComplianceResponse, agent="compliance_dora")
             
-            content = response.content
-            json_match = re.search(r'\{.*\}', content, re.DOTALL)
-            
-            if json_match:
-                result_data = json.loads(json_match.group())
-                
+            if result_data is not None:
                 # Bestimme ob compliant (alle mandatory requirements erfüllt)
                 mandatory_reqs = [req.requirement_id for req in self.requirements if req.mandatory]
-                requirements_met = result_data.get("requirements_met", [])
-                requirements_missing = result_data.get("requirements_missing", [])
+                requirements_met = result_data.requirements_met
+                requirements_missing = result_data.requirements_missing
                 
                 # Prüfe ob alle mandatory requirements erfüllt sind
                 mandatory_met = all(req_id in requirements_met for req_id in mandatory_reqs)
@@ -218,13 +231,15 @@ Antworte im JSON-Format:
                     standard=ComplianceStandard.DORA,
                     requirements_met=requirements_met,
                     requirements_missing=requirements_missing,
-                    warnings=result_data.get("warnings", []),
-                    details=result_data.get("details", {})
+                    warnings=result_data.warnings,
+                    details=result_data.details
                 )
             else:
                 # Fallback: Basierend auf Phase heuristische Bewertung
                 return self._heuristic_validation(inject_content, inject_phase, inject_metadata)
                 
+        except OperationCancelled:
+            raise
         except Exception as e:
             # Fallback bei Fehler
             return self._heuristic_validation(inject_content, inject_phase, inject_metadata)
@@ -17,17 +17,24 @@ Wissenschaftliche Methoden:
 - Evidence-based Entscheidungen
 """
 
-from typing import Dict, Any, List, Optional
-from langchain_openai import ChatOpenAI
+from typing import Dict, Any, Iterable, List, Optional
 from langchain_core.prompts import ChatPromptTemplate
+from pydantic import BaseModel, ConfigDict
+from utils.llm_provider import create_chat_model
+from utils.structured_output import JsonChain, parse_structured
+from utils.cancellation import OperationCancelled
+from utils.context_selector import focus_assets, select_relevant_assets, status_summary
 from state_models import Inject, ValidationResult, CrisisPhase
 from workflows.fsm import CrisisFSM
 from agents.critic_metrics import ScientificValidator, ValidationMetrics
 from utils.json_encoder import DateTimeEncoder
 import os
+import logging
 from dotenv import load_dotenv
 from datetime import datetime
 import json
+import random
+import threading
 from pathlib import Path
 
 # Optional: Compliance-Framework Import (für variable Compliance-Standards)
@@ -82,6 +89,161 @@ except (ImportError, ModuleNotFoundError, Exception) as e:
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+
+# Statischer System-Prompt der LLM-Validierung (stabiles Präfix für das Prompt-Caching des Providers)
+VALIDATION_SYSTEM_PROMPT = """Du bist ein erfahrener Security- und Krisenmanagement-Experte.
+Deine Aufgabe ist es, Injects für Krisenszenarien STRENG zu validieren.
+
+WICHTIG: Du bist der QUALITÄTSGARANT des Systems. Sei PRÄZISE und STRENG.
+
+VALIDIERUNGSKRITERIEN:
+
+1. LOGISCHE KONSISTENZ (KRITISCH):
+   - Widerspricht der Inject vorherigen Injects?
+   - Ist die Sequenz logisch und kausal nachvollziehbar?
+   - Ist der Content konsistent mit der Phase?
+   
+   ⚠️⚠️⚠️ KRITISCH - ASSET-NAMEN (DIESE REGEL IST ABSOLUT VERBINDLICH):
+   
+   ❌❌❌ FEHLER: Es ist KEIN FEHLER, wenn ein Asset sowohl mit ID als auch mit Namen bezeichnet wird!
+   
+   ✅✅✅ ERLAUBT (diese sind IMMER OK, niemals als Fehler melden):
+   - "SRV-001" → OK
+   - "DC-01" → OK (wenn SRV-001 = DC-01)
+   - "SRV-001 (DC-01)" → OK (beide zusammen)
+   - "Domain Controller SRV-001" → OK (Name + ID)
+   - "Application Server APP-SRV-01 (SRV-002)" → OK (verschiedene Namen für dasselbe Asset)
+   - "Payment Processing System" → OK (wenn APP-001 = Payment Processing System)
+   - "APP-001" → OK
+   - "Payment Processing System (APP-001)" → OK
+   - "APP-001 wird als Payment Processing System bezeichnet" → OK (beide Namen verwendet)
+   
+   ❌ NUR DIESE SIND ECHTE FEHLER:
+   - Asset-ID existiert nicht (z.B. verwendet "SRV-003" aber nur SRV-001, SRV-002 existieren)
+   - Asset ist offline, wird aber als aktiv verwendet (z.B. "SRV-001 ist offline" in Inject 1, aber "Lateral Movement von SRV-001" in Inject 2)
+   
+   ⚠️ WICHTIG: Wenn ein Asset sowohl mit ID als auch mit Namen bezeichnet wird, ist das IMMER ERLAUBT. 
+   Melde dies NIEMALS als "Asset-Name-Inkonsistenz" Fehler!
+
+2. CAUSAL VALIDITY (KRITISCH):
+   - Passt die MITRE ATT&CK Technik zur aktuellen Phase?
+   - Ist die Sequenz technisch möglich?
+   
+   ⚠️ WICHTIG - KAUSALE LOGIK:
+   - Phasen-Übergänge zeigen bereits die kausale Logik! Wenn wir von SUSPICIOUS_ACTIVITY zu INITIAL_INCIDENT gehen, ist das bereits ein kausaler Vorgänger
+   - Du musst NICHT erwarten, dass jeder Schritt explizit in vorherigen Injects erwähnt wird
+   - Prüfe nur, ob die Sequenz technisch möglich ist, nicht ob sie explizit erwähnt wurde
+   
+   WICHTIG: Sei nicht zu streng! Viele MITRE-Techniken können in mehreren Phasen vorkommen.
+   
+   BEISPIEL FÜR INVALIDITÄT (nur wirklich unmögliche Sequenzen):
+   - Phase: NORMAL_OPERATION, MITRE: T1041 (Exfiltration) → FEHLER: Exfiltration vor Initial Access unmöglich!
+   - Phase: NORMAL_OPERATION, MITRE: T1486 (Data Encrypted for Impact) → FEHLER: Impact vor Execution unmöglich!
+   
+   BEISPIEL FÜR VALIDITÄT (diese sind OK):
+   - Phase: SUSPICIOUS_ACTIVITY, MITRE: T1595 (Active Scanning) → OK: Scanning kann in verschiedenen Phasen vorkommen
+   - Phase: INITIAL_INCIDENT, MITRE: T1546.014 (Event Triggered Execution) → OK: Kann nach SUSPICIOUS_ACTIVITY vorkommen (Phasen-Übergang zeigt Logik)
+   - Phase: INITIAL_INCIDENT, MITRE: T1480 (Execution Guardrails) → OK: Kann in verschiedenen Phasen vorkommen, auch wenn nicht explizit erwähnt
+
+3. REGULATORISCHE ASPEKTE (optional, nicht blockierend):
+   - Incident Response Plan Testing
+   - Business Continuity Plan Testing
+   - Recovery Plan Testing
+   - Coverage of critical functions
+   - Realistic scenario testing
+   - Documentation adequate
+
+VALIDIERUNGSREGELN:
+- Sei STRENG aber FAIR: Bei echten Verstößen → FEHLER melden, bei Unsicherheiten → Warnung
+- Jeder Fehler MUSS eine klare, spezifische Begründung haben
+- Warnungen für potenzielle Probleme, Fehler für klare Verstöße
+- Prüfe ALLE Aspekte: Logik, Kausalität, State, Temporalität
+- ASSET-NAMEN: Erlaube sowohl IDs als auch Namen (siehe oben)
+- KAUSALE LOGIK: Phasen-Übergänge zeigen bereits die Logik (siehe oben)
+
+ANTWORT-FORMAT (STRICT JSON):
+{{
+    "logical_consistency": true/false,
+    "regulatory_compliance": true/false,
+    "causal_validity": true/false,
+    "errors": ["Spezifischer Fehler 1 mit Begründung", "Spezifischer Fehler 2 mit Begründung"],
+    "warnings": ["Potenzielle Warnung 1", "Potenzielle Warnung 2"]
+}}
+
+FEHLER-MUSTER (wenn diese auftreten → FEHLER):
+- Asset existiert nicht im Systemzustand (z.B. verwendet "SRV-003" aber nur SRV-001, SRV-002 existieren)
+- Asset ist offline, wird aber als aktiv behandelt (z.B. "SRV-001 ist offline" in Inject 1, aber "Lateral Movement von SRV-001" in Inject 2)
+- MITRE-Technik passt nicht zur Phase (nur wirklich unmögliche Sequenzen, siehe oben)
+- Temporale Inkonsistenz (Zeitstempel geht zurück)
+- Asset-ID ist falsch (z.B. verwendet "SRV-003" statt "SRV-001")
+
+WARNUNG-MUSTER (wenn diese auftreten → WARNUNG, nicht Fehler):
+- Großer Zeitsprung ohne Erklärung
+- Neue Assets ohne Kontext
+- Ungewöhnliche aber mögliche Sequenz
+- MITRE-Technik passt möglicherweise nicht perfekt zur Phase (aber technisch möglich)
+- Kausale Sequenz könnte besser erklärt werden (aber Phasen-Übergang zeigt bereits Logik)
+
+❌❌❌ ABSOLUT VERBOTEN - MELDE DIESE NIEMALS ALS FEHLER:
+- "Asset-Name-Inkonsistenz" wenn ein Asset sowohl mit ID als auch mit Namen bezeichnet wird
+- "Asset-Name-Inkonsistenz" wenn verschiedene Namen für dasselbe Asset verwendet werden (z.B. "SRV-001" und "DC-01")
+- "Asset-Name-Inkonsistenz" wenn "Payment Processing System" und "APP-001" für dasselbe Asset verwendet werden
+- "Asset-Name-Inkonsistenz" wenn "Application Server APP-SRV-01" und "SRV-002" für dasselbe Asset verwendet werden
+
+⚠️ Wenn du denkst, dass verschiedene Namen für dasselbe Asset verwendet werden, ist das ERLAUBT. 
+Melde es NIEMALS als Fehler, höchstens als Warnung wenn es wirklich verwirrend ist!"""
+
+VALIDATION_HUMAN_PROMPT = """Validiere folgenden Inject STRENG:
+
+Inject:
+{inject}
+
+Aktuelle Phase: {current_phase}
+Vorherige Phase: {previous_phase}
+
+Vorherige Injects (für Konsistenz-Prüfung):
+{previous_injects}
+
+Systemzustand (verfügbare Assets und deren Status):
+{system_state}
+
+MITRE ATT&CK Technik: {mitre_id}
+Regulatorische Checkliste (automatisch geprüft):
+{regulatory_checklist_results}
+
+SYMBOLISCHE VALIDIERUNG (bereits geprüft):
+- FSM-Übergang: ✓ OK
+- State-Consistency: ✓ OK
+- Temporale Konsistenz: ✓ OK
+
+LLM-VALIDIERUNG (deine Aufgabe):
+Prüfe jetzt:
+1. LOGISCHE KONSISTENZ: Widerspricht der Inject der Historie oder dem Systemzustand?
+2. CAUSAL VALIDITY: Passt MITRE {mitre_id} zur Phase {current_phase} und zur Sequenz?
+3. REGULATORISCHE ASPEKTE: Erfüllt der Inject die grundlegenden Anforderungen? (optional, nicht blockierend)
+
+Antworte STRICT JSON (nur JSON, keine zusätzlichen Erklärungen außerhalb des JSON)."""
+
+# Einmal kompilierte Vorlage für _llm_validate
+VALIDATION_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", VALIDATION_SYSTEM_PROMPT),
+    ("human", VALIDATION_HUMAN_PROMPT)
+])
+
+
+class CriticValidationResponse(BaseModel):
+    """Antwortschema der LLM-Validierung."""
+
+    model_config = ConfigDict(extra="allow")
+
+    logical_consistency: bool = True
+    causal_validity: bool = True
+    regulatory_compliance: bool = True
+    errors: Optional[List[str]] = None
+    warnings: Optional[List[str]] = None
+
 
 class CriticAgent:
     """
@@ -95,21 +257,27 @@ class CriticAgent:
         self,
         model_name: str = "gpt-4o",
         temperature: float = 0.3,
-        compliance_standards: Optional[List[ComplianceStandard]] = None
+        compliance_standards: Optional[List[ComplianceStandard]] = None,
+        skip_threshold: Optional[float] = None,
+        calibration_rate: Optional[float] = None,
+        seed: Optional[int] = None
     ):
         """
         Initialisiert den Critic Agent.
         
         Args:
-            model_name: OpenAI Modell-Name
+            model_name: Modell-Name (Provider per LLM_PROVIDER, siehe utils/llm_provider.py)
             temperature: Temperature (niedrig für konsistente Validierung)
             compliance_standards: Liste von Compliance-Standards (Standard: [DORA])
+            skip_threshold: Ab dieser Pre-LLM-Konfidenz wird ohne LLM-Call (und ohne
+                Compliance-Frameworks) akzeptiert. Opt-in - Standard: CRITIC_SKIP_THRESHOLD
+                ("on" = Schwellenwert "excellent", Zahl = eigener Schwellenwert), sonst aus
+            calibration_rate: Anteil der Gate-Kandidaten, die trotzdem ans LLM gehen
+                (Standard: CRITIC_CALIBRATION_RATE bzw. 0.1)
+            seed: Seed für die Kalibrierungs-Stichprobe
         """
-        self.llm = ChatOpenAI(
-            model=model_name,
-            temperature=temperature,
-            api_key=os.getenv("OPENAI_API_KEY")
-        )
+        self.llm = create_chat_model("critic", model_name=model_name, temperature=temperature)
+        self._validation_chain = JsonChain(VALIDATION_PROMPT)
         
         # Initialisiere Compliance-Frameworks
         self.compliance_frameworks: Dict[str, Any] = {}
@@ -130,6 +298,22 @@ class CriticAgent:
         
         # Metriken-Historie für statistische Analysen
         self.validation_history: List[Dict[str, float]] = []
+
+        # Konfidenz-Gate (opt-in): symbolisch eindeutige Drafts ohne LLM- und Compliance-Prüfung
+        # akzeptieren. Standardmäßig aus, damit jeder Draft die DORA-Prüfung durchläuft.
+        if skip_threshold is None:
+            env_threshold = os.getenv("CRITIC_SKIP_THRESHOLD", "off").strip().lower()
+            if env_threshold in ("on", "excellent"):
+                skip_threshold = self.scientific_validator.thresholds["excellent"]
+            elif env_threshold not in ("", "off"):
+                skip_threshold = float(env_threshold)
+        self.skip_threshold = skip_threshold
+        if calibration_rate is None:
+            calibration_rate = float(os.getenv("CRITIC_CALIBRATION_RATE", "0.1"))
+        self.calibration_rate = max(0.0, min(1.0, calibration_rate))
+        self._calibration_rng = random.Random(seed)
+        self._gate_lock = threading.Lock()
+        self.gate_stats = {"eligible": 0, "skipped": 0, "sampled": 0, "disagreements": 0}
     
     def validate_inject(
         self,
@@ -157,7 +341,7 @@ class CriticAgent:
         """
         # LEGACY MODE: Skip Validation komplett (simuliert altes System ohne Logic Guard)
         if mode == 'legacy':
-            print(f"[Critic] Legacy Mode: Skipping validation for {inject.inject_id}")
+            logger.debug("[Critic] Legacy Mode: Skipping validation for %s", inject.inject_id)
             return ValidationResult(
                 is_valid=True,
                 logical_consistency=True,
@@ -167,29 +351,31 @@ class CriticAgent:
                 warnings=[]
             )
         
-        print(f"[Critic] Validiere Inject {inject.inject_id}")
-        print(f"   Phase: {current_phase.value} → {inject.phase.value}")
-        print(f"   Assets: {inject.technical_metadata.affected_assets}")
-        print(f"   MITRE: {inject.technical_metadata.mitre_id}")
+        logger.debug("[Critic] Validiere Inject %s", inject.inject_id)
+        logger.debug("Phase: %s → %s", current_phase.value, inject.phase.value)
+        logger.debug("Assets: %s", inject.technical_metadata.affected_assets)
+        logger.debug("MITRE: %s", inject.technical_metadata.mitre_id)
         
         errors = []
         warnings = []
+        # Relevanz-Auswahl des Systemzustands: Assets des Injects und der letzten Injects
+        context_focus = focus_assets(previous_injects, extra=inject.technical_metadata.affected_assets)
         
         # ===== PHASE 1: SYMBOLISCHE VALIDIERUNG (OHNE LLM-CALL) =====
         # Diese Checks sind schnell und kostenlos - machen sie ZUERST
         
-        print(f"🔧 [Critic] Phase 1: Symbolische Validierung (ohne LLM-Call)")
+        logger.debug("🔧 [Critic] Phase 1: Symbolische Validierung (ohne LLM-Call)")
         
         # 1.1 Pydantic-Validierung (automatisch)
         try:
             # Inject ist bereits ein Pydantic-Model, Validierung erfolgt automatisch
             pydantic_valid = True
-            print(f"   ✅ Pydantic-Validierung: OK")
+            logger.debug("✅ Pydantic-Validierung: OK")
         except Exception as e:
-            print(f"   ❌ Pydantic-Validierung fehlgeschlagen: {e}")
+            logger.debug("❌ Pydantic-Validierung fehlgeschlagen: %s", e)
             error_msg = f"Schema-Validierung fehlgeschlagen: {e}"
             # Logge auch Pydantic-Fehler für Audit
-            formatted_system_state_str = self._format_system_state(system_state)
+            formatted_system_state_str = self._format_system_state(system_state, context_focus)
             self._log_critic_decision(
                 inject_id=inject.inject_id,
                 inject=inject,
@@ -220,14 +406,14 @@ class CriticAgent:
             )
         
         # 1.2 FSM-Validierung (Phase-Übergang) - KRITISCH, früh prüfen
-        print(f"   🔧 FSM-Validierung...")
+        logger.debug("🔧 FSM-Validierung...")
         fsm_result = self._validate_phase_transition_detailed(inject, current_phase, previous_injects)
         if not fsm_result["valid"]:
             errors.extend(fsm_result["errors"])
-            print(f"   ❌ FSM-Verstoß: {fsm_result['errors']}")
+            logger.debug("❌ FSM-Verstoß: %s", fsm_result['errors'])
             # FSM-Verstoß ist kritisch - kein LLM-Call nötig
             # Logge trotzdem für Audit
-            formatted_system_state_str = self._format_system_state(system_state)
+            formatted_system_state_str = self._format_system_state(system_state, context_focus)
             self._log_critic_decision(
                 inject_id=inject.inject_id,
                 inject=inject,
@@ -257,18 +443,18 @@ class CriticAgent:
                 errors=errors,
                 warnings=fsm_result.get("warnings", [])
             )
-        print(f"   ✅ FSM-Validierung: OK")
+        logger.debug("✅ FSM-Validierung: OK")
         
         # 1.3 State-Consistency-Check (Asset-Existenz, Status-Konsistenz)
-        print(f"   🔧 State-Consistency-Check...")
+        logger.debug("🔧 State-Consistency-Check...")
         state_result = self._validate_state_consistency(inject, system_state, previous_injects)
         if not state_result["valid"]:
             errors.extend(state_result["errors"])
             warnings.extend(state_result.get("warnings", []))
-            print(f"   ❌ State-Inkonsistenz: {state_result['errors']}")
+            logger.debug("❌ State-Inkonsistenz: %s", state_result['errors'])
             # State-Inkonsistenz ist kritisch - kein LLM-Call nötig
             # Logge trotzdem für Audit
-            formatted_system_state_str = self._format_system_state(system_state)
+            formatted_system_state_str = self._format_system_state(system_state, context_focus)
             self._log_critic_decision(
                 inject_id=inject.inject_id,
                 inject=inject,
@@ -298,18 +484,18 @@ class CriticAgent:
                 errors=errors,
                 warnings=warnings
             )
-        print(f"   ✅ State-Consistency: OK")
+        logger.debug("✅ State-Consistency: OK")
         
         # 1.4 Temporale Konsistenz-Check
-        print(f"   🔧 Temporale Konsistenz-Check...")
+        logger.debug("🔧 Temporale Konsistenz-Check...")
         temporal_result = self._validate_temporal_consistency(inject, previous_injects)
         if not temporal_result["valid"]:
             errors.extend(temporal_result["errors"])
             warnings.extend(temporal_result.get("warnings", []))
-            print(f"   ❌ Temporale Inkonsistenz: {temporal_result['errors']}")
+            logger.debug("❌ Temporale Inkonsistenz: %s", temporal_result['errors'])
             # Temporale Inkonsistenz ist kritisch - kein LLM-Call nötig
             # Logge trotzdem für Audit
-            formatted_system_state_str = self._format_system_state(system_state)
+            formatted_system_state_str = self._format_system_state(system_state, context_focus)
             self._log_critic_decision(
                 inject_id=inject.inject_id,
                 inject=inject,
@@ -339,16 +525,66 @@ class CriticAgent:
                 errors=errors,
                 warnings=warnings
             )
-        print(f"   ✅ Temporale Konsistenz: OK")
+        logger.debug("✅ Temporale Konsistenz: OK")
         
         warnings.extend(state_result.get("warnings", []))
         warnings.extend(temporal_result.get("warnings", []))
-        
+
+        # ===== KONFIDENZ-GATE: LLM-CALL NUR BEI UNSICHEREN DRAFTS =====
+        pre_scores = self.scientific_validator.calculate_pre_llm_confidence(
+            inject=inject,
+            previous_injects=previous_injects,
+            current_phase=current_phase,
+            system_state=system_state
+        )
+        calibration_sample = False
+        if self.skip_threshold is not None and pre_scores["confidence"] >= self.skip_threshold:
+            with self._gate_lock:
+                self.gate_stats["eligible"] += 1
+                calibration_sample = self._calibration_rng.random() < self.calibration_rate
+                self.gate_stats["sampled" if calibration_sample else "skipped"] += 1
+            if not calibration_sample:
+                logger.debug(
+                    "⏭️  [Critic] Konfidenz %.2f >= %.2f - akzeptiert ohne LLM-Call",
+                    pre_scores['confidence'], self.skip_threshold
+                )
+                self._log_critic_decision(
+                    inject_id=inject.inject_id,
+                    inject=inject,
+                    system_state=system_state,
+                    previous_injects=previous_injects,
+                    current_phase=current_phase,
+                    llm_validation={"logical_consistency": True, "causal_validity": True, "regulatory_compliance": True, "_raw_llm_output": "Konfidenz-Gate - kein LLM-Call"},
+                    final_result={
+                        "is_valid": True,
+                        "errors": errors,
+                        "warnings": warnings,
+                        "pydantic_valid": pydantic_valid,
+                        "fsm_valid": True,
+                        "state_valid": True,
+                        "temporal_valid": True,
+                        "logical_consistency": True,
+                        "causal_validity": True,
+                        "causal_blocking": False,
+                        "pre_llm_confidence": pre_scores["confidence"]
+                    },
+                    formatted_system_state_str=self._format_system_state(system_state, context_focus)
+                )
+                return ValidationResult(
+                    is_valid=True,
+                    logical_consistency=True,
+                    dora_compliance=True,  # Unbekannt ohne LLM-Call
+                    causal_validity=True,
+                    errors=errors,
+                    warnings=warnings
+                )
+            logger.debug("🎯 [Critic] Konfidenz %.2f - Kalibrierungs-Stichprobe mit LLM-Call", pre_scores['confidence'])
+
         # ===== PHASE 2: LLM-BASIERTE VALIDIERUNG (NUR WENN SYMBOLISCHE CHECKS OK) =====
         # Nur wenn alle symbolischen Checks passiert sind, LLM-Call machen
-        print(f"🔧 [Critic] Phase 2: LLM-basierte Validierung (alle symbolischen Checks OK)")
+        logger.debug("🔧 [Critic] Phase 2: LLM-basierte Validierung (alle symbolischen Checks OK)")
         # Speichere formatierten System-State für Audit-Log
-        formatted_system_state_str = self._format_system_state(system_state)
+        formatted_system_state_str = self._format_system_state(system_state, context_focus)
         
         # Compliance-Validierung mit variablen Standards
         compliance_results: Dict[str, Any] = {}
@@ -383,13 +619,16 @@ class CriticAgent:
                             compliance_results[standard.value] = compliance_result
                         else:
                             compliance_results[str(standard)] = compliance_result
+                    except OperationCancelled:
+                        raise
                     except Exception as e:
-                        print(f"⚠️  Fehler bei Compliance-Validierung ({standard}): {e}")
+                        logger.warning("⚠️  Fehler bei Compliance-Validierung (%s): %s", standard, e)
         
         llm_validation = self._llm_validate(inject, previous_injects, current_phase, system_state, formatted_system_state_str, compliance_results)
-        print(f"   LLM-Ergebnis: logical_consistency={llm_validation['logical_consistency']}, "
-              f"regulatory_compliance={llm_validation.get('regulatory_compliance', llm_validation.get('dora_compliance', True))}, "
-              f"causal_validity={llm_validation['causal_validity']}")
+        logger.debug(
+            "LLM-Ergebnis: logical_consistency=%s, regulatory_compliance=%s, causal_validity=%s",
+            llm_validation['logical_consistency'], llm_validation.get('regulatory_compliance', llm_validation.get('dora_compliance', True)), llm_validation['causal_validity']
+        )
         
         # Kombiniere alle Ergebnisse
         errors.extend(llm_validation.get("errors", []) or [])
@@ -429,6 +668,10 @@ class CriticAgent:
                 causal_blocking = True
         
         is_valid = not critical_errors and not causal_blocking
+        if calibration_sample and not is_valid:
+            # Gate hätte akzeptiert, das LLM lehnt ab
+            with self._gate_lock:
+                self.gate_stats["disagreements"] += 1
         
         # Stelle sicher, dass bei invalider Antwort immer eine Begründung vorhanden ist
         if not is_valid:
@@ -454,47 +697,27 @@ class CriticAgent:
                 else:
                     errors.append("Validierung fehlgeschlagen, aber keine spezifischen Fehler gefunden.")
         
-        print(f"🔍 [Critic] Validierung abgeschlossen für {inject.inject_id}")
-        print(f"   Ergebnis: {'✅ VALIDE' if is_valid else '❌ NICHT VALIDE'}")
-        print(f"   Fehler: {len(errors)}, Warnungen: {len(warnings)}")
+        logger.debug("🔍 [Critic] Validierung abgeschlossen für %s", inject.inject_id)
+        logger.debug("Ergebnis: %s", '✅ VALIDE' if is_valid else '❌ NICHT VALIDE')
+        logger.debug("Fehler: %s, Warnungen: %s", len(errors), len(warnings))
         if errors:
-            print(f"   Fehler-Details: {errors[:3]}")  # Erste 3 Fehler
+            logger.debug("Fehler-Details: %s", errors[:3])  # Erste 3 Fehler
         
         # ===== WISSENSCHAFTLICHE METRIKEN-BERECHNUNG =====
         # Berechne quantifizierbare Metriken für evidenzbasierte Entscheidung
-        print(f"🔬 [Critic] Berechne wissenschaftliche Metriken...")
-        
-        # 1. Logische Konsistenz-Score
-        logical_score = self.scientific_validator.calculate_logical_consistency_score(
-            inject=inject,
-            previous_injects=previous_injects,
-            system_state=system_state
-        )
+        logger.debug("🔬 [Critic] Berechne wissenschaftliche Metriken...")
         
-        # 2. Kausale Validität-Score
-        causal_score = self.scientific_validator.calculate_causal_validity_score(
-            inject=inject,
-            current_phase=current_phase,
-            mitre_id=inject.technical_metadata.mitre_id
-        )
+        # Symbolische Scores wurden bereits vor dem LLM-Call berechnet (Konfidenz-Gate)
+        logical_score = pre_scores["logical"]
+        causal_score = pre_scores["causal"]
+        temporal_score = pre_scores["temporal"]
+        asset_score = pre_scores["asset"]
         
-        # 3. Compliance-Score
+        # Compliance-Score (benötigt die Framework-Ergebnisse)
         compliance_score = self.scientific_validator.calculate_compliance_score(
             compliance_results=compliance_results
         )
         
-        # 4. Temporale Konsistenz-Score
-        temporal_score = self.scientific_validator.calculate_temporal_consistency_score(
-            inject=inject,
-            previous_injects=previous_injects
-        ) if previous_injects else 1.0
-        
-        # 5. Asset-Konsistenz-Score
-        asset_score = self.scientific_validator._check_asset_name_consistency(
-            inject=inject,
-            previous_injects=previous_injects
-        )
-        
         # Erstelle Metriken-Objekt
         metrics = ValidationMetrics(
             logical_consistency_score=logical_score,
@@ -539,8 +762,10 @@ class CriticAgent:
         if len(self.validation_history) > 100:
             self.validation_history = self.validation_history[-100:]
         
-        print(f"   📊 Metriken: Logical={logical_score:.2f}, Causal={causal_score:.2f}, "
-              f"Compliance={compliance_score:.2f}, Overall={metrics.overall_quality_score:.2f}")
+        logger.debug(
+            "📊 Metriken: Logical=%.2f, Causal=%.2f, Compliance=%.2f, Overall=%.2f",
+            logical_score, causal_score, compliance_score, metrics.overall_quality_score
+        )
         
         # Wissenschaftlich basierte Entscheidung: Verwende Overall Quality Score
         # Anpassung der Validierung basierend auf Metriken
@@ -608,7 +833,22 @@ class CriticAgent:
                 for standard, result in compliance_results.items()
             } if compliance_results else None
         )
-    
+
+    def get_gate_stats(self) -> Dict[str, Any]:
+        """
+        Gibt die Statistik des Konfidenz-Gates zum Tuning zurück.
+
+        skip_rate bezieht sich auf alle Gate-Kandidaten, disagreement_rate auf
+        die Kalibrierungs-Stichproben, die das LLM abgelehnt hat.
+        """
+        with self._gate_lock:
+            stats = dict(self.gate_stats)
+        stats["skip_threshold"] = self.skip_threshold
+        stats["calibration_rate"] = self.calibration_rate
+        stats["skip_rate"] = stats["skipped"] / stats["eligible"] if stats["eligible"] else 0.0
+        stats["disagreement_rate"] = stats["disagreements"] / stats["sampled"] if stats["sampled"] else 0.0
+        return stats
+
     def _validate_phase_transition(
         self,
         inject: Inject,
@@ -923,144 +1163,11 @@ class CriticAgent:
         # Generische Regulatorik-Check (vor LLM-Call)
         regulatory_check = self._check_regulatory_compliance(inject, current_phase)
         
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", """Du bist ein erfahrener Security- und Krisenmanagement-Experte.
-Deine Aufgabe ist es, Injects für Krisenszenarien STRENG zu validieren.
-
-WICHTIG: Du bist der QUALITÄTSGARANT des Systems. Sei PRÄZISE und STRENG.
-
-VALIDIERUNGSKRITERIEN:
-
-1. LOGISCHE KONSISTENZ (KRITISCH):
-   - Widerspricht der Inject vorherigen Injects?
-   - Ist die Sequenz logisch und kausal nachvollziehbar?
-   - Ist der Content konsistent mit der Phase?
-   
-   ⚠️⚠️⚠️ KRITISCH - ASSET-NAMEN (DIESE REGEL IST ABSOLUT VERBINDLICH):
-   
-   ❌❌❌ FEHLER: Es ist KEIN FEHLER, wenn ein Asset sowohl mit ID als auch mit Namen bezeichnet wird!
-   
-   ✅✅✅ ERLAUBT (diese sind IMMER OK, niemals als Fehler melden):
-   - "SRV-001" → OK
-   - "DC-01" → OK (wenn SRV-001 = DC-01)
-   - "SRV-001 (DC-01)" → OK (beide zusammen)
-   - "Domain Controller SRV-001" → OK (Name + ID)
-   - "Application Server APP-SRV-01 (SRV-002)" → OK (verschiedene Namen für dasselbe Asset)
-   - "Payment Processing System" → OK (wenn APP-001 = Payment Processing System)
-   - "APP-001" → OK
-   - "Payment Processing System (APP-001)" → OK
-   - "APP-001 wird als Payment Processing System bezeichnet" → OK (beide Namen verwendet)
-   
-   ❌ NUR DIESE SIND ECHTE FEHLER:
-   - Asset-ID existiert nicht (z.B. verwendet "SRV-003" aber nur SRV-001, SRV-002 existieren)
-   - Asset ist offline, wird aber als aktiv verwendet (z.B. "SRV-001 ist offline" in Inject 1, aber "Lateral Movement von SRV-001" in Inject 2)
-   
-   ⚠️ WICHTIG: Wenn ein Asset sowohl mit ID als auch mit Namen bezeichnet wird, ist das IMMER ERLAUBT. 
-   Melde dies NIEMALS als "Asset-Name-Inkonsistenz" Fehler!
-
-2. CAUSAL VALIDITY (KRITISCH):
-   - Passt die MITRE ATT&CK Technik zur aktuellen Phase?
-   - Ist die Sequenz technisch möglich?
-   
-   ⚠️ WICHTIG - KAUSALE LOGIK:
-   - Phasen-Übergänge zeigen bereits die kausale Logik! Wenn wir von SUSPICIOUS_ACTIVITY zu INITIAL_INCIDENT gehen, ist das bereits ein kausaler Vorgänger
-   - Du musst NICHT erwarten, dass jeder Schritt explizit in vorherigen Injects erwähnt wird
-   - Prüfe nur, ob die Sequenz technisch möglich ist, nicht ob sie explizit erwähnt wurde
-   
-   WICHTIG: Sei nicht zu streng! Viele MITRE-Techniken können in mehreren Phasen vorkommen.
-   
-   BEISPIEL FÜR INVALIDITÄT (nur wirklich unmögliche Sequenzen):
-   - Phase: NORMAL_OPERATION, MITRE: T1041 (Exfiltration) → FEHLER: Exfiltration vor Initial Access unmöglich!
-   - Phase: NORMAL_OPERATION, MITRE: T1486 (Data Encrypted for Impact) → FEHLER: Impact vor Execution unmöglich!
-   
-   BEISPIEL FÜR VALIDITÄT (diese sind OK):
-   - Phase: SUSPICIOUS_ACTIVITY, MITRE: T1595 (Active Scanning) → OK: Scanning kann in verschiedenen Phasen vorkommen
-   - Phase: INITIAL_INCIDENT, MITRE: T1546.014 (Event Triggered Execution) → OK: Kann nach SUSPICIOUS_ACTIVITY vorkommen (Phasen-Übergang zeigt Logik)
-   - Phase: INITIAL_INCIDENT, MITRE: T1480 (Execution Guardrails) → OK: Kann in verschiedenen Phasen vorkommen, auch wenn nicht explizit erwähnt
-
-3. REGULATORISCHE ASPEKTE (optional, nicht blockierend):
-   - Incident Response Plan Testing
-   - Business Continuity Plan Testing
-   - Recovery Plan Testing
-   - Coverage of critical functions
-   - Realistic scenario testing
-   - Documentation adequate
-
-VALIDIERUNGSREGELN:
-- Sei STRENG aber FAIR: Bei echten Verstößen → FEHLER melden, bei Unsicherheiten → Warnung
-- Jeder Fehler MUSS eine klare, spezifische Begründung haben
-- Warnungen für potenzielle Probleme, Fehler für klare Verstöße
-- Prüfe ALLE Aspekte: Logik, Kausalität, State, Temporalität
-- ASSET-NAMEN: Erlaube sowohl IDs als auch Namen (siehe oben)
-- KAUSALE LOGIK: Phasen-Übergänge zeigen bereits die Logik (siehe oben)
-
-ANTWORT-FORMAT (STRICT JSON):
-{{
-    "logical_consistency": true/false,
-    "regulatory_compliance": true/false,
-    "causal_validity": true/false,
-    "errors": ["Spezifischer Fehler 1 mit Begründung", "Spezifischer Fehler 2 mit Begründung"],
-    "warnings": ["Potenzielle Warnung 1", "Potenzielle Warnung 2"]
-}}
-
-FEHLER-MUSTER (wenn diese auftreten → FEHLER):
-- Asset existiert nicht im Systemzustand (z.B. verwendet "SRV-003" aber nur SRV-001, SRV-002 existieren)
-- Asset ist offline, wird aber als aktiv behandelt (z.B. "SRV-001 ist offline" in Inject 1, aber "Lateral Movement von SRV-001" in Inject 2)
-- MITRE-Technik passt nicht zur Phase (nur wirklich unmögliche Sequenzen, siehe oben)
-- Temporale Inkonsistenz (Zeitstempel geht zurück)
-- Asset-ID ist falsch (z.B. verwendet "SRV-003" statt "SRV-001")
-
-WARNUNG-MUSTER (wenn diese auftreten → WARNUNG, nicht Fehler):
-- Großer Zeitsprung ohne Erklärung
-- Neue Assets ohne Kontext
-- Ungewöhnliche aber mögliche Sequenz
-- MITRE-Technik passt möglicherweise nicht perfekt zur Phase (aber technisch möglich)
-- Kausale Sequenz könnte besser erklärt werden (aber Phasen-Übergang zeigt bereits Logik)
-
-❌❌❌ ABSOLUT VERBOTEN - MELDE DIESE NIEMALS ALS FEHLER:
-- "Asset-Name-Inkonsistenz" wenn ein Asset sowohl mit ID als auch mit Namen bezeichnet wird
-- "Asset-Name-Inkonsistenz" wenn verschiedene Namen für dasselbe Asset verwendet werden (z.B. "SRV-001" und "DC-01")
-- "Asset-Name-Inkonsistenz" wenn "Payment Processing System" und "APP-001" für dasselbe Asset verwendet werden
-- "Asset-Name-Inkonsistenz" wenn "Application Server APP-SRV-01" und "SRV-002" für dasselbe Asset verwendet werden
-
-⚠️ Wenn du denkst, dass verschiedene Namen für dasselbe Asset verwendet werden, ist das ERLAUBT. 
-Melde es NIEMALS als Fehler, höchstens als Warnung wenn es wirklich verwirrend ist!"""),
-            
-            ("human", """Validiere folgenden Inject STRENG:
-
-Inject:
-{inject}
-
-Aktuelle Phase: {current_phase}
-Vorherige Phase: {previous_phase}
-
-Vorherige Injects (für Konsistenz-Prüfung):
-{previous_injects}
-
-Systemzustand (verfügbare Assets und deren Status):
-{system_state}
-
-MITRE ATT&CK Technik: {mitre_id}
-Regulatorische Checkliste (automatisch geprüft):
-{regulatory_checklist_results}
-
-SYMBOLISCHE VALIDIERUNG (bereits geprüft):
-- FSM-Übergang: ✓ OK
-- State-Consistency: ✓ OK
-- Temporale Konsistenz: ✓ OK
-
-LLM-VALIDIERUNG (deine Aufgabe):
-Prüfe jetzt:
-1. LOGISCHE KONSISTENZ: Widerspricht der Inject der Historie oder dem Systemzustand?
-2. CAUSAL VALIDITY: Passt MITRE {mitre_id} zur Phase {current_phase} und zur Sequenz?
-3. REGULATORISCHE ASPEKTE: Erfüllt der Inject die grundlegenden Anforderungen? (optional, nicht blockierend)
-
-Antworte STRICT JSON (nur JSON, keine zusätzlichen Erklärungen außerhalb des JSON).""")
-        ])
-        
         # Formatierung
         previous_injects_str = self._format_previous_injects(previous_injects)
-        system_state_str = formatted_system_state_str or self._format_system_state(system_state)
+        system_state_str = formatted_system_state_str or self._format_system_state(
+            system_state, focus_assets(previous_injects, extra=inject.technical_metadata.affected_assets)
+        )
         inject_str = self._format_inject(inject)
         
         # Bestimme vorherige Phase
@@ -1072,7 +1179,7 @@ Antworte STRICT JSON (nur JSON, keine zusätzlichen Erklärungen außerhalb des
             for key, value in regulatory_check["checklist_results"].items()
         ])
         
-        chain = prompt | self.llm
+        chain = self._validation_chain.for_llm(self.llm)
         
         # Retry-Logik für LLM-Call
         from utils.retry_handler import safe_llm_call
@@ -1106,26 +1213,20 @@ Antworte STRICT JSON (nur JSON, keine zusätzlichen Erklärungen außerhalb des
                     "_raw_llm_output": "LLM-Call fehlgeschlagen (response is None)"
                 }
             
-            # Parse JSON
-            import json
-            import re
-            
             content = response.content
             raw_llm_output = content  # Speichere RAW Output für Audit-Log
             
-            json_match = re.search(r'\{.*\}', content, re.DOTALL)
+            validation = parse_structured(content, CriticValidationResponse, agent="critic")
             
-            if json_match:
-                validation = json.loads(json_match.group())
-                
-                # Extrahiere und validiere Felder
-                logical_consistency = validation.get("logical_consistency", True)
-                causal_validity = validation.get("causal_validity", True)
-                llm_regulatory_compliance = validation.get("regulatory_compliance", True)
+            if validation is not None:
+                # Extrahiere Felder (Typen prüft das Schema)
+                logical_consistency = validation.logical_consistency
+                causal_validity = validation.causal_validity
+                llm_regulatory_compliance = validation.regulatory_compliance
                 
                 # Kombiniere LLM-Validierung mit Regulatorik-Check
-                combined_errors = validation.get("errors", []) or []
-                combined_warnings = validation.get("warnings", []) or []
+                combined_errors = list(validation.errors or [])
+                combined_warnings = list(validation.warnings or [])
                 
                 # POST-PROCESSING: Konvertiere falsche "Asset-Name-Inkonsistenz" Fehler zu Warnungen
                 # Der LLM meldet manchmal fälschlicherweise Asset-Name-Inkonsistenzen als Fehler,
@@ -1207,9 +1308,12 @@ Antworte STRICT JSON (nur JSON, keine zusätzlichen Erklärungen außerhalb des
                     "causal_validity": True,
                     "errors": regulatory_check["issues"],
                     "warnings": regulatory_check["warnings"] + ["Validierung konnte nicht vollständig durchgeführt werden"],
-                    "_raw_llm_output": content if 'content' in locals() else "Kein JSON-Match gefunden"
+                    "_raw_llm_output": content if 'content' in locals() else "Kein verwertbares JSON gefunden"
                 }
                 
+        except OperationCancelled:
+            # Abbruch nicht als bestandene Validierung werten
+            raise
         except Exception as e:
             # Fallback bei Fehler: Verwende Regulatorik-Check Ergebnisse
             return {
@@ -1247,11 +1351,17 @@ Antworte STRICT JSON (nur JSON, keine zusätzlichen Erklärungen außerhalb des
         
         return "\n".join(lines)
     
-    def _format_system_state(self, system_state: Dict[str, Any]) -> str:
+    def _format_system_state(self, system_state: Dict[str, Any], focus: Iterable[str] = ()) -> str:
         """
         Formatiert den Systemzustand mit expliziter Asset-Liste.
         
-        WICHTIG: Filtert nur echte Assets, keine INJ-* oder SCEN-* IDs.
+        WICHTIG: Filtert nur echte Assets, keine INJ-* oder SCEN-* IDs. Bei großen
+        Infrastrukturen nur die relevanten Assets (siehe utils/context_selector.py)
+        plus Zusammenfassung pro Status.
+        
+        Args:
+            system_state: Aktueller Systemzustand
+            focus: Fokus-Assets (geprüfter Inject, letzte Injects)
         """
         if not system_state or not isinstance(system_state, dict):
             return "Keine Systemzustand-Informationen verfügbar. Verwende Standard-Assets: SRV-001, SRV-002"
@@ -1273,9 +1383,13 @@ Antworte STRICT JSON (nur JSON, keine zusätzlichen Erklärungen außerhalb des
         if not valid_assets:
             return "Keine Assets im Systemzustand verfügbar. Verwende Standard-Assets: SRV-001, SRV-002"
         
+        selected = select_relevant_assets(valid_assets, focus)
         lines = []
+        if len(selected) < len(valid_assets):
+            lines.append(status_summary(valid_assets, len(selected)))
         asset_list = []
-        for entity_id, entity_data in valid_assets.items():
+        for entity_id in selected:
+            entity_data = valid_assets[entity_id]
             status = entity_data.get("status", "unknown")
             name = entity_data.get("name", entity_id)
             entity_type = entity_data.get("entity_type", "Asset")
@@ -1322,7 +1436,9 @@ Antworte STRICT JSON (nur JSON, keine zusätzlichen Erklärungen außerhalb des
         
         # Formatiere System-State-String (wie er an LLM gesendet wurde)
         if formatted_system_state_str is None:
-            formatted_system_state_str = self._format_system_state(system_state)
+            formatted_system_state_str = self._format_system_state(
+                system_state, focus_assets(previous_injects, extra=inject.technical_metadata.affected_assets)
+            )
         
         # Formatiere vorherige Injects
         previous_injects_json = []
@@ -1441,7 +1557,7 @@ Antworte STRICT JSON (nur JSON, keine zusätzlichen Erklärungen außerhalb des
                     f.write("Jeder Eintrag zeigt die exakten Inputs, den Generator-Draft, die LLM-Antwort und die finale Entscheidung.\n\n")
                     f.write("---\n\n")
                 f.write(markdown_entry)
-            print(f"📝 [Critic] Audit-Log geschrieben: {log_file}")
+            logger.debug("📝 [Critic] Audit-Log geschrieben: %s", log_file)
         except Exception as e:
-            print(f"⚠️  [Critic] Fehler beim Schreiben des Audit-Logs: {e}")
+            logger.warning("⚠️  [Critic] Fehler beim Schreiben des Audit-Logs: %s", e)
 
@@ -204,7 +204,52 @@ class ScientificValidator:
         )
         
         return max(0.0, min(1.0, score))
-    
+
+    def calculate_pre_llm_confidence(
+        self,
+        inject: Any,
+        previous_injects: List[Any],
+        current_phase: Any,
+        system_state: Dict[str, Any]
+    ) -> Dict[str, float]:
+        """
+        Berechnet die symbolischen Scores VOR dem LLM-Call.
+
+        Compliance benötigt die LLM-basierten Framework-Prüfungen und fließt
+        daher nicht ein; die übrigen Gewichte werden auf 1.0 renormiert.
+
+        Returns:
+            Dict mit logical, causal, temporal, asset und confidence (0.0-1.0)
+        """
+        scores = {
+            "logical": self.calculate_logical_consistency_score(
+                inject=inject,
+                previous_injects=previous_injects,
+                system_state=system_state
+            ),
+            "causal": self.calculate_causal_validity_score(
+                inject=inject,
+                current_phase=current_phase,
+                mitre_id=inject.technical_metadata.mitre_id
+            ),
+            "temporal": self.calculate_temporal_consistency_score(
+                inject=inject,
+                previous_injects=previous_injects
+            ) if previous_injects else 1.0,
+            "asset": self._check_asset_name_consistency(
+                inject=inject,
+                previous_injects=previous_injects
+            )
+        }
+        weights = {
+            "logical": self.metric_weights[ValidationMetric.LOGICAL_CONSISTENCY_SCORE],
+            "causal": self.metric_weights[ValidationMetric.CAUSAL_VALIDITY_SCORE],
+            "temporal": self.metric_weights[ValidationMetric.TEMPORAL_CONSISTENCY_SCORE],
+            "asset": self.metric_weights[ValidationMetric.ASSET_CONSISTENCY_SCORE]
+        }
+        scores["confidence"] = sum(scores[key] * weight for key, weight in weights.items()) / sum(weights.values())
+        return scores
+
     def calculate_confidence_interval(
         self,
         score: float,
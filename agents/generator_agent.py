@@ -7,9 +7,13 @@ Verantwortlich für:
 - Integration von TTPs und Systemzustand
 """
 
-from typing import Dict, Any, Optional, List
-from langchain_openai import ChatOpenAI
+from typing import Dict, Any, Iterable, Optional, List
 from langchain_core.prompts import ChatPromptTemplate
+from pydantic import BaseModel, ConfigDict
+from utils.llm_provider import create_chat_model
+from utils.structured_output import JsonChain, parse_structured
+from utils.cancellation import OperationCancelled
+from utils.context_selector import focus_assets, select_relevant_assets, status_summary
 from state_models import (
     Inject,
     TechnicalMetadata,
@@ -19,69 +23,37 @@ from state_models import (
 )
 from datetime import datetime, timedelta
 import os
+import logging
 from dotenv import load_dotenv
-import json
 import re
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
 
-class GeneratorAgent:
-    """
-    Generator Agent für Inject-Erstellung.
-    
-    Verwendet LLM, um realistische, detaillierte Injects zu generieren,
-    die dem Inject-Schema entsprechen und DORA-konform sind.
-    """
-    
-    def __init__(self, model_name: str = "gpt-4o", temperature: float = 0.8):
-        """
-        Initialisiert den Generator Agent.
-        
-        Args:
-            model_name: OpenAI Modell-Name
-            temperature: Temperature für LLM
-        """
-        self.llm = ChatOpenAI(
-            model=model_name,
-            temperature=temperature,
-            api_key=os.getenv("OPENAI_API_KEY")
-        )
-    
-    def generate_inject(
-        self,
-        scenario_type: ScenarioType,
-        phase: CrisisPhase,
-        inject_id: str,
-        time_offset: str,
-        manager_plan: Dict[str, Any],
-        selected_ttp: Dict[str, Any],
-        system_state: Dict[str, Any],
-        previous_injects: list,
-        validation_feedback: Optional[Dict[str, Any]] = None,
-        user_feedback: Optional[str] = None
-    ) -> Inject:
-        """
-        Generiert einen neuen Inject.
-        
-        Args:
-            scenario_type: Typ des Szenarios
-            phase: Aktuelle Phase
-            inject_id: Eindeutige Inject-ID
-            time_offset: Zeitversatz (z.B. "T+02:00")
-            manager_plan: Storyline-Plan vom Manager Agent
-            selected_ttp: Ausgewählte TTP
-            system_state: Aktueller Systemzustand
-            previous_injects: Liste vorheriger Injects für Konsistenz
-            validation_feedback: Optional Feedback vom Critic Agent für Refine-Loops
-        
-        Returns:
-            Inject-Objekt (Pydantic)
-        """
-        # Erstelle Prompt für Inject-Generierung
-        is_refine = validation_feedback is not None
-        
-        system_prompt = """Du bist ein Experte für Cyber-Security Incident Response und Krisenmanagement.
+
+class InjectDraftResponse(BaseModel):
+    """Antwortschema für einen Inject-Draft (IDs und Phase setzt der Workflow)."""
+
+    model_config = ConfigDict(extra="allow")
+
+    time_offset: Optional[str] = None
+    source: Optional[str] = None
+    target: Optional[str] = None
+    modality: Optional[str] = None
+    content: str
+    technical_metadata: Dict[str, Any] = {}
+    business_impact: Optional[str] = None
+
+
+class InjectSequenceResponse(BaseModel):
+    """Antwortschema für eine Inject-Sequenz (Einträge werden einzeln geprüft)."""
+
+    injects: List[Dict[str, Any]] = []
+
+
+# System-Prompt des Generators (gemeinsam für Einzel- und Batch-Generierung)
+INJECT_SYSTEM_PROMPT = """Du bist ein Experte für Cyber-Security Incident Response und Krisenmanagement.
 Deine Aufgabe ist es, realistische, detaillierte Injects für Krisenszenarien zu erstellen.
 
 ### CRITICAL ASSET BINDING RULES (NON-NEGOTIABLE) ###
@@ -160,9 +132,9 @@ You MUST calculate the `time_offset` based on the NARRATIVE CONTEXT, not just ad
 - Weekend gap → `T+02:00:00` (2 days later)
 
 **IMPORTANT:** The time_offset MUST be chronologically AFTER the last inject's time_offset. Check previous_injects to ensure consistency."""
-        
-        if is_refine:
-            system_prompt += """
+
+# Zusatz im Refine-Modus (Variable: validation_errors)
+REFINE_PROMPT_SUFFIX = """
 
 ⚠️ REFINE-MODUS: Der vorherige Inject wurde zurückgewiesen.
 Korrigiere die folgenden Fehler:
@@ -171,11 +143,10 @@ Korrigiere die folgenden Fehler:
 WICHTIG: Behebe ALLE genannten Fehler. Verwende dieselbe Inject-ID und denselben Zeitstempel.
 
 🚫 TTP FREEZE (FORBIDDEN): Your task is to FIX the logical errors reported by the Critic. You are FORBIDDEN from changing the selected MITRE TTP or the affected assets unless the Critic explicitly tells you they are wrong. Keep the core scenario stable."""
-        
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", system_prompt),
-            
-            ("human", """Erstelle einen Inject für ein {scenario_type} Szenario.
+
+
+# Human-Prompt für einen einzelnen Inject (nach dem statischen System-Prompt)
+INJECT_HUMAN_PROMPT = """Erstelle einen Inject für ein {scenario_type} Szenario.
 
 Kontext:
 - Inject ID: {inject_id}
@@ -246,13 +217,142 @@ Weitere Anforderungen:
 - Verwende echte technische Details (aber keine echten IOCs)
 - Stelle sicher, dass der Inject zur Phase und zum TTP passt (TTP {ttp_id} sollte zur Phase {phase} passen)
 - Berücksichtige den Systemzustand (welche Assets sind betroffen?)
-- Business Impact sollte kritische Geschäftsfunktionen erwähnen""")
-        ])
+- Business Impact sollte kritische Geschäftsfunktionen erwähnen"""
+
+# Human-Prompt für eine Inject-Sequenz in einem Aufruf
+INJECT_SEQUENCE_HUMAN_PROMPT = """Erstelle eine Sequenz von {count} aufeinanderfolgenden Injects für ein {scenario_type} Szenario.
+
+Kontext:
+- Inject IDs (in dieser Reihenfolge): {inject_ids}
+- Vorgeschlagene Zeitversätze (NUR VORSCHLAG): {time_offsets}
+- Phase: {phase}
+- TTP: {ttp_name} ({ttp_id})
+{temporal_context}
+{normal_operation_rule}
+
+Storyline-Plan:
+{manager_plan}
+
+Geplante Ereignisse (ein Inject pro Ereignis, in dieser Reihenfolge):
+{plan_steps}
+
+⚠️ KRITISCH - SYSTEMZUSTAND (VERFÜGBARE ASSETS):
+{system_state}
+
+⚠️ KRITISCH - VORHERIGE INJECTS (für Konsistenz - verwende dieselben Asset-Namen!):
+{previous_injects}
+
+{user_feedback_section}
+
+⚠️ ABSOLUT VERBINDLICHE REGELN:
+1. Verwende NUR Asset-IDs aus der Liste "VERFÜGBARE ASSET-IDs" oben - keine neuen Assets, keine Variationen
+2. Jeder Inject baut auf dem vorherigen Inject der Sequenz auf (Kausalität, gleiche Asset-Namen)
+3. Die time_offsets sind innerhalb der Sequenz strikt aufsteigend und liegen nach dem letzten vorherigen Inject
+4. Jeder Inject hat mindestens 50 Zeichen Content und passt zu Phase {phase} und TTP {ttp_id}
+
+Antworte im folgenden JSON-Format (genau {count} Einträge, in der Reihenfolge der Inject IDs):
+{{
+    "injects": [
+        {{
+            "inject_id": "<Inject ID>",
+            "time_offset": "<T+DD:HH:MM>",
+            "source": "<Quelle, z.B. 'Red Team / Attacker' oder 'Blue Team / SOC'>",
+            "target": "<Empfänger, z.B. 'Blue Team / SOC' oder 'Management'>",
+            "modality": "<SIEM Alert|Email|Phone Call|Physical Event|News Report|Internal Report>",
+            "content": "<Detaillierter Inhalt des Injects, mindestens 50 Zeichen>",
+            "technical_metadata": {{
+                "mitre_id": "{ttp_id}",
+                "affected_assets": ["<Asset 1>", "<Asset 2>"],
+                "ioc_hash": "<SHA256 Hash>",
+                "ioc_ip": "<IP-Adresse>",
+                "ioc_domain": "<Domain>",
+                "severity": "<Low|Medium|High|Critical>"
+            }},
+            "business_impact": "<Beschreibung der geschäftlichen Auswirkung, optional>"
+        }}
+    ]
+}}"""
+
+# Einmal kompilierte Vorlagen: alle beginnen mit demselben System-Prompt
+# (stabiles Präfix für das Prompt-Caching des Providers)
+INJECT_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", INJECT_SYSTEM_PROMPT),
+    ("human", INJECT_HUMAN_PROMPT)
+])
+# Refine-Modus: Korrektur-Hinweis (mit den Fehlern) als eigene Nachricht hinter dem Präfix
+REFINE_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", INJECT_SYSTEM_PROMPT),
+    ("system", REFINE_PROMPT_SUFFIX.lstrip()),
+    ("human", INJECT_HUMAN_PROMPT)
+])
+INJECT_SEQUENCE_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", INJECT_SYSTEM_PROMPT),
+    ("human", INJECT_SEQUENCE_HUMAN_PROMPT)
+])
+
+
+class GeneratorAgent:
+    """
+    Generator Agent für Inject-Erstellung.
+    
+    Verwendet LLM, um realistische, detaillierte Injects zu generieren,
+    die dem Inject-Schema entsprechen und DORA-konform sind.
+    """
+    
+    def __init__(self, model_name: str = "gpt-4o", temperature: float = 0.8):
+        """
+        Initialisiert den Generator Agent.
+        
+        Args:
+            model_name: Modell-Name (Provider per LLM_PROVIDER, siehe utils/llm_provider.py)
+            temperature: Temperature für LLM
+        """
+        self.llm = create_chat_model("generator", model_name=model_name, temperature=temperature)
+        self._inject_chain = JsonChain(INJECT_PROMPT)
+        self._refine_chain = JsonChain(REFINE_PROMPT)
+        self._sequence_chain = JsonChain(INJECT_SEQUENCE_PROMPT)
+    
+    def generate_inject(
+        self,
+        scenario_type: ScenarioType,
+        phase: CrisisPhase,
+        inject_id: str,
+        time_offset: str,
+        manager_plan: Dict[str, Any],
+        selected_ttp: Dict[str, Any],
+        system_state: Dict[str, Any],
+        previous_injects: list,
+        validation_feedback: Optional[Dict[str, Any]] = None,
+        user_feedback: Optional[str] = None,
+        temperature: Optional[float] = None
+    ) -> Inject:
+        """
+        Generiert einen neuen Inject.
+        
+        Args:
+            scenario_type: Typ des Szenarios
+            phase: Aktuelle Phase
+            inject_id: Eindeutige Inject-ID
+            time_offset: Zeitversatz (z.B. "T+02:00")
+            manager_plan: Storyline-Plan vom Manager Agent
+            selected_ttp: Ausgewählte TTP
+            system_state: Aktueller Systemzustand
+            previous_injects: Liste vorheriger Injects für Konsistenz
+            validation_feedback: Optional Feedback vom Critic Agent für Refine-Loops
+            temperature: Optional abweichende Temperature für diesen Aufruf
+                         (z.B. für spekulative Kandidaten)
+        
+        Returns:
+            Inject-Objekt (Pydantic)
+        """
+        # Refine-Modus: gleicher System-Prompt, gefolgt vom Korrektur-Hinweis
+        is_refine = validation_feedback is not None
+        prompt_chain = self._refine_chain if is_refine else self._inject_chain
         
         # Formatierung
         ttp_name = selected_ttp.get("name", "Unknown TTP")
         ttp_id = selected_ttp.get("mitre_id", selected_ttp.get("technique_id", "T0000"))
-        system_state_str = self._format_system_state(system_state)
+        system_state_str = self._format_system_state(system_state, focus_assets(previous_injects, manager_plan))
         previous_injects_str = self._format_previous_injects(previous_injects)
         manager_plan_str = self._format_manager_plan(manager_plan)
         
@@ -264,37 +364,8 @@ Weitere Anforderungen:
             last_timestamp = last_inject.time_offset
             last_inject_id = last_inject.inject_id
         
-        # Normal Operation Regel
-        normal_operation_rule = ""
-        if phase == CrisisPhase.NORMAL_OPERATION:
-            normal_operation_rule = """
-⚠️ PHASE: NORMAL_OPERATION - SPEZIELLE REGELN:
-- Generiere KEINE offensichtlichen Angriffe (wie Ransomware, C2 Traffic, aktive Exploits).
-- ERLAUBT sind:
-  * False Positives (fehlerhafte SIEM-Alerts, verdächtige aber harmlose Aktivitäten)
-  * Wartungsfehler (falsche Konfigurationen, unbeabsichtigte Änderungen)
-  * Fehlgeschlagene Logins (Brute-Force-Versuche die fehlschlagen)
-  * Subtile Reconnaissance (Port-Scanning, OSINT-Sammlung, passive Scanning)
-- Falls du einen Angriff startest, MUSS der Inject eine Transition zu 'SUSPICIOUS_ACTIVITY' vorschlagen.
-- Der Content sollte eher "verdächtig" als "bedrohlich" klingen."""
-        
-        # User Feedback Formatierung (Human-in-the-Loop)
-        user_feedback_section = ""
-        if user_feedback and user_feedback.strip():
-            user_feedback_section = f"""
-### HUMAN RESPONSE TO LAST INJECT:
-The Incident Response Team performed the following action: "{user_feedback}"
-
-INSTRUCTION:
-The next Inject MUST reflect the consequences of this action.
-- If they mitigated the threat (e.g., isolated server, blocked IP, shutdown service) → Show recovery or a new, different attack vector.
-- If they ignored it or took insufficient action → Escalate the crisis drastically.
-- If they took defensive action → Show how the attacker adapts or how the system responds.
-- Be realistic: Actions have consequences. If SRV-001 was shut down, it cannot be attacked in the next inject, but services depending on it may be affected.
-
-CRITICAL: The inject content must logically follow from the response action. Do not ignore the human action."""
-        else:
-            user_feedback_section = ""
+        normal_operation_rule = self._normal_operation_rule(phase)
+        user_feedback_section = self._format_user_feedback(user_feedback)
         
         # Validation Feedback Formatierung
         validation_feedback_section = ""
@@ -336,31 +407,17 @@ CRITICAL: The inject content must logically follow from the response action. Do
                 validation_feedback_section += "WICHTIG: Verwende NUR Asset-IDs aus der Liste oben!\n"
                 validation_feedback_section += "="*60 + "\n"
         
-        # ================== TEMPORAL CONTEXT DEFINITION (FIX) ==================
-        # 1. Letzten Inject und Zeitstempel holen
-        if previous_injects:
-            last_inject = previous_injects[-1]
-            last_time_str = last_inject.time_offset
-        else:
-            last_time_str = "T+00:00:00"
-        
-        # 2. Variable 'temporal_context' DEFINIEREN (das fehlte!)
-        temporal_context = (
-            f"Der letzte validierte Inject fand um {last_time_str} statt. "
-            f"Dein neuer Inject MUSS zwingend zeitlich danach liegen (z.B. +15 bis +60 Minuten). "
-            f"Berechne den neuen Offset basierend auf {last_time_str}."
-        )
-        # ================== ENDE TEMPORAL CONTEXT DEFINITION ==================
+        temporal_context = self._temporal_context(previous_injects)
         
-        chain = prompt | self.llm
+        chain = prompt_chain.for_llm(self.llm, temperature)
         
         # Retry-Logik für LLM-Call
         from utils.retry_handler import safe_llm_call
         
-        print(f"🔧 [Generator] Starte LLM-Call für Inject {inject_id}")
-        print(f"   Phase: {phase.value}, TTP: {ttp_id}")
-        print(f"   System State Keys: {list(system_state.keys())[:5] if system_state else 'Keine'}")
-        print(f"   Validation Feedback: {'Ja' if validation_feedback else 'Nein'}")
+        logger.debug("🔧 [Generator] Starte LLM-Call für Inject %s", inject_id)
+        logger.debug("Phase: %s, TTP: %s", phase.value, ttp_id)
+        logger.debug("System State Keys: %s", list(system_state.keys())[:5] if system_state else 'Keine')
+        logger.debug("Validation Feedback: %s", 'Ja' if validation_feedback else 'Nein')
         
         try:
             def _invoke_chain():
@@ -388,90 +445,244 @@ CRITICAL: The inject content must logically follow from the response action. Do
             )
             
             if response is None:
-                print(f"❌ [Generator] LLM-Call fehlgeschlagen für {inject_id}")
+                logger.warning("❌ [Generator] LLM-Call fehlgeschlagen für %s", inject_id)
                 raise Exception("LLM-Call fehlgeschlagen nach mehreren Versuchen")
             
-            print(f"✅ [Generator] LLM-Call erfolgreich für {inject_id}")
+            logger.debug("✅ [Generator] LLM-Call erfolgreich für %s", inject_id)
             
             # Parse JSON aus Response
             content = response.content
-            print(f"🔧 [Generator] Parse JSON aus Response (Länge: {len(content)} Zeichen)")
+            logger.debug("🔧 [Generator] Parse JSON aus Response (Länge: %s Zeichen)", len(content))
             
-            # Verwende das global importierte re-Modul
-            json_match = re.search(r'\{.*\}', content, re.DOTALL)
-            print(f"🔧 [Generator] JSON Match gefunden: {json_match is not None}")
+            draft = parse_structured(content, InjectDraftResponse, agent="generator")
             
-            if json_match:
-                print(f"🔧 [Generator] Parse JSON-Daten...")
-                inject_data = json.loads(json_match.group())
+            if draft is not None:
+                inject = self._build_inject(draft.model_dump(exclude_none=True), inject_id, time_offset, phase, ttp_id, system_state)
                 
-                # POST-PROCESSING: Validiere und korrigiere Assets
-                requested_assets = inject_data.get("technical_metadata", {}).get("affected_assets", [])
-                print(f"🔧 [Generator] Angeforderte Assets vom LLM: {requested_assets}")
-                
-                valid_assets = self._validate_and_correct_assets(requested_assets, system_state)
-                print(f"✅ [Generator] Korrigierte Assets: {valid_assets}")
-                
-                # Erstelle TechnicalMetadata mit korrigierten Assets
-                tech_meta = TechnicalMetadata(
-                    mitre_id=inject_data.get("technical_metadata", {}).get("mitre_id", ttp_id),
-                    affected_assets=valid_assets,  # Verwende korrigierte Assets
-                    ioc_hash=inject_data.get("technical_metadata", {}).get("ioc_hash"),
-                    ioc_ip=inject_data.get("technical_metadata", {}).get("ioc_ip"),
-                    ioc_domain=inject_data.get("technical_metadata", {}).get("ioc_domain"),
-                    severity=inject_data.get("technical_metadata", {}).get("severity", "Medium")
-                )
-                
-                # Verwende Generator-generierten time_offset falls vorhanden, sonst Fallback
-                generated_time_offset = inject_data.get("time_offset")
-                if generated_time_offset and generated_time_offset.strip():
-                    # Validiere Format (akzeptiert sowohl T+DD:HH:MM als auch T+DD:HH)
-                    if re.match(r'^T\+\d{2}:\d{2}(?::\d{2})?$', generated_time_offset):
-                        final_time_offset = generated_time_offset
-                        print(f"✅ [Generator] Verwende Generator-generierten time_offset: {final_time_offset}")
-                    else:
-                        print(f"⚠️  [Generator] Ungültiges time_offset Format '{generated_time_offset}', verwende Fallback")
-                        final_time_offset = time_offset
-                else:
-                    # Fallback auf übergebenen time_offset
-                    final_time_offset = time_offset
-                    print(f"ℹ️  [Generator] Kein Generator-generierter time_offset, verwende Fallback: {final_time_offset}")
-                
-                # Erstelle Inject
-                inject = Inject(
-                    inject_id=inject_id,
-                    time_offset=final_time_offset,
-                    phase=phase,
-                    source=inject_data.get("source", "Red Team / Attacker"),
-                    target=inject_data.get("target", "Blue Team / SOC"),
-                    modality=InjectModality(inject_data.get("modality", "SIEM Alert")),
-                    content=inject_data.get("content", "Generic security event detected."),
-                    technical_metadata=tech_meta,
-                    dora_compliance_tag=None,  # Nicht mehr verwendet, für Rückwärtskompatibilität None
-                    business_impact=inject_data.get("business_impact")
-                )
-                
-                print(f"✅ [Generator] Inject {inject_id} erfolgreich erstellt")
-                print(f"   Assets: {valid_assets}")
-                print(f"   Content Preview: {inject.content[:80]}...")
+                logger.debug("✅ [Generator] Inject %s erfolgreich erstellt", inject_id)
+                logger.debug("Assets: %s", inject.technical_metadata.affected_assets)
+                logger.debug("Content Preview: %s...", inject.content[:80])
                 
                 return inject
             else:
-                print(f"⚠️  [Generator] Kein JSON-Match gefunden in Response")
-                print(f"   Response Preview: {content[:200]}...")
+                logger.warning("⚠️  [Generator] Kein verwertbares JSON in Response")
+                logger.debug("Response Preview: %s...", content[:200])
                 # Fallback: Erstelle minimalen Inject
                 return self._create_fallback_inject(
                     inject_id, time_offset, phase, ttp_id, selected_ttp
                 )
                 
+        except OperationCancelled:
+            # Abbruch (Node-Zeitlimit, Deadline, Client) nicht als Fallback-Inject verschlucken
+            raise
         except Exception as e:
-            import traceback
-            print(f"❌ [Generator] Fehler bei Inject-Generierung für {inject_id}: {e}")
-            print(f"   Traceback: {traceback.format_exc()}")
+            logger.warning("❌ [Generator] Fehler bei Inject-Generierung für %s: %s", inject_id, e, exc_info=True)
             return self._create_fallback_inject(
                 inject_id, time_offset, phase, ttp_id, selected_ttp
             )
     
+    def generate_injects(
+        self,
+        scenario_type: ScenarioType,
+        phase: CrisisPhase,
+        inject_ids: List[str],
+        time_offsets: List[str],
+        manager_plan: Dict[str, Any],
+        selected_ttp: Dict[str, Any],
+        system_state: Dict[str, Any],
+        previous_injects: list,
+        plan_steps: Optional[List[Dict[str, Any]]] = None,
+        user_feedback: Optional[str] = None,
+        temperature: Optional[float] = None
+    ) -> List[Inject]:
+        """
+        Generiert eine geordnete Sequenz von Injects in einem LLM-Aufruf.
+        
+        System-Prompt, Systemzustand und vorherige Injects werden nur einmal
+        für alle Injects der Sequenz gesendet. Die Injects werden nicht
+        validiert - der Workflow prüft sie einzeln über den Critic und
+        verwirft die Sequenz ab dem ersten abgelehnten Inject.
+        
+        Args:
+            scenario_type: Typ des Szenarios
+            phase: Aktuelle Phase (gilt für alle Injects der Sequenz)
+            inject_ids: IDs der zu erzeugenden Injects (Länge = Anzahl)
+            time_offsets: Vorgeschlagene Zeitversätze pro Inject
+            manager_plan: Storyline-Plan vom Manager Agent
+            selected_ttp: Ausgewählte TTP
+            system_state: Aktueller Systemzustand
+            previous_injects: Liste vorheriger Injects für Konsistenz
+            plan_steps: Optional - geplante Ereignisse ({"event", "assets"}) pro Inject
+            user_feedback: Optional letzte Response Action des Benutzers
+            temperature: Optional abweichende Temperature für diesen Aufruf
+        
+        Returns:
+            Liste der erzeugten Injects in Reihenfolge (kann kürzer sein als
+            inject_ids; leer, wenn der LLM-Call oder das Parsen fehlschlägt)
+        """
+        ttp_name = selected_ttp.get("name", "Unknown TTP")
+        ttp_id = selected_ttp.get("mitre_id", selected_ttp.get("technique_id", "T0000"))
+        plan_steps_str = "\n".join(
+            f"{i}. {step.get('event', '')}" + (f" (Assets: {', '.join(step['assets'])})" if step.get("assets") else "")
+            for i, step in enumerate(plan_steps or [], 1)
+        ) or "Keine - leite die Ereignisse aus dem Storyline-Plan ab"
+        
+        chain = self._sequence_chain.for_llm(self.llm, temperature)
+        
+        from utils.retry_handler import safe_llm_call
+        
+        logger.debug("🔧 [Generator] Starte LLM-Call für Inject-Sequenz %s..%s (%s Injects)", inject_ids[0], inject_ids[-1], len(inject_ids))
+        
+        try:
+            response = safe_llm_call(
+                lambda: chain.invoke({
+                    "count": len(inject_ids),
+                    "scenario_type": scenario_type.value,
+                    "inject_ids": ", ".join(inject_ids),
+                    "time_offsets": ", ".join(time_offsets),
+                    "phase": phase.value,
+                    "ttp_name": ttp_name,
+                    "ttp_id": ttp_id,
+                    "temporal_context": self._temporal_context(previous_injects),
+                    "normal_operation_rule": self._normal_operation_rule(phase),
+                    "manager_plan": self._format_manager_plan(manager_plan),
+                    "plan_steps": plan_steps_str,
+                    "system_state": self._format_system_state(system_state, focus_assets(
+                        previous_injects,
+                        manager_plan,
+                        extra=[asset for step in plan_steps or [] for asset in step.get("assets") or []]
+                    )),
+                    "previous_injects": self._format_previous_injects(previous_injects),
+                    "user_feedback_section": self._format_user_feedback(user_feedback)
+                }),
+                max_attempts=3,
+                default_return=None
+            )
+            if response is None:
+                logger.warning("❌ [Generator] LLM-Call für Inject-Sequenz fehlgeschlagen")
+                return []
+            
+            sequence = parse_structured(response.content, InjectSequenceResponse, agent="generator")
+            items = sequence.injects if sequence is not None else []
+        except OperationCancelled:
+            raise
+        except Exception as e:
+            logger.warning("❌ [Generator] Fehler bei Inject-Sequenz: %s", e)
+            return []
+        
+        # IDs und Reihenfolge gibt der Workflow vor; Sequenz endet beim ersten unbrauchbaren Eintrag
+        injects = []
+        for inject_id, time_offset, inject_data in zip(inject_ids, time_offsets, items):
+            try:
+                draft = InjectDraftResponse.model_validate(inject_data)
+                injects.append(self._build_inject(draft.model_dump(exclude_none=True), inject_id, time_offset, phase, ttp_id, system_state))
+            except Exception as e:
+                logger.warning("⚠️  [Generator] Inject %s der Sequenz unbrauchbar: %s", inject_id, e)
+                break
+        
+        logger.debug("✅ [Generator] Inject-Sequenz erstellt: %s/%s Injects", len(injects), len(inject_ids))
+        return injects
+    
+    @staticmethod
+    def _normal_operation_rule(phase: CrisisPhase) -> str:
+        """Zusatzregeln für die Phase NORMAL_OPERATION (sonst leer)."""
+        if phase != CrisisPhase.NORMAL_OPERATION:
+            return ""
+        return """
+⚠️ PHASE: NORMAL_OPERATION - SPEZIELLE REGELN:
+- Generiere KEINE offensichtlichen Angriffe (wie Ransomware, C2 Traffic, aktive Exploits).
+- ERLAUBT sind:
+  * False Positives (fehlerhafte SIEM-Alerts, verdächtige aber harmlose Aktivitäten)
+  * Wartungsfehler (falsche Konfigurationen, unbeabsichtigte Änderungen)
+  * Fehlgeschlagene Logins (Brute-Force-Versuche die fehlschlagen)
+  * Subtile Reconnaissance (Port-Scanning, OSINT-Sammlung, passive Scanning)
+- Falls du einen Angriff startest, MUSS der Inject eine Transition zu 'SUSPICIOUS_ACTIVITY' vorschlagen.
+- Der Content sollte eher "verdächtig" als "bedrohlich" klingen."""
+    
+    @staticmethod
+    def _format_user_feedback(user_feedback: Optional[str]) -> str:
+        """Formatiert die letzte Response Action des Benutzers (Human-in-the-Loop)."""
+        if not user_feedback or not user_feedback.strip():
+            return ""
+        return f"""
+### HUMAN RESPONSE TO LAST INJECT:
+The Incident Response Team performed the following action: "{user_feedback}"
+
+INSTRUCTION:
+The next Inject MUST reflect the consequences of this action.
+- If they mitigated the threat (e.g., isolated server, blocked IP, shutdown service) → Show recovery or a new, different attack vector.
+- If they ignored it or took insufficient action → Escalate the crisis drastically.
+- If they took defensive action → Show how the attacker adapts or how the system responds.
+- Be realistic: Actions have consequences. If SRV-001 was shut down, it cannot be attacked in the next inject, but services depending on it may be affected.
+
+CRITICAL: The inject content must logically follow from the response action. Do not ignore the human action."""
+    
+    @staticmethod
+    def _temporal_context(previous_injects: list) -> str:
+        """Hinweis auf den letzten validierten Zeitstempel (chronologische Konsistenz)."""
+        last_time_str = previous_injects[-1].time_offset if previous_injects else "T+00:00:00"
+        return (
+            f"Der letzte validierte Inject fand um {last_time_str} statt. "
+            f"Dein neuer Inject MUSS zwingend zeitlich danach liegen (z.B. +15 bis +60 Minuten). "
+            f"Berechne den neuen Offset basierend auf {last_time_str}."
+        )
+    
+    def _build_inject(
+        self,
+        inject_data: Dict[str, Any],
+        inject_id: str,
+        time_offset: str,
+        phase: CrisisPhase,
+        ttp_id: str,
+        system_state: Dict[str, Any]
+    ) -> Inject:
+        """Erstellt einen Inject aus der JSON-Antwort des LLM (Assets und time_offset werden geprüft)."""
+        # POST-PROCESSING: Validiere und korrigiere Assets
+        requested_assets = inject_data.get("technical_metadata", {}).get("affected_assets", [])
+        logger.debug("🔧 [Generator] Angeforderte Assets vom LLM: %s", requested_assets)
+        
+        valid_assets = self._validate_and_correct_assets(requested_assets, system_state)
+        logger.debug("✅ [Generator] Korrigierte Assets: %s", valid_assets)
+        
+        # Erstelle TechnicalMetadata mit korrigierten Assets
+        tech_meta = TechnicalMetadata(
+            mitre_id=inject_data.get("technical_metadata", {}).get("mitre_id", ttp_id),
+            affected_assets=valid_assets,  # Verwende korrigierte Assets
+            ioc_hash=inject_data.get("technical_metadata", {}).get("ioc_hash"),
+            ioc_ip=inject_data.get("technical_metadata", {}).get("ioc_ip"),
+            ioc_domain=inject_data.get("technical_metadata", {}).get("ioc_domain"),
+            severity=inject_data.get("technical_metadata", {}).get("severity", "Medium")
+        )
+        
+        # Verwende Generator-generierten time_offset falls vorhanden, sonst Fallback
+        generated_time_offset = inject_data.get("time_offset")
+        if generated_time_offset and generated_time_offset.strip():
+            # Validiere Format (akzeptiert sowohl T+DD:HH:MM als auch T+DD:HH)
+            if re.match(r'^T\+\d{2}:\d{2}(?::\d{2})?$', generated_time_offset):
+                final_time_offset = generated_time_offset
+                logger.debug("✅ [Generator] Verwende Generator-generierten time_offset: %s", final_time_offset)
+            else:
+                logger.warning("⚠️  [Generator] Ungültiges time_offset Format '%s', verwende Fallback", generated_time_offset)
+                final_time_offset = time_offset
+        else:
+            # Fallback auf übergebenen time_offset
+            final_time_offset = time_offset
+            logger.debug("ℹ️  [Generator] Kein Generator-generierter time_offset, verwende Fallback: %s", final_time_offset)
+        
+        # Erstelle Inject
+        return Inject(
+            inject_id=inject_id,
+            time_offset=final_time_offset,
+            phase=phase,
+            source=inject_data.get("source", "Red Team / Attacker"),
+            target=inject_data.get("target", "Blue Team / SOC"),
+            modality=InjectModality(inject_data.get("modality", "SIEM Alert")),
+            content=inject_data.get("content", "Generic security event detected."),
+            technical_metadata=tech_meta,
+            dora_compliance_tag=None,  # Nicht mehr verwendet, für Rückwärtskompatibilität None
+            business_impact=inject_data.get("business_impact")
+        )
+    
     def _create_fallback_inject(
         self,
         inject_id: str,
@@ -499,11 +710,17 @@ CRITICAL: The inject content must logically follow from the response action. Do
             dora_compliance_tag=None  # Nicht mehr verwendet
         )
     
-    def _format_system_state(self, system_state: Dict[str, Any]) -> str:
+    def _format_system_state(self, system_state: Dict[str, Any], focus: Iterable[str] = ()) -> str:
         """
         Formatiert den Systemzustand mit Fokus auf verfügbare Assets.
         
         Filtert nur echte Assets (Server, Applications) heraus, keine Inject-IDs oder Szenario-IDs.
+        Bei großen Infrastrukturen nur die relevanten Assets (siehe utils/context_selector.py)
+        plus Zusammenfassung pro Status, damit die Prompt-Größe nicht mit dem Graph wächst.
+        
+        Args:
+            system_state: Aktueller Systemzustand
+            focus: Fokus-Assets (Manager-Plan, letzte Injects)
         """
         if not system_state or not isinstance(system_state, dict):
             return "Keine Systemzustand-Informationen verfügbar"
@@ -525,9 +742,13 @@ CRITICAL: The inject content must logically follow from the response action. Do
         if not valid_assets:
             return "Keine Assets im Systemzustand verfügbar. Verwende Standard-Assets: SRV-001, SRV-002"
         
+        selected = select_relevant_assets(valid_assets, focus)
         lines = []
+        if len(selected) < len(valid_assets):
+            lines.append(status_summary(valid_assets, len(selected)))
         asset_list = []
-        for entity_id, entity_data in valid_assets.items():
+        for entity_id in selected:
+            entity_data = valid_assets[entity_id]
             status = entity_data.get("status", "unknown")
             name = entity_data.get("name", entity_id)
             entity_type = entity_data.get("entity_type", "Asset")
@@ -629,12 +850,12 @@ CRITICAL: The inject content must logically follow from the response action. Do
                     replacement = valid_asset_ids[0]
                     if replacement not in corrected_assets:
                         corrected_assets.append(replacement)
-                        print(f"⚠️  Asset '{asset_id}' existiert nicht. Ersetzt durch '{replacement}'")
+                        logger.warning("⚠️  Asset '%s' existiert nicht. Ersetzt durch '%s'", asset_id, replacement)
         
         # Falls alle Assets ungültig waren, verwende mindestens ein Standard-Asset
         if not corrected_assets and valid_asset_ids:
             corrected_assets = [valid_asset_ids[0]]
-            print(f"⚠️  Alle angeforderte Assets ungültig. Verwende Standard-Asset: {corrected_assets[0]}")
+            logger.warning("⚠️  Alle angeforderte Assets ungültig. Verwende Standard-Asset: %s", corrected_assets[0])
         
         return corrected_assets if corrected_assets else ["SRV-001"]
 
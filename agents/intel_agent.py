@@ -12,10 +12,13 @@ from state_models import CrisisPhase
 import chromadb
 from chromadb.config import Settings
 import os
+import logging
 from dotenv import load_dotenv
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 
 class IntelAgent:
     """
@@ -47,13 +50,13 @@ class IntelAgent:
             self.collection = self.client.get_collection(name=self.collection_name)
             # Prüfe ob Collection leer ist
             if auto_populate and self.collection.count() == 0:
-                print("⚠️  ChromaDB TTP Collection ist leer. Versuche automatische Population...")
+                logger.warning("⚠️  ChromaDB TTP Collection ist leer. Versuche automatische Population...")
                 self._try_auto_populate()
         except:
             # Collection existiert noch nicht - wird beim ersten Laden erstellt
             self.collection = None
             if auto_populate:
-                print("⚠️  ChromaDB TTP Collection existiert nicht. Versuche automatische Population...")
+                logger.warning("⚠️  ChromaDB TTP Collection existiert nicht. Versuche automatische Population...")
                 self._try_auto_populate()
     
     def _try_auto_populate(self):
@@ -75,10 +78,10 @@ class IntelAgent:
                 
                 if techniques:
                     self.initialize_ttp_database(techniques)
-                    print(f"✅ {len(techniques)} TTPs automatisch geladen")
+                    logger.info("✅ %s TTPs automatisch geladen", len(techniques))
         except Exception as e:
-            print(f"⚠️  Automatische Population fehlgeschlagen: {e}")
-            print("   Verwende Fallback-TTPs für diese Session")
+            logger.warning("⚠️  Automatische Population fehlgeschlagen: %s", e)
+            logger.info("Verwende Fallback-TTPs für diese Session")
     
     def get_relevant_ttps(
         self,
@@ -127,7 +130,7 @@ class IntelAgent:
             return ttps if ttps else self._get_fallback_ttps(phase, limit)
             
         except Exception as e:
-            print(f"⚠️  Fehler bei TTP-Abfrage: {e}")
+            logger.warning("⚠️  Fehler bei TTP-Abfrage: %s", e)
             return self._get_fallback_ttps(phase, limit)
     
     def _get_phase_keywords(self, phase: CrisisPhase) -> List[str]:
@@ -224,8 +227,8 @@ class IntelAgent:
                     metadatas=metadatas
                 )
             
-            print(f"✅ {len(ids)} TTPs in Datenbank geladen")
+            logger.info("✅ %s TTPs in Datenbank geladen", len(ids))
             
         except Exception as e:
-            print(f"⚠️  Fehler beim Initialisieren der TTP-Datenbank: {e}")
+            logger.warning("⚠️  Fehler beim Initialisieren der TTP-Datenbank: %s", e)
 
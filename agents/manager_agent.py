@@ -5,11 +5,16 @@ Verantwortlich für:
 - Grobe Planung der Szenario-Struktur
 - Phasen-Übergänge planen
 - Gesamt-Narrativ definieren
+- Mehrschrittige Pläne pro Phase (werden vom Workflow schrittweise abgearbeitet)
 """
 
-from typing import Dict, Any
-from langchain_openai import ChatOpenAI
+from typing import Dict, Any, List, Optional
 from langchain_core.prompts import ChatPromptTemplate
+from pydantic import BaseModel, ConfigDict
+from utils.llm_provider import create_chat_model
+from utils.structured_output import JsonChain, parse_structured
+from utils.cancellation import OperationCancelled
+from utils.context_selector import select_relevant_assets, status_summary
 from state_models import ScenarioType, CrisisPhase
 from workflows.fsm import CrisisFSM
 import os
@@ -17,6 +22,74 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# Maximale Anzahl Assets im Storyline-Prompt
+MAX_PROMPT_ASSETS = 10
+
+# Statischer System-Prompt inkl. Antwort-Format (stabiles Präfix für das Prompt-Caching des Providers)
+STORYLINE_SYSTEM_PROMPT = """Du bist ein erfahrener Crisis Management Experte für Finanzunternehmen.
+Deine Aufgabe ist es, realistische Krisenszenarien zu planen, die den DORA-Anforderungen entsprechen.
+
+WICHTIG:
+- Plane logisch konsistente Abläufe
+- Berücksichtige Second-Order Effects (wenn Server A fällt, sind Apps betroffen)
+- Stelle sicher, dass Phasen-Übergänge realistisch sind
+- Jede Phase sollte mehrere Injects haben, bevor zur nächsten Phase übergegangen wird
+- Der Plan deckt die gesamte gewählte Phase ab: ein Schritt pro Inject, in zeitlicher Reihenfolge
+
+ANTWORT-FORMAT (JSON):
+{{
+    "next_phase": "<PHASE>",
+    "narrative": "<Beschreibung der nächsten Schritte>",
+    "key_events": ["<Ereignis 1>", "<Ereignis 2>", ...],
+    "affected_assets": ["<Asset 1>", "<Asset 2>", ...],
+    "business_impact": "<Beschreibung der geschäftlichen Auswirkung>",
+    "steps": [
+        {{"event": "<Ereignis von Schritt 1>", "assets": ["<Asset>", ...]}},
+        ...
+    ],
+    "exit_phase": "<PHASE nach dem letzten Schritt>"
+}}"""
+
+STORYLINE_HUMAN_PROMPT = """Erstelle einen Storyline-Plan für ein {scenario_type} Szenario.
+
+Aktuelle Situation:
+- Aktuelle Phase: {current_phase}
+- Bereits generierte Injects: {inject_count}
+- Verfügbare nächste Phasen: {next_phases}
+- Vorgeschlagene nächste Phase: {suggested_phase}
+
+Systemzustand:
+{system_state}
+
+Erstelle einen Plan für die nächsten {planned_steps} Injects:
+1. Welche Phase sollte als nächstes kommen? (aus den verfügbaren wählen)
+2. Welche Ereignisse sollten in dieser Phase passieren? (genau {planned_steps} Schritte, geordnet)
+3. Welche Assets/Systeme sollten pro Schritt betroffen sein?
+4. Wie sollte sich das auf die Business Continuity auswirken?
+5. In welche Phase soll das Szenario nach dem letzten Schritt übergehen?
+
+Antworte im JSON-Format (siehe ANTWORT-FORMAT)."""
+
+# Einmal kompilierte Vorlage für create_storyline
+STORYLINE_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", STORYLINE_SYSTEM_PROMPT),
+    ("human", STORYLINE_HUMAN_PROMPT)
+])
+
+
+class StorylineResponse(BaseModel):
+    """Antwortschema des Managers (Storyline + Phasen-Plan)."""
+
+    model_config = ConfigDict(extra="allow")
+
+    next_phase: Optional[str] = None
+    narrative: Optional[str] = ""
+    key_events: Optional[List[Any]] = None
+    affected_assets: Optional[List[Any]] = None
+    business_impact: Optional[str] = ""
+    steps: Optional[List[Any]] = None
+    exit_phase: Optional[str] = None
+
 
 class ManagerAgent:
     """
@@ -31,21 +104,20 @@ class ManagerAgent:
         Initialisiert den Manager Agent.
         
         Args:
-            model_name: OpenAI Modell-Name
+            model_name: Modell-Name (Provider per LLM_PROVIDER, siehe utils/llm_provider.py)
             temperature: Temperature für LLM (höher = kreativer)
         """
-        self.llm = ChatOpenAI(
-            model=model_name,
-            temperature=temperature,
-            api_key=os.getenv("OPENAI_API_KEY")
-        )
+        self.llm = create_chat_model("manager", model_name=model_name, temperature=temperature)
+        self._storyline_chain = JsonChain(STORYLINE_PROMPT)
     
     def create_storyline(
         self,
         scenario_type: ScenarioType,
         current_phase: CrisisPhase,
         inject_count: int,
-        system_state: Dict[str, Any]
+        system_state: Dict[str, Any],
+        planned_steps: int = 1,
+        intended_phase: Optional[CrisisPhase] = None
     ) -> Dict[str, Any]:
         """
         Erstellt eine grobe Storyline für das Szenario.
@@ -55,12 +127,17 @@ class ManagerAgent:
             current_phase: Aktuelle Krisenphase
             inject_count: Anzahl bereits generierter Injects
             system_state: Aktueller Systemzustand aus Neo4j
+            planned_steps: Anzahl Injects, die der Plan für die gewählte Phase abdecken soll
+            intended_phase: Optional - im vorherigen Plan vorgesehener Phasen-Ausgang
+                            (ersetzt den FSM-Vorschlag, wenn der Übergang erlaubt ist)
         
         Returns:
             Dictionary mit Storyline-Plan:
             - next_phase: Nächste Phase
             - narrative: Beschreibung der nächsten Schritte
             - key_events: Wichtige Ereignisse, die kommen sollten
+            - steps: Geordnete Schritte der Phase ({"event", "assets"}, ein Inject pro Schritt)
+            - exit_phase: Vorgesehene Phase nach dem letzten Schritt
         """
         # Prüfe erlaubte Phasen-Übergänge
         next_phases = CrisisFSM.get_next_phases(current_phase)
@@ -68,50 +145,15 @@ class ManagerAgent:
             current_phase,
             inject_count
         )
-        
-        # Erstelle Prompt für Storyline-Planung
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", """Du bist ein erfahrener Crisis Management Experte für Finanzunternehmen.
-Deine Aufgabe ist es, realistische Krisenszenarien zu planen, die den DORA-Anforderungen entsprechen.
-
-WICHTIG:
-- Plane logisch konsistente Abläufe
-- Berücksichtige Second-Order Effects (wenn Server A fällt, sind Apps betroffen)
-- Stelle sicher, dass Phasen-Übergänge realistisch sind
-- Jede Phase sollte mehrere Injects haben, bevor zur nächsten Phase übergegangen wird"""),
-            
-            ("human", """Erstelle einen Storyline-Plan für ein {scenario_type} Szenario.
-
-Aktuelle Situation:
-- Aktuelle Phase: {current_phase}
-- Bereits generierte Injects: {inject_count}
-- Verfügbare nächste Phasen: {next_phases}
-- Vorgeschlagene nächste Phase: {suggested_phase}
-
-Systemzustand:
-{system_state}
-
-Erstelle einen Plan für die nächsten Schritte:
-1. Welche Phase sollte als nächstes kommen? (aus den verfügbaren wählen)
-2. Welche Ereignisse sollten in dieser Phase passieren?
-3. Welche Assets/Systeme sollten betroffen sein?
-4. Wie sollte sich das auf die Business Continuity auswirken?
-
-Antworte im JSON-Format:
-{{
-    "next_phase": "<PHASE>",
-    "narrative": "<Beschreibung der nächsten Schritte>",
-    "key_events": ["<Ereignis 1>", "<Ereignis 2>", ...],
-    "affected_assets": ["<Asset 1>", "<Asset 2>", ...],
-    "business_impact": "<Beschreibung der geschäftlichen Auswirkung>"
-}}""")
-        ])
+        if intended_phase is not None and intended_phase in next_phases:
+            suggested_phase = intended_phase
+        planned_steps = max(1, int(planned_steps))
         
         # Formatierung für Prompt
         next_phases_str = ", ".join([p.value for p in next_phases])
         system_state_str = self._format_system_state(system_state)
         
-        chain = prompt | self.llm
+        chain = self._storyline_chain.for_llm(self.llm)
         
         # Retry-Logik für LLM-Call
         from utils.retry_handler import safe_llm_call
@@ -124,7 +166,8 @@ Antworte im JSON-Format:
                     "inject_count": inject_count,
                     "next_phases": next_phases_str,
                     "suggested_phase": suggested_phase.value,
-                    "system_state": system_state_str
+                    "system_state": system_state_str,
+                    "planned_steps": planned_steps
                 })
             
             response = safe_llm_call(
@@ -144,23 +187,19 @@ Antworte im JSON-Format:
                     "error": "LLM-Call fehlgeschlagen nach mehreren Versuchen"
                 }
             
-            # Parse JSON aus Response (einfache Implementierung)
-            # In Produktion sollte hier ein robusterer Parser verwendet werden
-            import json
-            import re
-            
-            # Extrahiere JSON aus Response
             content = response.content
-            json_match = re.search(r'\{.*\}', content, re.DOTALL)
+            plan = parse_structured(content, StorylineResponse, agent="manager")
             
-            if json_match:
-                plan = json.loads(json_match.group())
+            if plan is not None:
+                next_phase = CrisisPhase(plan.next_phase or suggested_phase.value)
                 return {
-                    "next_phase": CrisisPhase(plan.get("next_phase", suggested_phase.value)),
-                    "narrative": plan.get("narrative", ""),
-                    "key_events": plan.get("key_events", []),
-                    "affected_assets": plan.get("affected_assets", []),
-                    "business_impact": plan.get("business_impact", "")
+                    "next_phase": next_phase,
+                    "narrative": plan.narrative or "",
+                    "key_events": plan.key_events or [],
+                    "affected_assets": plan.affected_assets or [],
+                    "business_impact": plan.business_impact or "",
+                    "steps": self._parse_steps(plan.steps, planned_steps),
+                    "exit_phase": self._parse_exit_phase(plan.exit_phase, next_phase)
                 }
             else:
                 # Fallback wenn kein JSON gefunden
@@ -172,6 +211,8 @@ Antworte im JSON-Format:
                     "business_impact": ""
                 }
                 
+        except OperationCancelled:
+            raise
         except Exception as e:
             # Fallback bei Fehler
             return {
@@ -192,8 +233,13 @@ Antworte im JSON-Format:
         if not system_state:
             return "Alle Systeme im Normalbetrieb"
         
+        # Limit für Prompt-Länge: betroffene Assets vor einer Stichprobe der übrigen
+        selected = select_relevant_assets(system_state, max_assets=MAX_PROMPT_ASSETS)
         lines = ["Aktueller Systemzustand:"]
-        for entity_id, entity_data in list(system_state.items())[:10]:  # Limit auf 10 für Prompt-Länge
+        if len(selected) < len(system_state):
+            lines.append(status_summary(system_state, len(selected)))
+        for entity_id in selected:
+            entity_data = system_state[entity_id]
             if isinstance(entity_data, dict):
                 status = entity_data.get("status", "unknown")
                 name = entity_data.get("name", entity_id)
@@ -202,4 +248,30 @@ Antworte im JSON-Format:
                 lines.append(f"- {entity_id}: {entity_data}")
         
         return "\n".join(lines)
-
+    
+    @staticmethod
+    def _parse_steps(raw_steps: Any, planned_steps: int) -> List[Dict[str, Any]]:
+        """Normalisiert die Plan-Schritte auf {"event": str, "assets": [str]} (maximal planned_steps)."""
+        if not isinstance(raw_steps, list):
+            return []
+        steps = []
+        for raw_step in raw_steps[:planned_steps]:
+            if isinstance(raw_step, str):
+                raw_step = {"event": raw_step}
+            if not isinstance(raw_step, dict) or not raw_step.get("event"):
+                continue
+            assets = raw_step.get("assets") or []
+            steps.append({
+                "event": str(raw_step["event"]),
+                "assets": [str(asset) for asset in assets] if isinstance(assets, list) else [str(assets)]
+            })
+        return steps
+    
+    @staticmethod
+    def _parse_exit_phase(raw_phase: Any, next_phase: CrisisPhase) -> Optional[CrisisPhase]:
+        """Vorgesehener Phasen-Ausgang; nur erlaubte Übergänge aus der geplanten Phase."""
+        try:
+            exit_phase = CrisisPhase(raw_phase)
+        except (ValueError, TypeError):
+            return None
+        return exit_phase if CrisisFSM.can_transition(next_phase, exit_phase) else None
@@ -2,7 +2,7 @@
 FastAPI REST API Server für CRUX Frontend Integration.
 
 Stellt Endpoints bereit für:
-- Szenario-Generierung
+- Szenario-Generierung (synchron, als Stream oder als Hintergrund-Job)
 - Inject-Verwaltung
 - Graph-Daten
 - Critic-Logs
@@ -10,11 +10,18 @@ Stellt Endpoints bereit für:
 
 from fastapi import FastAPI, HTTPException, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import StreamingResponse
+from fastapi.concurrency import run_in_threadpool
+from contextlib import asynccontextmanager
+from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 import sys
 import json
+import logging
+import math
+import threading
+import uuid
 from pathlib import Path
 from utils.json_utils import serialize_datetime_recursive, safe_json_dumps
 
@@ -25,14 +32,48 @@ if str(project_root) not in sys.path:
 
 from neo4j_client import Neo4jClient
 from workflows.scenario_workflow import ScenarioWorkflow
+from workflows.workflow_pool import WorkflowPool, PoolExhausted, DEFAULT_STANDARDS
+from workflows.job_queue import ScenarioJobQueue
+from workflows.fragment_cache import get_fragment_cache, fragment_cache_enabled
+from agents.critic_agent import ComplianceStandard
+from workflows.trace_sink import get_trace_sink, TRACE_LOGS, TRACE_KINDS
+from utils.structured_output import get_parse_stats
+from utils.cancellation import OperationCancelled
+from utils.llm_cache import get_llm_cache_stats
+from utils.rate_limiter import Priority, get_rate_limiter_stats, llm_priority_scope, prioritized
 from state_models import ScenarioType, Inject as InjectModel
 from forensic_logger import get_forensic_logger
+from utils.logging_config import configure_logging, set_verbose
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
-app = FastAPI(title="CRUX API", description="REST API für CRUX Frontend")
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Wärmt beim Start den Workflow-Pool für die Standard-Konfiguration vor (im
+    Hintergrund) und startet die Job-Worker (setzt persistierte Jobs fort).
+    Beim Beenden werden Job-Worker gestoppt und die Workflow-Instanzen freigegeben.
+    """
+    count = int(os.getenv("WORKFLOW_POOL_WARMUP", "1"))
+    if count > 0:
+        threading.Thread(
+            target=workflow_pool.warm_up,
+            args=([(DEFAULT_STANDARDS, False)], count),
+            name="workflow-pool-warmup",
+            daemon=True
+        ).start()
+    queue = get_job_queue()
+    yield
+    queue.stop(timeout=30)
+    workflow_pool.close()
+
+
+app = FastAPI(title="CRUX API", description="REST API für CRUX Frontend", lifespan=lifespan)
 
 # CORS Middleware für Frontend-Zugriff
 app.add_middleware(
@@ -45,7 +86,6 @@ app.add_middleware(
 
 # Global state
 neo4j_client: Optional[Neo4jClient] = None
-workflow: Optional[ScenarioWorkflow] = None
 
 
 def get_neo4j_client():
@@ -57,17 +97,41 @@ def get_neo4j_client():
     return neo4j_client
 
 
-def get_workflow(max_iterations: int = 20):
-    """Lazy initialization of workflow."""
-    global workflow
-    # Recreate workflow if max_iterations changed
-    if workflow is None or workflow.max_iterations != max_iterations:
-        workflow = ScenarioWorkflow(
-            neo4j_client=get_neo4j_client(),
-            max_iterations=max_iterations,
-            interactive_mode=False
-        )
-    return workflow
+def create_workflow(compliance_standards: tuple, interactive: bool) -> ScenarioWorkflow:
+    """Erzeugt eine Workflow-Instanz für den Pool (max_iterations wird pro Aufruf übergeben)."""
+    return ScenarioWorkflow(
+        neo4j_client=get_neo4j_client(),
+        interactive_mode=interactive,
+        compliance_standards=[ComplianceStandard(name) for name in compliance_standards] if ComplianceStandard else None
+    )
+
+
+workflow_pool = WorkflowPool(create_workflow)
+
+
+def get_workflow(compliance_standards: Optional[List[str]] = None, interactive: bool = False) -> ScenarioWorkflow:
+    """Leiht eine Workflow-Instanz aus dem Pool aus (mit release_workflow zurückgeben)."""
+    try:
+        return workflow_pool.acquire(compliance_standards, interactive)
+    except PoolExhausted as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+
+def release_workflow(workflow: ScenarioWorkflow):
+    """Gibt eine ausgeliehene Workflow-Instanz an den Pool zurück."""
+    workflow_pool.release(workflow)
+
+
+job_queue: Optional[ScenarioJobQueue] = None
+
+
+def get_job_queue() -> ScenarioJobQueue:
+    """Lazy initialization der Job-Queue (startet die Worker)."""
+    global job_queue
+    if job_queue is None:
+        job_queue = ScenarioJobQueue(run_scenario_job)
+        job_queue.start()
+    return job_queue
 
 
 # Pydantic Models für API
@@ -101,6 +165,13 @@ class GraphLinkResponse(BaseModel):
 class ScenarioRequest(BaseModel):
     scenario_type: str
     num_injects: int = 10
+    speculative_candidates: int = Field(1, ge=1, le=5)  # Parallele Draft-Kandidaten pro Inject (1 = aus)
+    compliance_standards: Optional[List[str]] = None  # z.B. ["DORA", "NIST"] (Standard: DORA)
+    deadline_seconds: Optional[float] = Field(None, gt=0)  # Wandzeit-Limit, danach Teilergebnis (end_condition TIMEOUT)
+
+
+class VerboseLoggingRequest(BaseModel):
+    enabled: bool
 
 
 class ScenarioListItem(BaseModel):
@@ -121,8 +192,12 @@ async def root():
         "version": "1.0.0",
         "endpoints": {
             "graph": "/api/graph/nodes, /api/graph/links",
-            "scenario": "/api/scenario/generate, /api/scenario/{id}/logs, /api/scenario/list, /api/scenario/{id}",
-            "forensic": "/api/forensic/upload"
+            "scenario": "/api/scenario/generate, /api/scenario/stream, /api/scenario/jobs, /api/scenario/jobs/{id}, /api/scenario/jobs/{id}/cancel, /api/scenario/{id}/cancel, /api/scenario/{id}/logs, /api/scenario/{id}/trace, /api/scenario/list, /api/scenario/{id}",
+            "forensic": "/api/forensic/upload",
+            "critic": "/api/critic/gate-stats",
+            "workflow": "/api/workflow/pool",
+            "llm": "/api/llm/parse-stats, /api/llm/cache-stats, /api/llm/rate-limit",
+            "logging": "/api/logging/verbose"
         }
     }
 
@@ -152,9 +227,7 @@ async def get_graph_nodes():
         
         return {"nodes": nodes}
     except Exception as e:
-        import traceback
-        error_trace = traceback.format_exc()
-        print(f"Error fetching graph nodes: {error_trace}")
+        logger.exception("Error fetching graph nodes")
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -182,71 +255,242 @@ async def get_graph_links():
         
         return {"links": links}
     except Exception as e:
-        print(f"Error fetching graph links: {e}")
+        logger.exception("Error fetching graph links")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# Map scenario type string to enum
+SCENARIO_TYPE_MAP = {
+    "ransomware": ScenarioType.RANSOMWARE_DOUBLE_EXTORTION,
+    "ransomware_double_extortion": ScenarioType.RANSOMWARE_DOUBLE_EXTORTION,
+    "data_breach": ScenarioType.INSIDER_THREAT_DATA_MANIPULATION,  # DATA_BREACH existiert nicht, verwende ähnlichen Typ
+    "ddos": ScenarioType.DDOS_CRITICAL_FUNCTIONS,
+    "ddos_critical_functions": ScenarioType.DDOS_CRITICAL_FUNCTIONS,
+    "insider_threat": ScenarioType.INSIDER_THREAT_DATA_MANIPULATION,
+    "insider_threat_data_manipulation": ScenarioType.INSIDER_THREAT_DATA_MANIPULATION,
+    "supply_chain_compromise": ScenarioType.SUPPLY_CHAIN_COMPROMISE,
+    "supply_chain": ScenarioType.SUPPLY_CHAIN_COMPROMISE,
+}
+
+# Abbruch-Signale laufender Szenario-Streams (scenario_id -> Event)
+stream_cancel_events: Dict[str, threading.Event] = {}
+
+
+def resolve_scenario_type(name: str) -> ScenarioType:
+    """Löst einen Szenario-Typ-String auf (HTTP 400 bei unbekanntem Typ)."""
+    scenario_type = SCENARIO_TYPE_MAP.get(name.lower())
+    if not scenario_type:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown scenario type: {name}. Available: {list(SCENARIO_TYPE_MAP.keys())}"
+        )
+    return scenario_type
+
+
+def resolve_compliance_standards(names: Optional[List[str]]) -> Optional[List[str]]:
+    """Prüft die angefragten Compliance-Standards (HTTP 400 bei unbekanntem Standard)."""
+    if not names:
+        return None
+    available = [standard.value for standard in ComplianceStandard] if ComplianceStandard else list(DEFAULT_STANDARDS)
+    unknown = [name for name in names if name.upper() not in available]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown compliance standards: {unknown}. Available: {available}"
+        )
+    return [name.upper() for name in names]
+
+
+def inject_to_response(inject: InjectModel, status: str = "verified") -> Dict[str, Any]:
+    """Konvertiert einen Inject in das Response-Format des Frontends."""
+    return {
+        "inject_id": inject.inject_id,
+        "time_offset": inject.time_offset,
+        "content": inject.content,
+        "status": status,
+        "phase": inject.phase.value if hasattr(inject.phase, 'value') else str(inject.phase),
+        "source": inject.source,
+        "target": inject.target,
+        "modality": inject.modality.value if hasattr(inject.modality, 'value') else str(inject.modality),
+        "mitre_id": inject.technical_metadata.mitre_id if inject.technical_metadata else None,
+        "affected_assets": inject.technical_metadata.affected_assets if inject.technical_metadata else [],
+    }
+
+
+def format_stream_event(event: Dict[str, Any]) -> str:
+    """Formatiert ein Workflow-Event als Server-Sent Event."""
+    payload = dict(event)
+    if payload["event"] == "draft":
+        payload["inject"] = inject_to_response(payload["inject"], status="validating")
+    elif payload["event"] == "inject":
+        payload["inject"] = inject_to_response(payload["inject"])
+    return f"event: {payload['event']}\ndata: {safe_json_dumps(payload)}\n\n"
+
+
 @app.post("/api/scenario/generate")
 async def generate_scenario(request: ScenarioRequest):
     """Generiert ein neues Szenario."""
     try:
-        workflow = get_workflow(max_iterations=request.num_injects)
+        scenario_type = resolve_scenario_type(request.scenario_type)
+        compliance_standards = resolve_compliance_standards(request.compliance_standards)
         
-        # Map scenario type string to enum
-        scenario_type_map = {
-            "ransomware": ScenarioType.RANSOMWARE_DOUBLE_EXTORTION,
-            "ransomware_double_extortion": ScenarioType.RANSOMWARE_DOUBLE_EXTORTION,
-            "data_breach": ScenarioType.INSIDER_THREAT_DATA_MANIPULATION,  # DATA_BREACH existiert nicht, verwende ähnlichen Typ
-            "ddos": ScenarioType.DDOS_CRITICAL_FUNCTIONS,
-            "ddos_critical_functions": ScenarioType.DDOS_CRITICAL_FUNCTIONS,
-            "insider_threat": ScenarioType.INSIDER_THREAT_DATA_MANIPULATION,
-            "insider_threat_data_manipulation": ScenarioType.INSIDER_THREAT_DATA_MANIPULATION,
-            "supply_chain_compromise": ScenarioType.SUPPLY_CHAIN_COMPROMISE,
-            "supply_chain": ScenarioType.SUPPLY_CHAIN_COMPROMISE,
-        }
-        
-        scenario_type = scenario_type_map.get(request.scenario_type.lower())
-        if not scenario_type:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Unknown scenario type: {request.scenario_type}. Available: {list(scenario_type_map.keys())}"
-            )
+        # Generate scenario (blockierend im Threadpool, die Instanz ist für die Dauer exklusiv ausgeliehen)
+        def run():
+            workflow = get_workflow(compliance_standards)
+            try:
+                with llm_priority_scope(Priority.INTERACTIVE):
+                    return workflow.generate_scenario(
+                        scenario_type=scenario_type,
+                        speculative_candidates=request.speculative_candidates,
+                        max_iterations=request.num_injects,
+                        deadline_seconds=request.deadline_seconds
+                    )
+            finally:
+                release_workflow(workflow)
         
-        # Generate scenario
-        result = workflow.generate_scenario(scenario_type=scenario_type)
+        result = await run_in_threadpool(run)
         
         # Convert injects to response format
-        injects_response = []
-        for inject in result.get("injects", []):
-            injects_response.append({
-                "inject_id": inject.inject_id,
-                "time_offset": inject.time_offset,
-                "content": inject.content,
-                "status": "verified",
-                "phase": inject.phase.value if hasattr(inject.phase, 'value') else str(inject.phase),
-                "source": inject.source,
-                "target": inject.target,
-                "modality": inject.modality.value if hasattr(inject.modality, 'value') else str(inject.modality),
-                "mitre_id": inject.technical_metadata.mitre_id if inject.technical_metadata else None,
-                "affected_assets": inject.technical_metadata.affected_assets if inject.technical_metadata else [],
-            })
+        injects_response = [inject_to_response(inject) for inject in result.get("injects", [])]
         
         return {
             "scenario_id": result.get("scenario_id"),
             "injects": injects_response,
+            "end_condition": result.get("end_condition"),
         }
     except HTTPException:
         raise
     except Exception as e:
         import traceback
         error_trace = traceback.format_exc()
-        print(f"Error generating scenario: {error_trace}")
+        logger.exception("Error generating scenario")
         raise HTTPException(
             status_code=500,
             detail=f"Error generating scenario: {str(e)}\n\nTraceback:\n{error_trace}"
         )
 
 
+@app.post("/api/scenario/stream")
+async def stream_scenario(request: ScenarioRequest):
+    """
+    Generiert ein neues Szenario als Server-Sent-Events-Stream.
+    
+    Events: start (enthält scenario_id), node, draft, critic, refine, inject,
+    cancelled, complete, error. Abbruch über /api/scenario/{id}/cancel oder
+    durch Schließen der Verbindung.
+    """
+    scenario_type = resolve_scenario_type(request.scenario_type)
+    compliance_standards = resolve_compliance_standards(request.compliance_standards)
+    scenario_id = f"SCEN-{uuid.uuid4().hex[:8].upper()}"
+    cancel_event = threading.Event()
+    stream_cancel_events[scenario_id] = cancel_event
+    
+    def event_stream():
+        # Ausleihen erst beim Start des Streams (läuft im Threadpool), Rückgabe beim Ende oder Verbindungsabbruch
+        workflow = None
+        try:
+            workflow = get_workflow(compliance_standards)
+            events = workflow.stream_scenario(
+                scenario_type=scenario_type,
+                scenario_id=scenario_id,
+                speculative_candidates=request.speculative_candidates,
+                cancel_event=cancel_event,
+                max_iterations=request.num_injects,
+                deadline_seconds=request.deadline_seconds
+            )
+            # Jeder Schritt läuft im Threadpool: Priorität pro Schritt binden
+            for event in prioritized(events, Priority.INTERACTIVE):
+                yield format_stream_event(event)
+        except HTTPException as e:
+            yield format_stream_event({"event": "error", "scenario_id": scenario_id, "error": e.detail})
+        finally:
+            stream_cancel_events.pop(scenario_id, None)
+            if workflow is not None:
+                release_workflow(workflow)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+def run_scenario_job(job: Dict[str, Any], report_progress, cancel_event: threading.Event) -> Dict[str, Any]:
+    """Führt einen Generierungs-Job aus (Worker-Thread der Job-Queue)."""
+    request = ScenarioRequest(**job["request"])
+    scenario_id = f"SCEN-{uuid.uuid4().hex[:8].upper()}"
+    injects: List[Dict[str, Any]] = []
+    summary: Dict[str, Any] = {}
+    try:
+        # Jobs warten ohne Zeitlimit auf eine freie Instanz (abbrechbar über cancel_event)
+        workflow = workflow_pool.acquire(request.compliance_standards, timeout=math.inf, cancel_event=cancel_event)
+    except OperationCancelled:
+        return {"scenario_id": scenario_id, "injects": []}
+    try:
+        for event in workflow.stream_scenario(
+            scenario_type=resolve_scenario_type(request.scenario_type),
+            scenario_id=scenario_id,
+            speculative_candidates=request.speculative_candidates,
+            cancel_event=cancel_event,
+            max_iterations=request.num_injects,
+            deadline_seconds=request.deadline_seconds
+        ):
+            if event["event"] == "inject":
+                injects.append(inject_to_response(event["inject"]))
+                report_progress(len(injects))
+            elif event["event"] == "error":
+                raise RuntimeError(event["error"])
+            elif event["event"] == "complete":
+                summary = {key: event.get(key) for key in ("current_phase", "end_condition", "warnings")}
+    finally:
+        workflow_pool.release(workflow)
+    return {"scenario_id": scenario_id, "injects": injects, **summary}
+
+
+@app.post("/api/scenario/jobs", status_code=202)
+async def submit_scenario_job(request: ScenarioRequest):
+    """Reiht einen Generierungs-Job ein und gibt sofort die Job-ID zurück."""
+    resolve_scenario_type(request.scenario_type)
+    request.compliance_standards = resolve_compliance_standards(request.compliance_standards)
+    job_id = get_job_queue().submit(request.model_dump(), total=request.num_injects)
+    return {"job_id": job_id, "status": "queued"}
+
+
+@app.get("/api/scenario/jobs")
+async def list_scenario_jobs(limit: int = 50):
+    """Gibt die neuesten Jobs (ohne Ergebnis) und die Anzahl Jobs pro Status zurück."""
+    queue = get_job_queue()
+    return {"jobs": queue.list(limit=limit), **queue.stats()}
+
+
+@app.get("/api/scenario/jobs/{job_id}")
+async def get_scenario_job(job_id: str):
+    """Gibt Status, Fortschritt (Injects fertig/gesamt) und Ergebnis eines Jobs zurück."""
+    job = get_job_queue().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job
+
+
+@app.post("/api/scenario/jobs/{job_id}/cancel")
+async def cancel_scenario_job(job_id: str):
+    """Storniert einen wartenden Job oder bricht einen laufenden nach dem aktuellen Node ab."""
+    status = get_job_queue().cancel(job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return {"job_id": job_id, "status": status}
+
+
+@app.post("/api/scenario/{scenario_id}/cancel")
+async def cancel_scenario_stream(scenario_id: str):
+    """Bricht einen laufenden Szenario-Stream nach dem aktuellen Node ab."""
+    cancel_event = stream_cancel_events.get(scenario_id)
+    if cancel_event is None:
+        raise HTTPException(status_code=404, detail=f"Kein laufender Stream für {scenario_id}")
+    cancel_event.set()
+    return {"scenario_id": scenario_id, "status": "cancelling"}
+
+
 @app.get("/api/scenario/{scenario_id}/logs")
 async def get_scenario_logs(scenario_id: str):
     """Gibt Critic-Logs für ein Szenario zurück."""
@@ -285,12 +529,82 @@ async def get_scenario_logs(scenario_id: str):
         
         return {"logs": logs}
     except Exception as e:
-        import traceback
-        error_trace = traceback.format_exc()
-        print(f"Error fetching scenario logs: {error_trace}")
+        logger.exception("Error fetching scenario logs")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/scenario/{scenario_id}/trace")
+async def get_scenario_trace(
+    scenario_id: str,
+    kind: str = TRACE_LOGS,
+    offset: int = 0,
+    limit: Optional[int] = 200
+):
+    """Gibt Workflow-Logs oder Agenten-Entscheidungen seitenweise aus dem Trace-Sink zurück."""
+    if kind not in TRACE_KINDS:
+        raise HTTPException(status_code=400, detail=f"Unknown trace kind: {kind}. Available: {list(TRACE_KINDS)}")
+    sink = get_trace_sink()
+    return {
+        "scenario_id": scenario_id,
+        "kind": kind,
+        "total": sink.count(scenario_id, kind),
+        "offset": offset,
+        "entries": serialize_datetime_recursive(sink.read(scenario_id, kind, offset=offset, limit=limit))
+    }
+
+
+@app.get("/api/critic/gate-stats")
+async def get_critic_gate_stats():
+    """Gibt Skip- und Disagreement-Rate des Critic-Konfidenz-Gates zurück (über alle Pool-Instanzen)."""
+    instances = workflow_pool.instances()
+    if not instances:
+        raise HTTPException(status_code=404, detail="No workflow initialized yet")
+    per_instance = [instance.critic_agent.get_gate_stats() for instance in instances]
+    stats = {key: sum(entry[key] for entry in per_instance) for key in ("eligible", "skipped", "sampled", "disagreements")}
+    stats["skip_threshold"] = per_instance[0]["skip_threshold"]
+    stats["calibration_rate"] = per_instance[0]["calibration_rate"]
+    stats["skip_rate"] = stats["skipped"] / stats["eligible"] if stats["eligible"] else 0.0
+    stats["disagreement_rate"] = stats["disagreements"] / stats["sampled"] if stats["sampled"] else 0.0
+    return stats
+
+
+@app.get("/api/workflow/pool")
+async def get_workflow_pool_stats():
+    """Gibt Instanzen, freie/ausgeliehene Workflows und Wartezeiten pro Pool-Konfiguration zurück."""
+    return workflow_pool.stats()
+
+
+@app.get("/api/workflow/fragment-cache")
+async def get_fragment_cache_stats():
+    """Gibt Treffer, Einträge und Trefferquote des Fragment-Caches zurück (SCENARIO_FRAGMENT_CACHE)."""
+    return {"enabled": fragment_cache_enabled(), **get_fragment_cache().stats()}
+
+
+@app.get("/api/llm/parse-stats")
+async def get_llm_parse_stats():
+    """Gibt die Parse-Statistik der LLM-Antworten pro Agent zurück."""
+    return get_parse_stats()
+
+
+@app.get("/api/llm/cache-stats")
+async def get_llm_cache_statistics():
+    """Gibt Füllstand und Trefferquoten des LLM-Antwort-Caches pro Agent zurück (LLM_CACHE)."""
+    return get_llm_cache_stats()
+
+
+@app.get("/api/llm/rate-limit")
+async def get_llm_rate_limit_stats():
+    """Gibt Grenzen, Auslastung und Wartezeiten pro Priorität des LLM-Rate-Limiters zurück."""
+    return get_rate_limiter_stats()
+
+
+@app.post("/api/logging/verbose")
+async def set_verbose_logging(request: VerboseLoggingRequest):
+    """Schaltet die Detail-Ausgabe pro Workflow-Node (DEBUG-Logs) zur Laufzeit ein oder aus."""
+    set_verbose(request.enabled)
+    return {"verbose": request.enabled}
+
+
 @app.get("/api/scenario/latest")
 async def get_latest_scenario():
     """Gibt das neueste Szenario zurück."""
@@ -333,9 +647,7 @@ async def get_latest_scenario():
             "injects": injects_response,
         }
     except Exception as e:
-        import traceback
-        error_trace = traceback.format_exc()
-        print(f"Error fetching latest scenario: {error_trace}")
+        logger.exception("Error fetching latest scenario")
         # Return empty result instead of raising error
         return {"scenario_id": None, "injects": []}
 
@@ -392,7 +704,7 @@ async def list_scenarios(
         
         return {"scenarios": scenarios_response}
     except Exception as e:
-        print(f"Error listing scenarios: {e}")
+        logger.exception("Error listing scenarios")
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -481,9 +793,7 @@ async def get_scenario(scenario_id: str):
     except HTTPException:
         raise
     except Exception as e:
-        import traceback
-        error_trace = traceback.format_exc()
-        print(f"Error fetching scenario: {error_trace}")
+        logger.exception("Error fetching scenario")
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -529,10 +839,11 @@ async def upload_forensic_trace(file: UploadFile = File(...)):
             "logs": logs
         }
     except Exception as e:
-        print(f"Error uploading forensic trace: {e}")
+        logger.exception("Error uploading forensic trace")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 if __name__ == "__main__":
     import uvicorn
+    configure_logging()
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -266,8 +266,8 @@ def init_session_state():
         st.session_state.filter_phase = None
     if "search_term"not in st.session_state:
         st.session_state.search_term = ""
-    if "interactive_scenario_state"not in st.session_state:
-        st.session_state.interactive_scenario_state = None
+    if "interactive_scenario_id"not in st.session_state:
+        st.session_state.interactive_scenario_id = None
     if "pending_decision"not in st.session_state:
         st.session_state.pending_decision = None
 
@@ -1064,7 +1064,7 @@ def main():
                     if interactive_mode:
                         status_text.info("🎮 Starting interactive scenario generation... Entscheidungen werden an Decision-Points erfragt.")
                         # Initialisiere interaktiven State
-                        st.session_state.interactive_scenario_state = None
+                        st.session_state.interactive_scenario_id = None
                         st.session_state.pending_decision = None
                     else:
                         status_text.info("Starting scenario generation... (This may take several minutes)")
@@ -1075,7 +1075,8 @@ def main():
                     
                     # Im interaktiven Modus: Prüfe ob Decision-Point erreicht wurde
                     if interactive_mode and result.get("pending_decision"):
-                        st.session_state.interactive_scenario_state = result
+                        # Session-State liegt im Checkpoint - hier nur die Szenario-ID merken
+                        st.session_state.interactive_scenario_id = result.get("scenario_id")
                         st.session_state.pending_decision = result.get("pending_decision")
                         progress_bar.progress(50)
                         status_text.info("🎯 Decision-Point erreicht! Bitte treffe eine Entscheidung unten.")
@@ -1152,7 +1153,7 @@ def main():
             st.markdown("</div>", unsafe_allow_html=True)
         
         # Interaktiver Modus: Decision Point UI
-        if st.session_state.get("pending_decision") and st.session_state.get("interactive_scenario_state"):
+        if st.session_state.get("pending_decision") and st.session_state.get("interactive_scenario_id"):
             st.markdown("---")
             st.markdown("""
             <div class="enterprise-card" style="border-left: 4px solid var(--warning); background: linear-gradient(135deg, #fff5e6 0%, #ffe6cc 100%);">
@@ -1162,7 +1163,9 @@ def main():
             """, unsafe_allow_html=True)
             
             pending_decision = st.session_state.pending_decision
-            interactive_state = st.session_state.interactive_scenario_state
+            interactive_state = st.session_state.workflow.get_paused_session(
+                st.session_state.interactive_scenario_id
+            ) or {}
             
             # Zeige aktuelle Situation
             situation = pending_decision.get("situation", {})
@@ -1222,47 +1225,31 @@ def main():
             
             # Wenn Option gewählt wurde
             if selected_option:
-                # Wende Entscheidung an
-                user_decisions = interactive_state.get("user_decisions", [])
-                user_decisions.append({
+                decision = {
                     "decision_id": pending_decision.get("decision_id"),
                     "choice_id": selected_option,
                     "decision_type": next((opt.get("type") for opt in options if opt.get("id") == selected_option), "general"),
                     "timestamp": datetime.now().isoformat()
-                })
-                
-                interactive_state["user_decisions"] = user_decisions
-                interactive_state["pending_decision"] = None
-                
-                # Setze State zurück für nächsten Schritt
-                st.session_state.interactive_scenario_state = interactive_state
+                }
                 st.session_state.pending_decision = None
                 
-                # Führe Workflow weiter aus
+                # Führe Workflow ab dem Checkpoint weiter aus
                 with st.spinner("🔄 Wende Entscheidung an und generiere nächste Events..."):
                     try:
-                        # Wende Entscheidung an
-                        interactive_state = st.session_state.workflow._apply_user_decision(
-                            interactive_state,
-                            user_decisions[-1]
-                        )
-                        
-                        # Führe Workflow weiter aus (generiert Events basierend auf Entscheidung)
-                        result = st.session_state.workflow._execute_interactive_workflow(
-                            interactive_state,
-                            recursion_limit=100
+                        result = st.session_state.workflow.resume_scenario(
+                            st.session_state.interactive_scenario_id,
+                            decision
                         )
                         
                         # Prüfe ob wieder pausiert
                         if result.get("pending_decision") and result.get("pending_decision", {}).get("required"):
-                            st.session_state.interactive_scenario_state = result
                             st.session_state.pending_decision = result.get("pending_decision")
                             st.success(f"✅ Entscheidung angewendet! {len(result.get('injects', []))} Injects generiert.")
                             st.rerun()
                         else:
                             # Szenario beendet
                             st.session_state.scenario_result = result
-                            st.session_state.interactive_scenario_state = None
+                            st.session_state.interactive_scenario_id = None
                             st.session_state.pending_decision = None
                             
                             # Zeige End-Bedingung
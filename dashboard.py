@@ -435,8 +435,8 @@ def run_next_step(scenario_type: ScenarioType, num_steps: int = 1, user_action:
                 "warnings": [],
                 "start_time": datetime.now(),
                 "metadata": {},
-                "workflow_logs": [],
-                "agent_decisions": [],
+                "workflow_log_count": 0,
+                "agent_decision_count": 0,
                 "pending_decision": None,
                 "user_decisions": [],
                 "end_condition": None,
@@ -445,16 +445,19 @@ def run_next_step(scenario_type: ScenarioType, num_steps: int = 1, user_action:
                 "user_feedback": user_action if step_num == 0 else None  # Nur beim ersten Step user_action verwenden
             }
             
+            # Logs/Decisions liegen im Trace-Sink - merke Position vor diesem Step
+            trace_workflow = st.session_state.workflow
+            log_offset = trace_workflow.trace_sink.count(st.session_state.current_scenario_id, "workflow_logs")
+            decision_offset = trace_workflow.trace_sink.count(st.session_state.current_scenario_id, "agent_decisions")
+            
             # Führe Workflow aus bis ein neuer Inject generiert wurde
             stream = st.session_state.workflow.graph.stream(
                 current_state,
                 config={"recursion_limit": 50}
             )
             
-            # Sammle alle State-Updates UND Logs während des Streams
+            # Sammle alle State-Updates während des Streams
             step_final_state = None
-            all_workflow_logs = []
-            all_agent_decisions = []
             
             for state_update in stream:
                 if isinstance(state_update, dict):
@@ -464,20 +467,10 @@ def run_next_step(scenario_type: ScenarioType, num_steps: int = 1, user_action:
                         step_final_state = state_update[node_name]
                 else:
                     step_final_state = state_update
-                
-                # Sammle Logs und Decisions während des Streams
-                if step_final_state:
-                    stream_logs = step_final_state.get("workflow_logs", [])
-                    stream_decisions = step_final_state.get("agent_decisions", [])
-                    
-                    # Füge neue Logs hinzu (vermeide Duplikate)
-                    for log in stream_logs:
-                        if log not in all_workflow_logs:
-                            all_workflow_logs.append(log)
-                    
-                    for dec in stream_decisions:
-                        if dec not in all_agent_decisions:
-                            all_agent_decisions.append(dec)
+            
+            # Logs und Decisions dieses Steps aus dem Trace-Sink
+            all_workflow_logs = trace_workflow.get_workflow_logs(st.session_state.current_scenario_id, offset=log_offset)
+            all_agent_decisions = trace_workflow.get_agent_decisions(st.session_state.current_scenario_id, offset=decision_offset)
             
             if step_final_state:
                 # Update Session State mit neuem Inject
@@ -27,6 +27,7 @@ from evaluation.hallucination_test_cases import (
 )
 from agents.critic_agent import CriticAgent
 from state_models import ValidationResult, CrisisPhase
+from utils.rate_limiter import Priority, llm_priority_scope
 
 
 @dataclass
@@ -239,9 +240,11 @@ class AutomaticEvaluator:
             test_cases = self.test_generator.generate_all_test_cases()
         
         results = []
-        for test_case in test_cases:
-            result = self.evaluate_test_case(test_case)
-            results.append(result)
+        # Evaluierung ist Batch-Arbeit: beim Rate-Limiter hinter interaktiven Aufrufen
+        with llm_priority_scope(Priority.BATCH):
+            for test_case in test_cases:
+                result = self.evaluate_test_case(test_case)
+                results.append(result)
         
         self.results = results
         return results
@@ -8,12 +8,15 @@ Dieser Logger erfasst:
 """
 
 import json
+import logging
 import threading
 from datetime import datetime
 from typing import Dict, Any, Optional
 from pathlib import Path
 from utils.json_encoder import DateTimeEncoder
 
+logger = logging.getLogger(__name__)
+
 
 class ForensicLogger:
     """
@@ -78,7 +81,7 @@ class ForensicLogger:
             
             self._write_log(log_entry)
         except Exception as e:
-            print(f"⚠️  Fehler beim Loggen von DRAFT: {e}")
+            logger.warning("⚠️  Fehler beim Loggen von DRAFT: %s", e)
     
     def log_critic(
         self,
@@ -129,7 +132,7 @@ class ForensicLogger:
             
             self._write_log(log_entry)
         except Exception as e:
-            print(f"⚠️  Fehler beim Loggen von CRITIC: {e}")
+            logger.warning("⚠️  Fehler beim Loggen von CRITIC: %s", e)
     
     def log_refined(
         self,
@@ -168,7 +171,7 @@ class ForensicLogger:
             
             self._write_log(log_entry)
         except Exception as e:
-            print(f"⚠️  Fehler beim Loggen von REFINED: {e}")
+            logger.warning("⚠️  Fehler beim Loggen von REFINED: %s", e)
     
     def _serialize_inject(self, inject: Any) -> Dict[str, Any]:
         """
@@ -240,7 +243,7 @@ class ForensicLogger:
                     f.write(json_line + '\n')
                     f.flush()  # Sofortiges Schreiben für Debugging
             except Exception as e:
-                print(f"⚠️  Fehler beim Schreiben in Log-Datei: {e}")
+                logger.warning("⚠️  Fehler beim Schreiben in Log-Datei: %s", e)
 
 
 # Globaler Logger-Instanz (wird pro Szenario erstellt)
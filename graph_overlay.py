@@ -0,0 +1,328 @@
+"""
+In-Memory Graph-Overlay für den Knowledge Graph.
+
+Stellt dieselbe Schnittstelle wie der Neo4jClient bereit (Systemzustand lesen,
+Status schreiben, Kaskadierungsanalyse, Szenario speichern), hält aber alle
+Änderungen lokal im Prozess. Basis ist ein einmal erstellter Snapshot aus
+einem Infrastructure Template oder aus Neo4j; Schreibzugriffe landen in einem
+Overlay und verändern weder den Snapshot noch die Datenbank.
+
+Einsatz: Batch-Generierung in Worker-Prozessen, Benchmarks und Tests ohne Neo4j.
+"""
+
+from typing import Dict, Any, Optional, List
+from collections import deque
+from datetime import datetime
+import copy
+
+from neo4j_client import Neo4jClient
+from state_models import ScenarioState
+
+
+# Beziehungstypen, entlang derer sich Statusänderungen fortpflanzen (wie in Neo4jClient)
+CASCADING_RELATIONSHIP_TYPES = ["RUNS_ON", "DEPENDS_ON", "USES", "CONNECTS_TO", "REQUIRES"]
+
+
+class GraphOverlayClient(Neo4jClient):
+    """
+    Neo4j-kompatibler Client auf einem In-Memory-Snapshot.
+
+    Der Snapshot (Entitäten + Beziehungen) wird nie verändert; Status-Änderungen
+    werden im Overlay gehalten und in `writes` protokolliert. Mehrere Overlays
+    können sich denselben Snapshot teilen.
+    """
+
+    def __init__(
+        self,
+        entities: List[Dict[str, Any]],
+        relationships: Optional[List[Dict[str, Any]]] = None
+    ):
+        """
+        Initialisiert das Overlay.
+
+        Args:
+            entities: Entitäten im Template-Format ({"id", "type", "name", "status", ...})
+            relationships: Beziehungen im Template-Format ({"source", "target", "type"})
+        """
+        super().__init__(uri="memory://overlay", user="", password="")
+        self.driver = None
+        self._entities: Dict[str, Dict[str, Any]] = {
+            entity["id"]: dict(entity) for entity in entities if entity.get("id")
+        }
+        self._relationships: List[Dict[str, Any]] = [dict(rel) for rel in (relationships or [])]
+        self._outgoing: Dict[str, List[Dict[str, Any]]] = {}
+        for rel in self._relationships:
+            self._outgoing.setdefault(rel["source"], []).append(rel)
+
+        # Overlay: entity_id -> geänderte Properties
+        self._overlay: Dict[str, Dict[str, Any]] = {}
+        self.writes: List[Dict[str, Any]] = []
+        self.scenarios: Dict[str, ScenarioState] = {}
+        self._version = 0
+
+    @classmethod
+    def from_template(cls, template_name: str) -> "GraphOverlayClient":
+        """
+        Erstellt ein Overlay aus einem Infrastructure Template.
+
+        Args:
+            template_name: Name des Templates (z.B. 'standard_bank')
+        """
+        from templates.infrastructure_templates import get_available_templates
+        templates = get_available_templates()
+        if template_name not in templates:
+            raise ValueError(f"Template '{template_name}' nicht gefunden. Verfügbar: {list(templates.keys())}")
+        template = templates[template_name]
+        return cls(template.get_entities(), template.get_relationships())
+
+    @classmethod
+    def from_neo4j(cls, neo4j_client: Neo4jClient) -> "GraphOverlayClient":
+        """
+        Erstellt ein Overlay aus dem aktuellen Inhalt einer Neo4j-Datenbank.
+
+        Args:
+            neo4j_client: Verbundener Neo4jClient
+        """
+        snapshot = cls.snapshot_from_neo4j(neo4j_client)
+        return cls(snapshot["entities"], snapshot["relationships"])
+
+    @staticmethod
+    def snapshot_from_neo4j(neo4j_client: Neo4jClient) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Liest Entitäten und Beziehungen einmalig aus Neo4j (picklebar für Worker-Prozesse).
+
+        Returns:
+            {"entities": [...], "relationships": [...]}
+        """
+        if not neo4j_client.driver:
+            raise RuntimeError("Neo4j Client nicht verbunden. Rufe connect() auf.")
+
+        with neo4j_client.driver.session(database=neo4j_client.database) as session:
+            entities = []
+            for record in session.run("MATCH (e) WHERE e.id IS NOT NULL RETURN e"):
+                properties = dict(record["e"])
+                properties.pop("last_updated", None)
+                entities.append(properties)
+
+            relationships = [
+                {"source": record["source"], "target": record["target"], "type": record["type"]}
+                for record in session.run("""
+                MATCH (a)-[r]->(b)
+                WHERE a.id IS NOT NULL AND b.id IS NOT NULL
+                RETURN a.id as source, b.id as target, type(r) as type
+                """)
+            ]
+        return {"entities": entities, "relationships": relationships}
+
+    def snapshot(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Gibt den unveränderten Basis-Snapshot zurück (ohne Overlay)."""
+        return {
+            "entities": [dict(entity) for entity in self._entities.values()],
+            "relationships": [dict(rel) for rel in self._relationships]
+        }
+
+    def fork(self) -> "GraphOverlayClient":
+        """
+        Erstellt ein unabhängiges Overlay auf demselben Snapshot inkl. aktueller Änderungen.
+
+        Returns:
+            Neues GraphOverlayClient-Objekt
+        """
+        forked = GraphOverlayClient.__new__(GraphOverlayClient)
+        forked.__dict__.update(self.__dict__)
+        forked._overlay = copy.deepcopy(self._overlay)
+        forked.writes = list(self.writes)
+        forked.scenarios = dict(self.scenarios)
+        return forked
+
+    def reset(self):
+        """Verwirft alle Änderungen im Overlay."""
+        self._overlay.clear()
+        self.writes = []
+        self._version += 1
+
+    # ------------------------------------------------------------------
+    # Neo4jClient-Schnittstelle
+    # ------------------------------------------------------------------
+
+    def connect(self):
+        """Keine Verbindung notwendig (In-Memory)."""
+        return None
+
+    def close(self):
+        """Keine Verbindung zu schließen (In-Memory)."""
+        return None
+
+    def _resolve(self, entity_id: str) -> Dict[str, Any]:
+        """Gibt die Entität inkl. Overlay-Änderungen zurück."""
+        return {**self._entities[entity_id], **self._overlay.get(entity_id, {})}
+
+    def get_current_state(self, entity_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Ruft den aktuellen Systemzustand ab (gleiches Format wie Neo4jClient)."""
+        entities = []
+        for entity_id in self._entities:
+            entity = self._resolve(entity_id)
+            if entity_type and entity.get("type") != entity_type:
+                continue
+            entities.append({
+                "entity_id": entity_id,
+                "entity_type": entity.get("type"),
+                "name": entity.get("name"),
+                "status": entity.get("status", "unknown"),
+                "properties": entity,
+                "relationships": [
+                    {"target": rel["target"], "type": rel["type"]}
+                    for rel in self._outgoing.get(entity_id, [])
+                ]
+            })
+        return entities
+
+    def get_entity_status(self, entity_id: str) -> Optional[str]:
+        """Ruft den Status einer Entität ab."""
+        if entity_id not in self._entities:
+            return None
+        return self._resolve(entity_id).get("status")
+
+    def update_entity_status(
+        self,
+        entity_id: str,
+        new_status: str,
+        inject_id: Optional[str] = None
+    ) -> bool:
+        """
+        Aktualisiert den Status einer Entität im Overlay.
+
+        Wie bei Neo4j (MATCH ... SET) bleibt ein Update auf eine unbekannte
+        Entität ohne Wirkung.
+        """
+        self.writes.append({"entity_id": entity_id, "new_status": new_status, "inject_id": inject_id})
+        # Wie Neo4jClient: jeder Aufruf erhöht die Version um genau 1
+        self._version += 1
+        if entity_id not in self._entities:
+            return True
+
+        changes = self._overlay.setdefault(entity_id, {})
+        changes["status"] = new_status
+        changes["last_updated"] = datetime.now().isoformat()
+        if inject_id:
+            changes["last_updated_by_inject"] = inject_id
+        return True
+
+    def get_state_version(self) -> str:
+        """Versions-Token des Overlays (ändert sich bei jedem Schreibzugriff)."""
+        return f"{len(self._entities)}:{self._version}"
+
+    def _walk(self, entity_id: str, max_depth: int) -> List[Dict[str, Any]]:
+        """
+        Breitensuche entlang der kaskadierenden Beziehungstypen.
+
+        Returns:
+            Liste von {"entity_id", "depth", "relationship_chain"} (kürzester Pfad)
+        """
+        visited = {entity_id}
+        found = []
+        queue = deque([(entity_id, 0, [])])
+        while queue:
+            current, depth, chain = queue.popleft()
+            if depth >= max_depth:
+                continue
+            for rel in self._outgoing.get(current, []):
+                target = rel["target"]
+                if rel["type"] not in CASCADING_RELATIONSHIP_TYPES or target in visited:
+                    continue
+                if target not in self._entities:
+                    continue
+                visited.add(target)
+                target_chain = chain + [rel["type"]]
+                found.append({"entity_id": target, "depth": depth + 1, "relationship_chain": target_chain})
+                queue.append((target, depth + 1, target_chain))
+        return found
+
+    def get_affected_entities(self, entity_id: str, max_depth: int = 3) -> List[str]:
+        """Ruft alle Entitäten ab, die von einer Statusänderung betroffen sind."""
+        return [item["entity_id"] for item in self._walk(entity_id, max_depth)]
+
+    def calculate_cascading_impact(
+        self,
+        entity_id: str,
+        new_status: str,
+        max_depth: int = 3
+    ) -> Dict[str, Any]:
+        """Berechnet kaskadierende Auswirkungen (gleiches Format wie Neo4jClient)."""
+        affected_entities = []
+        critical_paths = []
+        max_depth_found = 0
+
+        for item in self._walk(entity_id, max_depth):
+            entity = self._resolve(item["entity_id"])
+            affected_entities.append({
+                "entity_id": item["entity_id"],
+                "entity_name": entity.get("name"),
+                "entity_type": entity.get("type"),
+                "current_status": entity.get("status"),
+                "depth": item["depth"],
+                "relationship_chain": item["relationship_chain"]
+            })
+            max_depth_found = max(max_depth_found, item["depth"])
+            if item["depth"] >= 2:
+                critical_paths.append({
+                    "path_length": item["depth"],
+                    "entity_id": item["entity_id"],
+                    "entity_type": entity.get("type")
+                })
+
+        affected_entities.sort(key=lambda e: (e["depth"], e["entity_type"] or ""))
+
+        return {
+            "affected_entities": affected_entities,
+            "critical_paths": critical_paths,
+            "estimated_recovery_time": self._estimate_recovery_time(new_status, len(affected_entities), max_depth_found),
+            "impact_severity": self._calculate_impact_severity(len(affected_entities), max_depth_found, new_status),
+            "total_affected": len(affected_entities),
+            "max_depth": max_depth_found
+        }
+
+    def create_entity(self, entity) -> bool:
+        """Fügt eine Entität hinzu (Kopie des Snapshots, damit Forks unberührt bleiben)."""
+        self._entities = dict(self._entities)
+        self._entities[entity.entity_id] = {
+            "id": entity.entity_id,
+            "type": entity.entity_type,
+            "name": entity.name,
+            "status": entity.status,
+            **entity.properties
+        }
+        self._version += 1
+        return True
+
+    def save_scenario(self, scenario_state: ScenarioState, user: Optional[str] = None) -> str:
+        """Speichert ein Szenario im Speicher."""
+        self.scenarios[scenario_state.scenario_id] = scenario_state
+        return scenario_state.scenario_id
+
+    def get_scenario(self, scenario_id: str) -> Optional[Dict[str, Any]]:
+        """Lädt ein im Speicher abgelegtes Szenario."""
+        scenario = self.scenarios.get(scenario_id)
+        return scenario.model_dump() if scenario else None
+
+    def list_scenarios(
+        self,
+        limit: int = 50,
+        user: Optional[str] = None,
+        scenario_type: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Listet die im Speicher abgelegten Szenarien auf."""
+        return [
+            {
+                "scenario_id": scenario.scenario_id,
+                "scenario_type": scenario.scenario_type.value,
+                "current_phase": scenario.current_phase.value,
+                "inject_count": len(scenario.injects)
+            }
+            for scenario in self.scenarios.values()
+            if not scenario_type or scenario.scenario_type.value == scenario_type
+        ][:limit]
+
+    def delete_scenario(self, scenario_id: str) -> bool:
+        """Entfernt ein Szenario aus dem Speicher."""
+        return self.scenarios.pop(scenario_id, None) is not None
@@ -7,15 +7,43 @@ State-Abfragen und Updates bereit.
 
 from typing import List, Optional, Dict, Any
 from datetime import datetime
-from neo4j import GraphDatabase
+from neo4j import GraphDatabase, Query
 from state_models import KnowledgeGraphEntity, GraphStateUpdate, CrisisPhase, ScenarioState, Inject
 import os
 from dotenv import load_dotenv
 import json
+import logging
 from utils.json_encoder import DateTimeEncoder
+from utils.cancellation import remaining_time
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+
+# Zählt jeden Schreibzugriff über den Client hoch (ein einzelner Knoten statt Graph-Scan).
+# Die Epoche ändert sich, wenn der Knoten neu angelegt wird (z.B. nach einem Reset des Graphs).
+STATE_VERSION_BUMP = """
+MERGE (v:StateVersion {name: 'global'})
+ON CREATE SET v.epoch = timestamp(), v.counter = 0
+SET v.counter = v.counter + 1
+"""
+
+
+def _query(text: str) -> Any:
+    """
+    Abfrage mit Transaktions-Timeout aus der Restzeit des aktuellen Scopes.
+
+    Läuft der Aufruf innerhalb eines Workflow-Nodes mit Zeitlimit, bricht der
+    Server die Transaktion nach Ablauf ab, statt nach dem Node-Timeout weiter
+    zu lesen oder zu schreiben (siehe utils/cancellation.remaining_time).
+    """
+    timeout = remaining_time()
+    if timeout is None:
+        return text
+    # 0 würde den Timeout abschalten - abgelaufene Frist als kürzestmöglicher Timeout
+    return Query(text, timeout=max(timeout, 0.001))
+
 
 class Neo4jClient:
     """
@@ -57,16 +85,16 @@ class Neo4jClient:
             # Teste die Verbindung
             with self.driver.session(database=self.database) as session:
                 session.run("RETURN 1")
-            print(f"✓ Verbindung zu Neo4j hergestellt: {self.uri}")
+            logger.info("✓ Verbindung zu Neo4j hergestellt: %s", self.uri)
         except Exception as e:
-            print(f"✗ Fehler bei Neo4j-Verbindung: {e}")
+            logger.warning("✗ Fehler bei Neo4j-Verbindung: %s", e)
             raise
 
     def close(self):
         """Schließt die Verbindung zu Neo4j."""
         if self.driver:
             self.driver.close()
-            print("✓ Neo4j-Verbindung geschlossen")
+            logger.info("✓ Neo4j-Verbindung geschlossen")
 
     def get_current_state(self, entity_type: Optional[str] = None) -> List[Dict[str, Any]]:
         """
@@ -88,7 +116,7 @@ class Neo4jClient:
                 OPTIONAL MATCH (e)-[r]->(related)
                 RETURN e, collect(r) as relationships, collect(related) as related_entities
                 """
-                result = session.run(query, entity_type=entity_type)
+                result = session.run(_query(query), entity_type=entity_type)
             else:
                 query = """
                 MATCH (e)
@@ -96,7 +124,7 @@ class Neo4jClient:
                 RETURN e, collect(r) as relationships, collect(related) as related_entities
                 LIMIT 100
                 """
-                result = session.run(query)
+                result = session.run(_query(query))
 
             entities = []
             for record in result:
@@ -135,7 +163,7 @@ class Neo4jClient:
             MATCH (e {id: $entity_id})
             RETURN e.status as status
             """
-            result = session.run(query, entity_id=entity_id)
+            result = session.run(_query(query), entity_id=entity_id)
             record = result.single()
             return record["status"] if record else None
 
@@ -160,13 +188,18 @@ class Neo4jClient:
             raise RuntimeError("Neo4j Client nicht verbunden. Rufe connect() auf.")
 
         with self.driver.session(database=self.database) as session:
-            query = """
-            MATCH (e {id: $entity_id})
-            SET e.status = $new_status,
-                e.last_updated = datetime()
+            # Versionszähler im selben Write erhöhen - auch wenn die Entität fehlt,
+            # damit jeder Aufruf genau +1 zählt (der Workflow rechnet lokal mit)
+            query = STATE_VERSION_BUMP + """
+            WITH v
+            OPTIONAL MATCH (e {id: $entity_id})
+            FOREACH (_ IN CASE WHEN e IS NULL THEN [] ELSE [1] END |
+                SET e.status = $new_status,
+                    e.last_updated = datetime()
             """
             if inject_id:
                 query += ", e.last_updated_by_inject = $inject_id"
+            query += "\n            )"
             
             params = {
                 "entity_id": entity_id,
@@ -175,9 +208,34 @@ class Neo4jClient:
             if inject_id:
                 params["inject_id"] = inject_id
 
-            session.run(query, **params)
+            session.run(_query(query), **params)
             return True
 
+    def get_state_version(self) -> str:
+        """
+        Liefert ein leichtgewichtiges Versions-Token für den Systemzustand.
+
+        Das Token liest nur den StateVersion-Knoten, dessen Zähler bei jedem
+        Aufruf von update_entity_status bzw. create_entity um genau 1 steigt.
+        Damit kann der Workflow externe Änderungen erkennen, ohne den Graph
+        zu scannen, und die erwartete Version nach eigenen Writes lokal
+        berechnen (siehe ScenarioWorkflow._advance_state_version).
+
+        Returns:
+            Versions-Token "<epoche>:<zähler>"
+        """
+        if not self.driver:
+            raise RuntimeError("Neo4j Client nicht verbunden. Rufe connect() auf.")
+
+        with self.driver.session(database=self.database) as session:
+            record = session.run(_query("""
+            MATCH (v:StateVersion {name: 'global'})
+            RETURN v.epoch as epoch, v.counter as counter
+            """)).single()
+            if record is None:
+                return "0:0"
+            return f"{record['epoch']}:{record['counter']}"
+
     def get_affected_entities(self, entity_id: str, max_depth: int = 3) -> List[str]:
         """
         Ruft alle Entitäten ab, die von einer Statusänderung betroffen sind
@@ -205,7 +263,7 @@ class Neo4jClient:
             ORDER BY depth, target.id
             """ % max_depth
             
-            result = session.run(query, entity_id=entity_id)
+            result = session.run(_query(query), entity_id=entity_id)
             affected_ids = []
             for record in result:
                 affected_ids.append(record["affected_id"])
@@ -252,7 +310,7 @@ class Neo4jClient:
             ORDER BY depth, target.type
             """ % max_depth
             
-            result = session.run(query, entity_id=entity_id)
+            result = session.run(_query(query), entity_id=entity_id)
             
             affected_entities = []
             critical_paths = []
@@ -384,7 +442,7 @@ class Neo4jClient:
             raise RuntimeError("Neo4j Client nicht verbunden. Rufe connect() auf.")
 
         with self.driver.session(database=self.database) as session:
-            query = """
+            query = STATE_VERSION_BUMP + """
             CREATE (e:Entity {
                 id: $entity_id,
                 type: $entity_type,
@@ -427,11 +485,11 @@ class Neo4jClient:
                     template = templates[template_name]
                     return load_template_to_neo4j(template, self, clear_existing=True)
                 else:
-                    print(f"⚠️  Template '{template_name}' nicht gefunden. Verwende Basis-Infrastruktur.")
+                    logger.warning("⚠️  Template '%s' nicht gefunden. Verwende Basis-Infrastruktur.", template_name)
             except ImportError:
-                print("⚠️  Infrastructure Templates nicht verfügbar. Verwende Basis-Infrastruktur.")
+                logger.warning("⚠️  Infrastructure Templates nicht verfügbar. Verwende Basis-Infrastruktur.")
             except Exception as e:
-                print(f"⚠️  Fehler beim Laden des Templates: {e}. Verwende Basis-Infrastruktur.")
+                logger.warning("⚠️  Fehler beim Laden des Templates: %s. Verwende Basis-Infrastruktur.", e)
 
         # Fallback: Einfache Basis-Infrastruktur
         base_entities = [
@@ -503,7 +561,7 @@ class Neo4jClient:
                 """ % rel_type
                 session.run(query, source_id=source_id, target_id=target_id)
             
-            print("✓ Basis-Infrastruktur initialisiert")
+            logger.info("✓ Basis-Infrastruktur initialisiert")
 
     def seed_enterprise_infrastructure(self):
         """
@@ -567,11 +625,11 @@ class Neo4jClient:
         
         with self.driver.session(database=self.database) as session:
             # Lösche ALLE bestehenden Entities (inklusive Szenarien und Injects)
-            print("🗑️  Lösche bestehende Datenbank-Inhalte...")
+            logger.info("🗑️  Lösche bestehende Datenbank-Inhalte...")
             session.run("MATCH (n) DETACH DELETE n")
             
             # Erstelle alle Enterprise Assets
-            print(f"🏢 Erstelle {len(enterprise_assets)} Enterprise Assets...")
+            logger.info("🏢 Erstelle %s Enterprise Assets...", len(enterprise_assets))
             for asset in enterprise_assets:
                 query = """
                 CREATE (e:Entity {
@@ -637,13 +695,13 @@ class Neo4jClient:
                 """
                 session.run(query, source_id=source_id, target_id=target_id)
             
-            print(f"✅ Enterprise Infrastructure erfolgreich geseeded: {len(enterprise_assets)} Assets erstellt")
-            print(f"   - Core Servers: 5 (SRV-CORE-001 bis 005)")
-            print(f"   - App Servers: 15 (SRV-APP-001 bis 015)")
-            print(f"   - Production Databases: 5 (DB-PROD-01 bis 05)")
-            print(f"   - Development Databases: 5 (DB-DEV-01 bis 05) - leicht mit PROD zu verwechseln!")
-            print(f"   - Finance Workstations: 10 (WS-FINANCE-01 bis 10)")
-            print(f"   - Relationships: {len(relationships)}")
+            logger.info("✅ Enterprise Infrastructure erfolgreich geseeded: %s Assets erstellt", len(enterprise_assets))
+            logger.info("- Core Servers: 5 (SRV-CORE-001 bis 005)")
+            logger.info("- App Servers: 15 (SRV-APP-001 bis 015)")
+            logger.info("- Production Databases: 5 (DB-PROD-01 bis 05)")
+            logger.info("- Development Databases: 5 (DB-DEV-01 bis 05) - leicht mit PROD zu verwechseln!")
+            logger.info("- Finance Workstations: 10 (WS-FINANCE-01 bis 10)")
+            logger.info("- Relationships: %s", len(relationships))
             return len(enterprise_assets)
 
     def __enter__(self):
@@ -756,7 +814,7 @@ class Neo4jClient:
                     """
                     session.run(entity_link_query, inject_id=inject.inject_id, asset_id=asset_id)
             
-            print(f"✅ Szenario {scenario_id} in Neo4j gespeichert ({len(scenario_state.injects)} Injects)")
+            logger.info("✅ Szenario %s in Neo4j gespeichert (%s Injects)", scenario_id, len(scenario_state.injects))
             return scenario_id
     
     def get_scenario(self, scenario_id: str) -> Optional[Dict[str, Any]]:
@@ -889,9 +947,9 @@ class Neo4jClient:
             deleted = result.single()["deleted"]
             
             if deleted > 0:
-                print(f"✅ Szenario {scenario_id} gelöscht")
+                logger.info("✅ Szenario %s gelöscht", scenario_id)
                 return True
             else:
-                print(f"⚠️  Szenario {scenario_id} nicht gefunden")
+                logger.warning("⚠️  Szenario %s nicht gefunden", scenario_id)
                 return False
 
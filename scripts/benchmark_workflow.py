@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Benchmark der Workflow-Orchestrierung mit Fake-LLM und In-Memory-Graph.
+
+Führt ScenarioWorkflow.generate_scenario end-to-end aus, wobei alle
+Chat-Modelle durch ein FakeChatModel (konfigurierbare Latenz, schema-konforme
+JSON-Antworten) und Neo4j durch ein GraphOverlayClient auf einem synthetischen
+Graph ersetzt werden. Gemessen wird pro Node die eigene Overhead-Zeit
+(Wandzeit minus simulierte LLM-Zeit) als p50/p95, optional die Allokationen
+(tracemalloc) sowie Injects/Sekunde pro Kombination aus Graph-Größe und
+max_iterations. Die TTP-Auswahl nutzt die Fallback-TTPs des IntelAgent (keine
+ChromaDB-Abfrage).
+
+Die Ergebnisse werden als JSON geschrieben, damit Läufe zwischen Commits
+verglichen werden können (--compare).
+
+Nutzung:
+    python scripts/benchmark_workflow.py --graph-sizes 10,100,1000 --iterations 5,10 --latency 0.05
+    python scripts/benchmark_workflow.py --output reports/benchmarks/neu.json --compare reports/benchmarks/alt.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+# Füge Projekt-Root zum Python-Pfad hinzu
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+# Agenten erzeugen beim Start ChatOpenAI-Clients; ohne Key schlägt das fehl (es wird nie aufgerufen)
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+from state_models import ScenarioType
+from graph_overlay import GraphOverlayClient
+from utils.fake_llm import FakeChatModel, llm_seconds
+from utils.logging_config import configure_logging
+from utils.structured_output import get_parse_stats, reset_parse_stats
+from workflows.scenario_workflow import ScenarioWorkflow
+from workflows.trace_sink import MemoryTraceSink
+
+
+DEFAULT_OUTPUT_DIR = "reports/benchmarks"
+
+
+def build_synthetic_graph(size: int) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Erstellt einen synthetischen Infrastruktur-Graph mit `size` Assets.
+
+    Verhältnis Server : Applikationen : Datenbanken = 2 : 2 : 1, mit
+    RUNS_ON (Server → Applikation) und USES (Applikation → Datenbank).
+    """
+    servers = max(1, size * 2 // 5)
+    apps = max(1, size * 2 // 5)
+    databases = max(1, size - servers - apps)
+    entities, relationships = [], []
+    for i in range(servers):
+        entities.append({"id": f"SRV-{i + 1:04d}", "type": "Server", "name": f"Server {i + 1}", "status": "online", "criticality": "standard"})
+    for i in range(apps):
+        entities.append({"id": f"APP-{i + 1:04d}", "type": "Application", "name": f"Applikation {i + 1}", "status": "online", "criticality": "high" if i % 5 == 0 else "standard"})
+        relationships.append({"source": f"SRV-{i % servers + 1:04d}", "target": f"APP-{i + 1:04d}", "type": "RUNS_ON"})
+    for i in range(databases):
+        entities.append({"id": f"DB-{i + 1:04d}", "type": "Database", "name": f"Datenbank {i + 1}", "status": "online", "criticality": "critical" if i % 3 == 0 else "standard"})
+    for i in range(apps):
+        relationships.append({"source": f"APP-{i + 1:04d}", "target": f"DB-{i % databases + 1:04d}", "type": "USES"})
+    return {"entities": entities, "relationships": relationships}
+
+
+class InstrumentedWorkflow(ScenarioWorkflow):
+    """ScenarioWorkflow, dessen Nodes Wandzeit, LLM-Zeit und Allokationen aufzeichnen."""
+
+    def __init__(self, *args, track_allocations: bool = False, **kwargs):
+        self.node_samples: Dict[str, List[Dict[str, float]]] = {}
+        self.track_allocations = track_allocations
+        super().__init__(*args, **kwargs)
+
+    def _scoped_node(self, node):
+        scoped = super()._scoped_node(node)
+        name = node.__name__.strip("_").replace("_node", "")
+
+        def run(state):
+            llm_before = llm_seconds()
+            if self.track_allocations:
+                tracemalloc.reset_peak()
+                memory_before = tracemalloc.get_traced_memory()[0]
+            start = time.perf_counter()
+            try:
+                return scoped(state)
+            finally:
+                wall = time.perf_counter() - start
+                sample = {"wall": wall, "llm": llm_seconds() - llm_before}
+                if self.track_allocations:
+                    sample["alloc_peak"] = tracemalloc.get_traced_memory()[1] - memory_before
+                self.node_samples.setdefault(name, []).append(sample)
+        return run
+
+
+def create_benchmark_workflow(
+    graph: Dict[str, List[Dict[str, Any]]],
+    max_iterations: int,
+    latency: float,
+    jitter: float,
+    seed: int,
+    track_allocations: bool = False,
+    batch_drafts: int = 1,
+    **workflow_options: Any
+) -> InstrumentedWorkflow:
+    """
+    Erstellt einen Workflow mit Fake-LLMs, Overlay-Graph und In-Memory-Traces.
+    
+    Weitere Keyword-Argumente gehen an den ScenarioWorkflow (z.B. interactive_mode).
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        workflow = InstrumentedWorkflow(
+            neo4j_client=GraphOverlayClient(graph["entities"], graph["relationships"]),
+            max_iterations=max_iterations,
+            trace_sink=MemoryTraceSink(),
+            track_allocations=track_allocations,
+            batch_drafts=batch_drafts,
+            **workflow_options
+        )
+    fake = lambda agent, offset: FakeChatModel(agent=agent, latency=latency, jitter=jitter, seed=seed + offset)
+    workflow.manager_agent.llm = fake("manager", 1)
+    workflow.generator_agent.llm = fake("generator", 2)
+    workflow.critic_agent.llm = fake("critic", 3)
+    for offset, framework in enumerate(workflow.critic_agent.compliance_frameworks.values(), start=4):
+        if hasattr(framework, "llm"):
+            framework.llm = fake("compliance_dora", offset)
+    workflow.intel_agent.collection = None  # Fallback-TTPs statt ChromaDB-Abfrage
+    return workflow
+
+
+def _percentile(values: List[float], percentile: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(percentile / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize_nodes(samples: Dict[str, List[Dict[str, float]]]) -> Dict[str, Dict[str, Any]]:
+    """Fasst die Node-Samples zu p50/p95-Overhead (ms) und Allokationen (KiB) zusammen."""
+    summary = {}
+    for name, node_samples in samples.items():
+        overhead = [(s["wall"] - s["llm"]) * 1000 for s in node_samples]
+        summary[name] = {
+            "calls": len(node_samples),
+            "overhead_p50_ms": round(_percentile(overhead, 50), 3),
+            "overhead_p95_ms": round(_percentile(overhead, 95), 3),
+            "overhead_total_ms": round(sum(overhead), 3),
+            "llm_total_ms": round(sum(s["llm"] for s in node_samples) * 1000, 3)
+        }
+        if node_samples and "alloc_peak" in node_samples[0]:
+            summary[name]["alloc_peak_kib_mean"] = round(statistics.mean(s["alloc_peak"] for s in node_samples) / 1024, 1)
+    return summary
+
+
+def run_case(
+    graph_size: int,
+    max_iterations: int,
+    repeat: int,
+    latency: float,
+    jitter: float,
+    mode: str,
+    track_allocations: bool,
+    seed: int = 42,
+    batch_drafts: int = 1
+) -> Dict[str, Any]:
+    """Führt eine Kombination (Graph-Größe, max_iterations) `repeat`-mal aus."""
+    graph = build_synthetic_graph(graph_size)
+    workflow = create_benchmark_workflow(graph, max_iterations, latency, jitter, seed, track_allocations, batch_drafts)
+
+    reset_parse_stats()
+    if track_allocations:
+        tracemalloc.start()
+    walls, llm_totals, inject_counts, token_totals = [], [], [], []
+    try:
+        for run in range(repeat):
+            llm_before = llm_seconds()
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = workflow.generate_scenario(
+                    ScenarioType.RANSOMWARE_DOUBLE_EXTORTION,
+                    scenario_id=f"BENCH-{graph_size}-{max_iterations}-{run}",
+                    mode=mode
+                )
+            walls.append(time.perf_counter() - start)
+            llm_totals.append(llm_seconds() - llm_before)
+            inject_counts.append(len(result.get("injects", [])))
+            token_totals.append(result.get("metadata", {}).get("token_usage", {}).get("total", {}).get("total_tokens", 0))
+        peak_kib = tracemalloc.get_traced_memory()[1] / 1024 if track_allocations else None
+    finally:
+        if track_allocations:
+            tracemalloc.stop()
+
+    total_wall = sum(walls)
+    total_overhead = total_wall - sum(llm_totals)
+    case = {
+        "graph_size": graph_size,
+        "max_iterations": max_iterations,
+        "repeat": repeat,
+        "injects": sum(inject_counts),
+        "wall_seconds": round(total_wall, 4),
+        "llm_seconds": round(sum(llm_totals), 4),
+        "overhead_seconds": round(total_overhead, 4),
+        "overhead_share": round(total_overhead / total_wall, 4) if total_wall else 0.0,
+        "injects_per_sec": round(sum(inject_counts) / total_wall, 3) if total_wall else 0.0,
+        "tokens_per_inject": round(sum(token_totals) / sum(inject_counts), 1) if sum(inject_counts) else 0.0,
+        "nodes": summarize_nodes(workflow.node_samples),
+        "critic_gate": workflow.critic_agent.get_gate_stats(),
+        "parse_stats": get_parse_stats()
+    }
+    if peak_kib is not None:
+        case["alloc_peak_kib"] = round(peak_kib, 1)
+    return case
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=project_root, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def compare_results(current: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """Vergleicht zwei Ergebnis-Dateien (Injects/s und Node-p50 pro Fall)."""
+    lines = [f"Vergleich mit {baseline['meta'].get('commit') or 'Baseline'} ({baseline['meta'].get('timestamp')}):"]
+    baseline_cases = {(c["graph_size"], c["max_iterations"]): c for c in baseline["cases"]}
+    for case in current["cases"]:
+        old = baseline_cases.get((case["graph_size"], case["max_iterations"]))
+        if not old:
+            continue
+        change = (case["injects_per_sec"] / old["injects_per_sec"] - 1) * 100 if old["injects_per_sec"] else 0.0
+        lines.append(
+            f"  Graph {case['graph_size']:>5}, Iterationen {case['max_iterations']:>3}: "
+            f"{old['injects_per_sec']:.2f} → {case['injects_per_sec']:.2f} Injects/s ({change:+.1f}%)"
+        )
+        for name, node in case["nodes"].items():
+            old_node = old["nodes"].get(name)
+            if old_node:
+                lines.append(
+                    f"    {name:<16} p50 {old_node['overhead_p50_ms']:>8.2f} → {node['overhead_p50_ms']:>8.2f} ms, "
+                    f"p95 {old_node['overhead_p95_ms']:>8.2f} → {node['overhead_p95_ms']:>8.2f} ms"
+                )
+    return lines
+
+
+def _parse_int_list(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark der Workflow-Orchestrierung mit Fake-LLM und In-Memory-Graph."
+    )
+    parser.add_argument("--graph-sizes", type=_parse_int_list, default=[10, 100, 1000],
+                        help="Kommagetrennte Graph-Größen (Anzahl Assets, Standard: 10,100,1000)")
+    parser.add_argument("--iterations", type=_parse_int_list, default=[5],
+                        help="Kommagetrennte Werte für max_iterations (Standard: 5)")
+    parser.add_argument("--repeat", type=int, default=3, help="Szenarien pro Kombination (Standard: 3)")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="Simulierte LLM-Latenz pro Aufruf in Sekunden (Standard: 0)")
+    parser.add_argument("--jitter", type=float, default=0.0,
+                        help="Standardabweichung der LLM-Latenz in Sekunden (Standard: 0)")
+    parser.add_argument("--mode", choices=["legacy", "thesis"], default="legacy",
+                        help="Workflow-Modus (Standard: legacy, ohne forensisches Logging)")
+    parser.add_argument("--batch-drafts", type=int, default=1,
+                        help="Injects pro Generator-Aufruf (batch_drafts des Workflows, Standard: 1)")
+    parser.add_argument("--allocations", action="store_true",
+                        help="Allokationen pro Node mit tracemalloc messen (verlangsamt den Lauf)")
+    parser.add_argument("--output", type=str, default=None,
+                        help=f"Ergebnis-Datei (Standard: {DEFAULT_OUTPUT_DIR}/<commit>_<zeitstempel>.json)")
+    parser.add_argument("--compare", type=str, default=None, help="Ergebnis-Datei eines früheren Laufs zum Vergleich")
+    args = parser.parse_args()
+    # Node-Logs würden die Messung verfälschen; nur Warnungen/Fehler ausgeben
+    configure_logging(level=os.getenv("LOG_LEVEL", "WARNING"))
+
+    commit = _git_commit()
+    results = {
+        "meta": {
+            "commit": commit,
+            "timestamp": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "latency": args.latency,
+            "jitter": args.jitter,
+            "mode": args.mode,
+            "batch_drafts": args.batch_drafts,
+            "allocations": args.allocations
+        },
+        "cases": []
+    }
+
+    print("=" * 60)
+    print(f"Workflow-Benchmark (Commit {commit or 'unbekannt'}, LLM-Latenz {args.latency * 1000:.0f} ms)")
+    print("=" * 60)
+    for graph_size in args.graph_sizes:
+        for max_iterations in args.iterations:
+            case = run_case(
+                graph_size, max_iterations, args.repeat, args.latency, args.jitter, args.mode, args.allocations,
+                batch_drafts=args.batch_drafts
+            )
+            results["cases"].append(case)
+            print(
+                f"📊 Graph {graph_size:>5}, Iterationen {max_iterations:>3}: {case['injects_per_sec']:.2f} Injects/s, "
+                f"Overhead {case['overhead_share'] * 100:.1f}% der Wandzeit"
+            )
+            for name, node in sorted(case["nodes"].items(), key=lambda item: -item[1]["overhead_total_ms"]):
+                print(f"   {name:<16} p50 {node['overhead_p50_ms']:>8.2f} ms  p95 {node['overhead_p95_ms']:>8.2f} ms  ({node['calls']} Aufrufe)")
+
+    output = Path(args.output) if args.output else (
+        project_root / DEFAULT_OUTPUT_DIR / f"{commit or 'local'}_{datetime.now():%Y%m%d_%H%M%S}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"\n💾 Ergebnisse gespeichert: {output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        print()
+        print("\n".join(compare_results(results, baseline)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,450 @@
+#!/usr/bin/env python3
+"""
+Headless Batch-Generierung von Szenarien über einen Prozess-Pool.
+
+Liest eine Spezifikation (Szenario-Typen, Anzahl, Iterationen, Modi), verteilt
+die einzelnen Szenarien auf Worker-Prozesse und schreibt die Ergebnisse als
+JSONL. Jeder Worker hat seinen eigenen Workflow und pro Szenario ein eigenes
+In-Memory Graph-Overlay (GraphOverlayClient), sodass parallele Läufe sich
+nicht gegenseitig den Systemzustand verändern.
+
+Abgeschlossene Szenarien werden in einem Manifest festgehalten; ein
+abgebrochener Lauf setzt beim erneuten Start an derselben Stelle fort.
+
+Nutzung:
+    python scripts/generate_batch.py --spec batch_spec.json --output-dir reports/batch --workers 4
+
+Beispiel-Spezifikation:
+    {
+        "name": "thesis_eval",
+        "template": "standard_bank",
+        "runs": [
+            {"scenario_type": "RANSOMWARE_DOUBLE_EXTORTION", "count": 5, "iterations": 8, "modes": ["thesis", "legacy"]},
+            {"scenario_type": "DDOS_CRITICAL_FUNCTIONS", "count": 3, "iterations": 5}
+        ]
+    }
+"""
+
+import argparse
+import contextlib
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Iterator, Tuple
+
+# Füge Projekt-Root zum Python-Pfad hinzu
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from state_models import ScenarioType
+from utils.json_utils import safe_json_dumps
+from utils.logging_config import configure_logging
+from utils.rate_limiter import Priority, llm_priority_scope
+
+
+MANIFEST_FILE = "manifest.json"
+RESULTS_FILE = "results.jsonl"
+VALID_MODES = ("thesis", "legacy")
+
+
+def load_spec(spec_path: Path) -> Dict[str, Any]:
+    """
+    Lädt und validiert eine Batch-Spezifikation.
+
+    Args:
+        spec_path: Pfad zur JSON-Spezifikation
+
+    Returns:
+        Spezifikation als Dictionary
+    """
+    with open(spec_path, "r", encoding="utf-8") as f:
+        spec = json.load(f)
+
+    if not spec.get("runs"):
+        raise ValueError("Spezifikation enthält keine 'runs'")
+
+    for run in spec["runs"]:
+        ScenarioType(run["scenario_type"])  # ValueError bei unbekanntem Typ
+        for mode in run.get("modes", ["thesis"]):
+            if mode not in VALID_MODES:
+                raise ValueError(f"Unbekannter Modus '{mode}' (erlaubt: {', '.join(VALID_MODES)})")
+    return spec
+
+
+def spec_fingerprint(spec: Dict[str, Any]) -> str:
+    """Kurzer Hash der Spezifikation (erkennt geänderte Specs beim Fortsetzen)."""
+    return hashlib.sha256(json.dumps(spec, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+
+
+def expand_jobs(spec: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Expandiert die Spezifikation in einzelne Szenario-Jobs mit stabilen IDs.
+
+    Die Job-IDs hängen nur von der Spezifikation ab, damit ein fortgesetzter
+    Lauf dieselben IDs erzeugt.
+
+    Returns:
+        Liste von Jobs (picklebar)
+    """
+    jobs = []
+    for run_index, run in enumerate(spec["runs"]):
+        scenario_type = ScenarioType(run["scenario_type"])
+        iterations = int(run.get("iterations", spec.get("iterations", 5)))
+        for mode in run.get("modes", ["thesis"]):
+            for index in range(int(run.get("count", 1))):
+                job_id = f"R{run_index:02d}-{scenario_type.value}-{mode.upper()}-{index + 1:03d}"
+                jobs.append({
+                    "job_id": job_id,
+                    "scenario_id": f"BATCH-{spec_fingerprint(spec)}-{job_id}",
+                    "scenario_type": scenario_type.value,
+                    "mode": mode,
+                    "iterations": iterations
+                })
+    return jobs
+
+
+class BatchManifest:
+    """
+    Manifest eines Batch-Laufs (abgeschlossene und fehlgeschlagene Jobs).
+
+    Wird nach jedem Job atomar neu geschrieben, damit ein Abbruch nie ein
+    halb geschriebenes Manifest hinterlässt.
+    """
+
+    def __init__(self, output_dir: Path, fingerprint: str):
+        self.path = output_dir / MANIFEST_FILE
+        self.fingerprint = fingerprint
+        self.completed: List[str] = []
+        self.failed: Dict[str, str] = {}
+        self.created_at = datetime.now().isoformat()
+
+    @classmethod
+    def load(cls, output_dir: Path, fingerprint: str) -> "BatchManifest":
+        """Lädt ein bestehendes Manifest oder erstellt ein neues."""
+        manifest = cls(output_dir, fingerprint)
+        if manifest.path.exists():
+            with open(manifest.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("spec_fingerprint") != fingerprint:
+                raise ValueError(
+                    f"Manifest in {output_dir} gehört zu einer anderen Spezifikation "
+                    f"({data.get('spec_fingerprint')} != {fingerprint}). Anderes --output-dir verwenden."
+                )
+            manifest.completed = list(data.get("completed", []))
+            manifest.failed = dict(data.get("failed", {}))
+            manifest.created_at = data.get("created_at", manifest.created_at)
+
+        # Jobs, deren Ergebnis bereits geschrieben wurde (Abbruch vor Manifest-Update)
+        results_path = output_dir / RESULTS_FILE
+        if results_path.exists():
+            with open(results_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # Abgeschnittene letzte Zeile
+                    job_id = record.get("job_id")
+                    if record.get("status") == "completed" and job_id and job_id not in manifest.completed:
+                        manifest.completed.append(job_id)
+        return manifest
+
+    def mark_completed(self, job_id: str):
+        """Markiert einen Job als abgeschlossen."""
+        if job_id not in self.completed:
+            self.completed.append(job_id)
+        self.failed.pop(job_id, None)
+        self.save()
+
+    def mark_failed(self, job_id: str, error: str):
+        """Markiert einen Job als fehlgeschlagen (wird beim Fortsetzen wiederholt)."""
+        self.failed[job_id] = error
+        self.save()
+
+    def save(self):
+        """Schreibt das Manifest atomar."""
+        tmp_path = self.path.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "spec_fingerprint": self.fingerprint,
+                "created_at": self.created_at,
+                "updated_at": datetime.now().isoformat(),
+                "completed": self.completed,
+                "failed": self.failed
+            }, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+# ----------------------------------------------------------------------
+# Worker-Prozess
+# ----------------------------------------------------------------------
+
+_WORKER_CONTEXT: Dict[str, Any] = {}
+
+
+def _init_worker(graph_snapshot: Dict[str, Any], speculative_candidates: int, quiet: bool):
+    """
+    Initialisiert einen Worker-Prozess (einmal pro Prozess).
+
+    Args:
+        graph_snapshot: Entitäten/Beziehungen für die Graph-Overlays
+        speculative_candidates: Parallele Draft-Kandidaten pro Inject
+        quiet: Konsolen-Ausgaben der Agenten unterdrücken
+    """
+    if quiet:
+        sys.stdout = open(os.devnull, "w")
+    _WORKER_CONTEXT["graph_snapshot"] = graph_snapshot
+    _WORKER_CONTEXT["speculative_candidates"] = speculative_candidates
+    _WORKER_CONTEXT["workflows"] = {}
+
+
+def _get_worker_workflow(iterations: int):
+    """Gibt den Workflow des Workers für die gegebene Iterationszahl zurück (lazy)."""
+    workflows = _WORKER_CONTEXT["workflows"]
+    if iterations not in workflows:
+        from workflows.scenario_workflow import ScenarioWorkflow
+        from graph_overlay import GraphOverlayClient
+
+        snapshot = _WORKER_CONTEXT["graph_snapshot"]
+        workflows[iterations] = ScenarioWorkflow(
+            neo4j_client=GraphOverlayClient(snapshot["entities"], snapshot["relationships"]),
+            max_iterations=iterations,
+            interactive_mode=False,
+            speculative_candidates=_WORKER_CONTEXT["speculative_candidates"]
+        )
+    return workflows[iterations]
+
+
+def run_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Führt einen einzelnen Szenario-Job aus (im Worker-Prozess).
+
+    Returns:
+        Ergebnis-Record für die JSONL-Datei
+    """
+    from graph_overlay import GraphOverlayClient
+
+    workflow = _get_worker_workflow(job["iterations"])
+    snapshot = _WORKER_CONTEXT["graph_snapshot"]
+    # Frisches Overlay pro Szenario: jedes Szenario startet vom Basis-Zustand
+    workflow.neo4j_client = GraphOverlayClient(snapshot["entities"], snapshot["relationships"])
+
+    start = time.time()
+    # Batch-Läufe stehen beim Rate-Limiter hinter interaktiven Aufrufen an
+    with llm_priority_scope(Priority.BATCH):
+        result = workflow.generate_scenario(
+            scenario_type=ScenarioType(job["scenario_type"]),
+            scenario_id=job["scenario_id"],
+            mode=job["mode"]
+        )
+    duration = time.time() - start
+
+    injects = result.get("injects", [])
+    if not injects and result.get("errors"):
+        # generate_scenario fängt Fehler ab - ohne Injects als fehlgeschlagen werten (Retry beim Fortsetzen)
+        raise RuntimeError("; ".join(str(e) for e in result["errors"][-3:]))
+    current_phase = result.get("current_phase")
+    return {
+        **job,
+        "status": "completed",
+        "finished_at": datetime.now().isoformat(),
+        "duration_seconds": round(duration, 2),
+        "inject_count": len(injects),
+        "final_phase": current_phase.value if hasattr(current_phase, "value") else current_phase,
+        "end_condition": result.get("end_condition"),
+        "errors": result.get("errors", []),
+        "warnings": result.get("warnings", []),
+        "metadata": result.get("metadata", {}),
+        "injects": [inject.model_dump(mode="json") for inject in injects]
+    }
+
+
+# ----------------------------------------------------------------------
+# Orchestrierung
+# ----------------------------------------------------------------------
+
+def _iter_job_results(
+    pending: List[Dict[str, Any]],
+    graph_snapshot: Dict[str, Any],
+    workers: int,
+    speculative_candidates: int,
+    quiet: bool
+) -> Iterator[Tuple[Dict[str, Any], Optional[Dict[str, Any]], Optional[Exception]]]:
+    """
+    Führt die Jobs aus und liefert (Job, Ergebnis-Record, Fehler) in Abschlussreihenfolge.
+
+    Mit einem Worker laufen die Jobs im eigenen Prozess (kein Pool-Overhead,
+    Debugging und Profiling möglich), sonst in einem Prozess-Pool.
+    """
+    if workers <= 1:
+        # Ausgaben nur pro Job unterdrücken - _init_worker würde stdout dauerhaft umlenken
+        _init_worker(graph_snapshot, speculative_candidates, quiet=False)
+        for job in pending:
+            with open(os.devnull, "w") as devnull, \
+                 (contextlib.redirect_stdout(devnull) if quiet else contextlib.nullcontext()):
+                try:
+                    record, error = run_job(job), None
+                except Exception as e:
+                    record, error = None, e
+            yield job, record, error
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(graph_snapshot, speculative_candidates, quiet)
+    ) as executor:
+        futures = {executor.submit(run_job, job): job for job in pending}
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result(), None
+            except Exception as e:
+                yield futures[future], None, e
+
+
+def load_graph_snapshot(template: Optional[str], from_neo4j: bool) -> Dict[str, Any]:
+    """
+    Erstellt den Basis-Snapshot für alle Graph-Overlays.
+
+    Args:
+        template: Name des Infrastructure Templates
+        from_neo4j: Snapshot einmalig aus Neo4j lesen statt aus dem Template
+    """
+    from graph_overlay import GraphOverlayClient
+
+    if from_neo4j:
+        from neo4j_client import Neo4jClient
+        client = Neo4jClient()
+        client.connect()
+        try:
+            return GraphOverlayClient.snapshot_from_neo4j(client)
+        finally:
+            client.close()
+    return GraphOverlayClient.from_template(template or "standard_bank").snapshot()
+
+
+def run_batch(
+    spec: Dict[str, Any],
+    output_dir: Path,
+    workers: int = 2,
+    from_neo4j: bool = False,
+    speculative_candidates: int = 1,
+    quiet: bool = True
+) -> Dict[str, Any]:
+    """
+    Führt alle offenen Jobs der Spezifikation aus.
+
+    Returns:
+        Zusammenfassung (total, skipped, completed, failed)
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest = BatchManifest.load(output_dir, spec_fingerprint(spec))
+    manifest.save()
+
+    jobs = expand_jobs(spec)
+    pending = [job for job in jobs if job["job_id"] not in manifest.completed]
+    summary = {"total": len(jobs), "skipped": len(jobs) - len(pending), "completed": 0, "failed": 0}
+
+    print(f"📋 {len(jobs)} Szenarien in Spezifikation, {summary['skipped']} bereits abgeschlossen, {len(pending)} offen")
+    if not pending:
+        return summary
+
+    graph_snapshot = load_graph_snapshot(spec.get("template"), from_neo4j)
+    print(f"🗺️  Graph-Snapshot: {len(graph_snapshot['entities'])} Entitäten, {len(graph_snapshot['relationships'])} Beziehungen")
+    workers = min(workers, len(pending))
+    print(f"🚀 Starte {workers} Worker-Prozesse..." if workers > 1 else "🚀 Starte im aktuellen Prozess...")
+
+    results_path = output_dir / RESULTS_FILE
+    with open(results_path, "a", encoding="utf-8") as results_file:
+        for job, record, error in _iter_job_results(pending, graph_snapshot, workers, speculative_candidates, quiet):
+            if error is not None:
+                summary["failed"] += 1
+                manifest.mark_failed(job["job_id"], str(error))
+                print(f"❌ {job['job_id']}: {error}")
+                continue
+
+            # Erst Ergebnis schreiben, dann Manifest - so geht bei Abbruch kein Ergebnis verloren
+            results_file.write(safe_json_dumps(record, ensure_ascii=False) + "\n")
+            results_file.flush()
+            manifest.mark_completed(job["job_id"])
+            summary["completed"] += 1
+            print(
+                f"✅ [{summary['skipped'] + summary['completed']}/{len(jobs)}] {job['job_id']}: "
+                f"{record['inject_count']} Injects in {record['duration_seconds']:.1f}s"
+            )
+
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generiert Szenarien headless und parallel über einen Prozess-Pool (fortsetzbar)."
+    )
+    parser.add_argument(
+        "--spec",
+        type=str,
+        required=True,
+        help="Pfad zur JSON-Spezifikation (Szenario-Typen, Anzahl, Iterationen, Modi)"
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=str,
+        default="reports/batch",
+        help="Ausgabeverzeichnis für results.jsonl und manifest.json (Standard: reports/batch)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=2,
+        help="Anzahl Worker-Prozesse (Standard: 2; 1 = im aktuellen Prozess)"
+    )
+    parser.add_argument(
+        "--from-neo4j",
+        action="store_true",
+        help="Graph-Snapshot einmalig aus Neo4j lesen statt aus dem Template der Spezifikation"
+    )
+    parser.add_argument(
+        "--speculative-candidates",
+        type=int,
+        default=1,
+        help="Parallele Draft-Kandidaten pro Inject (Standard: 1 = aus)"
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Detail-Logs pro Workflow-Node (DEBUG) und Konsolen-Ausgaben der Worker anzeigen"
+    )
+
+    args = parser.parse_args()
+    # Im Batch-Betrieb nur Warnungen/Fehler der Agenten, außer mit --verbose
+    configure_logging(level=None if args.verbose else "WARNING", verbose=args.verbose)
+
+    spec = load_spec(Path(args.spec))
+
+    print("=" * 60)
+    print(f"Batch-Generierung: {spec.get('name', Path(args.spec).stem)}")
+    print("=" * 60)
+
+    summary = run_batch(
+        spec=spec,
+        output_dir=Path(args.output_dir),
+        workers=max(1, args.workers),
+        from_neo4j=args.from_neo4j,
+        speculative_candidates=max(1, args.speculative_candidates),
+        quiet=not args.verbose
+    )
+
+    print()
+    print(f"📊 Fertig: {summary['completed']} abgeschlossen, {summary['failed']} fehlgeschlagen, "
+          f"{summary['skipped']} übersprungen (von {summary['total']})")
+    if summary["failed"]:
+        print("   Fehlgeschlagene Szenarien werden beim nächsten Start erneut versucht.")
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
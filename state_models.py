@@ -38,6 +38,8 @@ class ScenarioEndCondition(str, Enum):
     FATAL = "FATAL"  # Fataler Ausgang - System komplett kompromittiert
     VICTORY = "VICTORY"  # Sieg - Bedrohung erfolgreich abgewehrt
     NORMAL_END = "NORMAL_END"  # Normales Ende - Recovery abgeschlossen
+    BUDGET_EXCEEDED = "BUDGET_EXCEEDED"  # Token-/Kosten-Budget des Szenarios erschöpft
+    TIMEOUT = "TIMEOUT"  # Deadline bzw. Node-Timeout erreicht, Teilergebnis
 
 
 class UserDecision(BaseModel):
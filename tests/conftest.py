@@ -5,8 +5,10 @@ Pytest-Konfiguration mit strukturiertem Logging für Backend-Tests.
 import pytest
 import logging
 import sys
+import time
 from pathlib import Path
 from datetime import datetime
+from unittest.mock import patch
 
 # Füge Projekt-Root zum Python-Path hinzu
 project_root = Path(__file__).parent.parent
@@ -101,5 +103,63 @@ def mock_env_vars(monkeypatch):
     monkeypatch.setenv("NEO4J_DATABASE", "neo4j")
 
 
+@pytest.fixture
+def mocked_workflow():
+    """
+    Factory für einen ScenarioWorkflow mit gemockten Agenten (Manager, Intel,
+    Generator, Critic).
+
+    Ohne neo4j_client wird ein In-Memory-Overlay mit SRV-001 verwendet, ohne
+    trace_sink ein MemoryTraceSink; alle weiteren Argumente gehen an
+    ScenarioWorkflow.
+    """
+    # Workflow zuerst importieren (zirkulärer Import agents <-> workflows)
+    from workflows.scenario_workflow import ScenarioWorkflow
+    from workflows.trace_sink import MemoryTraceSink
+    from graph_overlay import GraphOverlayClient
+
+    def factory(neo4j_client=None, **kwargs):
+        if neo4j_client is None:
+            neo4j_client = GraphOverlayClient(
+                entities=[{"id": "SRV-001", "type": "Server", "name": "Server 001", "status": "online"}],
+                relationships=[]
+            )
+        kwargs.setdefault("trace_sink", MemoryTraceSink())
+        with patch("workflows.scenario_workflow.ManagerAgent"), \
+             patch("workflows.scenario_workflow.IntelAgent"), \
+             patch("workflows.scenario_workflow.GeneratorAgent"), \
+             patch("workflows.scenario_workflow.CriticAgent"):
+            return ScenarioWorkflow(neo4j_client=neo4j_client, **kwargs)
+
+    return factory
 
 
+@pytest.fixture
+def reject_first_critic():
+    """
+    Factory für ein validate_inject-Side-Effect, das den ersten Draft der
+    angegebenen inject_ids ablehnt und alle übrigen Drafts akzeptiert.
+
+    Args (der Factory):
+        reject: abzulehnende inject_ids
+        error: Fehlermeldung der Ablehnung
+        failed_check: Prüfung, die bei der Ablehnung fehlschlägt (Feld des ValidationResult)
+        delay: Dauer der Validierung in Sekunden
+    """
+    from state_models import ValidationResult
+
+    def factory(reject=(), error="Draft abgelehnt", failed_check="logical_consistency", delay=0.0):
+        rejected = set()
+
+        def validate_inject(inject, **kwargs):
+            if delay:
+                time.sleep(delay)
+            is_valid = inject.inject_id not in reject or inject.inject_id in rejected
+            rejected.add(inject.inject_id)
+            checks = {"logical_consistency": True, "dora_compliance": True, "causal_validity": True}
+            checks[failed_check] = is_valid
+            return ValidationResult(is_valid=is_valid, errors=[] if is_valid else [error], **checks)
+
+        return validate_inject
+
+    return factory
@@ -0,0 +1,171 @@
+"""
+Tests für Batch-Drafting (mehrere Injects pro Generator-Aufruf).
+
+Testet GeneratorAgent.generate_injects (Parsen der Sequenz, vorgegebene IDs,
+Abbruch beim ersten unbrauchbaren Eintrag) und die Einbindung in den
+Workflow: Drafts werden einzeln vom Critic geprüft, ab der ersten Ablehnung
+wird der Rest der Sequenz verworfen.
+"""
+
+import pytest
+import sys
+import json
+from pathlib import Path
+import logging
+
+# Füge Projekt-Root zum Python-Path hinzu
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from workflows.scenario_workflow import ScenarioWorkflow, GeneratorAgent
+from state_models import (
+    ScenarioType,
+    CrisisPhase,
+    Inject,
+    InjectModality,
+    TechnicalMetadata
+)
+
+logger = logging.getLogger("tests.test_batch_drafting")
+
+
+def _inject(inject_id: str, label: str) -> Inject:
+    return Inject(
+        inject_id=inject_id,
+        time_offset="T+00:30",
+        phase=CrisisPhase.SUSPICIOUS_ACTIVITY,
+        source="Red Team / Attacker",
+        target="Blue Team / SOC",
+        modality=InjectModality.SIEM_ALERT,
+        content=f"{label} für {inject_id} auf SRV-001",
+        technical_metadata=TechnicalMetadata(mitre_id="T1046", affected_assets=["SRV-001"], severity="Low")
+    )
+
+
+@pytest.fixture
+def make_workflow(mocked_workflow, reject_first_critic):
+    """
+    Factory für einen Workflow mit gemockten Agenten (Manager-Plan mit 3 Schritten).
+
+    Args (der Factory):
+        reject: inject_ids, deren erster Draft abgelehnt wird
+    """
+    def factory(max_iterations: int, batch_drafts: int, reject=()) -> ScenarioWorkflow:
+        workflow = mocked_workflow(max_iterations=max_iterations, phase_plan_steps=3, batch_drafts=batch_drafts)
+
+        workflow.manager_agent.create_storyline.side_effect = lambda planned_steps=1, **kwargs: {
+            "next_phase": CrisisPhase.SUSPICIOUS_ACTIVITY,
+            "narrative": "Angreifer erkundet das Netzwerk",
+            "affected_assets": ["SRV-001"],
+            "steps": [{"event": f"Schritt {i + 1}", "assets": ["SRV-001"]} for i in range(planned_steps)]
+        }
+        workflow.intel_agent.get_relevant_ttps.return_value = [
+            {"mitre_id": "T1046", "name": "Network Service Discovery", "technique_id": "T1046"}
+        ]
+        workflow.generator_agent.generate_injects.side_effect = lambda inject_ids, **kwargs: [
+            _inject(inject_id, "Sequenz") for inject_id in inject_ids
+        ]
+        workflow.generator_agent.generate_inject.side_effect = lambda inject_id, **kwargs: _inject(inject_id, "Einzeln")
+        workflow.critic_agent.validate_inject.side_effect = reject_first_critic(
+            reject, error="DORA-Anforderung fehlt", failed_check="dora_compliance"
+        )
+        return workflow
+
+    return factory
+
+
+class TestBatchDrafting:
+    """Test-Klasse für Batch-Drafting im Workflow."""
+
+    def test_batch_follows_phase_plan(self, make_workflow):
+        """Testet, dass Sequenzen die verbleibenden Plan-Schritte abdecken."""
+        workflow = make_workflow(max_iterations=5, batch_drafts=4)
+        result = workflow.generate_scenario(ScenarioType.RANSOMWARE_DOUBLE_EXTORTION, scenario_id="SCEN-BATCH-1", mode="legacy")
+
+        assert [inject.inject_id for inject in result["injects"]] == ["INJ-001", "INJ-002", "INJ-003", "INJ-004", "INJ-005"]
+        calls = workflow.generator_agent.generate_injects.call_args_list
+        # Plan 1: 3 Schritte, Plan 2: die verbleibenden 2 Injects
+        assert [c.kwargs["inject_ids"] for c in calls] == [["INJ-001", "INJ-002", "INJ-003"], ["INJ-004", "INJ-005"]]
+        assert [step["event"] for step in calls[0].kwargs["plan_steps"]] == ["Schritt 1", "Schritt 2", "Schritt 3"]
+        assert workflow.generator_agent.generate_inject.call_count == 0
+        assert workflow.critic_agent.validate_inject.call_count == 5
+        assert result["draft_batch"] is None
+        logger.info("✓ 5 Injects mit 2 Generator-Aufrufen")
+
+    def test_rejection_discards_rest_of_batch(self, make_workflow):
+        """Testet, dass nach einer Ablehnung nur der valide Präfix erhalten bleibt."""
+        workflow = make_workflow(max_iterations=3, batch_drafts=3, reject={"INJ-002"})
+        result = workflow.generate_scenario(ScenarioType.RANSOMWARE_DOUBLE_EXTORTION, scenario_id="SCEN-BATCH-2", mode="legacy")
+
+        # INJ-002 wird einzeln verfeinert; der Sequenz-Draft INJ-003 ist verworfen und
+        # wird neu erzeugt (nur noch ein Plan-Schritt übrig → einzelner Inject)
+        assert [inject.content.split(" für ")[0] for inject in result["injects"]] == ["Sequenz", "Einzeln", "Einzeln"]
+        assert workflow.generator_agent.generate_injects.call_count == 1
+        refine_call, next_call = workflow.generator_agent.generate_inject.call_args_list
+        assert refine_call.kwargs["inject_id"] == "INJ-002"
+        assert refine_call.kwargs["validation_feedback"]["errors"] == ["DORA-Anforderung fehlt"]
+        assert next_call.kwargs["inject_id"] == "INJ-003"
+        assert next_call.kwargs["validation_feedback"] is None
+
+    def test_batch_disabled_by_default(self, make_workflow):
+        """Testet, dass ohne batch_drafts einzeln generiert wird."""
+        workflow = make_workflow(max_iterations=2, batch_drafts=1)
+        workflow.generate_scenario(ScenarioType.RANSOMWARE_DOUBLE_EXTORTION, scenario_id="SCEN-BATCH-3", mode="legacy")
+
+        assert workflow.generator_agent.generate_injects.call_count == 0
+        assert workflow.generator_agent.generate_inject.call_count == 2
+
+
+class TestGenerateInjects:
+    """Test-Klasse für GeneratorAgent.generate_injects."""
+
+    def test_sequence_parsed_with_given_ids(self):
+        """Testet vorgegebene IDs und Abbruch beim ersten unbrauchbaren Eintrag."""
+        entry = {
+            "inject_id": "FALSCH",
+            "time_offset": "T+00:45",
+            "source": "Red Team / Attacker",
+            "target": "Blue Team / SOC",
+            "modality": "SIEM Alert",
+            "content": "Port-Scan gegen SRV-001 aus dem internen Netz erkannt",
+            "technical_metadata": {"mitre_id": "T1046", "affected_assets": ["SRV-001"], "severity": "Low"}
+        }
+        response = json.dumps({"injects": [entry, {**entry, "modality": "Brieftaube"}, entry]})
+
+        agent = GeneratorAgent()
+        agent.llm = FakeListChatModel(responses=[response])
+        injects = agent.generate_injects(
+            scenario_type=ScenarioType.RANSOMWARE_DOUBLE_EXTORTION,
+            phase=CrisisPhase.SUSPICIOUS_ACTIVITY,
+            inject_ids=["INJ-004", "INJ-005", "INJ-006"],
+            time_offsets=["T+02:00", "T+02:30", "T+03:00"],
+            manager_plan={"narrative": "Erkundung"},
+            selected_ttp={"mitre_id": "T1046", "name": "Network Service Discovery"},
+            system_state={"SRV-001": {"status": "online", "entity_type": "Server", "name": "Server 001"}},
+            previous_injects=[],
+            plan_steps=[{"event": "Port-Scan", "assets": ["SRV-001"]}]
+        )
+
+        # Zweiter Eintrag hat eine ungültige Modalität → Sequenz endet davor
+        assert [inject.inject_id for inject in injects] == ["INJ-004"]
+        assert injects[0].time_offset == "T+00:45"
+        assert injects[0].technical_metadata.affected_assets == ["SRV-001"]
+
+    def test_unparsable_response_returns_empty(self):
+        """Testet, dass eine Antwort ohne JSON eine leere Sequenz liefert."""
+        agent = GeneratorAgent()
+        agent.llm = FakeListChatModel(responses=["Keine Ahnung"])
+        injects = agent.generate_injects(
+            scenario_type=ScenarioType.RANSOMWARE_DOUBLE_EXTORTION,
+            phase=CrisisPhase.SUSPICIOUS_ACTIVITY,
+            inject_ids=["INJ-001", "INJ-002"],
+            time_offsets=["T+00:30", "T+01:00"],
+            manager_plan={},
+            selected_ttp={"mitre_id": "T1046"},
+            system_state={},
+            previous_injects=[]
+        )
+        assert injects == []
@@ -0,0 +1,63 @@
+"""
+Tests für den Workflow-Benchmark (scripts/benchmark_workflow.py) und das FakeChatModel.
+
+Führt einen kleinen Benchmark-Lauf ohne Latenz aus und prüft, dass die
+Fake-Antworten den Workflow bis zum Ende tragen.
+"""
+
+import pytest
+import sys
+import json
+from pathlib import Path
+import logging
+
+# Füge Projekt-Root zum Python-Path hinzu
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from langchain_core.prompts import ChatPromptTemplate
+
+from utils.fake_llm import FakeChatModel, llm_seconds
+from scripts.benchmark_workflow import build_synthetic_graph, run_case, compare_results
+
+logger = logging.getLogger("tests.test_benchmark_workflow")
+
+
+class TestBenchmarkWorkflow:
+    """Test-Klasse für Benchmark und Fake-LLM."""
+
+    def test_fake_llm_latency_and_canned_json(self):
+        """Testet simulierte Latenz und Antwort-Vorlage des Generators."""
+        prompt = ChatPromptTemplate.from_messages([("human", "{text}")])
+        chain = prompt | FakeChatModel(agent="generator", latency=0.01)
+        before = llm_seconds()
+        response = chain.invoke({"text": "- TTP: Phishing (T1566)\nAssets: SRV-001, DB-002"})
+
+        data = json.loads(response.content)
+        assert data["technical_metadata"]["mitre_id"] == "T1566"
+        assert data["technical_metadata"]["affected_assets"] == ["SRV-001", "DB-002"]
+        assert llm_seconds() - before == pytest.approx(0.01)
+        assert response.response_metadata["token_usage"]["total_tokens"] > 0
+
+    def test_synthetic_graph_size(self):
+        """Testet, dass der synthetische Graph die gewünschte Asset-Anzahl hat."""
+        graph = build_synthetic_graph(50)
+        assert len(graph["entities"]) == 50
+        ids = {e["id"] for e in graph["entities"]}
+        assert all(r["source"] in ids and r["target"] in ids for r in graph["relationships"])
+
+    def test_run_case_end_to_end(self):
+        """Testet einen vollständigen Benchmark-Lauf mit Node-Statistiken."""
+        case = run_case(graph_size=20, max_iterations=2, repeat=1, latency=0.0, jitter=0.0,
+                        mode="legacy", track_allocations=True)
+
+        assert case["injects"] == 2
+        assert case["injects_per_sec"] > 0
+        for node in ("manager", "intel", "generator", "critic", "state_update"):
+            assert case["nodes"][node]["calls"] >= 2
+            assert "alloc_peak_kib_mean" in case["nodes"][node]
+
+        lines = compare_results({"cases": [case]}, {"meta": {"commit": "abc123"}, "cases": [case]})
+        assert "+0.0%" in lines[1]
+        logger.info(f"✓ Benchmark: {case['injects_per_sec']} Injects/s")
@@ -0,0 +1,99 @@
+"""
+Tests für die Relevanz-Auswahl des Systemzustands (utils/context_selector.py).
+
+Testet, dass kleine Infrastrukturen vollständig bleiben, große auf Fokus,
+Nachbarschaft, betroffene Assets und eine Stichprobe reduziert werden und die
+Prompt-Größe der Agenten mit dem Graph nicht mehr wächst.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+import logging
+
+# Füge Projekt-Root zum Python-Path hinzu
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from scripts.benchmark_workflow import build_synthetic_graph, create_benchmark_workflow
+from state_models import ScenarioType
+from workflows.scenario_workflow import ScenarioWorkflow  # noqa: F401 - vor den Agenten importieren
+from agents.critic_agent import CriticAgent
+from agents.generator_agent import GeneratorAgent
+from agents.manager_agent import ManagerAgent
+from utils.context_selector import focus_assets, select_relevant_assets, status_summary
+
+logger = logging.getLogger("tests.test_context_selector")
+
+
+def _system_state(size: int, compromised=()):
+    """Systemzustand wie im State Check (inkl. Abhängigkeiten) aus dem synthetischen Graph."""
+    graph = build_synthetic_graph(size)
+    state = {
+        entity["id"]: {
+            "status": "compromised" if entity["id"] in compromised else entity["status"],
+            "entity_type": entity["type"],
+            "name": entity["name"],
+            "criticality": entity["criticality"],
+            "dependencies": []
+        }
+        for entity in graph["entities"]
+    }
+    for rel in graph["relationships"]:
+        state[rel["source"]]["dependencies"].append(rel["target"])
+    return state
+
+
+class TestContextSelector:
+    """Test-Klasse für Auswahl, Zusammenfassung und Prompt-Größe."""
+
+    def test_small_state_unchanged(self):
+        """Testet, dass kleine Infrastrukturen vollständig und in Originalreihenfolge bleiben."""
+        state = _system_state(10)
+        assert select_relevant_assets(state, ["DB-0001"]) == list(state)
+
+    def test_large_state_selection(self):
+        """Testet Fokus, Nachbarschaft, betroffene Assets und Obergrenze."""
+        state = _system_state(2000, compromised={"SRV-0500", "DB-0300"})
+        selected = select_relevant_assets(state, ["APP-0007", "UNBEKANNT"], max_assets=30, hops=1, sample_size=5)
+
+        assert len(selected) <= 30
+        assert "APP-0007" in selected
+        assert "SRV-0007" in selected  # RUNS_ON-Nachbar
+        assert "DB-0007" in selected  # USES-Nachbar
+        assert {"SRV-0500", "DB-0300"} <= set(selected)
+        assert "UNBEKANNT" not in selected
+        assert selected == [entity_id for entity_id in state if entity_id in selected]
+
+        summary = status_summary(state, len(selected))
+        assert "Gesamt: 2000 Assets" in summary and "compromised: 2" in summary
+
+    def test_focus_assets(self):
+        """Testet die Fokus-Assets aus Manager-Plan und Inject-Dicts ohne Duplikate."""
+        plan = {"affected_assets": ["SRV-0001"], "steps": [{"event": "x", "assets": ["APP-0002", "SRV-0001"]}]}
+        injects = [{"technical_metadata": {"affected_assets": ["DB-0003"]}}]
+        assert focus_assets(injects, plan, extra=["APP-0009"]) == ["APP-0009", "SRV-0001", "APP-0002", "DB-0003"]
+
+    def test_prompt_size_flat(self):
+        """Testet, dass die Prompt-Länge der Agenten bei wachsender Infrastruktur etwa konstant bleibt."""
+        generator, critic, manager = GeneratorAgent(), CriticAgent(), ManagerAgent()
+        sizes = {}
+        for size in (200, 5000):
+            state = _system_state(size, compromised={"SRV-0010"})
+            sizes[size] = [
+                len(generator._format_system_state(state, ["APP-0003"])),
+                len(critic._format_system_state(state, ["APP-0003"])),
+                len(manager._format_system_state(state))
+            ]
+            assert "SRV-0010" in manager._format_system_state(state)
+        for small, large in zip(sizes[200], sizes[5000]):
+            assert large < small * 1.3
+        logger.info(f"✓ Prompt-Längen (Zeichen): {sizes}")
+
+    def test_workflow_state_has_dependencies(self):
+        """Testet, dass der State Check die Abhängigkeiten für die Nachbarschaft übernimmt."""
+        workflow = create_benchmark_workflow(build_synthetic_graph(100), max_iterations=2, latency=0.0, jitter=0.0, seed=1)
+        result = workflow.generate_scenario(ScenarioType.RANSOMWARE_DOUBLE_EXTORTION, scenario_id="SCEN-CTX-1", mode="legacy")
+        assert result["system_state"]["APP-0001"]["dependencies"] == ["DB-0001"]
+        assert len(result["injects"]) == 2
@@ -0,0 +1,198 @@
+"""
+Tests für Szenario-Deadline und Node-Timeouts (workflows/scenario_workflow.py).
+
+Testet die Rückgabe der bis zur Deadline akzeptierten Injects mit
+End-Bedingung TIMEOUT, den kooperativen Abbruch überfälliger Nodes (auch
+ohne weitere Graph-Writes nach dem Abbruch), den Transaktions-Timeout der
+Neo4j-Abfragen, das Stream-Ende mit Teilergebnis und dass die Agenten einen
+Abbruch weiterreichen statt ihn als Fallback zu verschlucken. Die
+LLM-Latenz kommt vom Fake-LLM.
+"""
+
+import pytest
+import sys
+import threading
+import time
+from pathlib import Path
+import logging
+
+# Füge Projekt-Root zum Python-Path hinzu
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from neo4j import Query
+
+from neo4j_client import _query
+from scripts.benchmark_workflow import build_synthetic_graph, create_benchmark_workflow
+from agents.critic_agent import CriticAgent
+from agents.generator_agent import GeneratorAgent
+from agents.manager_agent import ManagerAgent
+from Compliance.dora import DORAComplianceFramework
+from state_models import (
+    ScenarioType, ScenarioEndCondition, CrisisPhase, Inject, InjectModality, TechnicalMetadata
+)
+from utils.cancellation import OperationCancelled, cancellation_scope
+from utils.fake_llm import FakeChatModel
+
+logger = logging.getLogger("tests.test_deadlines")
+
+
+def _workflow(latency: float, max_iterations: int = 10):
+    return create_benchmark_workflow(
+        build_synthetic_graph(10), max_iterations=max_iterations, latency=latency, jitter=0.0, seed=1
+    )
+
+
+class TestScenarioDeadlines:
+    """Test-Klasse für Deadline, Node-Timeout und Teilergebnisse."""
+
+    def test_deadline_returns_partial_result(self):
+        """Testet, dass nach Ablauf der Deadline die akzeptierten Injects zurückkommen."""
+        workflow = _workflow(latency=0.02)
+        start = time.monotonic()
+        result = workflow.generate_scenario(
+            ScenarioType.RANSOMWARE_DOUBLE_EXTORTION, scenario_id="SCEN-DL-1", mode="legacy", deadline_seconds=0.3
+        )
+        elapsed = time.monotonic() - start
+
+        assert result["end_condition"] == ScenarioEndCondition.TIMEOUT.value
+        assert 0 < len(result["injects"]) < 10
+        inject_ids = [inject.inject_id for inject in result["injects"]]
+        assert len(inject_ids) == len(set(inject_ids))
+        assert elapsed < 2.0
+        assert workflow.deadline_seconds is None
+        logger.info(f"✓ {len(inject_ids)} Injects bis zur Deadline in {elapsed:.2f}s")
+
+    def test_node_timeout_aborts_slow_node(self):
+        """Testet, dass ein überfälliger Node abgebrochen wird und das Szenario endet."""
+        workflow = _workflow(latency=0.5)
+        workflow.node_timeout = 0.05
+        start = time.monotonic()
+        result = workflow.generate_scenario(
+            ScenarioType.RANSOMWARE_DOUBLE_EXTORTION, scenario_id="SCEN-DL-2", mode="legacy"
+        )
+        elapsed = time.monotonic() - start
+
+        assert result["end_condition"] == ScenarioEndCondition.TIMEOUT.value
+        assert result["injects"] == []
+        assert result["metadata"]["deadline_exceeded"].startswith("Node-Timeout: manager")
+        assert elapsed < 0.5
+
+    def test_timed_out_state_update_stops_writing(self):
+        """Testet, dass ein abgebrochener State Update nach dem Timeout nichts mehr in den Graph schreibt."""
+        workflow = _workflow(latency=0.0, max_iterations=3)
+        workflow.node_timeout = 0.3
+        client = workflow.neo4j_client
+        calculate_cascading_impact = client.calculate_cascading_impact
+
+        def slow_impact(*args, **kwargs):
+            time.sleep(0.6)
+            return calculate_cascading_impact(*args, **kwargs)
+
+        client.calculate_cascading_impact = slow_impact
+        result = workflow.generate_scenario(
+            ScenarioType.RANSOMWARE_DOUBLE_EXTORTION, scenario_id="SCEN-DL-5", mode="legacy"
+        )
+        writes_at_return = len(client.writes)
+        time.sleep(0.8)  # abgebrochener Node-Thread läuft aus
+
+        assert result["end_condition"] == ScenarioEndCondition.TIMEOUT.value
+        assert result["injects"] == []
+        assert result["metadata"]["deadline_node"] == "state_update"
+        assert len(client.writes) == writes_at_return
+
+    def test_neo4j_queries_use_remaining_time(self):
+        """Testet den Transaktions-Timeout aus der Frist des Cancel-Scopes."""
+        assert _query("RETURN 1") == "RETURN 1"
+        with cancellation_scope(None, deadline=time.time() + 5):
+            query = _query("RETURN 1")
+            with cancellation_scope(None, deadline=time.time() + 60):
+                nested = _query("RETURN 1")
+        assert isinstance(query, Query) and 0 < query.timeout <= 5
+        assert nested.timeout <= 5
+
+    def test_stream_completes_with_timeout(self):
+        """Testet das complete-Event mit End-Bedingung TIMEOUT im Stream."""
+        workflow = _workflow(latency=0.02)
+        events = list(workflow.stream_scenario(
+            ScenarioType.RANSOMWARE_DOUBLE_EXTORTION, scenario_id="SCEN-DL-3", mode="legacy", deadline_seconds=0.3
+        ))
+
+        complete = events[-1]
+        assert complete["event"] == "complete"
+        assert complete["end_condition"] == ScenarioEndCondition.TIMEOUT.value
+        assert complete["inject_count"] == sum(1 for event in events if event["event"] == "inject")
+        assert complete["inject_count"] < 10
+
+    def test_without_deadline_unchanged(self):
+        """Testet, dass ohne Deadline alle Injects ohne End-Bedingung TIMEOUT entstehen."""
+        workflow = _workflow(latency=0.0, max_iterations=3)
+        result = workflow.generate_scenario(
+            ScenarioType.RANSOMWARE_DOUBLE_EXTORTION, scenario_id="SCEN-DL-4", mode="legacy"
+        )
+        assert len(result["injects"]) == 3
+        assert result["end_condition"] != ScenarioEndCondition.TIMEOUT.value
+        assert "deadline_exceeded" not in result["metadata"]
+
+
+class TestAgentCancellation:
+    """Test-Klasse für abgebrochene Agenten-Aufrufe (kein Fallback-Ergebnis)."""
+
+    SYSTEM_STATE = {"SRV-001": {"name": "Domain Controller", "status": "online", "type": "Server"}}
+
+    @pytest.fixture
+    def cancelled(self):
+        event = threading.Event()
+        event.set()
+        with cancellation_scope(event):
+            yield
+
+    def _inject(self) -> Inject:
+        return Inject(
+            inject_id="INJ-001",
+            time_offset="T+00:30",
+            phase=CrisisPhase.SUSPICIOUS_ACTIVITY,
+            source="Red Team / Attacker",
+            target="Blue Team / SOC",
+            modality=InjectModality.SIEM_ALERT,
+            content="Ungewöhnliche Scan-Aktivität auf SRV-001, das SOC prüft die Incident-Response-Schritte",
+            technical_metadata=TechnicalMetadata(mitre_id="T1046", affected_assets=["SRV-001"], severity="Low")
+        )
+
+    def test_generator_propagates_cancellation(self, cancelled):
+        """Testet, dass Einzel- und Sequenz-Generierung keinen Fallback liefern."""
+        generator = GeneratorAgent()
+        generator.llm = FakeChatModel(agent="generator")
+        ttp = {"name": "Network Service Discovery", "mitre_id": "T1046"}
+        with pytest.raises(OperationCancelled):
+            generator.generate_inject(
+                ScenarioType.RANSOMWARE_DOUBLE_EXTORTION, CrisisPhase.SUSPICIOUS_ACTIVITY, "INJ-001", "T+00:30",
+                {}, ttp, self.SYSTEM_STATE, []
+            )
+        with pytest.raises(OperationCancelled):
+            generator.generate_injects(
+                ScenarioType.RANSOMWARE_DOUBLE_EXTORTION, CrisisPhase.SUSPICIOUS_ACTIVITY, ["INJ-001"], ["T+00:30"],
+                {}, ttp, self.SYSTEM_STATE, []
+            )
+
+    def test_manager_propagates_cancellation(self, cancelled):
+        """Testet, dass der Manager keinen automatischen Phasenübergang liefert."""
+        manager = ManagerAgent()
+        manager.llm = FakeChatModel(agent="manager")
+        with pytest.raises(OperationCancelled):
+            manager.create_storyline(
+                ScenarioType.RANSOMWARE_DOUBLE_EXTORTION, CrisisPhase.NORMAL_OPERATION, 0, self.SYSTEM_STATE
+            )
+
+    def test_critic_and_compliance_propagate_cancellation(self, cancelled):
+        """Testet, dass Critic und DORA-Prüfung den Abbruch nicht als Ergebnis werten."""
+        critic = CriticAgent()
+        critic.llm = FakeChatModel(agent="critic")
+        with pytest.raises(OperationCancelled):
+            critic._llm_validate(self._inject(), [], CrisisPhase.SUSPICIOUS_ACTIVITY, self.SYSTEM_STATE)
+
+        framework = DORAComplianceFramework()
+        framework.llm = FakeChatModel(agent="compliance_dora")
+        with pytest.raises(OperationCancelled):
+            framework.validate_inject(self._inject().content, "SUSPICIOUS_ACTIVITY", {})
@@ -0,0 +1,102 @@
+"""
+Tests für spekulativ vorberechnete Entscheidungs-Zweige im interaktiven Modus.
+
+Testet, dass am Decision-Point für die wahrscheinlichsten Optionen die nächste
+Iteration im Hintergrund vorbereitet wird, der gewählte Zweig beim Fortsetzen
+übernommen und die übrigen verworfen werden. Verwendet Fake-LLMs.
+"""
+
+import pytest
+import sys
+import threading
+from pathlib import Path
+import logging
+
+# Füge Projekt-Root zum Python-Path hinzu
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from scripts.benchmark_workflow import build_synthetic_graph, create_benchmark_workflow
+from state_models import ScenarioType
+
+logger = logging.getLogger("tests.test_decision_branches")
+
+
+def _interactive_workflow(tmp_path, decision_branches: int = 2):
+    return create_benchmark_workflow(
+        build_synthetic_graph(10), max_iterations=4, latency=0.0, jitter=0.0, seed=1,
+        interactive_mode=True,
+        checkpoint_path=str(tmp_path / "sessions.sqlite"),
+        decision_branches=decision_branches
+    )
+
+
+def _decision(paused, option):
+    return {
+        "decision_id": paused["pending_decision"]["decision_id"],
+        "choice_id": option["id"],
+        "decision_type": option.get("type", "general")
+    }
+
+
+class TestDecisionBranches:
+    """Test-Klasse für Start, Übernahme und Verwerfen der Zweige."""
+
+    def test_chosen_branch_is_adopted(self, tmp_path):
+        """Testet, dass der Zweig der gewählten Option die nächste Iteration liefert."""
+        workflow = _interactive_workflow(tmp_path)
+        paused = workflow.generate_scenario(
+            ScenarioType.RANSOMWARE_DOUBLE_EXTORTION, scenario_id="SCEN-BR-1", mode="legacy"
+        )
+        options = paused["pending_decision"]["options"]
+        branches = workflow._decision_branches["SCEN-BR-1"]
+        assert list(branches) == [option["id"] for option in options[:2]]
+
+        chosen = branches[options[1]["id"]]
+        speculative_draft = chosen["future"].result(timeout=10)["generator"]["update"]["draft_inject"]
+        result = workflow.resume_scenario("SCEN-BR-1", _decision(paused, options[1]))
+
+        assert result["injects"][2].inject_id == speculative_draft.inject_id
+        assert result["injects"][2].content == speculative_draft.content
+        assert result["user_decisions"][-1]["choice_id"] == options[1]["id"]
+        assert workflow.branch_stats["committed"] == 1
+        assert workflow.branch_stats["discarded"] >= 1
+        assert workflow.pipeline_stats["adopted"] == 1
+        logger.info(f"✓ Zweig {options[1]['id']} übernommen: {speculative_draft.inject_id}")
+
+    def test_unlikely_choice_runs_normally(self, tmp_path):
+        """Testet eine Option ohne vorberechneten Zweig und die Rangfolge nach Wahlhäufigkeit."""
+        workflow = _interactive_workflow(tmp_path, decision_branches=1)
+        paused = workflow.generate_scenario(
+            ScenarioType.RANSOMWARE_DOUBLE_EXTORTION, scenario_id="SCEN-BR-2", mode="legacy"
+        )
+        options = paused["pending_decision"]["options"]
+        result = workflow.resume_scenario("SCEN-BR-2", _decision(paused, options[-1]))
+
+        assert len(result["injects"]) > 2
+        assert workflow.branch_stats == {"started": 1, "committed": 0, "discarded": 1}
+        assert workflow.pipeline_stats["adopted"] == 0
+        assert workflow._rank_decision_options(options)[0]["id"] == options[-1]["id"]
+
+    def test_branches_disabled(self, tmp_path):
+        """Testet, dass mit decision_branches=0 keine Zweige gestartet werden."""
+        workflow = _interactive_workflow(tmp_path, decision_branches=0)
+        workflow.generate_scenario(ScenarioType.RANSOMWARE_DOUBLE_EXTORTION, scenario_id="SCEN-BR-3", mode="legacy")
+        assert workflow._decision_branches == {}
+        assert workflow.branch_stats["started"] == 0
+
+    def test_concurrent_choices_are_counted(self, tmp_path):
+        """Testet die Wahlhäufigkeit bei gleichzeitigen Entscheidungen mehrerer Sessions."""
+        workflow = _interactive_workflow(tmp_path, decision_branches=0)
+
+        def commit(session: int):
+            for _ in range(200):
+                workflow._commit_decision_branch(f"SCEN-BR-C{session}", "OPT-A")
+
+        threads = [threading.Thread(target=commit, args=(session,)) for session in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert workflow._choice_counts["OPT-A"] == 8 * 200
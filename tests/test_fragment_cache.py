@@ -0,0 +1,119 @@
+"""
+Tests für den Fragment-Cache validierter Inject-Sequenzen (workflows/fragment_cache.py).
+
+Testet Umnummerierung von ID und Zeitversatz, Diversität, LRU-Verdrängung,
+die Beschränkung auf frühe Phasen sowie die Wiederverwendung im Workflow
+(zweites Szenario gegen dieselbe Infrastruktur ohne Generator-Aufrufe).
+"""
+
+import pytest
+import sys
+from pathlib import Path
+import logging
+
+# Füge Projekt-Root zum Python-Path hinzu
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from scripts.benchmark_workflow import build_synthetic_graph, create_benchmark_workflow
+from state_models import (
+    ScenarioType,
+    CrisisPhase,
+    Inject,
+    InjectModality,
+    TechnicalMetadata,
+    ValidationResult
+)
+from workflows.fragment_cache import FragmentCache, parse_time_offset, format_time_offset
+
+logger = logging.getLogger("tests.test_fragment_cache")
+
+VALID = ValidationResult(is_valid=True, logical_consistency=True, dora_compliance=True, causal_validity=True)
+
+
+def _inject(number: int, time_offset: str, content: str = "Ungewöhnliche Anmeldungen am VPN-Gateway") -> Inject:
+    return Inject(
+        inject_id=f"INJ-{number:03d}",
+        time_offset=time_offset,
+        phase=CrisisPhase.NORMAL_OPERATION,
+        source="Blue Team / SOC",
+        target="Management",
+        modality=InjectModality.SIEM_ALERT,
+        content=content,
+        technical_metadata=TechnicalMetadata(mitre_id="T1078", affected_assets=["SRV-001"], severity="Low")
+    )
+
+
+def _key(cache: FragmentCache, previous, phase=CrisisPhase.NORMAL_OPERATION):
+    return cache.key(ScenarioType.RANSOMWARE_DOUBLE_EXTORTION, phase, "thesis:DORA", {"SRV-001": "online"}, previous)
+
+
+class TestFragmentCache:
+    """Test-Klasse für Schlüssel, Umnummerierung, Diversität und LRU."""
+
+    def test_time_offset_roundtrip(self):
+        """Testet das Parsen und Formatieren von Zeitversätzen."""
+        assert parse_time_offset("T+01:30") == 5400
+        assert parse_time_offset("T+00:02:30") == 150
+        assert format_time_offset(5400) == "T+01:30"
+        assert format_time_offset(150) == "T+00:02:30"
+
+    def test_lookup_renumbers_id_and_time(self):
+        """Testet, dass ID und Zeitversatz an das laufende Szenario angepasst werden."""
+        cache = FragmentCache(diversity=0.0, seed=1)
+        first = _inject(1, "T+00:30")
+        cache.store(_key(cache, [first]), _inject(2, "T+01:15", "Zweiter Inject"), VALID, [first])
+
+        # Gleiche Vorgeschichte mit anderer ID/Zeit → gleicher Schlüssel
+        renumbered_first = first.model_copy(update={"inject_id": "INJ-007", "time_offset": "T+02:00"})
+        inject, validation = cache.lookup(_key(cache, [renumbered_first]), "INJ-008", [renumbered_first])
+
+        assert inject.inject_id == "INJ-008"
+        assert inject.time_offset == "T+02:45"
+        assert inject.content == "Zweiter Inject"
+        assert validation.is_valid
+        assert cache.lookup(_key(cache, []), "INJ-001", []) is None
+        assert cache.stats()["hit_ratio"] == 0.5
+
+    def test_diversity_variants_and_eviction(self):
+        """Testet Diversität, Variantenlimit, LRU-Verdrängung und nicht gecachte Phasen."""
+        cache = FragmentCache(max_entries=2, diversity=1.0, max_variants=2)
+        key = _key(cache, [])
+        for content in ("Variante A des Injects", "Variante B des Injects", "Variante C des Injects"):
+            cache.store(key, _inject(1, "T+00:30", content), VALID, [])
+        assert cache.lookup(key, "INJ-001", []) is None
+        assert cache.stats()["diversity_skips"] == 1
+        assert cache.stats()["variants"] == 2
+
+        for content in ("Vorgeschichte X des Szenarios", "Vorgeschichte Y des Szenarios"):
+            previous = [_inject(1, "T+00:30", content)]
+            cache.store(_key(cache, previous), _inject(2, "T+01:00"), VALID, previous)
+        assert cache.stats()["entries"] == 2
+        assert cache.stats()["evictions"] == 1
+        assert _key(cache, [], phase=CrisisPhase.ESCALATION_CRISIS) is None
+
+    def test_workflow_reuses_opening(self):
+        """Testet, dass ein zweites Szenario die validierte Eröffnung ohne Generator übernimmt."""
+        cache = FragmentCache(diversity=0.0, seed=1)
+
+        def run(scenario_id):
+            workflow = create_benchmark_workflow(
+                build_synthetic_graph(10), max_iterations=3, latency=0.0, jitter=0.0, seed=1,
+                fragment_cache=cache
+            )
+            result = workflow.generate_scenario(
+                ScenarioType.RANSOMWARE_DOUBLE_EXTORTION, scenario_id=scenario_id, mode="legacy"
+            )
+            return result, workflow.generator_agent.llm.calls
+
+        first, first_calls = run("SCEN-FRAG-1")
+        assert cache.stats()["stores"] > 0
+        second, second_calls = run("SCEN-FRAG-2")
+
+        assert cache.stats()["hits"] > 0
+        assert second_calls < first_calls
+        assert [inject.inject_id for inject in second["injects"]] == ["INJ-001", "INJ-002", "INJ-003"]
+        offsets = [parse_time_offset(inject.time_offset) for inject in second["injects"]]
+        assert offsets == sorted(offsets)
+        logger.info(f"✓ Generator-Aufrufe: {first_calls} → {second_calls}, {cache.stats()}")
@@ -0,0 +1,155 @@
+"""
+Tests für die Batch-Generierung (scripts/generate_batch.py).
+
+Testet Job-Expansion, Manifest-Fortsetzung und einen vollständigen Lauf
+von run_batch im aktuellen Prozess (workers=1) mit gemockten Agenten.
+"""
+
+import pytest
+import sys
+import json
+from contextlib import ExitStack
+from pathlib import Path
+from unittest.mock import patch
+import logging
+
+# Füge Projekt-Root zum Python-Path hinzu
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from scripts.generate_batch import (
+    BatchManifest,
+    expand_jobs,
+    run_batch,
+    spec_fingerprint,
+    RESULTS_FILE
+)
+from state_models import (
+    ScenarioType,
+    CrisisPhase,
+    Inject,
+    InjectModality,
+    TechnicalMetadata,
+    ValidationResult
+)
+
+logger = logging.getLogger("tests.test_generate_batch")
+
+
+@pytest.fixture
+def spec():
+    return {
+        "template": "minimal_bank",
+        "runs": [
+            {"scenario_type": "RANSOMWARE_DOUBLE_EXTORTION", "count": 2, "iterations": 3, "modes": ["thesis", "legacy"]},
+            {"scenario_type": "DDOS_CRITICAL_FUNCTIONS", "count": 1}
+        ]
+    }
+
+
+def _stub_agents(stack: ExitStack, failing_types=()):
+    """
+    Ersetzt die Agenten des Workflows durch Stubs (ohne LLM).
+
+    Args:
+        failing_types: Szenario-Typen, für die der Generator fehlschlägt
+    """
+    agents = {
+        name: stack.enter_context(patch(f"workflows.scenario_workflow.{name}"))
+        for name in ("ManagerAgent", "IntelAgent", "GeneratorAgent", "CriticAgent")
+    }
+    manager = agents["ManagerAgent"].return_value
+    manager.create_storyline.return_value = {
+        "next_phase": CrisisPhase.SUSPICIOUS_ACTIVITY,
+        "narrative": "Angreifer bewegt sich lateral",
+        "affected_assets": []
+    }
+    agents["IntelAgent"].return_value.get_relevant_ttps.return_value = [
+        {"mitre_id": "T1566", "name": "Phishing", "technique_id": "T1566"}
+    ]
+
+    def generate_inject(**kwargs):
+        if kwargs["scenario_type"] in failing_types:
+            raise RuntimeError("LLM nicht erreichbar")
+        return Inject(
+            inject_id=kwargs["inject_id"],
+            time_offset=kwargs["time_offset"],
+            phase=CrisisPhase.SUSPICIOUS_ACTIVITY,
+            source="Red Team / Attacker",
+            target="Blue Team / SOC",
+            modality=InjectModality.SIEM_ALERT,
+            content=f"Verdächtige Aktivität für {kwargs['inject_id']}",
+            technical_metadata=TechnicalMetadata(mitre_id="T1566", affected_assets=[], severity="Low")
+        )
+
+    agents["GeneratorAgent"].return_value.generate_inject.side_effect = generate_inject
+    agents["CriticAgent"].return_value.validate_inject.return_value = ValidationResult(
+        is_valid=True,
+        logical_consistency=True,
+        dora_compliance=True,
+        causal_validity=True
+    )
+
+
+class TestGenerateBatch:
+    """Test-Klasse für die Batch-Generierung (ohne LLM)."""
+
+    def test_expand_jobs_stable_ids(self, spec):
+        """Testet, dass Job-IDs deterministisch aus der Spezifikation entstehen."""
+        jobs = expand_jobs(spec)
+        assert len(jobs) == 5
+        assert [j["job_id"] for j in jobs] == [j["job_id"] for j in expand_jobs(spec)]
+        assert len({j["scenario_id"] for j in jobs}) == 5
+
+    def test_manifest_resume(self, spec, tmp_path):
+        """Testet, dass abgeschlossene Jobs beim Fortsetzen erkannt werden."""
+        fingerprint = spec_fingerprint(spec)
+        jobs = expand_jobs(spec)
+
+        manifest = BatchManifest.load(tmp_path, fingerprint)
+        manifest.mark_completed(jobs[0]["job_id"])
+        # Ergebnis geschrieben, aber Manifest nicht mehr aktualisiert (Abbruch)
+        with open(tmp_path / RESULTS_FILE, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"job_id": jobs[1]["job_id"], "status": "completed"}) + "\n")
+            f.write(json.dumps({"status": "completed"}) + "\n")  # Record ohne job_id
+            f.write('{"job_id": "abgeschnitten')
+
+        resumed = BatchManifest.load(tmp_path, fingerprint)
+        assert set(resumed.completed) == {jobs[0]["job_id"], jobs[1]["job_id"]}
+
+        with pytest.raises(ValueError):
+            BatchManifest.load(tmp_path, "anderer-hash")
+
+    def test_run_batch_resumes_failed_jobs(self, tmp_path):
+        """Testet einen Lauf mit workers=1, bei dem ein Job fehlschlägt und beim Fortsetzen nachgeholt wird."""
+        spec = {
+            "template": "minimal_bank",
+            "runs": [
+                {"scenario_type": "RANSOMWARE_DOUBLE_EXTORTION", "count": 2, "iterations": 1, "modes": ["legacy"]},
+                {"scenario_type": "DDOS_CRITICAL_FUNCTIONS", "count": 1, "iterations": 1, "modes": ["legacy"]}
+            ]
+        }
+        jobs = expand_jobs(spec)
+        failing_job = jobs[2]["job_id"]
+
+        with ExitStack() as stack:
+            _stub_agents(stack, failing_types={ScenarioType.DDOS_CRITICAL_FUNCTIONS})
+            first = run_batch(spec, tmp_path, workers=1)
+
+        assert first == {"total": 3, "skipped": 0, "completed": 2, "failed": 1}
+        manifest = json.loads((tmp_path / "manifest.json").read_text(encoding="utf-8"))
+        assert list(manifest["failed"]) == [failing_job]
+
+        with ExitStack() as stack:
+            _stub_agents(stack)
+            second = run_batch(spec, tmp_path, workers=1)
+
+        assert second == {"total": 3, "skipped": 2, "completed": 1, "failed": 0}
+        records = [json.loads(line) for line in (tmp_path / RESULTS_FILE).read_text(encoding="utf-8").splitlines()]
+        assert sorted(r["job_id"] for r in records) == sorted(j["job_id"] for j in jobs)
+        assert all(r["inject_count"] == 1 for r in records)
+
+        # Dritter Lauf: nichts mehr offen
+        assert run_batch(spec, tmp_path, workers=1)["skipped"] == 3
+        logger.info(f"✓ Fortsetzung: {first} → {second}")
@@ -0,0 +1,82 @@
+"""
+Tests für das In-Memory Graph-Overlay.
+
+Testet die Neo4j-kompatible Schnittstelle des GraphOverlayClient.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+import logging
+
+# Füge Projekt-Root zum Python-Path hinzu
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from graph_overlay import GraphOverlayClient
+
+logger = logging.getLogger("tests.test_graph_overlay")
+
+
+@pytest.fixture
+def overlay():
+    """Kleines Overlay: SRV-001 ← APP-001 ← DEPT-001 (USES/RUNS_ON)."""
+    return GraphOverlayClient(
+        entities=[
+            {"id": "SRV-001", "type": "Server", "name": "Server 001", "status": "online"},
+            {"id": "APP-001", "type": "Application", "name": "Payment", "status": "online"},
+            {"id": "DB-001", "type": "Database", "name": "Ledger", "status": "online"},
+        ],
+        relationships=[
+            {"source": "SRV-001", "target": "APP-001", "type": "RUNS_ON"},
+            {"source": "APP-001", "target": "DB-001", "type": "USES"},
+        ]
+    )
+
+
+class TestGraphOverlay:
+    """Test-Klasse für GraphOverlayClient."""
+
+    def test_current_state_format(self, overlay):
+        """Testet das Neo4jClient-kompatible Format von get_current_state."""
+        entities = {e["entity_id"]: e for e in overlay.get_current_state()}
+
+        assert set(entities) == {"SRV-001", "APP-001", "DB-001"}
+        assert entities["SRV-001"]["relationships"] == [{"target": "APP-001", "type": "RUNS_ON"}]
+        assert entities["APP-001"]["status"] == "online"
+
+    def test_update_does_not_touch_snapshot(self, overlay):
+        """Testet, dass Schreibzugriffe nur im Overlay landen."""
+        version_before = overlay.get_state_version()
+        overlay.update_entity_status("SRV-001", "compromised", inject_id="INJ-001")
+
+        assert overlay.get_entity_status("SRV-001") == "compromised"
+        assert overlay.get_state_version() != version_before
+        assert overlay.snapshot()["entities"][0]["status"] == "online"
+        assert overlay.writes[-1]["inject_id"] == "INJ-001"
+
+    def test_cascading_impact(self, overlay):
+        """Testet die Kaskadierungsanalyse entlang der Beziehungen."""
+        impact = overlay.calculate_cascading_impact("SRV-001", "compromised", max_depth=3)
+
+        depths = {e["entity_id"]: e["depth"] for e in impact["affected_entities"]}
+        assert depths == {"APP-001": 1, "DB-001": 2}
+        assert impact["max_depth"] == 2
+        assert len(impact["critical_paths"]) == 1
+        assert impact["impact_severity"] in ("Low", "Medium", "High", "Critical")
+
+    def test_fork_is_independent(self, overlay):
+        """Testet, dass Forks sich den Snapshot teilen, aber eigene Änderungen haben."""
+        overlay.update_entity_status("SRV-001", "degraded")
+        forked = overlay.fork()
+        forked.update_entity_status("SRV-001", "offline")
+
+        assert overlay.get_entity_status("SRV-001") == "degraded"
+        assert forked.get_entity_status("SRV-001") == "offline"
+
+    def test_from_template(self):
+        """Testet das Laden eines Infrastructure Templates."""
+        client = GraphOverlayClient.from_template("minimal_bank")
+        assert len(client.get_current_state()) > 0
+
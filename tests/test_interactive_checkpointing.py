@@ -0,0 +1,142 @@
+"""
+Tests für das Checkpointing im interaktiven Modus.
+
+Testet Pausieren am Decision-Point, Fortsetzen ab dem Checkpoint und das
+Wiederaufnehmen einer Session nach einem "Neustart" (neue Workflow-Instanz
+mit derselben SQLite-Datei). Agenten-Nodes werden durch Stubs ersetzt.
+"""
+
+import pytest
+import sys
+from contextlib import ExitStack
+from pathlib import Path
+from unittest.mock import Mock, patch
+import logging
+
+# Füge Projekt-Root zum Python-Path hinzu
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from workflows.scenario_workflow import ScenarioWorkflow
+from workflows.checkpointing import CHECKPOINT_SQLITE_AVAILABLE
+from state_models import (
+    ScenarioType,
+    CrisisPhase,
+    Inject,
+    InjectModality,
+    TechnicalMetadata,
+    ValidationResult
+)
+
+logger = logging.getLogger("tests.test_interactive_checkpointing")
+
+
+def _state_check(self, state):
+    return {"system_state": state.get("system_state") or {"SRV-001": {"status": "online", "criticality": "standard"}}}
+
+
+def _passthrough(self, state):
+    return {}
+
+
+def _generator(self, state):
+    number = len(state["injects"]) + 1
+    return {"draft_inject": Inject(
+        inject_id=f"INJ-{number:03d}",
+        time_offset=f"T+{number:02d}:00",
+        phase=CrisisPhase.SUSPICIOUS_ACTIVITY,
+        source="Red Team / Attacker",
+        target="Blue Team / SOC",
+        modality=InjectModality.SIEM_ALERT,
+        content=f"Verdächtige Aktivität Nummer {number}",
+        technical_metadata=TechnicalMetadata(mitre_id="T1566", affected_assets=["SRV-001"], severity="Low")
+    )}
+
+
+def _critic(self, state):
+    return {"validation_result": ValidationResult(
+        is_valid=True, logical_consistency=True, dora_compliance=True, causal_validity=True
+    )}
+
+
+def _state_update(self, state):
+    return {"injects": state["injects"] + [state["draft_inject"]], "iteration": state["iteration"] + 1}
+
+
+NODE_STUBS = {
+    "_state_check_node": _state_check,
+    "_manager_node": _passthrough,
+    "_intel_node": _passthrough,
+    "_action_selection_node": _passthrough,
+    "_generator_node": _generator,
+    "_critic_node": _critic,
+    "_state_update_node": _state_update,
+}
+
+
+def _make_workflow(checkpoint_path: str) -> ScenarioWorkflow:
+    """Erstellt einen interaktiven Workflow mit Stub-Nodes."""
+    with ExitStack() as stack:
+        for agent in ("ManagerAgent", "IntelAgent", "GeneratorAgent", "CriticAgent"):
+            stack.enter_context(patch(f"workflows.scenario_workflow.{agent}"))
+        for name, stub in NODE_STUBS.items():
+            stack.enter_context(patch.object(ScenarioWorkflow, name, stub))
+        return ScenarioWorkflow(
+            neo4j_client=Mock(),
+            max_iterations=4,
+            interactive_mode=True,
+            checkpoint_path=checkpoint_path
+        )
+
+
+class TestInteractiveCheckpointing:
+    """Test-Klasse für Checkpointing im interaktiven Modus."""
+
+    def test_pauses_at_decision_point(self, tmp_path):
+        """Testet, dass der Workflow am ersten Decision-Point pausiert."""
+        workflow = _make_workflow(str(tmp_path / "sessions.sqlite"))
+
+        result = workflow.generate_scenario(ScenarioType.RANSOMWARE_DOUBLE_EXTORTION, scenario_id="SCEN-CKPT-1")
+
+        assert result["pending_decision"]["required"]
+        assert len(result["injects"]) == 2
+        assert workflow.get_paused_session("SCEN-CKPT-1") is not None
+        logger.info(f"✓ Pausiert bei {result['pending_decision']['decision_id']}")
+
+    def test_resume_applies_decision(self, tmp_path):
+        """Testet das Fortsetzen ab dem Checkpoint mit angewendeter Entscheidung."""
+        workflow = _make_workflow(str(tmp_path / "sessions.sqlite"))
+        paused = workflow.generate_scenario(ScenarioType.RANSOMWARE_DOUBLE_EXTORTION, scenario_id="SCEN-CKPT-2")
+        option = paused["pending_decision"]["options"][0]
+
+        result = workflow.resume_scenario("SCEN-CKPT-2", {
+            "decision_id": paused["pending_decision"]["decision_id"],
+            "choice_id": option["id"],
+            "decision_type": option.get("type", "general")
+        })
+
+        assert len(result["injects"]) > 2
+        assert result["user_decisions"][-1]["choice_id"] == option["id"]
+        assert isinstance(result["injects"][0], Inject)
+
+    @pytest.mark.skipif(not CHECKPOINT_SQLITE_AVAILABLE, reason="langgraph-checkpoint-sqlite nicht installiert")
+    def test_session_survives_restart(self, tmp_path):
+        """Testet, dass eine pausierte Session in einer neuen Workflow-Instanz fortsetzbar ist."""
+        checkpoint_path = str(tmp_path / "sessions.sqlite")
+        paused = _make_workflow(checkpoint_path).generate_scenario(
+            ScenarioType.RANSOMWARE_DOUBLE_EXTORTION, scenario_id="SCEN-CKPT-3"
+        )
+
+        restarted = _make_workflow(checkpoint_path)
+        session = restarted.get_paused_session("SCEN-CKPT-3")
+
+        assert session is not None
+        assert session["pending_decision"]["decision_id"] == paused["pending_decision"]["decision_id"]
+        assert session["current_phase"] == CrisisPhase.NORMAL_OPERATION
+
+    def test_resume_without_session_raises(self, tmp_path):
+        """Testet die Fehlermeldung bei unbekannter Session."""
+        workflow = _make_workflow(str(tmp_path / "sessions.sqlite"))
+        with pytest.raises(ValueError):
+            workflow.resume_scenario("SCEN-UNBEKANNT", {"choice_id": "x"})
@@ -0,0 +1,137 @@
+"""
+Tests für die persistente Job-Queue (workflows/job_queue.py).
+
+Testet Abarbeitung mit Fortschritt, Stornieren wartender und laufender Jobs,
+das Überleben eines Neustarts (SQLite) sowie den API-Ablauf
+POST /api/scenario/jobs → GET /api/scenario/jobs/{id} mit Fake-LLM-Workflows.
+"""
+
+import pytest
+import sys
+import threading
+import time
+from pathlib import Path
+import logging
+
+# Füge Projekt-Root zum Python-Path hinzu
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from fastapi.testclient import TestClient
+
+import api_server
+from scripts.benchmark_workflow import build_synthetic_graph, create_benchmark_workflow
+from workflows.job_queue import ScenarioJobQueue, JOB_QUEUED, JOB_RUNNING, JOB_COMPLETED, JOB_CANCELLED, FINAL_STATUSES
+from workflows.workflow_pool import WorkflowPool
+
+logger = logging.getLogger("tests.test_job_queue")
+
+
+def _wait_for(queue: ScenarioJobQueue, job_id: str, statuses=FINAL_STATUSES, timeout: float = 10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = queue.get(job_id)
+        if job["status"] in statuses:
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"Job {job_id} nicht in {statuses}: {queue.get(job_id)}")
+
+
+def _counting_runner(job, report_progress, cancel_event):
+    for done in range(1, job["request"]["num_injects"] + 1):
+        report_progress(done)
+    return {"injects": job["request"]["num_injects"]}
+
+
+class TestScenarioJobQueue:
+    """Test-Klasse für Abarbeitung, Abbruch und Persistenz."""
+
+    def test_job_completes_with_progress(self, tmp_path):
+        """Testet Status, Fortschritt und Ergebnis eines abgeschlossenen Jobs."""
+        queue = ScenarioJobQueue(_counting_runner, path=str(tmp_path / "jobs.sqlite"), workers=2)
+        queue.start()
+        try:
+            job_id = queue.submit({"num_injects": 3}, total=3)
+            job = _wait_for(queue, job_id)
+        finally:
+            queue.stop(timeout=5)
+
+        assert job["status"] == JOB_COMPLETED
+        assert job["progress"] == {"done": 3, "total": 3}
+        assert job["result"] == {"injects": 3}
+        assert queue.stats()["jobs"] == {JOB_COMPLETED: 1}
+
+    def test_cancel_queued_and_running(self, tmp_path):
+        """Testet Stornieren eines wartenden und Abbruch eines laufenden Jobs."""
+        started = threading.Event()
+
+        def blocking_runner(job, report_progress, cancel_event):
+            started.set()
+            cancel_event.wait(5)
+            return {"injects": 0}
+
+        queue = ScenarioJobQueue(blocking_runner, path=str(tmp_path / "jobs.sqlite"), workers=1)
+        queue.start()
+        try:
+            running_id = queue.submit({"num_injects": 1})
+            queued_id = queue.submit({"num_injects": 1})
+            assert started.wait(5)
+            assert queue.cancel(queued_id) == JOB_CANCELLED
+            assert queue.cancel(running_id) == "cancelling"
+            assert _wait_for(queue, running_id)["status"] == JOB_CANCELLED
+            assert queue.get(queued_id)["started_at"] is None
+            assert queue.cancel("JOB-UNBEKANNT") is None
+        finally:
+            queue.stop(timeout=5)
+
+    def test_jobs_survive_restart(self, tmp_path):
+        """Testet, dass wartende und unterbrochene Jobs nach einem Neustart ausgeführt werden."""
+        path = str(tmp_path / "jobs.sqlite")
+        first = ScenarioJobQueue(_counting_runner, path=path)
+        queued_id = first.submit({"num_injects": 1}, total=1)
+        interrupted_id = first.submit({"num_injects": 2}, total=2)
+        first._update(interrupted_id, status=JOB_RUNNING, progress_done=1)
+
+        second = ScenarioJobQueue(_counting_runner, path=path, workers=1)
+        assert second.get(interrupted_id)["status"] == JOB_QUEUED
+        second.start()
+        try:
+            assert _wait_for(second, queued_id)["status"] == JOB_COMPLETED
+            assert _wait_for(second, interrupted_id)["progress"]["done"] == 2
+        finally:
+            second.stop(timeout=5)
+
+
+class TestScenarioJobApi:
+    """Test-Klasse für die Job-Endpunkte der API."""
+
+    def test_submit_and_poll_job(self, tmp_path, monkeypatch):
+        """Testet Einreihen, Abfragen und Ergebnis eines Jobs über die API."""
+        pool = WorkflowPool(lambda *key: create_benchmark_workflow(
+            build_synthetic_graph(10), max_iterations=10, latency=0.0, jitter=0.0, seed=1
+        ))
+        queue = ScenarioJobQueue(api_server.run_scenario_job, path=str(tmp_path / "jobs.sqlite"), workers=1)
+        monkeypatch.setattr(api_server, "workflow_pool", pool)
+        monkeypatch.setattr(api_server, "job_queue", queue)
+        # Thesis-Modus schreibt sonst ins Critic-Audit-Log des Repos
+        monkeypatch.setattr("agents.critic_agent.CriticAgent._log_critic_decision", lambda *args, **kwargs: None)
+        queue.start()
+        client = TestClient(api_server.app)
+        try:
+            response = client.post("/api/scenario/jobs", json={"scenario_type": "ransomware", "num_injects": 2})
+            assert response.status_code == 202
+            job_id = response.json()["job_id"]
+
+            _wait_for(queue, job_id)
+            response = client.get(f"/api/scenario/jobs/{job_id}")
+        finally:
+            queue.stop(timeout=5)
+
+        data = response.json()
+        assert data["status"] == JOB_COMPLETED
+        assert data["progress"] == {"done": 2, "total": 2}
+        assert len(data["result"]["injects"]) == 2
+        assert client.get("/api/scenario/jobs/JOB-UNBEKANNT").status_code == 404
+        assert client.post("/api/scenario/jobs", json={"scenario_type": "unbekannt"}).status_code == 400
+        logger.info(f"✓ Job {job_id}: {data['result']['scenario_id']}")
@@ -0,0 +1,97 @@
+"""
+Tests für den persistenten LLM-Antwort-Cache (utils/llm_cache.py).
+
+Testet Treffer bei identischem Prompt, die Freischaltung pro Agent,
+Schlüssel mit Temperatur, LRU-Verdrängung, Persistenz über Instanzen
+hinweg und Treffer ohne Token-Nutzung. Als "echtes" Modell dient das
+Fake-LLM des Projekts.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+import logging
+
+# Füge Projekt-Root zum Python-Path hinzu
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.prompts import ChatPromptTemplate
+
+from utils.fake_llm import FakeChatModel
+from utils.llm_cache import LLMResponseCache, CachingChatModel
+from utils.llm_recorder import LLMRecorder, wrap_llm
+
+logger = logging.getLogger("tests.test_llm_cache")
+
+PROMPT = ChatPromptTemplate.from_messages([("system", "Du bist ein Test."), ("human", "Frage {number}")])
+
+
+def _chain(cache, agent="critic", responses=("erste", "zweite", "dritte")):
+    return PROMPT | wrap_llm(FakeListChatModel(responses=list(responses)), agent, LLMRecorder("off"), cache)
+
+
+def _tempered_chain(cache, response, temperature):
+    model = FakeChatModel(agent="critic", temperature=temperature, responder=lambda prompt: response)
+    return PROMPT | wrap_llm(model, "critic", LLMRecorder("off"), cache)
+
+
+class TestLLMResponseCache:
+    """Test-Klasse für Cache-Treffer, Freischaltung, LRU und Persistenz."""
+
+    def test_identical_prompt_hits_cache(self, tmp_path):
+        """Testet, dass ein wiederholter Prompt aus dem Cache beantwortet wird."""
+        cache = LLMResponseCache(str(tmp_path / "cache.sqlite"))
+        chain = _chain(cache)
+
+        assert [chain.invoke({"number": n}).content for n in (1, 1, 2)] == ["erste", "erste", "zweite"]
+        assert chain.invoke({"number": 1}).response_metadata["cached"] is True
+        stats = cache.stats()
+        assert stats["agents"]["critic"] == {"hits": 2, "misses": 2, "stores": 2, "evictions": 0, "hit_ratio": 0.5}
+        assert stats["entries"] == 2
+
+    def test_opt_in_per_agent(self, tmp_path):
+        """Testet, dass nur freigeschaltete Agenten (Präfix) gecacht werden."""
+        cache = LLMResponseCache(str(tmp_path / "cache.sqlite"))
+        model = FakeListChatModel(responses=["a"])
+
+        assert wrap_llm(model, "generator", LLMRecorder("off"), cache) is model
+        assert isinstance(wrap_llm(FakeListChatModel(responses=["a"]), "compliance_dora", LLMRecorder("off"), cache), CachingChatModel)
+        generator = _chain(cache, agent="generator")
+        assert [generator.invoke({"number": 1}).content for _ in range(2)] == ["erste", "zweite"]
+
+    def test_temperature_is_part_of_key(self, tmp_path):
+        """Testet, dass unterschiedliche Temperaturen getrennt gecacht werden."""
+        cache = LLMResponseCache(str(tmp_path / "cache.sqlite"))
+        assert _tempered_chain(cache, "kalt", 0.0).invoke({"number": 1}).content == "kalt"
+        assert _tempered_chain(cache, "warm", 0.7).invoke({"number": 1}).content == "warm"
+        assert _tempered_chain(cache, "neu", 0.0).invoke({"number": 1}).content == "kalt"
+
+    def test_lru_eviction_and_persistence(self, tmp_path):
+        """Testet LRU-Verdrängung und Treffer in einer neuen Instanz (Neustart)."""
+        path = str(tmp_path / "cache.sqlite")
+        cache = LLMResponseCache(path, max_entries=2)
+        cache.put("a", "critic", None, "A", {})
+        cache.put("b", "critic", None, "B", {})
+        assert cache.get("a", "critic")["response"] == "A"  # a zuletzt genutzt
+        cache.put("c", "critic", None, "C", {})
+
+        restarted = LLMResponseCache(path, max_entries=2)
+        assert restarted.get("b", "critic") is None
+        assert restarted.get("a", "critic")["response"] == "A"
+        assert restarted.get("c", "critic")["response"] == "C"
+        assert cache.stats()["agents"]["critic"]["evictions"] == 1
+
+    def test_hits_report_no_token_usage(self, tmp_path):
+        """Testet, dass Treffer keine Token-Nutzung melden (keine Kosten)."""
+        cache = LLMResponseCache(str(tmp_path / "cache.sqlite"))
+        chain = PROMPT | wrap_llm(FakeChatModel(agent="critic"), "critic", LLMRecorder("off"), cache)
+
+        first = chain.invoke({"number": 1})
+        second = chain.invoke({"number": 1})
+        assert first.response_metadata.get("token_usage")
+        assert second.content == first.content
+        assert "token_usage" not in second.response_metadata
+        logger.info(f"✓ Cache-Statistik: {cache.stats()}")
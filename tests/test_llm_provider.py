@@ -0,0 +1,102 @@
+"""
+Tests für die Provider-Registry der Chat-Modelle (utils/llm_provider.py).
+
+Testet die Auswahl per Umgebung (global und pro Agent), den OpenAI-kompatiblen
+Provider, die Latenz-Verteilungen des Fake-Providers sowie einen kompletten
+Workflow-Lauf ohne OpenAI-Key mit dem Fake-Provider.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+import logging
+import statistics
+
+# Füge Projekt-Root zum Python-Path hinzu
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from langchain_openai import ChatOpenAI
+
+from graph_overlay import GraphOverlayClient
+from scripts.benchmark_workflow import build_synthetic_graph
+from state_models import ScenarioType
+from utils.fake_llm import FakeChatModel
+from utils.llm_provider import create_chat_model, available_providers, register_provider
+from utils.llm_recorder import LLMRecorder, set_recorder
+from workflows.scenario_workflow import ScenarioWorkflow
+
+logger = logging.getLogger("tests.test_llm_provider")
+
+
+@pytest.fixture(autouse=True)
+def recorder_off():
+    """Record/Replay aus, damit die Modelle nicht eingehüllt werden."""
+    set_recorder(LLMRecorder("off"))
+    yield
+    set_recorder(None)
+
+
+class TestLLMProvider:
+    """Test-Klasse für Provider-Auswahl, Fake-Latenzen und Offline-Workflow."""
+
+    def test_provider_selection(self, monkeypatch):
+        """Testet globalen Provider, Überschreibung pro Agent und unbekannte Provider."""
+        monkeypatch.setenv("LLM_PROVIDER", "fake")
+        monkeypatch.setenv("LLM_PROVIDER_CRITIC", "openai")
+        monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+
+        assert {"openai", "openai-compatible", "fake"} <= set(available_providers())
+        generator = create_chat_model("generator", temperature=0.8)
+        assert isinstance(generator, FakeChatModel)
+        assert generator.temperature == 0.8
+        assert isinstance(create_chat_model("critic"), ChatOpenAI)
+        with pytest.raises(ValueError):
+            create_chat_model("manager", provider="unbekannt")
+
+        register_provider("test-echo", lambda agent, model, temperature: FakeChatModel(agent=agent, responder=lambda prompt: model))
+        assert create_chat_model("manager", model_name="echo-1", provider="test-echo").invoke("Hallo").content == "echo-1"
+
+    def test_openai_compatible(self, monkeypatch):
+        """Testet den OpenAI-kompatiblen Provider (Basis-URL Pflicht, Modell überschreibbar)."""
+        monkeypatch.delenv("LLM_BASE_URL", raising=False)
+        with pytest.raises(ValueError):
+            create_chat_model("critic", provider="openai-compatible")
+
+        monkeypatch.setenv("LLM_BASE_URL", "http://localhost:8000/v1")
+        monkeypatch.setenv("LLM_MODEL", "llama-local")
+        llm = create_chat_model("critic", provider="openai-compatible")
+        assert isinstance(llm, ChatOpenAI)
+        assert llm.model_name == "llama-local"
+        assert llm.openai_api_base == "http://localhost:8000/v1"
+
+    @pytest.mark.parametrize("distribution", ["normal", "lognormal", "exponential"])
+    def test_fake_latency_distributions(self, distribution):
+        """Testet, dass die Latenz-Verteilungen den konfigurierten Mittelwert einhalten."""
+        model = FakeChatModel(latency=0.1, jitter=0.05, distribution=distribution, seed=7)
+        samples = [model._sample_latency() for _ in range(2000)]
+        assert min(samples) >= 0.0
+        assert statistics.mean(samples) == pytest.approx(0.1, rel=0.1)
+        if distribution == "lognormal":
+            assert statistics.stdev(samples) == pytest.approx(0.05, rel=0.2)
+
+    def test_workflow_runs_offline(self, monkeypatch):
+        """Testet einen Workflow-Lauf ausschließlich mit dem Fake-Provider (kein OpenAI-Key)."""
+        monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+        monkeypatch.setenv("LLM_PROVIDER", "fake")
+        graph = build_synthetic_graph(10)
+        workflow = ScenarioWorkflow(
+            neo4j_client=GraphOverlayClient(graph["entities"], graph["relationships"]),
+            max_iterations=2
+        )
+        workflow.intel_agent.collection = None
+
+        result = workflow.generate_scenario(ScenarioType.RANSOMWARE_DOUBLE_EXTORTION, scenario_id="SCEN-FAKE-1", mode="legacy")
+        assert len(result["injects"]) == 2
+        assert workflow.generator_agent.llm.calls > 0
+        assert all(
+            isinstance(framework.llm, FakeChatModel)
+            for framework in workflow.critic_agent.compliance_frameworks.values() if hasattr(framework, "llm")
+        )
+        logger.info(f"✓ Offline-Lauf: {[inject.inject_id for inject in result['injects']]}")
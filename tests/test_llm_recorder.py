@@ -0,0 +1,121 @@
+"""
+Tests für Record & Replay von LLM-Aufrufen.
+
+Testet Aufzeichnung pro Szenario, Replay ohne echtes Modell (identische
+Prompts in Aufnahme-Reihenfolge, fehlende Aufzeichnungen) und die
+Einbindung in den GeneratorAgent. Als "echtes" Modell dient ein
+FakeListChatModel aus langchain_core.
+"""
+
+import pytest
+import sys
+import gzip
+import json
+from pathlib import Path
+from unittest.mock import patch
+import logging
+
+# Füge Projekt-Root zum Python-Path hinzu
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.prompts import ChatPromptTemplate
+
+from utils.llm_recorder import LLMRecorder, ReplayMiss, llm_scenario_scope, wrap_llm
+from state_models import ScenarioType, CrisisPhase
+
+logger = logging.getLogger("tests.test_llm_recorder")
+
+PROMPT = ChatPromptTemplate.from_messages([("system", "Du bist ein Test."), ("human", "Frage {number}")])
+
+
+class _BrokenChatModel(FakeListChatModel):
+    """Modell, das jeden Aufruf ablehnt (simuliert fehlendes Netzwerk)."""
+
+    def _call(self, *args, **kwargs):
+        raise AssertionError("Replay darf das Modell nicht aufrufen")
+
+
+def _offline_model() -> _BrokenChatModel:
+    return _BrokenChatModel(responses=["unbenutzt"])
+
+
+class TestLLMRecorder:
+    """Test-Klasse für LLMRecorder und RecordingChatModel."""
+
+    def test_off_mode_returns_model_unchanged(self, tmp_path):
+        """Testet, dass im Modus off nichts eingehüllt wird."""
+        model = FakeListChatModel(responses=["a"])
+        assert wrap_llm(model, "manager", LLMRecorder("off", str(tmp_path))) is model
+
+    def test_record_then_replay(self, tmp_path):
+        """Testet Aufnahme pro Szenario und Replay in Aufnahme-Reihenfolge."""
+        recorder = LLMRecorder("record", str(tmp_path))
+        chain = PROMPT | wrap_llm(FakeListChatModel(responses=["erste", "zweite", "dritte"]), "critic", recorder)
+        with llm_scenario_scope("SCEN-REC"):
+            assert [chain.invoke({"number": n}).content for n in (1, 1, 2)] == ["erste", "zweite", "dritte"]
+
+        archive = tmp_path / "SCEN-REC.jsonl.gz"
+        with gzip.open(archive, "rt", encoding="utf-8") as f:
+            entries = [json.loads(line) for line in f]
+        assert [e["agent"] for e in entries] == ["critic"] * 3
+        assert entries[0]["prompt"][1] == {"role": "human", "content": "Frage 1"}
+        assert entries[0]["key"] == entries[1]["key"] != entries[2]["key"]
+
+        replayer = LLMRecorder("replay", str(tmp_path))
+        chain = PROMPT | wrap_llm(_offline_model(), "critic", replayer)
+        # Identischer Prompt: Antworten in Aufnahme-Reihenfolge, danach die letzte wiederholt
+        assert [chain.invoke({"number": n}).content for n in (2, 1, 1, 1)] == ["dritte", "erste", "zweite", "zweite"]
+        assert replayer.stats == {"recorded": 0, "replayed": 4, "misses": 0}
+
+        with pytest.raises(ReplayMiss):
+            chain.invoke({"number": 3})
+        assert replayer.stats["misses"] == 1
+
+    def test_replay_latency(self, tmp_path):
+        """Testet die simulierte Latenz (Faktor auf die aufgezeichnete Latenz)."""
+        recorder = LLMRecorder("record", str(tmp_path))
+        (PROMPT | wrap_llm(FakeListChatModel(responses=["a"]), "manager", recorder)).invoke({"number": 1})
+
+        replayer = LLMRecorder("replay", str(tmp_path), replay_latency=2.0)
+        entry = replayer.archive.lookup(next(iter(replayer.archive._load_unlocked())))
+        replayer.archive._cursors.clear()
+        with patch("utils.llm_recorder.time.sleep") as sleep:
+            (PROMPT | wrap_llm(_offline_model(), "manager", replayer)).invoke({"number": 1})
+        sleep.assert_called_once_with(entry["latency"] * 2.0)
+
+    def test_generator_agent_replays_offline(self, tmp_path):
+        """Testet, dass ein aufgezeichneter Generator-Aufruf offline identisch erneut entsteht."""
+        from workflows.scenario_workflow import GeneratorAgent  # Vermeidet den zirkulären Import agents → workflows
+
+        response = json.dumps({
+            "time_offset": "T+00:30",
+            "source": "Red Team / Attacker",
+            "target": "Blue Team / SOC",
+            "modality": "SIEM Alert",
+            "content": "Verdächtige Anmeldung am Server SRV-001 erkannt",
+            "technical_metadata": {"mitre_id": "T1078", "affected_assets": ["SRV-001"], "severity": "Medium"}
+        })
+        kwargs = {
+            "scenario_type": ScenarioType.RANSOMWARE_DOUBLE_EXTORTION,
+            "phase": CrisisPhase.SUSPICIOUS_ACTIVITY,
+            "inject_id": "INJ-001",
+            "time_offset": "T+00:30",
+            "manager_plan": {"narrative": "Angreifer meldet sich an"},
+            "selected_ttp": {"mitre_id": "T1078", "name": "Valid Accounts"},
+            "system_state": {"SRV-001": {"status": "online", "entity_type": "Server", "name": "Server 001"}},
+            "previous_injects": []
+        }
+
+        agent = GeneratorAgent()
+        agent.llm = wrap_llm(FakeListChatModel(responses=[response]), "generator", LLMRecorder("record", str(tmp_path)))
+        recorded = agent.generate_inject(**kwargs)
+
+        agent.llm = wrap_llm(_offline_model(), "generator", LLMRecorder("replay", str(tmp_path)))
+        replayed = agent.generate_inject(**kwargs)
+
+        assert replayed.model_dump(exclude={"created_at"}) == recorded.model_dump(exclude={"created_at"})
+        assert replayed.content == "Verdächtige Anmeldung am Server SRV-001 erkannt"
+        logger.info("✓ Generator-Aufruf offline reproduziert")
@@ -0,0 +1,89 @@
+"""
+Tests für die Logging-Konfiguration (utils/logging_config.py).
+
+Testet den JSON-Formatter mit Szenario-/Node-Kontext, Levels pro Modul
+(LOG_LEVELS) und den Verbose-Schalter für die Detail-Ausgabe pro Node.
+"""
+
+import io
+import json
+import pytest
+import sys
+from pathlib import Path
+import logging
+
+# Füge Projekt-Root zum Python-Path hinzu
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from scripts.benchmark_workflow import build_synthetic_graph, create_benchmark_workflow
+from state_models import ScenarioType
+from utils.llm_recorder import llm_scenario_scope
+from utils.token_usage import llm_node_scope
+from utils.logging_config import configure_logging, set_verbose, VERBOSE_LOGGERS
+
+logger = logging.getLogger("tests.test_logging_config")
+
+_TOUCHED_LOGGERS = ("", *VERBOSE_LOGGERS, "agents.critic_agent")
+
+
+@pytest.fixture(autouse=True)
+def restore_logging():
+    """Stellt Levels und Handler nach jedem Test wieder her (conftest konfiguriert DEBUG)."""
+    levels = {name: logging.getLogger(name).level for name in _TOUCHED_LOGGERS}
+    handlers = list(logging.getLogger().handlers)
+    yield
+    root = logging.getLogger()
+    for handler in [h for h in root.handlers if h not in handlers]:
+        root.removeHandler(handler)
+    for name, level in levels.items():
+        logging.getLogger(name).setLevel(level)
+
+
+class TestLoggingConfig:
+    """Test-Klasse für Formatter, Modul-Levels und Verbose-Schalter."""
+
+    def test_json_formatter_with_context(self):
+        """Testet JSON-Zeilen mit scenario_id/node aus dem Kontext und Zusatzfeldern."""
+        stream = io.StringIO()
+        configure_logging(level="INFO", json_format=True, verbose=False, stream=stream)
+
+        with llm_scenario_scope("SCEN-LOG-1"), llm_node_scope("critic"):
+            logging.getLogger("workflows.test").info("Inject %s validiert", "INJ-001", extra={"inject_id": "INJ-001"})
+        logging.getLogger("workflows.test").info("ohne Kontext")
+
+        entries = [json.loads(line) for line in stream.getvalue().splitlines()]
+        assert entries[0]["message"] == "Inject INJ-001 validiert"
+        assert entries[0]["scenario_id"] == "SCEN-LOG-1"
+        assert entries[0]["node"] == "critic"
+        assert entries[0]["inject_id"] == "INJ-001"
+        assert entries[0]["level"] == "INFO"
+        assert "scenario_id" not in entries[1]
+
+    def test_module_levels_from_env(self, monkeypatch):
+        """Testet LOG_LEVELS und explizite Modul-Levels."""
+        monkeypatch.setenv("LOG_LEVELS", "workflows=DEBUG, agents.critic_agent=ERROR,ungültig")
+        configure_logging(level="WARNING", stream=io.StringIO(), verbose=False)
+
+        assert logging.getLogger().level == logging.WARNING
+        assert logging.getLogger("workflows").level == logging.DEBUG
+        assert logging.getLogger("agents.critic_agent").level == logging.ERROR
+
+    def test_node_details_off_by_default(self):
+        """Testet, dass Node-Details nur mit Verbose-Schalter ausgegeben werden."""
+        stream = io.StringIO()
+        configure_logging(level="INFO", stream=stream, verbose=False)
+        workflow = create_benchmark_workflow(
+            build_synthetic_graph(10), max_iterations=2, latency=0.0, jitter=0.0, seed=1
+        )
+        workflow.generate_scenario(ScenarioType.RANSOMWARE_DOUBLE_EXTORTION, scenario_id="SCEN-LOG-2", mode="legacy")
+        quiet_output = stream.getvalue()
+        assert "Starte Szenario-Generierung: SCEN-LOG-2" in quiet_output
+        assert "[State Check]" not in quiet_output
+
+        set_verbose(True)
+        assert logging.getLogger("workflows").isEnabledFor(logging.DEBUG)
+        workflow.generate_scenario(ScenarioType.RANSOMWARE_DOUBLE_EXTORTION, scenario_id="SCEN-LOG-3", mode="legacy")
+        assert "[State Check]" in stream.getvalue()
+        logger.info(f"✓ Log-Zeilen ohne/mit Verbose: {quiet_output.count(chr(10))}/{stream.getvalue().count(chr(10))}")
@@ -0,0 +1,172 @@
+"""
+Tests für die Planung pro Phase.
+
+Testet, dass der Manager einen mehrschrittigen Plan für die ganze Phase
+erstellt, der Workflow ihn schrittweise abarbeitet und nur bei abgearbeitetem
+Plan, Phasenwechsel, plan-bezogener Critic-Ablehnung oder
+Benutzer-Entscheidung neu plant. Agenten sind gemockt, der Knowledge Graph
+ist ein In-Memory-Overlay.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+from unittest.mock import patch
+import logging
+
+# Füge Projekt-Root zum Python-Path hinzu
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from workflows.scenario_workflow import ScenarioWorkflow, ManagerAgent
+from state_models import (
+    ScenarioType,
+    CrisisPhase,
+    Inject,
+    InjectModality,
+    TechnicalMetadata
+)
+
+logger = logging.getLogger("tests.test_phase_planning")
+
+
+@pytest.fixture
+def make_workflow(mocked_workflow, reject_first_critic):
+    """
+    Factory für einen Workflow mit gemockten Agenten und Plan pro Phase.
+
+    Args (der Factory):
+        reject: inject_ids, deren erster Draft mit logischem Fehler abgelehnt wird
+    """
+    def factory(max_iterations: int, phase_plan_steps: int = 4, reject=()) -> ScenarioWorkflow:
+        workflow = mocked_workflow(max_iterations=max_iterations, phase_plan_steps=phase_plan_steps)
+
+        def create_storyline(planned_steps=1, **kwargs):
+            return {
+                "next_phase": CrisisPhase.SUSPICIOUS_ACTIVITY,
+                "narrative": "Angreifer erkundet das Netzwerk",
+                "key_events": [],
+                "affected_assets": ["SRV-001"],
+                "steps": [{"event": f"Schritt {i + 1}", "assets": ["SRV-001"]} for i in range(planned_steps)],
+                "exit_phase": CrisisPhase.INITIAL_INCIDENT
+            }
+
+        workflow.manager_agent.create_storyline.side_effect = create_storyline
+        workflow.intel_agent.get_relevant_ttps.return_value = [
+            {"mitre_id": "T1046", "name": "Network Service Discovery", "technique_id": "T1046"}
+        ]
+
+        def generate_inject(**kwargs):
+            return Inject(
+                inject_id=kwargs["inject_id"],
+                time_offset=kwargs["time_offset"],
+                phase=CrisisPhase.SUSPICIOUS_ACTIVITY,
+                source="Red Team / Attacker",
+                target="Blue Team / SOC",
+                modality=InjectModality.SIEM_ALERT,
+                content=f"{kwargs['manager_plan']['key_events'][0]} für {kwargs['inject_id']}",
+                technical_metadata=TechnicalMetadata(mitre_id="T1046", affected_assets=["SRV-001"], severity="Low")
+            )
+
+        workflow.generator_agent.generate_inject.side_effect = generate_inject
+        workflow.critic_agent.validate_inject.side_effect = reject_first_critic(
+            reject, error="Ereignis passt nicht zur Storyline"
+        )
+        return workflow
+
+    return factory
+
+
+class TestPhasePlanning:
+    """Test-Klasse für die Planung pro Phase."""
+
+    def test_plan_consumed_step_by_step(self, make_workflow):
+        """Testet, dass der Manager nur einmal pro Plan aufgerufen wird."""
+        workflow = make_workflow(max_iterations=6)
+        result = workflow.generate_scenario(ScenarioType.RANSOMWARE_DOUBLE_EXTORTION, scenario_id="SCEN-PLAN-1", mode="legacy")
+
+        assert len(result["injects"]) == 6
+        # Plan 1: 4 Schritte, Plan 2: die verbleibenden 2 Injects
+        assert workflow.manager_agent.create_storyline.call_count == 2
+        planned_steps = [c.kwargs["planned_steps"] for c in workflow.manager_agent.create_storyline.call_args_list]
+        assert planned_steps == [4, 2]
+        # Nach abgearbeitetem Plan wird der vorgesehene Phasen-Ausgang übergeben
+        assert workflow.manager_agent.create_storyline.call_args_list[1].kwargs["intended_phase"] == CrisisPhase.INITIAL_INCIDENT
+        assert [inject.content.split(" für ")[0] for inject in result["injects"]] == [
+            "Schritt 1", "Schritt 2", "Schritt 3", "Schritt 4", "Schritt 1", "Schritt 2"
+        ]
+        assert result["planning_stats"] == {
+            "manager_calls": 2,
+            "plan_steps_reused": 4,
+            "replan_reasons": {"kein Plan": 1, "Plan abgearbeitet": 1}
+        }
+        logger.info(f"✓ Planung: {result['planning_stats']}")
+
+    def test_single_step_plans_every_inject(self, make_workflow):
+        """Testet, dass phase_plan_steps=1 den Manager für jeden Inject aufruft."""
+        workflow = make_workflow(max_iterations=3, phase_plan_steps=1)
+        result = workflow.generate_scenario(ScenarioType.RANSOMWARE_DOUBLE_EXTORTION, scenario_id="SCEN-PLAN-2", mode="legacy")
+
+        assert len(result["injects"]) == 3
+        assert workflow.manager_agent.create_storyline.call_count == 3
+        assert result["planning_stats"]["plan_steps_reused"] == 0
+
+    def test_storyline_rejection_triggers_replan(self, make_workflow):
+        """Testet, dass eine logische Critic-Ablehnung den Plan verwirft."""
+        workflow = make_workflow(max_iterations=4, reject={"INJ-002"})
+        result = workflow.generate_scenario(ScenarioType.RANSOMWARE_DOUBLE_EXTORTION, scenario_id="SCEN-PLAN-3", mode="legacy")
+
+        assert len(result["injects"]) == 4
+        assert workflow.manager_agent.create_storyline.call_count == 2
+        assert result["planning_stats"]["replan_reasons"] == {"kein Plan": 1, "Critic-Ablehnung (Storyline)": 1}
+
+    def test_replan_reasons(self, make_workflow):
+        """Testet Phasenwechsel und Benutzer-Entscheidung als Gründe für eine Neuplanung."""
+        workflow = make_workflow(max_iterations=4)
+        phase_plan = {
+            "plan": {},
+            "phase": CrisisPhase.SUSPICIOUS_ACTIVITY,
+            "exit_phase": None,
+            "steps": [{"event": "a", "assets": []}, {"event": "b", "assets": []}],
+            "step_index": 1,
+            "decision_count": 0,
+            "invalidated": None
+        }
+        state = {"current_phase": CrisisPhase.SUSPICIOUS_ACTIVITY, "user_decisions": []}
+
+        assert workflow._replan_reason(state, phase_plan) is None
+        assert workflow._replan_reason({**state, "current_phase": CrisisPhase.INITIAL_INCIDENT}, phase_plan) == "Phasenwechsel"
+        assert workflow._replan_reason({**state, "user_decisions": [{"decision_id": "D-1"}]}, phase_plan) == "Benutzer-Entscheidung"
+        assert workflow._replan_reason(state, {**phase_plan, "step_index": 2}) == "Plan abgearbeitet"
+
+
+class TestManagerPhasePlan:
+    """Test-Klasse für das Parsen des Phasen-Plans im ManagerAgent."""
+
+    @patch('utils.retry_handler.safe_llm_call')
+    def test_steps_and_exit_phase_parsed(self, mock_safe_llm_call):
+        """Testet Normalisierung der Schritte und Prüfung des Phasen-Ausgangs."""
+        class MockResponse:
+            content = (
+                '{"next_phase": "SUSPICIOUS_ACTIVITY", "narrative": "Test", "key_events": [], '
+                '"affected_assets": [], "business_impact": "", '
+                '"steps": [{"event": "Scan", "assets": ["SRV-001"]}, "Phishing-Mail", {"assets": []}, '
+                '{"event": "Zu viel", "assets": []}], "exit_phase": "RECOVERY"}'
+            )
+
+        mock_safe_llm_call.side_effect = lambda func, *args, **kwargs: MockResponse()
+        plan = ManagerAgent().create_storyline(
+            scenario_type=ScenarioType.RANSOMWARE_DOUBLE_EXTORTION,
+            current_phase=CrisisPhase.NORMAL_OPERATION,
+            inject_count=0,
+            system_state={},
+            planned_steps=3
+        )
+
+        assert plan["steps"] == [
+            {"event": "Scan", "assets": ["SRV-001"]},
+            {"event": "Phishing-Mail", "assets": []}
+        ]
+        # SUSPICIOUS_ACTIVITY → RECOVERY ist kein erlaubter Übergang
+        assert plan["exit_phase"] is None
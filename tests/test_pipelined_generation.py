@@ -0,0 +1,198 @@
+"""
+Tests für die gepipelinete Generierung.
+
+Testet, dass die nächste Iteration (Manager → Intel → Action → Generator)
+während der Critic-Validierung spekulativ läuft und übernommen wird, sowie
+das Verwerfen bei abgelehntem Draft, geänderten Assets, abgebrochenem
+Stream oder Node-Timeout. Agenten sind
+gemockt, der Knowledge Graph ist ein In-Memory-Overlay.
+"""
+
+import pytest
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import patch
+import logging
+
+# Füge Projekt-Root zum Python-Path hinzu
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from workflows.scenario_workflow import ScenarioWorkflow
+from utils.cancellation import is_cancelled
+from graph_overlay import GraphOverlayClient
+from state_models import (
+    ScenarioType,
+    CrisisPhase,
+    Inject,
+    InjectModality,
+    TechnicalMetadata
+)
+
+logger = logging.getLogger("tests.test_pipelined_generation")
+
+
+def _overlay() -> GraphOverlayClient:
+    """SRV-001 → APP-001 (RUNS_ON), SRV-002 unabhängig."""
+    return GraphOverlayClient(
+        entities=[
+            {"id": "SRV-001", "type": "Server", "name": "Server 001", "status": "online"},
+            {"id": "SRV-002", "type": "Server", "name": "Server 002", "status": "online"},
+            {"id": "APP-001", "type": "Application", "name": "Payment", "status": "online"},
+        ],
+        relationships=[{"source": "SRV-001", "target": "APP-001", "type": "RUNS_ON"}]
+    )
+
+
+@pytest.fixture
+def make_workflow(mocked_workflow, reject_first_critic):
+    """
+    Factory für einen Workflow im Pipelining-Modus mit gemockten Agenten.
+
+    Args (der Factory):
+        assets_per_inject: inject_id -> betroffene Assets des Drafts
+        reject: inject_ids, deren erster Draft vom Critic abgelehnt wird
+    """
+    def factory(assets_per_inject, reject=(), max_iterations: int = 3) -> ScenarioWorkflow:
+        workflow = mocked_workflow(neo4j_client=_overlay(), max_iterations=max_iterations, pipelined=True)
+
+        workflow.manager_agent.create_storyline.return_value = {
+            "next_phase": CrisisPhase.SUSPICIOUS_ACTIVITY,
+            "narrative": "Angreifer bewegt sich lateral",
+            "affected_assets": []
+        }
+        workflow.intel_agent.get_relevant_ttps.return_value = [
+            {"mitre_id": "T1566", "name": "Phishing", "technique_id": "T1566"}
+        ]
+
+        def generate_inject(**kwargs):
+            return Inject(
+                inject_id=kwargs["inject_id"],
+                time_offset=kwargs["time_offset"],
+                phase=CrisisPhase.SUSPICIOUS_ACTIVITY,
+                source="Red Team / Attacker",
+                target="Blue Team / SOC",
+                modality=InjectModality.SIEM_ALERT,
+                content=f"Verdächtige Aktivität für {kwargs['inject_id']}",
+                technical_metadata=TechnicalMetadata(
+                    mitre_id="T1566",
+                    affected_assets=assets_per_inject.get(kwargs["inject_id"], ["SRV-002"]),
+                    severity="Low"
+                )
+            )
+
+        workflow.generator_agent.generate_inject.side_effect = generate_inject
+        # Spekulation läuft während der Validierung
+        workflow.critic_agent.validate_inject.side_effect = reject_first_critic(
+            reject, error="Zeitlicher Widerspruch", delay=0.05
+        )
+        return workflow
+
+    return factory
+
+
+def _generate(workflow: ScenarioWorkflow, **kwargs):
+    """Führt generate_scenario mit Timeout aus (ein Deadlock lässt den Test scheitern statt hängen)."""
+    executor = ThreadPoolExecutor(max_workers=1)
+    try:
+        return executor.submit(
+            workflow.generate_scenario, ScenarioType.RANSOMWARE_DOUBLE_EXTORTION, **kwargs
+        ).result(timeout=30)
+    finally:
+        executor.shutdown(wait=False)
+
+
+class TestPipelinedGeneration:
+    """Test-Klasse für die gepipelinete Generierung."""
+
+    def test_speculation_adopted(self, make_workflow):
+        """Testet, dass unabhängige Folge-Iterationen ohne Neuberechnung übernommen werden."""
+        workflow = make_workflow({})
+        result = _generate(workflow, scenario_id="SCEN-PIPE-1")
+
+        assert [inject.inject_id for inject in result["injects"]] == ["INJ-001", "INJ-002", "INJ-003"]
+        assert workflow.pipeline_stats == {"started": 2, "adopted": 2, "discarded": 0}
+        # Kein Draft doppelt erzeugt
+        assert workflow.generator_agent.generate_inject.call_count == 3
+        # Gepufferte Traces wurden bei Übernahme geschrieben, Zähler stimmen
+        assert result["workflow_log_count"] == len(result["workflow_logs"])
+        assert [log["iteration"] for log in result["workflow_logs"] if log["node"] == "Generator Agent"] == [0, 1, 2]
+        logger.info(f"✓ Pipeline-Statistik: {workflow.pipeline_stats}")
+
+    def test_rejected_draft_discards_speculation(self, make_workflow):
+        """Testet das Verwerfen der Spekulation, wenn der Critic den Draft ablehnt."""
+        workflow = make_workflow({}, reject={"INJ-001"})
+        result = _generate(workflow)
+
+        assert [inject.inject_id for inject in result["injects"]] == ["INJ-001", "INJ-002", "INJ-003"]
+        assert workflow.pipeline_stats["discarded"] == 1
+        assert workflow.pipeline_stats["adopted"] == 2
+
+    def test_changed_assets_discard_speculation(self, make_workflow):
+        """Testet das Verwerfen, wenn das State Update ein genutztes Asset ändert (Kaskade)."""
+        # INJ-001 trifft SRV-001 → Kaskade auf APP-001, die INJ-002 spekulativ nutzt
+        workflow = make_workflow({"INJ-001": ["SRV-001"], "INJ-002": ["APP-001"]})
+        result = _generate(workflow)
+
+        assert len(result["injects"]) == 3
+        assert workflow.pipeline_stats["discarded"] == 1
+        assert workflow.generator_agent.generate_inject.call_count == 4
+
+    def test_cancelled_stream_discards_speculation(self, make_workflow):
+        """Testet, dass ein abgebrochener Stream die laufende Spekulation verwirft und aufräumt."""
+        workflow = make_workflow({}, max_iterations=5)
+        cancel_event = threading.Event()
+        events = []
+        with patch("workflows.scenario_workflow.pop_scenario_usage") as pop_usage:
+            for event in workflow.stream_scenario(
+                ScenarioType.RANSOMWARE_DOUBLE_EXTORTION, scenario_id="SCEN-PIPE-C", cancel_event=cancel_event
+            ):
+                events.append(event)
+                if event["event"] == "node" and event["node"] == "critic":
+                    cancel_event.set()  # Spekulation für INJ-002 wurde im Critic gestartet
+
+        assert events[-1]["event"] == "cancelled"
+        assert workflow.pipeline_stats["started"] == 1
+        assert workflow.pipeline_stats["discarded"] == 1
+        assert workflow._speculations == {}
+        pop_usage.assert_called_once_with("SCEN-PIPE-C")
+
+    def test_node_timeout_cancels_slow_speculation(self, make_workflow):
+        """Testet, dass der Manager nur bis zum Node-Timeout wartet und die Spekulation abbricht."""
+        workflow = make_workflow({}, max_iterations=5)
+        workflow.node_timeout = 0.2
+        storyline = workflow.manager_agent.create_storyline.return_value
+        cancelled = []
+
+        def create_storyline(**kwargs):
+            if workflow.manager_agent.create_storyline.call_count == 2:  # spekulative Iteration
+                time.sleep(1.0)
+                cancelled.append(is_cancelled())
+            return storyline
+
+        workflow.manager_agent.create_storyline.side_effect = create_storyline
+        start = time.monotonic()
+        _generate(workflow, scenario_id="SCEN-PIPE-T")
+        elapsed = time.monotonic() - start
+
+        assert elapsed < 0.8
+        assert workflow.pipeline_stats["discarded"] == 1
+        assert workflow._speculations == {}
+        time.sleep(1.0)  # Spekulation läuft aus
+        assert cancelled == [True]
+
+    def test_close_shuts_down_pipeline_executor(self, make_workflow):
+        """Testet, dass close() den Thread-Pool für Pipelining beendet."""
+        workflow = make_workflow({})
+        _generate(workflow)
+        executor = workflow._pipeline_executor
+        assert executor is not None
+
+        workflow.close()
+        assert workflow._pipeline_executor is None
+        with pytest.raises(RuntimeError):
+            executor.submit(time.sleep, 0)
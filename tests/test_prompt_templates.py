@@ -0,0 +1,132 @@
+"""
+Tests für die einmal kompilierten Prompt-Vorlagen der Agenten.
+
+Testet, dass Manager, Generator, Critic und DORA-Framework pro Aufruf keine
+Vorlage mehr bauen, dass alle System-Prompts statisch sind (stabiles Präfix
+für das Prompt-Caching des Providers) und dass JsonChain Ketten
+wiederverwendet bzw. nach einem Modellwechsel neu aufbaut.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+import logging
+
+# Füge Projekt-Root zum Python-Path hinzu
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.prompts import ChatPromptTemplate
+
+# Workflow zuerst importieren (zirkulärer Import agents <-> workflows)
+from workflows.scenario_workflow import ScenarioWorkflow  # noqa: F401
+from agents import generator_agent, manager_agent, critic_agent
+from agents.generator_agent import GeneratorAgent
+from agents.manager_agent import ManagerAgent
+from agents.critic_agent import CriticAgent
+from Compliance import dora
+from Compliance.dora import DORAComplianceFramework
+from state_models import ScenarioType, CrisisPhase, Inject, InjectModality, TechnicalMetadata
+from utils.fake_llm import FakeChatModel
+from utils.structured_output import JsonChain
+
+logger = logging.getLogger("tests.test_prompt_templates")
+
+SYSTEM_STATE = {
+    "SRV-001": {"name": "Domain Controller", "status": "online", "type": "Server"},
+    "APP-001": {"name": "Payment Processing System", "status": "online", "type": "Application"}
+}
+
+
+def _inject() -> Inject:
+    return Inject(
+        inject_id="INJ-001",
+        time_offset="T+00:30",
+        phase=CrisisPhase.SUSPICIOUS_ACTIVITY,
+        source="Red Team / Attacker",
+        target="Blue Team / SOC",
+        modality=InjectModality.SIEM_ALERT,
+        content="Ungewöhnliche Scan-Aktivität auf SRV-001, das SOC prüft die Incident-Response-Schritte",
+        technical_metadata=TechnicalMetadata(mitre_id="T1046", affected_assets=["SRV-001"], severity="Low")
+    )
+
+
+@pytest.fixture
+def no_template_building(monkeypatch):
+    """Schlägt fehl, sobald eine Vorlage zur Laufzeit gebaut wird."""
+    def _fail(*args, **kwargs):
+        raise AssertionError("ChatPromptTemplate.from_messages pro Aufruf")
+    monkeypatch.setattr(ChatPromptTemplate, "from_messages", _fail)
+
+
+class TestCompiledTemplates:
+    """Test-Klasse für Vorlagen ohne Neuaufbau pro Aufruf."""
+
+    def test_agents_reuse_templates(self, no_template_building):
+        """Testet alle vier Agenten-Aufrufe mit Fake-LLM ohne Vorlagen-Aufbau."""
+        manager = ManagerAgent()
+        manager.llm = FakeChatModel(agent="manager")
+        plan = manager.create_storyline(ScenarioType.RANSOMWARE_DOUBLE_EXTORTION, CrisisPhase.NORMAL_OPERATION, 0, SYSTEM_STATE)
+        assert "error" not in plan
+
+        generator = GeneratorAgent()
+        generator.llm = FakeChatModel(agent="generator")
+        for feedback in (None, {"errors": ["Asset SRV-003 existiert nicht"], "warnings": []}):
+            inject = generator.generate_inject(
+                ScenarioType.RANSOMWARE_DOUBLE_EXTORTION, CrisisPhase.SUSPICIOUS_ACTIVITY, "INJ-001", "T+00:30",
+                plan, {"name": "Network Service Discovery", "mitre_id": "T1046"}, SYSTEM_STATE, [],
+                validation_feedback=feedback
+            )
+            assert inject.inject_id == "INJ-001"
+
+        critic = CriticAgent()
+        critic.llm = FakeChatModel(agent="critic")
+        result = critic._llm_validate(_inject(), [], CrisisPhase.SUSPICIOUS_ACTIVITY, SYSTEM_STATE)
+        assert "LLM-Call fehlgeschlagen" not in result.get("_raw_llm_output", "")
+
+        framework = DORAComplianceFramework()
+        framework.llm = FakeChatModel(agent="compliance_dora")
+        compliance = framework.validate_inject(_inject().content, "SUSPICIOUS_ACTIVITY", {})
+        assert compliance.details.get("method") != "heuristic"
+
+    def test_system_prompts_are_static(self):
+        """Testet, dass kein System-Prompt Variablen enthält (identisches Präfix je Aufruf)."""
+        templates = [
+            manager_agent.STORYLINE_PROMPT,
+            generator_agent.INJECT_PROMPT,
+            generator_agent.REFINE_PROMPT,
+            generator_agent.INJECT_SEQUENCE_PROMPT,
+            critic_agent.VALIDATION_PROMPT,
+            dora.DORA_PROMPT
+        ]
+        for template in templates:
+            assert template.messages[0].prompt.input_variables == []
+
+        # Einzel-, Refine- und Sequenz-Aufrufe des Generators teilen denselben Anfang
+        system = generator_agent.INJECT_PROMPT.messages[0].prompt.template
+        assert generator_agent.REFINE_PROMPT.messages[0].prompt.template == system
+        assert generator_agent.INJECT_SEQUENCE_PROMPT.messages[0].prompt.template == system
+        assert generator_agent.REFINE_PROMPT.messages[1].prompt.input_variables == ["validation_errors"]
+
+
+class TestJsonChain:
+    """Test-Klasse für Wiederverwendung und Neuaufbau der Ketten."""
+
+    def test_chain_reused_until_model_changes(self, monkeypatch):
+        """Testet Wiederverwendung, Neuaufbau nach Modellwechsel und Ketten pro Temperature."""
+        chain = JsonChain(ChatPromptTemplate.from_messages([("system", "Statisch"), ("human", "Frage {number}")]))
+        first = FakeListChatModel(responses=["eins"])
+        second = FakeListChatModel(responses=["zwei"])
+
+        assert chain.for_llm(first) is chain.for_llm(first)
+        assert chain.for_llm(first, 0.9) is chain.for_llm(first, 0.9)
+        assert chain.for_llm(first, 0.9) is not chain.for_llm(first)
+        assert chain.for_llm(first).invoke({"number": 1}).content == "eins"
+        assert chain.for_llm(second).invoke({"number": 1}).content == "zwei"
+
+        reused = chain.for_llm(second)
+        monkeypatch.setenv("LLM_JSON_MODE", "off")
+        assert chain.for_llm(second) is not reused
+        logger.info("✓ Ketten werden pro Modell und Temperature wiederverwendet")
@@ -0,0 +1,142 @@
+"""
+Tests für den prozessweiten LLM-Rate-Limiter (utils/rate_limiter.py).
+
+Testet Token-Bucket, Prioritätsklassen bei voller Semaphore, die gemeinsame
+Pause nach einem 429 (Retry-After) und den Abgleich über Rate-Limit-Header.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+import logging
+import threading
+import time
+
+# Füge Projekt-Root zum Python-Path hinzu
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+import httpx
+from openai import RateLimitError
+
+from utils.fake_llm import FakeChatModel
+from utils.llm_recorder import LLMRecorder, wrap_llm
+from utils.rate_limiter import (
+    Priority,
+    RateLimiter,
+    RateLimitedChatModel,
+    llm_priority_scope,
+    parse_duration,
+    prioritized,
+    current_priority
+)
+
+logger = logging.getLogger("tests.test_rate_limiter")
+
+
+def _rate_limit_error(headers):
+    response = httpx.Response(429, headers=headers, request=httpx.Request("POST", "http://llm.local/v1/chat/completions"))
+    return RateLimitError("Rate limit reached", response=response, body=None)
+
+
+class TestRateLimiter:
+    """Test-Klasse für Buckets, Prioritäten, 429-Pause und Header-Abgleich."""
+
+    def test_token_bucket_throttles(self):
+        """Testet, dass ein leerer Token-Bucket den nächsten Aufruf bis zur Auffüllung verzögert."""
+        limiter = RateLimiter(tokens_per_minute=6000)  # 100 Tokens/s
+        assert limiter.acquire(6000) < 0.1
+        limiter.release(6000, 6000, {})
+
+        start = time.monotonic()
+        limiter.acquire(50)
+        assert 0.35 < time.monotonic() - start < 1.5
+        limiter.release(50)
+
+    def test_priority_order(self):
+        """Testet, dass bei belegter Semaphore INTERACTIVE vor früher wartendem BATCH startet."""
+        limiter = RateLimiter(max_concurrency=1)
+        limiter.acquire(priority=Priority.NORMAL)
+        order = []
+
+        def call(priority):
+            limiter.acquire(priority=priority)
+            order.append(priority)
+            limiter.release()
+
+        threads = []
+        for priority in (Priority.BATCH, Priority.BATCH, Priority.INTERACTIVE):
+            thread = threading.Thread(target=call, args=(priority,))
+            thread.start()
+            threads.append(thread)
+            time.sleep(0.05)  # Ankunftsreihenfolge festlegen
+        assert limiter.stats()["waiting"] == 3
+        limiter.release()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        assert order == [Priority.INTERACTIVE, Priority.BATCH, Priority.BATCH]
+        assert limiter.stats()["acquired"] == {"interactive": 1, "normal": 1, "batch": 2}
+
+    def test_rate_limit_pauses_and_retries(self):
+        """Testet gemeinsame Pause nach 429 mit Retry-After, halbierte Rate und erneuten Versuch."""
+        limiter = RateLimiter(requests_per_minute=600)
+        attempts = []
+
+        def responder(prompt):
+            attempts.append(time.monotonic())
+            if len(attempts) == 1:
+                raise _rate_limit_error({"retry-after-ms": "300"})
+            return "ok"
+
+        llm = RateLimitedChatModel(inner=FakeChatModel(responder=responder), limiter=limiter, agent="critic")
+        assert llm.invoke("Prüfe den Inject").content == "ok"
+        assert attempts[1] - attempts[0] >= 0.29
+        stats = limiter.stats()
+        assert stats["rate_limited"] == 1
+        assert stats["rate_factor"] == 0.55  # halbiert, danach +0.05 für den Erfolg
+
+        failing = RateLimitedChatModel(
+            inner=FakeChatModel(responder=lambda prompt: (_ for _ in ()).throw(_rate_limit_error({"retry-after": "0"}))),
+            limiter=limiter,
+            rate_limit_retries=1
+        )
+        with pytest.raises(RateLimitError):
+            failing.invoke("Prüfe den Inject")
+        assert limiter.stats()["rate_limited"] == 3
+        assert limiter.stats()["active"] == 0
+
+    def test_headers_sync_and_durations(self):
+        """Testet Dauer-Parsing und die Pause bei erschöpftem Provider-Kontingent."""
+        assert parse_duration("6m0s") == 360.0
+        assert parse_duration("1.5s") == 1.5
+        assert parse_duration("20ms") == pytest.approx(0.02)
+        assert parse_duration("2") == 2.0
+        assert parse_duration("bald") is None
+
+        limiter = RateLimiter(requests_per_minute=100)
+        limiter.acquire()
+        limiter.release(headers={"x-ratelimit-remaining-requests": "0", "x-ratelimit-reset-requests": "250ms"})
+        assert 0 < limiter.stats()["paused_for"] <= 0.25
+        start = time.monotonic()
+        limiter.acquire()
+        assert time.monotonic() - start >= 0.2
+        limiter.release()
+
+    def test_wrap_llm_and_priority_scope(self):
+        """Testet die Einbindung über wrap_llm und die Priorität pro Iterationsschritt."""
+        limiter = RateLimiter(max_concurrency=2)
+        llm = wrap_llm(FakeChatModel(agent="critic"), "critic", LLMRecorder("off"), limiter=limiter)
+        assert isinstance(llm, RateLimitedChatModel)
+
+        def calls():
+            for _ in range(2):
+                llm.invoke("Prüfe den Inject")
+                yield current_priority()
+
+        assert list(prioritized(calls(), Priority.INTERACTIVE)) == [Priority.INTERACTIVE] * 2
+        with llm_priority_scope(Priority.BATCH):
+            llm.invoke("Prüfe den Inject")
+        assert limiter.stats()["acquired"] == {"interactive": 2, "normal": 0, "batch": 1}
+        logger.info(f"✓ Limiter-Statistik: {limiter.stats()}")
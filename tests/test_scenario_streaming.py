@@ -0,0 +1,168 @@
+"""
+Tests für die gestreamte Szenario-Generierung.
+
+Testet die Event-Folge von ScenarioWorkflow.stream_scenario (Node-Übergänge,
+Drafts, Critic-Urteile, Refine, akzeptierte Injects), den Abbruch über ein
+Cancel-Event und das SSE-Format des API-Servers. Agenten-Nodes werden durch
+Stubs ersetzt.
+"""
+
+import pytest
+import sys
+import json
+import threading
+from contextlib import ExitStack
+from pathlib import Path
+from unittest.mock import Mock, patch
+import logging
+
+# Füge Projekt-Root zum Python-Path hinzu
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from workflows.scenario_workflow import ScenarioWorkflow
+from state_models import (
+    ScenarioType,
+    CrisisPhase,
+    Inject,
+    InjectModality,
+    TechnicalMetadata,
+    ValidationResult
+)
+
+logger = logging.getLogger("tests.test_scenario_streaming")
+
+
+def _state_check(self, state):
+    return {"system_state": state.get("system_state") or {"SRV-001": {"status": "online", "criticality": "standard"}}}
+
+
+def _passthrough(self, state):
+    return {}
+
+
+def _generator(self, state):
+    number = len(state["injects"]) + 1
+    return {"draft_inject": Inject(
+        inject_id=f"INJ-{number:03d}",
+        time_offset=f"T+{number:02d}:00",
+        phase=CrisisPhase.SUSPICIOUS_ACTIVITY,
+        source="Red Team / Attacker",
+        target="Blue Team / SOC",
+        modality=InjectModality.SIEM_ALERT,
+        content=f"Verdächtige Aktivität Nummer {number}",
+        technical_metadata=TechnicalMetadata(mitre_id="T1566", affected_assets=["SRV-001"], severity="Low")
+    )}
+
+
+def _make_critic(reject_first: bool):
+    """Critic-Stub; lehnt optional den allerersten Draft ab (erzwingt einen Refine)."""
+    calls = []
+
+    def _critic(self, state):
+        calls.append(state["draft_inject"].inject_id)
+        is_valid = not (reject_first and len(calls) == 1)
+        return {"validation_result": ValidationResult(
+            is_valid=is_valid,
+            logical_consistency=is_valid,
+            dora_compliance=True,
+            causal_validity=True,
+            errors=[] if is_valid else ["Zeitlicher Widerspruch"]
+        )}
+    return _critic
+
+
+def _state_update(self, state):
+    return {"injects": state["injects"] + [state["draft_inject"]], "iteration": state["iteration"] + 1}
+
+
+def _make_workflow(reject_first: bool = False, max_iterations: int = 2) -> ScenarioWorkflow:
+    """Erstellt einen nicht-interaktiven Workflow mit Stub-Nodes."""
+    stubs = {
+        "_state_check_node": _state_check,
+        "_manager_node": _passthrough,
+        "_intel_node": _passthrough,
+        "_action_selection_node": _passthrough,
+        "_generator_node": _generator,
+        "_critic_node": _make_critic(reject_first),
+        "_state_update_node": _state_update,
+    }
+    with ExitStack() as stack:
+        for agent in ("ManagerAgent", "IntelAgent", "GeneratorAgent", "CriticAgent"):
+            stack.enter_context(patch(f"workflows.scenario_workflow.{agent}"))
+        for name, stub in stubs.items():
+            stack.enter_context(patch.object(ScenarioWorkflow, name, stub))
+        return ScenarioWorkflow(neo4j_client=Mock(), max_iterations=max_iterations)
+
+
+class TestScenarioStreaming:
+    """Test-Klasse für ScenarioWorkflow.stream_scenario."""
+
+    def test_event_sequence(self):
+        """Testet Start-, Node-, Inject- und Complete-Events."""
+        workflow = _make_workflow()
+        events = list(workflow.stream_scenario(ScenarioType.RANSOMWARE_DOUBLE_EXTORTION, scenario_id="SCEN-STREAM-1"))
+        kinds = [e["event"] for e in events]
+
+        assert events[0] == {
+            "event": "start",
+            "scenario_id": "SCEN-STREAM-1",
+            "scenario_type": ScenarioType.RANSOMWARE_DOUBLE_EXTORTION.value,
+            "max_iterations": 2
+        }
+        assert kinds[-1] == "complete"
+        assert events[-1]["inject_count"] == 2
+        assert [e["inject"].inject_id for e in events if e["event"] == "inject"] == ["INJ-001", "INJ-002"]
+        # Erster Inject kommt vor dem zweiten Draft, nicht erst am Ende
+        assert kinds.index("inject") < [i for i, k in enumerate(kinds) if k == "draft"][1]
+        workflow.neo4j_client.save_scenario.assert_called_once()
+        logger.info(f"✓ {len(events)} Events gestreamt")
+
+    def test_refine_event(self):
+        """Testet Critic- und Refine-Events bei abgelehntem Draft."""
+        workflow = _make_workflow(reject_first=True, max_iterations=1)
+        events = list(workflow.stream_scenario(ScenarioType.RANSOMWARE_DOUBLE_EXTORTION))
+        verdicts = [e for e in events if e["event"] == "critic"]
+        refines = [e for e in events if e["event"] == "refine"]
+
+        assert [v["is_valid"] for v in verdicts] == [False, True]
+        assert len(refines) == 1
+        assert refines[0]["errors"] == ["Zeitlicher Widerspruch"]
+        assert [e["event"] for e in events].count("inject") == 1
+
+    def test_cancel(self):
+        """Testet den Abbruch über ein Cancel-Event nach dem ersten Inject."""
+        workflow = _make_workflow(max_iterations=5)
+        cancel_event = threading.Event()
+        events = []
+        for event in workflow.stream_scenario(ScenarioType.RANSOMWARE_DOUBLE_EXTORTION, cancel_event=cancel_event):
+            events.append(event)
+            if event["event"] == "inject":
+                cancel_event.set()
+
+        assert events[-1]["event"] == "cancelled"
+        assert events[-1]["inject_count"] == 1
+        workflow.neo4j_client.save_scenario.assert_not_called()
+
+    def test_interactive_mode_rejected(self):
+        """Testet, dass Streaming im interaktiven Modus abgelehnt wird."""
+        workflow = _make_workflow()
+        workflow.interactive_mode = True
+        with pytest.raises(ValueError):
+            next(workflow.stream_scenario(ScenarioType.RANSOMWARE_DOUBLE_EXTORTION))
+
+    def test_sse_format(self):
+        """Testet das SSE-Format inkl. Inject-Konvertierung."""
+        from api_server import format_stream_event
+
+        inject = _generator(None, {"injects": []})["draft_inject"]
+        message = format_stream_event({"event": "inject", "inject": inject})
+        lines = message.split("\n")
+
+        assert lines[0] == "event: inject"
+        assert message.endswith("\n\n")
+        payload = json.loads(lines[1][len("data: "):])
+        assert payload["inject"]["inject_id"] == "INJ-001"
+        assert payload["inject"]["status"] == "verified"
+        assert payload["inject"]["modality"] == InjectModality.SIEM_ALERT.value
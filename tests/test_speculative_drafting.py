@@ -0,0 +1,215 @@
+"""
+Tests für spekulatives Multi-Kandidaten-Drafting.
+
+Testet die parallele Generate→Validate-Pipeline pro Kandidat im
+Generator-Node (erster valider gewinnt, Verlierer werden abgebrochen) und
+die Übernahme der Vorab-Validierung im Critic-Node (ohne LLM und ohne Neo4j).
+"""
+
+import pytest
+import sys
+import time
+from pathlib import Path
+from unittest.mock import Mock, patch
+import logging
+
+# Füge Projekt-Root zum Python-Path hinzu
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from workflows.scenario_workflow import ScenarioWorkflow
+from state_models import (
+    ScenarioType,
+    CrisisPhase,
+    Inject,
+    InjectModality,
+    TechnicalMetadata,
+    ValidationResult
+)
+
+logger = logging.getLogger("tests.test_speculative_drafting")
+
+
+def _make_inject(content: str) -> Inject:
+    """Erstellt einen minimalen Test-Inject."""
+    return Inject(
+        inject_id="INJ-001",
+        time_offset="T+00:30",
+        phase=CrisisPhase.SUSPICIOUS_ACTIVITY,
+        source="Red Team / Attacker",
+        target="Blue Team / SOC",
+        modality=InjectModality.SIEM_ALERT,
+        content=content,
+        technical_metadata=TechnicalMetadata(mitre_id="T1566", affected_assets=["SRV-001"])
+    )
+
+
+def _make_validation(is_valid: bool, errors=None) -> ValidationResult:
+    """Erstellt ein ValidationResult für Tests."""
+    return ValidationResult(
+        is_valid=is_valid,
+        logical_consistency=is_valid,
+        dora_compliance=True,
+        causal_validity=is_valid,
+        errors=errors or []
+    )
+
+
+@pytest.fixture
+def workflow(mocked_workflow):
+    """Erstellt einen Workflow mit gemockten Agenten."""
+    wf = mocked_workflow(neo4j_client=Mock(), max_iterations=2, speculative_candidates=3)
+    wf.generator_agent.llm.temperature = 0.8
+    return wf
+
+
+@pytest.fixture
+def base_state():
+    """Erstellt einen Basis-State für Tests."""
+    return {
+        "scenario_id": "TEST-SPEC",
+        "scenario_type": ScenarioType.RANSOMWARE_DOUBLE_EXTORTION,
+        "current_phase": CrisisPhase.SUSPICIOUS_ACTIVITY,
+        "injects": [],
+        "system_state": {"SRV-001": {"status": "online", "entity_type": "Server"}},
+        "iteration": 0,
+        "max_iterations": 2,
+        "manager_plan": {},
+        "selected_action": {"ttp": {"mitre_id": "T1566"}},
+        "draft_inject": None,
+        "draft_validation": None,
+        "validation_result": None,
+        "errors": [],
+        "warnings": [],
+        "metadata": {},
+        "workflow_log_count": 0,
+        "agent_decision_count": 0,
+        "mode": "legacy",
+        "speculative_candidates": 3
+    }
+
+
+class TestSpeculativeDrafting:
+    """Test-Klasse für spekulatives Drafting."""
+
+    def test_candidate_temperatures(self, workflow):
+        """Testet die Temperatur-Streuung der Kandidaten."""
+        temperatures = workflow._candidate_temperatures(3)
+        assert temperatures == [None, 0.95, 1.1]
+        logger.info(f"✓ Temperaturen: {temperatures}")
+
+    def test_first_valid_candidate_wins(self, workflow, base_state):
+        """Testet, dass der erste valide Kandidat (Generate→Validate) übernommen wird."""
+        delays = {None: 0.3, 0.95: 0.0, 1.1: 0.05}
+        workflow.generator_agent.generate_inject.side_effect = lambda **kwargs: _make_inject(
+            f"Kandidat {kwargs.get('temperature')}"
+        )
+
+        def validate(inject, **kwargs):
+            temperature = None if inject.content.endswith("None") else float(inject.content.split()[-1])
+            time.sleep(delays[temperature])
+            if temperature == 0.95:
+                return _make_validation(False, ["Fehler"])
+            return _make_validation(True)
+
+        workflow.critic_agent.validate_inject.side_effect = validate
+
+        result = workflow._generator_node(base_state)
+
+        assert result["draft_inject"].content == "Kandidat 1.1"
+        assert result["draft_validation"]["candidate_index"] == 2
+        assert result["draft_validation"]["candidates"] == 3
+        assert result["draft_validation"]["validation_result"].is_valid
+        logger.info("✓ Schnellster valider Kandidat ausgewählt")
+
+    def test_losing_candidates_are_cancelled(self, workflow, base_state):
+        """Testet, dass unterlegene Kandidaten nach dem Gewinner keine LLM-Calls mehr machen."""
+        def generate(**kwargs):
+            if kwargs.get("temperature") is None:
+                time.sleep(0.2)  # Langsamer Kandidat: fertig erst nach dem Gewinner
+            return _make_inject(f"Kandidat {kwargs.get('temperature')}")
+
+        workflow.generator_agent.generate_inject.side_effect = generate
+        workflow.critic_agent.validate_inject.side_effect = lambda inject, **kwargs: _make_validation(True)
+
+        workflow._generator_node(base_state)
+        time.sleep(0.3)
+
+        validated = [c.kwargs["inject"].content for c in workflow.critic_agent.validate_inject.call_args_list]
+        assert "Kandidat None" not in validated
+        assert len(validated) <= 2
+
+    def test_safe_llm_call_respects_cancellation(self):
+        """Testet, dass safe_llm_call bei gesetztem Cancel-Event keinen Call mehr macht."""
+        import threading
+        from utils.cancellation import cancellation_scope, OperationCancelled
+        from utils.retry_handler import safe_llm_call
+
+        llm_call = Mock(return_value="antwort")
+        cancel_event = threading.Event()
+        with cancellation_scope(cancel_event):
+            assert safe_llm_call(llm_call) == "antwort"
+            cancel_event.set()
+            with pytest.raises(OperationCancelled):
+                safe_llm_call(llm_call)
+        assert llm_call.call_count == 1
+
+    def test_generator_node_without_speculation(self, workflow, base_state):
+        """Testet ob K=1 den klassischen Einzel-Draft verwendet."""
+        base_state["speculative_candidates"] = 1
+        workflow.generator_agent.generate_inject.return_value = _make_inject("Einzel-Draft")
+
+        result = workflow._generator_node(base_state)
+
+        assert result["draft_validation"] is None
+        assert workflow.generator_agent.generate_inject.call_count == 1
+        assert "temperature" not in workflow.generator_agent.generate_inject.call_args.kwargs
+        workflow.critic_agent.validate_inject.assert_not_called()
+
+    def test_best_invalid_candidate(self, workflow, base_state):
+        """Testet die Auswahl des Kandidaten mit den wenigsten Fehlern, wenn keiner valide ist."""
+        workflow.generator_agent.generate_inject.side_effect = lambda **kwargs: _make_inject(
+            "ein Fehler" if kwargs.get("temperature") == 1.1 else "zwei Fehler"
+        )
+        workflow.critic_agent.validate_inject.side_effect = lambda inject, **kwargs: _make_validation(
+            False, ["A"] if inject.content == "ein Fehler" else ["A", "B"]
+        )
+
+        result = workflow._generator_node(base_state)
+
+        assert result["draft_inject"].content == "ein Fehler"
+        assert result["draft_validation"]["validation_result"].errors == ["A"]
+
+    def test_critic_reuses_validation_and_logs_winner_only(self, workflow, base_state):
+        """Testet, dass der Critic die Vorab-Validierung übernimmt und nur den Gewinner forensisch loggt."""
+        winner = _make_inject("Gewinner-Kandidat")
+        base_state["mode"] = "thesis"
+        base_state["draft_inject"] = winner
+        base_state["draft_validation"] = {
+            "inject_id": winner.inject_id,
+            "validation_result": _make_validation(True),
+            "candidate_index": 2,
+            "candidates": 3
+        }
+
+        with patch("workflows.scenario_workflow.get_forensic_logger") as forensic:
+            result = workflow._critic_node(base_state)
+
+        assert result["validation_result"].is_valid
+        assert result["draft_validation"] is None
+        workflow.critic_agent.validate_inject.assert_not_called()
+        forensic.return_value.log_draft.assert_called_once()
+        assert forensic.return_value.log_draft.call_args.kwargs["inject"] is winner
+        forensic.return_value.log_critic.assert_called_once()
+        details = workflow.get_workflow_logs(base_state["scenario_id"])[-1]["details"]
+        assert details["selected_candidate"] == 2
+        assert details["candidates"] == 3
+
+    def test_candidate_count_is_clamped(self, workflow, base_state, mocked_workflow):
+        """Testet die Obergrenze für Kandidaten (Konstruktor und Initial-State)."""
+        wf = mocked_workflow(neo4j_client=Mock(), speculative_candidates=50)
+
+        assert wf.speculative_candidates == ScenarioWorkflow.MAX_SPECULATIVE_CANDIDATES
+        state = workflow._build_initial_state(ScenarioType.RANSOMWARE_DOUBLE_EXTORTION, "SCEN-X", "legacy", 99)
+        assert state["speculative_candidates"] == ScenarioWorkflow.MAX_SPECULATIVE_CANDIDATES
@@ -0,0 +1,165 @@
+"""
+Tests für die lokale Pflege des Systemzustands über State-Update-Deltas.
+
+Testet, dass der State Update Node die geschriebenen Deltas (inkl.
+Second-Order Effects) zurückgibt und der State Check Neo4j nur bei
+Intervall-Ablauf oder externer Änderung vollständig neu liest.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+from unittest.mock import Mock
+import logging
+
+# Füge Projekt-Root zum Python-Path hinzu
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from state_models import (
+    ScenarioType,
+    CrisisPhase,
+    Inject,
+    InjectModality,
+    TechnicalMetadata
+)
+
+logger = logging.getLogger("tests.test_state_deltas")
+
+
+@pytest.fixture
+def neo4j_client():
+    """Mock-Client mit einem Server und einer abhängigen Applikation."""
+    client = Mock()
+    client.get_current_state.return_value = [
+        {"entity_id": "SRV-001", "entity_type": "Server", "name": "Server 001", "status": "online", "properties": {}},
+        {"entity_id": "APP-001", "entity_type": "Application", "name": "Payment", "status": "online", "properties": {}},
+    ]
+    client.get_state_version.return_value = "1:10"
+    client.calculate_cascading_impact.return_value = {
+        "affected_entities": [
+            {"entity_id": "APP-001", "entity_type": "Application", "depth": 1},
+            {"entity_id": "DEPT-001", "entity_type": "Department", "depth": 2},
+        ],
+        "critical_paths": [],
+        "impact_severity": "low",
+        "estimated_recovery_time": "1h"
+    }
+    return client
+
+
+@pytest.fixture
+def workflow(neo4j_client, mocked_workflow):
+    """Erstellt einen Workflow mit gemockten Agenten."""
+    return mocked_workflow(neo4j_client=neo4j_client, max_iterations=5, state_refresh_interval=3)
+
+
+@pytest.fixture
+def base_state():
+    """Erstellt einen Basis-State für Tests."""
+    return {
+        "scenario_id": "TEST-DELTA",
+        "scenario_type": ScenarioType.RANSOMWARE_DOUBLE_EXTORTION,
+        "current_phase": CrisisPhase.INITIAL_INCIDENT,
+        "injects": [],
+        "system_state": {},
+        "iteration": 0,
+        "max_iterations": 5,
+        "draft_inject": None,
+        "errors": [],
+        "warnings": [],
+        "metadata": {},
+        "workflow_log_count": 0,
+        "agent_decision_count": 0
+    }
+
+
+def _make_inject() -> Inject:
+    """Erstellt einen Inject, der SRV-001 betrifft."""
+    return Inject(
+        inject_id="INJ-001",
+        time_offset="T+00:30",
+        phase=CrisisPhase.INITIAL_INCIDENT,
+        source="Red Team / Attacker",
+        target="Blue Team / SOC",
+        modality=InjectModality.SIEM_ALERT,
+        content="Ransomware-Verschlüsselung auf SRV-001 erkannt.",
+        technical_metadata=TechnicalMetadata(mitre_id="T1486", affected_assets=["SRV-001"])
+    )
+
+
+class TestStateDeltas:
+    """Test-Klasse für State-Deltas."""
+
+    def test_initial_state_check_reads_graph(self, workflow, base_state, neo4j_client):
+        """Testet, dass der erste State Check vollständig liest."""
+        result = workflow._state_check_node(base_state)
+
+        assert set(result["system_state"].keys()) == {"SRV-001", "APP-001"}
+        assert result["metadata"]["state_last_full_read"] == 0
+        assert result["metadata"]["state_version"] == "1:10"
+        assert neo4j_client.get_current_state.call_count == 1
+
+    def test_state_update_returns_deltas(self, workflow, base_state, neo4j_client):
+        """Testet, dass State Update die geschriebenen Deltas inkl. Second-Order Effects zurückgibt."""
+        base_state.update(workflow._state_check_node(base_state))
+        base_state["draft_inject"] = _make_inject()
+        version_reads = neo4j_client.get_state_version.call_count
+
+        result = workflow._state_update_node(base_state)
+
+        system_state = result["system_state"]
+        assert system_state["SRV-001"]["status"] == workflow._determine_asset_status(CrisisPhase.INITIAL_INCIDENT, "T1486")
+        assert system_state["APP-001"]["status"] in ("degraded", "suspicious")
+        assert "DEPT-001" not in system_state  # Keine Assets → nicht übernommen
+        # Drei eigene Writes (SRV-001, APP-001, DEPT-001) - Version lokal fortgeschrieben, nicht neu gelesen
+        assert result["metadata"]["state_version"] == "1:13"
+        assert neo4j_client.get_state_version.call_count == version_reads
+        logger.info(f"✓ Deltas übernommen: {system_state}")
+
+    def test_state_check_uses_deltas_without_external_change(self, workflow, base_state, neo4j_client):
+        """Testet, dass ohne externe Änderung kein vollständiges Neu-Laden erfolgt."""
+        base_state.update(workflow._state_check_node(base_state))
+        base_state["draft_inject"] = _make_inject()
+        base_state.update(workflow._state_update_node(base_state))
+        neo4j_client.get_state_version.return_value = "1:13"  # Nur die eigenen drei Writes
+
+        result = workflow._state_check_node(base_state)
+
+        assert "system_state" not in result
+        assert workflow.get_workflow_logs(base_state["scenario_id"])[-1]["details"]["source"] == "deltas"
+        assert neo4j_client.get_current_state.call_count == 1
+
+    def test_concurrent_external_write_is_detected(self, workflow, base_state, neo4j_client):
+        """Testet, dass ein externer Write während des State Updates nicht als eigener gilt."""
+        base_state.update(workflow._state_check_node(base_state))
+        base_state["draft_inject"] = _make_inject()
+        base_state.update(workflow._state_update_node(base_state))
+        neo4j_client.get_state_version.return_value = "1:14"  # Drei eigene + ein externer Write
+
+        workflow._state_check_node(base_state)
+
+        assert workflow.get_workflow_logs(base_state["scenario_id"])[-1]["details"]["refresh_reason"] == "external_change"
+        assert neo4j_client.get_current_state.call_count == 2
+
+    def test_state_check_reloads_on_external_change(self, workflow, base_state, neo4j_client):
+        """Testet das Neu-Laden bei geänderter Zustandsversion."""
+        base_state.update(workflow._state_check_node(base_state))
+        base_state["iteration"] = 1
+        neo4j_client.get_state_version.return_value = "1:99"
+
+        result = workflow._state_check_node(base_state)
+
+        assert workflow.get_workflow_logs(base_state["scenario_id"])[-1]["details"]["refresh_reason"] == "external_change"
+        assert neo4j_client.get_current_state.call_count == 2
+
+    def test_state_check_reloads_after_interval(self, workflow, base_state, neo4j_client):
+        """Testet das Neu-Laden nach Ablauf des Refresh-Intervalls."""
+        base_state.update(workflow._state_check_node(base_state))
+        base_state["iteration"] = 3
+
+        result = workflow._state_check_node(base_state)
+
+        assert workflow.get_workflow_logs(base_state["scenario_id"])[-1]["details"]["refresh_reason"] == "interval"
+        assert result["metadata"]["state_last_full_read"] == 3
@@ -0,0 +1,117 @@
+"""
+Tests für strukturierte LLM-Ausgaben (utils/structured_output.py).
+
+Testet den toleranten JSON-Parser (Fences, Fließtext, abgeschnittene
+Antworten), die Schema-Validierung mit Parse-Statistik pro Agent und die
+Aktivierung des JSON-Modus nur für OpenAI-Modelle.
+"""
+
+import pytest
+import sys
+import json
+from pathlib import Path
+import logging
+
+# Füge Projekt-Root zum Python-Path hinzu
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.runnables import RunnableBinding
+
+from workflows.scenario_workflow import GeneratorAgent
+from agents.generator_agent import InjectDraftResponse
+from state_models import ScenarioType, CrisisPhase
+from utils.structured_output import (
+    json_mode,
+    parse_json_object,
+    parse_structured,
+    get_parse_stats,
+    reset_parse_stats
+)
+
+logger = logging.getLogger("tests.test_structured_output")
+
+
+class TestJsonParser:
+    """Test-Klasse für den toleranten JSON-Parser."""
+
+    @pytest.mark.parametrize("content, expected, outcome", [
+        ('{"a": 1}', {"a": 1}, "direct"),
+        ('```json\n{"a": 1}\n```', {"a": 1}, "direct"),
+        ('Hier das Ergebnis: {"a": {"b": 2}} und {"c": 3}', {"a": {"b": 2}}, "extracted"),
+        ('{"a": "Klammer } im Text"}', {"a": "Klammer } im Text"}, "direct"),
+        ('{"a": 1, "b": [1, 2,', {"a": 1, "b": [1, 2]}, "repaired"),
+        ('{"a": 1, "content": "abgeschnitt', {"a": 1, "content": "abgeschnitt"}, "repaired"),
+        ('{"a": 1, "b": tr', {"a": 1}, "repaired"),
+        ('{"meta": {"a": 1}, "content": "abge', {"meta": {"a": 1}, "content": "abge"}, "repaired"),
+        ('{"a": 1,}', {"a": 1}, "repaired"),
+        ("Keine Ahnung", None, "failures")
+    ])
+    def test_parse_json_object(self, content, expected, outcome):
+        """Testet direkte, extrahierte und reparierte Antworten."""
+        assert parse_json_object(content) == (expected, outcome)
+
+
+class TestParseStructured:
+    """Test-Klasse für Schema-Validierung und Parse-Statistik."""
+
+    def setup_method(self):
+        reset_parse_stats()
+
+    def test_schema_failures_counted_per_agent(self):
+        """Testet, dass Parse- und Schema-Fehler pro Agent gezählt werden."""
+        assert parse_structured('{"content": "Port-Scan erkannt"}', InjectDraftResponse, agent="generator") is not None
+        # Pflichtfeld content fehlt → Schema-Fehler
+        assert parse_structured('{"source": "SOC"}', InjectDraftResponse, agent="generator") is None
+        assert parse_structured("kein JSON", InjectDraftResponse, agent="critic") is None
+
+        stats = get_parse_stats()
+        assert stats["generator"]["direct"] == 1
+        assert stats["generator"]["failures"] == 1
+        assert stats["generator"]["failure_rate"] == 0.5
+        assert stats["critic"]["responses"] == 1
+        logger.info(f"✓ Parse-Statistik: {stats}")
+
+    def test_generator_accepts_truncated_response(self):
+        """Testet, dass eine abgeschnittene Antwort keinen Fallback-Inject erzeugt."""
+        response = json.dumps({
+            "time_offset": "T+00:45",
+            "modality": "SIEM Alert",
+            "technical_metadata": {"mitre_id": "T1046", "affected_assets": ["SRV-001"], "severity": "Low"},
+            "content": "Port-Scan gegen SRV-001 aus dem internen Netz erkannt"
+        })[:-2]
+
+        agent = GeneratorAgent()
+        agent.llm = FakeListChatModel(responses=[response])
+        inject = agent.generate_inject(
+            scenario_type=ScenarioType.RANSOMWARE_DOUBLE_EXTORTION,
+            phase=CrisisPhase.SUSPICIOUS_ACTIVITY,
+            inject_id="INJ-001",
+            time_offset="T+00:30",
+            manager_plan={"narrative": "Erkundung"},
+            selected_ttp={"mitre_id": "T1046", "name": "Network Service Discovery"},
+            system_state={"SRV-001": {"status": "online", "entity_type": "Server", "name": "Server 001"}},
+            previous_injects=[]
+        )
+
+        assert inject.content.startswith("Port-Scan gegen SRV-001")
+        assert get_parse_stats()["generator"]["repaired"] == 1
+
+
+class TestJsonMode:
+    """Test-Klasse für die Aktivierung des JSON-Modus."""
+
+    def test_only_openai_models_are_bound(self, monkeypatch):
+        """Testet response_format für OpenAI und unveränderte Fake-Modelle."""
+        agent = GeneratorAgent()
+        bound = json_mode(agent.llm)
+        assert isinstance(bound, RunnableBinding)
+        assert bound.kwargs["response_format"] == {"type": "json_object"}
+
+        fake = FakeListChatModel(responses=["{}"])
+        assert json_mode(fake) is fake
+
+        monkeypatch.setenv("LLM_JSON_MODE", "off")
+        assert json_mode(agent.llm) is agent.llm
@@ -0,0 +1,86 @@
+"""
+Tests für die Token- und Kosten-Erfassung (utils/token_usage.py).
+
+Testet die Zuordnung der LLM-Aufrufe zu Szenario, Node und Agent, die
+Übernahme in die Szenario-Metadaten und den Performance-Monitor sowie den
+Abbruch bei erschöpftem Token-Budget. Die Agenten verwenden das
+FakeChatModel aus dem Benchmark (ohne Latenz).
+"""
+
+import pytest
+import sys
+from pathlib import Path
+from unittest.mock import patch
+import logging
+
+# Füge Projekt-Root zum Python-Path hinzu
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from scripts.benchmark_workflow import build_synthetic_graph, create_benchmark_workflow
+from state_models import ScenarioType, ScenarioEndCondition, ValidationResult
+from utils.token_usage import estimate_cost
+
+logger = logging.getLogger("tests.test_token_usage")
+
+
+def _make_workflow(max_iterations: int):
+    return create_benchmark_workflow(
+        build_synthetic_graph(10), max_iterations=max_iterations, latency=0.0, jitter=0.0, seed=1
+    )
+
+
+class TestTokenUsage:
+    """Test-Klasse für die Token-Erfassung im Workflow."""
+
+    def test_usage_per_node_and_agent(self):
+        """Testet Aggregation pro Node/Agent in Metadaten und Performance-Monitor."""
+        workflow = _make_workflow(max_iterations=3)
+        result = workflow.generate_scenario(ScenarioType.RANSOMWARE_DOUBLE_EXTORTION, scenario_id="SCEN-TOK-1", mode="legacy")
+
+        usage = result["metadata"]["token_usage"]
+        assert usage["total"]["total_tokens"] > 0
+        assert usage["nodes"]["generator"]["calls"] == 3
+        assert usage["agents"]["generator"]["calls"] == 3
+        assert usage["nodes"]["manager"]["calls"] == usage["agents"]["manager"]["calls"] >= 1
+        assert sum(node["total_tokens"] for node in usage["nodes"].values()) == usage["total"]["total_tokens"]
+        assert workflow.performance_monitor.get_llm_usage_statistics()["generator"]["calls"] == 3
+        logger.info(f"✓ Token-Nutzung: {usage['total']}")
+
+    def test_token_budget_stops_scenario(self):
+        """Testet, dass ein erschöpftes Budget das Szenario nach dem aktuellen Inject beendet."""
+        workflow = _make_workflow(max_iterations=5)
+        workflow.token_budget = 1
+        result = workflow.generate_scenario(ScenarioType.RANSOMWARE_DOUBLE_EXTORTION, scenario_id="SCEN-TOK-2", mode="legacy")
+
+        assert len(result["injects"]) == 1
+        assert result["end_condition"] == ScenarioEndCondition.BUDGET_EXCEEDED.value
+        assert result["metadata"]["budget_exceeded"].startswith("Token-Budget erschöpft")
+
+    def test_budget_skips_refine(self):
+        """Testet, dass bei erschöpftem Budget nicht mehr verfeinert wird."""
+        workflow = _make_workflow(max_iterations=2)
+        workflow.token_budget = 100
+        state = {
+            "scenario_id": "SCEN-TOK-3",
+            "metadata": {},
+            "mode": "legacy",
+            "draft_inject": None,
+            "validation_result": ValidationResult(
+                is_valid=False, logical_consistency=False, dora_compliance=True, causal_validity=True, errors=["Fehler"]
+            )
+        }
+        usage = {"total": {"total_tokens": 150, "cost_usd": 0.0}, "nodes": {}, "agents": {}}
+        with patch("workflows.scenario_workflow.get_scenario_usage", return_value=usage):
+            assert workflow._should_refine(state) == "update"
+        assert "150/100" in state["metadata"]["budget_exceeded"]
+
+        workflow.token_budget = None
+        assert workflow._should_refine({**state, "metadata": {}}) == "refine"
+
+    def test_estimate_cost(self):
+        """Testet Preistabelle (Präfix-Match) und unbekannte Modelle."""
+        assert estimate_cost("gpt-4o", 1000, 1000) == pytest.approx(0.0125)
+        assert estimate_cost("gpt-4o-mini-2024-07-18", 1000, 0) == pytest.approx(0.00015)
+        assert estimate_cost("fake-chat-model", 1000, 1000) == 0.0
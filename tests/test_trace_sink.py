@@ -0,0 +1,137 @@
+"""
+Tests für die Trace-Sinks (Workflow-Logs und Agenten-Entscheidungen).
+
+Testet Ringpuffer, JSONL- und SQLite-Sink sowie die Anbindung im Workflow:
+Nodes schreiben in den Sink, im State stehen nur Zähler.
+"""
+
+import pytest
+import sys
+import json
+from pathlib import Path
+from unittest.mock import Mock, patch
+import logging
+
+# Füge Projekt-Root zum Python-Path hinzu
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from workflows.trace_sink import (
+    MemoryTraceSink,
+    JsonlTraceSink,
+    SqliteTraceSink,
+    create_trace_sink,
+    TRACE_LOGS,
+    TRACE_DECISIONS
+)
+from state_models import ScenarioType, CrisisPhase
+
+logger = logging.getLogger("tests.test_trace_sink")
+
+
+@pytest.fixture(params=["memory", "jsonl", "sqlite"])
+def sink(request, tmp_path):
+    """Erstellt jeden Sink-Typ einmal."""
+    if request.param == "memory":
+        return MemoryTraceSink()
+    if request.param == "jsonl":
+        return JsonlTraceSink(str(tmp_path / "traces"))
+    return SqliteTraceSink(str(tmp_path / "traces.sqlite"))
+
+
+class TestTraceSinks:
+    """Test-Klasse für die Sink-Implementierungen."""
+
+    def test_append_read_count(self, sink):
+        """Testet Schreiben, Lesen mit Offset/Limit und Zähler pro Szenario und Art."""
+        for number in range(5):
+            assert sink.append("SCEN-A", TRACE_LOGS, {"node": "Generator", "iteration": number}) == number + 1
+        sink.append("SCEN-A", TRACE_DECISIONS, {"agent": "Critic", "phase": CrisisPhase.INITIAL_INCIDENT})
+        sink.append("SCEN-B", TRACE_LOGS, {"node": "Manager"})
+
+        assert sink.count("SCEN-A", TRACE_LOGS) == 5
+        assert sink.count("SCEN-A", TRACE_DECISIONS) == 1
+        assert [e["iteration"] for e in sink.read("SCEN-A", TRACE_LOGS, offset=1, limit=2)] == [1, 2]
+        assert sink.read("SCEN-B", TRACE_LOGS) == [{"node": "Manager"}]
+
+        sink.clear("SCEN-A")
+        assert sink.count("SCEN-A", TRACE_LOGS) == 0
+        assert sink.count("SCEN-B", TRACE_LOGS) == 1
+        logger.info(f"✓ {type(sink).__name__}")
+
+    def test_memory_ring_buffer(self):
+        """Testet, dass der Ringpuffer begrenzt ist und Offsets absolut bleiben."""
+        sink = MemoryTraceSink(max_entries=3)
+        for number in range(10):
+            sink.append("SCEN-A", TRACE_LOGS, {"iteration": number})
+
+        assert sink.count("SCEN-A", TRACE_LOGS) == 10
+        assert [e["iteration"] for e in sink.read("SCEN-A", TRACE_LOGS)] == [7, 8, 9]
+        assert [e["iteration"] for e in sink.read("SCEN-A", TRACE_LOGS, offset=8)] == [8, 9]
+
+    def test_memory_evicts_least_recently_used_scenario(self):
+        """Testet die LRU-Begrenzung der Szenarien im Speicher."""
+        sink = MemoryTraceSink(max_scenarios=2)
+        sink.append("SCEN-A", TRACE_LOGS, {"node": "A"})
+        sink.append("SCEN-B", TRACE_LOGS, {"node": "B"})
+        sink.read("SCEN-A", TRACE_LOGS)  # SCEN-A zuletzt genutzt
+        sink.append("SCEN-C", TRACE_LOGS, {"node": "C"})
+
+        assert sink.count("SCEN-B", TRACE_LOGS) == 0
+        assert sink.read("SCEN-A", TRACE_LOGS) == [{"node": "A"}]
+        assert sink.read("SCEN-C", TRACE_LOGS) == [{"node": "C"}]
+
+    def test_jsonl_read_uses_line_index(self, tmp_path):
+        """Testet, dass read nur die angefragten Zeilen parst und externe Writes nachindiziert."""
+        writer = JsonlTraceSink(str(tmp_path))
+        for number in range(10):
+            writer.append("SCEN-A", TRACE_LOGS, {"iteration": number})
+            writer.append("SCEN-A", TRACE_DECISIONS, {"iteration": number})
+
+        reader = JsonlTraceSink(str(tmp_path))  # z.B. Dashboard in einem anderen Prozess
+        assert reader.count("SCEN-A", TRACE_LOGS) == 10
+
+        with patch("workflows.trace_sink.json.loads", wraps=json.loads) as loads:
+            assert reader.read("SCEN-A", TRACE_LOGS, offset=8, limit=1) == [{"iteration": 8}]
+        assert loads.call_count == 1
+
+        writer.append("SCEN-A", TRACE_LOGS, {"iteration": 10})
+        assert reader.count("SCEN-A", TRACE_LOGS) == 11
+        assert reader.read("SCEN-A", TRACE_LOGS, offset=10) == [{"iteration": 10}]
+
+    def test_create_trace_sink(self, tmp_path):
+        """Testet die Sink-Auswahl über die Spezifikation."""
+        assert isinstance(create_trace_sink("memory:10"), MemoryTraceSink)
+        assert isinstance(create_trace_sink(f"jsonl:{tmp_path}"), JsonlTraceSink)
+        assert isinstance(create_trace_sink(f"sqlite:{tmp_path / 't.sqlite'}"), SqliteTraceSink)
+        with pytest.raises(ValueError):
+            create_trace_sink("redis:localhost")
+
+
+class TestWorkflowTraces:
+    """Test-Klasse für die Trace-Anbindung im Workflow."""
+
+    def test_nodes_keep_only_counters_in_state(self, mocked_workflow):
+        """Testet, dass Nodes in den Sink schreiben und nur Zähler zurückgeben."""
+        sink = MemoryTraceSink()
+        workflow = mocked_workflow(neo4j_client=Mock(), trace_sink=sink)
+
+        state = {
+            "scenario_id": "SCEN-TRACE",
+            "scenario_type": ScenarioType.RANSOMWARE_DOUBLE_EXTORTION,
+            "current_phase": CrisisPhase.SUSPICIOUS_ACTIVITY,
+            "iteration": 0,
+            "available_ttps": [{"mitre_id": "T1566", "name": "Phishing", "technique_id": "T1566"}],
+            "errors": [],
+            "workflow_log_count": 0,
+            "agent_decision_count": 0
+        }
+        for _ in range(3):
+            state.update(workflow._action_selection_node(state))
+
+        assert "workflow_logs" not in state
+        assert state["workflow_log_count"] == 3
+        assert state["agent_decision_count"] == 3
+        assert len(workflow.get_workflow_logs("SCEN-TRACE")) == 3
+        assert workflow.get_agent_decisions("SCEN-TRACE")[0]["agent"] == "Action Selection"
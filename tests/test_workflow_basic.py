@@ -86,8 +86,8 @@ class TestWorkflowState:
             "warnings": [],
             "start_time": None,
             "metadata": {},
-            "workflow_logs": [],
-            "agent_decisions": [],
+            "workflow_log_count": 0,
+            "agent_decision_count": 0,
             "pending_decision": None,
             "user_decisions": [],
             "end_condition": None,
@@ -97,7 +97,7 @@ class TestWorkflowState:
         result = workflow._state_check_node(state)
         
         assert "system_state" in result
-        assert "workflow_logs" in result
+        assert "workflow_log_count" in result
         assert isinstance(result["system_state"], dict)
     
     def test_state_update_iteration_increment(self, workflow):
@@ -120,8 +120,8 @@ class TestWorkflowState:
             "warnings": [],
             "start_time": None,
             "metadata": {},
-            "workflow_logs": [],
-            "agent_decisions": [],
+            "workflow_log_count": 0,
+            "agent_decision_count": 0,
             "pending_decision": None,
             "user_decisions": [],
             "end_condition": None,
@@ -144,7 +144,7 @@ class TestWorkflowLogic:
             "injects": [],
             "errors": [],
             "current_phase": CrisisPhase.NORMAL_OPERATION,
-            "workflow_logs": []
+            "workflow_log_count": 0
         }
         
         result = workflow._should_continue(state)
@@ -179,7 +179,7 @@ class TestWorkflowLogic:
             "injects": mock_injects,
             "errors": [],
             "current_phase": CrisisPhase.NORMAL_OPERATION,
-            "workflow_logs": []
+            "workflow_log_count": 0
         }
         
         result = workflow._should_continue(state)
@@ -212,7 +212,7 @@ class TestInteractiveMode:
             "interactive_mode": True,
             "user_decisions": [],
             "system_state": {},
-            "workflow_logs": []
+            "workflow_log_count": 0
         }
         
         result = workflow._should_ask_decision(state)
@@ -251,7 +251,7 @@ class TestInteractiveMode:
             "interactive_mode": True,
             "user_decisions": [],
             "system_state": {},
-            "workflow_logs": []
+            "workflow_log_count": 0
         }
         
         result = workflow._should_ask_decision(state)
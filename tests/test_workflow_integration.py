@@ -80,8 +80,8 @@ class TestWorkflowIntegration:
             "warnings": [],
             "start_time": None,
             "metadata": {},
-            "workflow_logs": [],
-            "agent_decisions": [],
+            "workflow_log_count": 0,
+            "agent_decision_count": 0,
             "pending_decision": None,
             "user_decisions": [],
             "end_condition": None,
@@ -119,8 +119,8 @@ class TestWorkflowIntegration:
             "warnings": [],
             "start_time": None,
             "metadata": {},
-            "workflow_logs": [],
-            "agent_decisions": [],
+            "workflow_log_count": 0,
+            "agent_decision_count": 0,
             "pending_decision": None,
             "user_decisions": [],
             "end_condition": None,
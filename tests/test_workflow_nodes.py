@@ -64,8 +64,8 @@ def base_state():
         "warnings": [],
         "start_time": None,
         "metadata": {},
-        "workflow_logs": [],
-        "agent_decisions": [],
+        "workflow_log_count": 0,
+        "agent_decision_count": 0,
         "pending_decision": None,
         "user_decisions": [],
         "end_condition": None,
@@ -82,7 +82,7 @@ class TestStateCheckNode:
         
         assert isinstance(result, dict)
         assert "system_state" in result
-        assert "workflow_logs" in result
+        assert "workflow_log_count" in result
     
     def test_system_state_is_dict(self, workflow, base_state):
         """Testet ob system_state direktes Dictionary ist."""
@@ -109,7 +109,7 @@ class TestManagerNode:
             
             assert isinstance(result, dict)
             assert "manager_plan" in result
-            assert "workflow_logs" in result
+            assert "workflow_log_count" in result
         except Exception as e:
             # Kann fehlschlagen wenn LLM nicht verfügbar
             pytest.skip(f"Manager node requires LLM: {e}")
@@ -124,7 +124,7 @@ class TestIntelNode:
         
         assert isinstance(result, dict)
         assert "available_ttps" in result
-        assert "workflow_logs" in result
+        assert "workflow_log_count" in result
         assert isinstance(result["available_ttps"], list)
 
 
@@ -141,7 +141,7 @@ class TestActionSelectionNode:
         
         assert isinstance(result, dict)
         assert "selected_action" in result
-        assert "workflow_logs" in result
+        assert "workflow_log_count" in result
     
     def test_action_selection_without_ttps(self, workflow, base_state):
         """Testet action_selection_node ohne verfügbare TTPs."""
@@ -0,0 +1,132 @@
+"""
+Tests für den Workflow-Pool der API (workflows/workflow_pool.py).
+
+Testet exklusives Ausleihen und Wiederverwenden pro Konfiguration, die
+Wartezeit bei erschöpftem Pool, das unbegrenzte, abbrechbare Warten der
+Job-Worker, das Vorwärmen sowie max_iterations pro Aufruf statt auf der
+Instanz.
+"""
+
+import math
+import pytest
+import sys
+import threading
+import time
+from pathlib import Path
+import logging
+
+# Füge Projekt-Root zum Python-Path hinzu
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from scripts.benchmark_workflow import build_synthetic_graph, create_benchmark_workflow
+from state_models import ScenarioType
+from utils.cancellation import OperationCancelled
+from workflows.workflow_pool import WorkflowPool, PoolExhausted, pool_key, DEFAULT_STANDARDS
+
+logger = logging.getLogger("tests.test_workflow_pool")
+
+
+class _Instance:
+    def __init__(self, standards, interactive):
+        self.standards = standards
+        self.interactive = interactive
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class TestWorkflowPool:
+    """Test-Klasse für Ausleihen, Rückgabe und Vorwärmen."""
+
+    def test_pool_key_normalization(self):
+        """Testet, dass Reihenfolge/Schreibweise der Standards egal ist."""
+        assert pool_key(["nist", "DORA"]) == pool_key(["DORA", "NIST"]) == (("DORA", "NIST"), False)
+        assert pool_key(None, interactive=True) == (DEFAULT_STANDARDS, True)
+
+    def test_instances_reused_per_key(self):
+        """Testet Wiederverwendung nach Rückgabe und getrennte Instanzen pro Konfiguration."""
+        created = []
+        pool = WorkflowPool(lambda *key: created.append(key) or _Instance(*key), max_per_key=2)
+
+        first = pool.acquire(["DORA"])
+        pool.release(first)
+        assert pool.acquire(["dora"]) is first
+        second = pool.acquire(["DORA"])
+        assert second is not first
+        nist = pool.acquire(["NIST"], interactive=True)
+        assert (nist.standards, nist.interactive) == (("NIST",), True)
+        assert len(created) == 3
+
+        stats = {tuple(entry["compliance_standards"]): entry for entry in pool.stats()["pools"]}
+        assert stats[("DORA",)]["in_use"] == 2
+        assert stats[("DORA",)]["borrows"] == 3
+        pool.release(object())  # fremde Objekte werden ignoriert
+
+    def test_exhausted_pool_waits_and_times_out(self):
+        """Testet Warten auf eine freie Instanz und PoolExhausted nach Ablauf."""
+        pool = WorkflowPool(_Instance, max_per_key=1, timeout=0.05)
+        instance = pool.acquire()
+        with pytest.raises(PoolExhausted):
+            pool.acquire()
+
+        threading.Timer(0.05, pool.release, args=(instance,)).start()
+        start = time.monotonic()
+        assert pool.acquire(timeout=2) is instance
+        assert time.monotonic() - start < 1.5
+        assert pool.stats()["pools"][0]["waits"] == 2
+
+    def test_unbounded_wait_until_release_or_cancel(self):
+        """Testet das Warten ohne Zeitlimit (Job-Worker) und den Abbruch über das Cancel-Event."""
+        pool = WorkflowPool(_Instance, max_per_key=1, timeout=0.05)
+        instance = pool.acquire()
+
+        cancel_event = threading.Event()
+        threading.Timer(0.2, pool.release, args=(instance,)).start()
+        assert pool.acquire(timeout=math.inf, cancel_event=cancel_event) is instance
+
+        threading.Timer(0.1, cancel_event.set).start()
+        start = time.monotonic()
+        with pytest.raises(OperationCancelled):
+            pool.acquire(timeout=math.inf, cancel_event=cancel_event)
+        assert time.monotonic() - start < 1.5
+
+    def test_warm_up(self):
+        """Testet das Vorwärmen und das Ignorieren fehlschlagender Factories."""
+        pool = WorkflowPool(_Instance, max_per_key=2)
+        pool.warm_up([(DEFAULT_STANDARDS, False)], count=3)
+        assert pool.stats()["pools"][0]["idle"] == 2
+
+        def failing(*key):
+            raise RuntimeError("Neo4j nicht erreichbar")
+
+        broken = WorkflowPool(failing)
+        broken.warm_up([(DEFAULT_STANDARDS, False)])
+        assert broken.instances() == []
+
+    def test_close_releases_instances(self):
+        """Testet, dass close() alle Instanzen (frei und ausgeliehen) schließt und den Pool leert."""
+        pool = WorkflowPool(_Instance, max_per_key=2)
+        idle = pool.acquire()
+        borrowed = pool.acquire()
+        pool.release(idle)
+
+        pool.close()
+        assert idle.closed and borrowed.closed
+        assert pool.instances() == []
+        assert pool.stats()["pools"][0]["instances"] == 0
+
+    def test_max_iterations_per_call(self):
+        """Testet, dass max_iterations pro Aufruf gilt und die Instanz unverändert bleibt."""
+        workflow = create_benchmark_workflow(
+            build_synthetic_graph(10), max_iterations=5, latency=0.0, jitter=0.0, seed=1
+        )
+        result = workflow.generate_scenario(
+            ScenarioType.RANSOMWARE_DOUBLE_EXTORTION, scenario_id="SCEN-POOL-1", mode="legacy", max_iterations=2
+        )
+        assert len(result["injects"]) == 2
+        assert result["max_iterations"] == 2
+        assert workflow.max_iterations == 5
+        logger.info(f"✓ Injects mit max_iterations=2: {len(result['injects'])}")
@@ -0,0 +1,67 @@
+"""
+Kooperativer Abbruch für LLM-Calls.
+
+Ein Cancel-Event wird per `cancellation_scope` an den aktuellen Thread
+gebunden; `check_cancelled()` wird vor jedem LLM-Call aufgerufen (z.B. in
+`safe_llm_call`) und bricht mit `OperationCancelled` ab, sobald das Event
+gesetzt ist. Verwendet z.B. beim spekulativen Drafting, um unterlegene
+Kandidaten nach dem ersten validen Ergebnis zu stoppen.
+
+Optional trägt der Scope eine Frist (z.B. das Zeitlimit eines Workflow-Nodes);
+`remaining_time()` liefert die Restzeit, die Neo4j-Abfragen als
+Transaktions-Timeout verwenden (siehe neo4j_client.py).
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+
+class OperationCancelled(Exception):
+    """Die Operation wurde über das Cancel-Event des aktuellen Threads abgebrochen."""
+
+
+_local = threading.local()
+
+
+@contextmanager
+def cancellation_scope(cancel_event: Optional[threading.Event], deadline: Optional[float] = None):
+    """
+    Bindet ein Cancel-Event an den aktuellen Thread (verschachtelbar).
+
+    Args:
+        cancel_event: Event, dessen Setzen laufende Operationen abbricht
+        deadline: Optionale Frist (time.time()); die früheste Frist umgebender Scopes bleibt gültig
+    """
+    previous = getattr(_local, "event", None)
+    previous_deadline = getattr(_local, "deadline", None)
+    _local.event = cancel_event
+    if deadline is not None and previous_deadline is not None:
+        deadline = min(deadline, previous_deadline)
+    _local.deadline = deadline if deadline is not None else previous_deadline
+    try:
+        yield
+    finally:
+        _local.event = previous
+        _local.deadline = previous_deadline
+
+
+def remaining_time() -> Optional[float]:
+    """Restzeit bis zur Frist des aktuellen Threads in Sekunden (None ohne Frist)."""
+    deadline = getattr(_local, "deadline", None)
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.time())
+
+
+def is_cancelled() -> bool:
+    """Ob das Cancel-Event des aktuellen Threads gesetzt ist."""
+    event = getattr(_local, "event", None)
+    return event is not None and event.is_set()
+
+
+def check_cancelled():
+    """Wirft OperationCancelled, wenn das Cancel-Event des aktuellen Threads gesetzt ist."""
+    if is_cancelled():
+        raise OperationCancelled("Operation abgebrochen")
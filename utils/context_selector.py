@@ -0,0 +1,165 @@
+"""
+Relevanz-Auswahl des Systemzustands für Agenten-Prompts.
+
+Ohne Auswahl landet jede Asset-Zeile in jedem Prompt; Prompt-Größe, Kosten
+und Latenz wachsen linear mit der Infrastruktur. Ab `max_assets` Assets
+wählt `select_relevant_assets` deshalb nur die für den aktuellen Schritt
+relevanten aus, in dieser Reihenfolge:
+
+1. Fokus-Assets (Ziele des Manager-Plans, Assets der letzten Injects bzw. des
+   zu prüfenden Injects)
+2. deren k-Hop-Nachbarschaft im Abhängigkeitsgraph (Einträge "dependencies"
+   im Systemzustand, ungerichtet)
+3. kompromittierte bzw. beeinträchtigte Assets (Status außerhalb des Normalbetriebs)
+4. eine begrenzte Stichprobe der übrigen (kritische zuerst, dann nach ID)
+
+Die ausgewählten Assets behalten die Reihenfolge des Systemzustands (stabile
+Prompt-Präfixe); `status_summary` ergänzt eine kompakte Zeile mit den
+Anzahlen pro Status über alle Assets. Kleine Infrastrukturen bleiben
+unverändert vollständig im Prompt.
+
+Konfiguration über Umgebungsvariablen:
+- SYSTEM_STATE_MAX_ASSETS: Maximale Anzahl Assets im Prompt (Standard: 40)
+- SYSTEM_STATE_HOPS: Tiefe der Nachbarschaft um Fokus-Assets (Standard: 1)
+- SYSTEM_STATE_SAMPLE: Maximale Stichprobe sonstiger Assets (Standard: 10)
+"""
+
+import os
+from collections import Counter, deque
+from typing import Any, Dict, Iterable, List, Optional
+
+DEFAULT_MAX_ASSETS = 40
+DEFAULT_HOPS = 1
+DEFAULT_SAMPLE_SIZE = 10
+
+# Status, die als Normalbetrieb gelten (alles andere ist "betroffen")
+NORMAL_STATUSES = frozenset({"online", "normal", "operational", "active", "running", "healthy", "unknown"})
+CRITICALITY_RANK = {"critical": 0, "high": 1, "medium": 2, "standard": 3, "low": 4}
+
+# Letzte Injects, deren Assets in den Fokus eingehen
+FOCUS_INJECTS = 3
+
+
+def _asset_status(entity_data: Any) -> str:
+    if isinstance(entity_data, dict):
+        return str(entity_data.get("status", "unknown")).lower()
+    return str(entity_data).lower()
+
+
+def focus_assets(
+    injects: Iterable[Any] = (),
+    manager_plan: Optional[Dict[str, Any]] = None,
+    extra: Iterable[str] = ()
+) -> List[str]:
+    """
+    Fokus-Assets eines Schritts (ohne Duplikate, Reihenfolge wie angegeben).
+
+    Args:
+        injects: Injects, deren betroffene Assets relevant sind (die letzten FOCUS_INJECTS)
+        manager_plan: Storyline-Plan des Managers (affected_assets und Assets der Schritte)
+        extra: Weitere Asset-IDs (z.B. des zu prüfenden Injects)
+    """
+    assets: List[str] = list(extra)
+    if manager_plan:
+        assets.extend(manager_plan.get("affected_assets") or [])
+        for step in manager_plan.get("steps") or []:
+            if isinstance(step, dict):
+                assets.extend(step.get("assets") or [])
+    for inject in list(injects)[-FOCUS_INJECTS:]:
+        if isinstance(inject, dict):
+            metadata = inject.get("technical_metadata") or {}
+            assets.extend(metadata.get("affected_assets") or [])
+        elif getattr(inject, "technical_metadata", None) is not None:
+            assets.extend(inject.technical_metadata.affected_assets or [])
+    return list(dict.fromkeys(str(asset) for asset in assets if asset))
+
+
+def _neighbourhood(system_state: Dict[str, Any], start: List[str], hops: int) -> List[str]:
+    """Assets im Abstand 1..hops von `start` (Breitensuche, Abhängigkeiten ungerichtet)."""
+    if hops <= 0 or not start:
+        return []
+    adjacency: Dict[str, List[str]] = {}
+    for entity_id, entity_data in system_state.items():
+        if not isinstance(entity_data, dict):
+            continue
+        for target in entity_data.get("dependencies") or []:
+            if target in system_state:
+                adjacency.setdefault(entity_id, []).append(target)
+                adjacency.setdefault(target, []).append(entity_id)
+    visited = set(start)
+    found = []
+    queue = deque((asset, 0) for asset in start)
+    while queue:
+        current, depth = queue.popleft()
+        if depth >= hops:
+            continue
+        for neighbour in adjacency.get(current, []):
+            if neighbour not in visited:
+                visited.add(neighbour)
+                found.append(neighbour)
+                queue.append((neighbour, depth + 1))
+    return found
+
+
+def select_relevant_assets(
+    system_state: Dict[str, Any],
+    focus: Iterable[str] = (),
+    max_assets: Optional[int] = None,
+    hops: Optional[int] = None,
+    sample_size: Optional[int] = None
+) -> List[str]:
+    """
+    Wählt die für den aktuellen Schritt relevanten Asset-IDs aus.
+
+    Args:
+        system_state: entity_id -> entity_data
+        focus: Fokus-Assets (siehe focus_assets)
+        max_assets: Maximale Anzahl (Standard: SYSTEM_STATE_MAX_ASSETS)
+        hops: Tiefe der Nachbarschaft (Standard: SYSTEM_STATE_HOPS)
+        sample_size: Maximale Stichprobe sonstiger Assets (Standard: SYSTEM_STATE_SAMPLE)
+
+    Returns:
+        Asset-IDs in der Reihenfolge des Systemzustands (alle, wenn höchstens max_assets)
+    """
+    if max_assets is None:
+        max_assets = int(os.getenv("SYSTEM_STATE_MAX_ASSETS", DEFAULT_MAX_ASSETS))
+    if len(system_state) <= max_assets:
+        return list(system_state)
+    if hops is None:
+        hops = int(os.getenv("SYSTEM_STATE_HOPS", DEFAULT_HOPS))
+    if sample_size is None:
+        sample_size = int(os.getenv("SYSTEM_STATE_SAMPLE", DEFAULT_SAMPLE_SIZE))
+
+    selected: Dict[str, None] = {}
+
+    def add(candidates: Iterable[str], limit: int = max_assets):
+        for asset in candidates:
+            if len(selected) >= limit:
+                return
+            selected.setdefault(asset, None)
+
+    focus_ids = [asset for asset in dict.fromkeys(focus) if asset in system_state]
+    affected = [
+        entity_id for entity_id, entity_data in system_state.items()
+        if _asset_status(entity_data) not in NORMAL_STATUSES
+    ]
+    add(focus_ids)
+    add(_neighbourhood(system_state, focus_ids, hops))
+    add(affected)
+    others = sorted(
+        (entity_id for entity_id in system_state if entity_id not in selected),
+        key=lambda entity_id: (
+            CRITICALITY_RANK.get(str((system_state[entity_id] or {}).get("criticality", "standard")).lower(), 3)
+            if isinstance(system_state[entity_id], dict) else 3,
+            entity_id
+        )
+    )
+    add(others, min(max_assets, len(selected) + sample_size))
+    return [entity_id for entity_id in system_state if entity_id in selected]
+
+
+def status_summary(system_state: Dict[str, Any], shown: int) -> str:
+    """Kompakte Zusammenfassung: Anzahl Assets pro Status und wie viele im Prompt stehen."""
+    counts = Counter(_asset_status(entity_data) for entity_data in system_state.values())
+    per_status = ", ".join(f"{status}: {count}" for status, count in counts.most_common())
+    return f"Gesamt: {len(system_state)} Assets ({per_status}) - im Prompt: {shown} relevante Assets"
@@ -0,0 +1,190 @@
+"""
+Konfigurierbares Fake-Chat-Modell für Benchmarks und Offline-Läufe.
+
+Liefert für jeden Agenten schema-konforme JSON-Antworten, die aus dem
+gerenderten Prompt abgeleitet werden (Phase, TTP, Asset-IDs, Anforderungen),
+und simuliert eine konfigurierbare Latenz. Die simulierte LLM-Zeit wird pro
+Thread aufsummiert, damit Benchmarks die eigene Orchestrierungs-Zeit eines
+Nodes (Wandzeit minus LLM-Zeit) bestimmen können.
+"""
+
+import json
+import math
+import random
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+
+ASSET_ID_PATTERN = re.compile(r"\b(?:SRV|APP|DB|SVC|SYS)-[A-Z0-9-]*\d\b")
+
+# Simulierte LLM-Zeit pro Thread (Sekunden)
+_llm_time = threading.local()
+
+
+def llm_seconds() -> float:
+    """Bisher im aktuellen Thread simulierte LLM-Zeit in Sekunden."""
+    return getattr(_llm_time, "seconds", 0.0)
+
+
+def _prompt_text(messages: List[BaseMessage]) -> str:
+    return "\n".join(m.content if isinstance(m.content, str) else json.dumps(m.content) for m in messages)
+
+
+def _first(pattern: str, text: str, default: Optional[str] = None) -> Optional[str]:
+    match = re.search(pattern, text)
+    return match.group(1) if match else default
+
+
+def _manager_response(prompt: str) -> Dict[str, Any]:
+    phase = _first(r"Vorgeschlagene nächste Phase: (\w+)", prompt, "SUSPICIOUS_ACTIVITY")
+    assets = ASSET_ID_PATTERN.findall(prompt)[:2]
+    step_count = int(_first(r"genau (\d+) Schritte", prompt, "1"))
+    return {
+        "next_phase": phase,
+        "narrative": f"Der Angreifer setzt das Szenario in Phase {phase} fort.",
+        "key_events": ["Auffällige Anmeldungen", "Erhöhte Netzwerklast"],
+        "affected_assets": assets,
+        "business_impact": "Eingeschränkte Verfügbarkeit kritischer Funktionen",
+        "steps": [{"event": f"Ereignis {i + 1} in Phase {phase}", "assets": assets} for i in range(step_count)]
+    }
+
+
+def _generator_response(prompt: str) -> Dict[str, Any]:
+    assets = list(dict.fromkeys(ASSET_ID_PATTERN.findall(prompt)))[:2] or ["SRV-001"]
+    mitre_id = _first(r"- TTP: .*\((T\d{4}(?:\.\d{3})?)\)", prompt, "T1078")
+    sequence = _first(r"Inject IDs \(in dieser Reihenfolge\): ([^\n]+)", prompt)
+    if sequence:
+        # Inject-Sequenz (GeneratorAgent.generate_injects)
+        offsets = (_first(r"Zeitversätze[^:]*: ([^\n]+)", prompt) or "").split(", ")
+        injects = []
+        for index, inject_id in enumerate(sequence.split(", ")):
+            inject = _single_inject(assets, mitre_id, offsets[index] if index < len(offsets) else None)
+            inject["inject_id"] = inject_id
+            injects.append(inject)
+        return {"injects": injects}
+    return _single_inject(assets, mitre_id, _first(r"Zeitversatz[^:]*: (T\+[\d:]+)", prompt))
+
+
+def _single_inject(assets: List[str], mitre_id: str, time_offset: Optional[str]) -> Dict[str, Any]:
+    response = {
+        "source": "Red Team / Attacker",
+        "target": "Blue Team / SOC",
+        "modality": "SIEM Alert",
+        "content": f"SIEM meldet verdächtige Aktivität ({mitre_id}) auf {', '.join(assets)}. Das SOC prüft die Alarme.",
+        "technical_metadata": {"mitre_id": mitre_id, "affected_assets": assets, "severity": "Medium"},
+        "business_impact": "Mögliche Beeinträchtigung der betroffenen Systeme"
+    }
+    if time_offset:
+        response["time_offset"] = time_offset
+    return response
+
+
+def _critic_response(prompt: str) -> Dict[str, Any]:
+    return {
+        "logical_consistency": True,
+        "causal_validity": True,
+        "regulatory_compliance": True,
+        "errors": [],
+        "warnings": []
+    }
+
+
+def _compliance_response(prompt: str) -> Dict[str, Any]:
+    requirements = list(dict.fromkeys(re.findall(r"\bDORA_Art\d+_\w+", prompt)))
+    return {
+        "requirements_met": requirements,
+        "requirements_missing": [],
+        "warnings": [],
+        "compliance_score": 1.0,
+        "details": {}
+    }
+
+
+# Agent-Name -> Funktion(Prompt-Text) -> JSON-Antwort
+CANNED_RESPONDERS: Dict[str, Callable[[str], Dict[str, Any]]] = {
+    "manager": _manager_response,
+    "generator": _generator_response,
+    "critic": _critic_response,
+    "compliance_dora": _compliance_response,
+}
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    Chat-Modell ohne Netzwerk mit simulierter Latenz.
+
+    Attributes:
+        agent: Agent-Name (wählt die Antwort-Vorlage aus CANNED_RESPONDERS)
+        latency: Mittlere Latenz pro Aufruf in Sekunden
+        jitter: Standardabweichung der Latenz in Sekunden (bei normal/lognormal)
+        distribution: Latenz-Verteilung: normal (abgeschnitten bei 0), lognormal
+                      (rechtsschief, typisch für API-Latenzen) oder exponential
+                      (Mittelwert = latency, jitter wird ignoriert)
+        seed: Seed für reproduzierbare Latenzen
+        responder: Optional eigene Funktion(Prompt-Text) -> Antwort (str oder dict)
+    """
+
+    agent: str = "generator"
+    latency: float = 0.0
+    jitter: float = 0.0
+    distribution: str = "normal"
+    seed: Optional[int] = None
+    responder: Optional[Callable[[str], Any]] = None
+    model_name: str = "fake-chat-model"
+    temperature: Optional[float] = None
+    calls: int = 0
+
+    def model_post_init(self, __context: Any):
+        self._random = random.Random(self.seed)
+        self._lock = threading.Lock()
+        self.metadata = {"agent": self.agent, **(self.metadata or {})}
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat-model"
+
+    def _sample_latency(self) -> float:
+        if self.latency <= 0:
+            return 0.0
+        if self.distribution == "exponential":
+            with self._lock:
+                return self._random.expovariate(1.0 / self.latency)
+        if self.jitter <= 0:
+            return self.latency
+        with self._lock:
+            if self.distribution == "lognormal":
+                # Parameter so gewählt, dass Mittelwert und Standardabweichung latency/jitter entsprechen
+                sigma = math.sqrt(math.log(1 + (self.jitter / self.latency) ** 2))
+                return self._random.lognormvariate(math.log(self.latency) - sigma ** 2 / 2, sigma)
+            return max(0.0, self._random.gauss(self.latency, self.jitter))
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        prompt = _prompt_text(messages)
+        responder = self.responder or CANNED_RESPONDERS.get(self.agent, _critic_response)
+        content = responder(prompt)
+        if not isinstance(content, str):
+            content = json.dumps(content, ensure_ascii=False)
+
+        latency = self._sample_latency()
+        if latency > 0:
+            time.sleep(latency)
+        _llm_time.seconds = llm_seconds() + latency
+        with self._lock:
+            self.calls += 1
+
+        usage = {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(content) // 4}
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        message = AIMessage(content=content, response_metadata={"model_name": self.model_name, "token_usage": usage})
+        return ChatResult(generations=[ChatGeneration(message=message)], llm_output={"token_usage": usage})
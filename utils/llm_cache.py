@@ -0,0 +1,225 @@
+"""
+Persistenter Antwort-Cache für LLM-Aufrufe.
+
+Identische Prompts kommen ständig wieder: Compliance-Prüfungen desselben
+Inhalts, Critic-Revalidierungen unveränderter Drafts, wiederholte
+Evaluierungsläufe. `wrap_llm` (siehe utils/llm_recorder.py) hüllt die
+Chat-Modelle der freigeschalteten Agenten in ein CachingChatModel, das
+Antworten unter dem Schlüssel (Modell, Temperatur, Hash der gerenderten
+Nachrichten) in einer lokalen SQLite-Datei ablegt.
+
+Die Datei ist auf `max_entries` Antworten begrenzt; verdrängt wird die am
+längsten nicht mehr genutzte (LRU). Treffer liefern keine Token-Nutzung,
+damit die Kosten-Erfassung (utils/token_usage.py) nur echte Aufrufe zählt.
+Trefferquoten pro Agent liefert `stats()` bzw. die API unter
+/api/llm/cache-stats.
+
+Konfiguration über Umgebungsvariablen:
+- LLM_CACHE: on | off (Standard: off)
+- LLM_CACHE_PATH: SQLite-Datei (Standard: logs/llm_cache.sqlite)
+- LLM_CACHE_AGENTS: Agenten mit Cache, Präfixe kommagetrennt (Standard: critic,compliance;
+  kreative Generierung durch Manager und Generator bleibt ungecacht)
+- LLM_CACHE_MAX_ENTRIES: Maximale Anzahl Antworten (Standard: 10000)
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+DEFAULT_CACHE_PATH = "logs/llm_cache.sqlite"
+DEFAULT_CACHE_AGENTS = ("critic", "compliance")
+DEFAULT_MAX_ENTRIES = 10000
+
+
+class LLMResponseCache:
+    """
+    SQLite-gestützter LRU-Cache für LLM-Antworten.
+
+    Args:
+        path: SQLite-Datei (":memory:" möglich)
+        agents: Agenten-Präfixe mit Cache (z.B. "critic" deckt "critic" ab,
+                "compliance" deckt "compliance_dora" ab)
+        max_entries: Maximale Anzahl gespeicherter Antworten
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_CACHE_PATH,
+        agents: Iterable[str] = DEFAULT_CACHE_AGENTS,
+        max_entries: int = DEFAULT_MAX_ENTRIES
+    ):
+        self.path = str(path)
+        self.agents = tuple(agent.strip() for agent in agents if agent.strip())
+        self.max_entries = max(1, int(max_entries))
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        # check_same_thread=False: spekulative Kandidaten und Compliance-Prüfungen laufen parallel
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+        with self._lock, self._connection:
+            self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    agent TEXT NOT NULL,
+                    model TEXT,
+                    response TEXT NOT NULL,
+                    response_metadata TEXT,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL,
+                    hits INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            self._connection.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)")
+
+    def enabled_for(self, agent: str) -> bool:
+        """Ob Antworten dieses Agenten gecacht werden."""
+        return any(agent.startswith(prefix) for prefix in self.agents)
+
+    def _count(self, agent: str, name: str, amount: int = 1):
+        stats = self._stats.setdefault(agent, {"hits": 0, "misses": 0, "stores": 0, "evictions": 0})
+        stats[name] += amount
+
+    def get(self, key: str, agent: str) -> Optional[Dict[str, Any]]:
+        """Gespeicherte Antwort ({"response", "response_metadata"}) oder None."""
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT response, response_metadata FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self._count(agent, "misses")
+                return None
+            self._connection.execute(
+                "UPDATE responses SET last_used = ?, hits = hits + 1 WHERE key = ?", (time.time(), key)
+            )
+            self._count(agent, "hits")
+        return {"response": row[0], "response_metadata": json.loads(row[1] or "{}")}
+
+    def put(self, key: str, agent: str, model: Optional[str], response: str, response_metadata: Dict[str, Any]):
+        """Speichert eine Antwort und verdrängt bei Überschreitung die ältesten (LRU)."""
+        now = time.time()
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses (key, agent, model, response, response_metadata, created_at, last_used)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, agent, model, response, json.dumps(response_metadata, default=str), now, now)
+            )
+            self._count(agent, "stores")
+            overflow = self._connection.execute("SELECT COUNT(*) FROM responses").fetchone()[0] - self.max_entries
+            if overflow > 0:
+                self._connection.execute(
+                    "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY last_used LIMIT ?)",
+                    (overflow,)
+                )
+                self._count(agent, "evictions", overflow)
+
+    def clear(self):
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM responses")
+
+    def stats(self) -> Dict[str, Any]:
+        """Treffer, Fehlschläge und Trefferquote pro Agent sowie Füllstand der Datei."""
+        with self._lock:
+            entries = self._connection.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            agents = {agent: dict(stats) for agent, stats in self._stats.items()}
+        for stats in agents.values():
+            lookups = stats["hits"] + stats["misses"]
+            stats["hit_ratio"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        hits = sum(stats["hits"] for stats in agents.values())
+        lookups = hits + sum(stats["misses"] for stats in agents.values())
+        return {
+            "path": self.path,
+            "cached_agents": list(self.agents),
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "hit_ratio": round(hits / lookups, 3) if lookups else 0.0,
+            "agents": agents
+        }
+
+
+class CachingChatModel(BaseChatModel):
+    """Chat-Modell-Hülle, die Antworten aus dem LLMResponseCache liefert bzw. dort ablegt."""
+
+    inner: BaseChatModel
+    response_cache: Any  # "cache" ist bereits ein Feld von BaseChatModel (LangChain-eigener Cache)
+    agent: str = "llm"
+    model_name: Optional[str] = None
+    temperature: Optional[float] = None
+
+    @property
+    def _llm_type(self) -> str:
+        return f"caching-{self.inner._llm_type}"
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        # Import hier: llm_recorder importiert dieses Modul für wrap_llm
+        from utils.llm_recorder import prompt_key, serialize_messages
+
+        params = {**kwargs, "temperature": kwargs.get("temperature", self.temperature), "stop": stop}
+        key = prompt_key(self.model_name, params, serialize_messages(messages))
+        cached = self.response_cache.get(key, self.agent)
+        if cached is not None:
+            metadata = {**cached["response_metadata"], "cached": True}
+            message = AIMessage(content=cached["response"], response_metadata=metadata)
+            return ChatResult(generations=[ChatGeneration(message=message)])
+
+        result = self.inner._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+        message = result.generations[0].message
+        if isinstance(message.content, str):
+            # Token-Nutzung nicht mitspeichern: Treffer kosten nichts (Header betreffen nur den echten Aufruf)
+            metadata = {
+                name: value for name, value in (getattr(message, "response_metadata", None) or {}).items()
+                if name not in ("token_usage", "headers")
+            }
+            self.response_cache.put(key, self.agent, self.model_name, message.content, metadata)
+        return result
+
+
+# Globaler Cache (aus Umgebungsvariablen, lazy; None = deaktiviert)
+_cache: Optional[LLMResponseCache] = None
+_cache_configured = False
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """Gibt den globalen Antwort-Cache zurück (None, wenn LLM_CACHE nicht aktiviert ist)."""
+    global _cache, _cache_configured
+    with _cache_lock:
+        if not _cache_configured:
+            if os.getenv("LLM_CACHE", "off").lower() in ("on", "1", "true"):
+                _cache = LLMResponseCache(
+                    path=os.getenv("LLM_CACHE_PATH", DEFAULT_CACHE_PATH),
+                    agents=os.getenv("LLM_CACHE_AGENTS", ",".join(DEFAULT_CACHE_AGENTS)).split(","),
+                    max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES))
+                )
+            _cache_configured = True
+        return _cache
+
+
+def set_llm_cache(cache: Optional[LLMResponseCache]):
+    """Setzt den globalen Cache (z.B. für Tests oder Benchmarks; None = deaktiviert)."""
+    global _cache, _cache_configured
+    with _cache_lock:
+        _cache = cache
+        _cache_configured = True
+
+
+def get_llm_cache_stats() -> Dict[str, Any]:
+    """Statistik des globalen Caches ({"enabled": False} ohne Cache)."""
+    cache = get_llm_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
@@ -0,0 +1,154 @@
+"""
+Provider-Registry für die Chat-Modelle der Agenten.
+
+Manager, Generator, Critic und die Compliance-Frameworks beziehen ihr Modell
+über `create_chat_model`, statt selbst einen ChatOpenAI-Client zu erzeugen.
+Welcher Provider verwendet wird, entscheidet die Konfiguration:
+
+- openai: ChatOpenAI gegen die OpenAI-API (OPENAI_API_KEY)
+- openai-compatible: ChatOpenAI gegen einen beliebigen OpenAI-kompatiblen
+  Endpunkt (z.B. vLLM, Ollama, LM Studio im lokalen Netz)
+- fake: Deterministisches Fake-Modell ohne Netzwerk (utils/fake_llm.py), das
+  schema-konforme JSON-Antworten aus Vorlagen liefert und eine konfigurierbare
+  Latenz-Verteilung simuliert (Lasttests auf isolierten Maschinen)
+
+Weitere Provider können mit `register_provider` ergänzt werden. Das Modell
+wird anschließend wie bisher per `wrap_llm` für Rate-Limit, Antwort-Cache
+und Record/Replay eingehüllt.
+
+Konfiguration über Umgebungsvariablen:
+- LLM_PROVIDER: openai | openai-compatible | fake (Standard: openai)
+- LLM_PROVIDER_<AGENT>: Provider für einen einzelnen Agenten, z.B.
+  LLM_PROVIDER_CRITIC=fake oder LLM_PROVIDER_COMPLIANCE_DORA=fake
+- LLM_BASE_URL: Basis-URL des OpenAI-kompatiblen Endpunkts (erforderlich für openai-compatible)
+- LLM_API_KEY: API-Key des OpenAI-kompatiblen Endpunkts (Standard: "not-needed")
+- LLM_MODEL: Modellname am OpenAI-kompatiblen Endpunkt (Standard: Modell des Agenten)
+- LLM_FAKE_LATENCY: Mittlere Latenz des Fake-Modells in Sekunden (Standard: 0)
+- LLM_FAKE_JITTER: Standardabweichung der Latenz in Sekunden (Standard: 0)
+- LLM_FAKE_DISTRIBUTION: normal | lognormal | exponential (Standard: normal)
+- LLM_FAKE_SEED: Seed für reproduzierbare Latenzen (Standard: keiner)
+"""
+
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+
+from utils.llm_recorder import wrap_llm
+from utils.rate_limiter import get_rate_limiter
+
+DEFAULT_PROVIDER = "openai"
+
+# Provider-Name -> Funktion(agent, model_name, temperature) -> Chat-Modell
+ProviderFactory = Callable[[str, str, float], BaseChatModel]
+
+_providers: Dict[str, ProviderFactory] = {}
+_providers_lock = threading.Lock()
+
+
+def register_provider(name: str, factory: ProviderFactory):
+    """Registriert (bzw. ersetzt) einen Provider unter `name`."""
+    with _providers_lock:
+        _providers[name.lower()] = factory
+
+
+def available_providers() -> List[str]:
+    """Namen aller registrierten Provider."""
+    with _providers_lock:
+        return sorted(_providers)
+
+
+def provider_for(agent: str) -> str:
+    """Konfigurierter Provider eines Agenten (LLM_PROVIDER_<AGENT> vor LLM_PROVIDER)."""
+    return (
+        os.getenv(f"LLM_PROVIDER_{agent.upper()}")
+        or os.getenv("LLM_PROVIDER")
+        or DEFAULT_PROVIDER
+    ).lower()
+
+
+def create_chat_model(
+    agent: str,
+    model_name: str = "gpt-4o",
+    temperature: float = 0.7,
+    provider: Optional[str] = None
+) -> BaseChatModel:
+    """
+    Erzeugt das Chat-Modell eines Agenten beim konfigurierten Provider.
+
+    Args:
+        agent: Name des Agenten (z.B. "critic", "compliance_dora")
+        model_name: Modell-Name des Agenten
+        temperature: Temperature für LLM
+        provider: Optional expliziter Provider (Standard: aus Umgebung, siehe provider_for)
+
+    Returns:
+        Per wrap_llm eingehülltes Chat-Modell
+
+    Raises:
+        ValueError: Wenn der Provider nicht registriert ist
+    """
+    name = (provider or provider_for(agent)).lower()
+    with _providers_lock:
+        factory = _providers.get(name)
+    if factory is None:
+        raise ValueError(f"Unbekannter LLM-Provider '{name}' (verfügbar: {', '.join(available_providers())})")
+    return wrap_llm(factory(agent, model_name, temperature), agent=agent)
+
+
+def _client_options() -> Dict[str, Any]:
+    """
+    Optionen für ChatOpenAI-Clients bei aktivem Rate-Limiter: Antwort-Header
+    für den Abgleich mit dem Provider-Kontingent, keine eigenen Retries des
+    Clients (429 behandelt der Limiter gemeinsam, übrige Fehler safe_llm_call).
+    """
+    if get_rate_limiter() is None:
+        return {}
+    return {"include_response_headers": True, "max_retries": 0}
+
+
+def _openai(agent: str, model_name: str, temperature: float) -> BaseChatModel:
+    from langchain_openai import ChatOpenAI
+
+    return ChatOpenAI(
+        model=model_name,
+        temperature=temperature,
+        api_key=os.getenv("OPENAI_API_KEY"),
+        **_client_options()
+    )
+
+
+def _openai_compatible(agent: str, model_name: str, temperature: float) -> BaseChatModel:
+    from langchain_openai import ChatOpenAI
+
+    base_url = os.getenv("LLM_BASE_URL")
+    if not base_url:
+        raise ValueError("LLM_BASE_URL muss für den Provider 'openai-compatible' gesetzt sein")
+    return ChatOpenAI(
+        model=os.getenv("LLM_MODEL", model_name),
+        temperature=temperature,
+        base_url=base_url,
+        # Lokale Server prüfen den Key meist nicht, der Client verlangt aber einen
+        api_key=os.getenv("LLM_API_KEY", "not-needed"),
+        **_client_options()
+    )
+
+
+def _fake(agent: str, model_name: str, temperature: float) -> BaseChatModel:
+    from utils.fake_llm import FakeChatModel
+
+    seed = os.getenv("LLM_FAKE_SEED")
+    return FakeChatModel(
+        agent=agent,
+        temperature=temperature,
+        latency=float(os.getenv("LLM_FAKE_LATENCY", "0")),
+        jitter=float(os.getenv("LLM_FAKE_JITTER", "0")),
+        distribution=os.getenv("LLM_FAKE_DISTRIBUTION", "normal").lower(),
+        seed=int(seed) if seed else None
+    )
+
+
+register_provider("openai", _openai)
+register_provider("openai-compatible", _openai_compatible)
+register_provider("fake", _fake)
@@ -0,0 +1,319 @@
+"""
+Record & Replay für LLM-Aufrufe.
+
+Alle Chat-Modelle der Agenten (Manager, Generator, Critic) und der
+Compliance-Frameworks werden über `wrap_llm` in ein RecordingChatModel
+gehüllt. Je nach Modus werden die Aufrufe unverändert durchgereicht,
+archiviert oder aus dem Archiv beantwortet:
+
+- off (Standard): keine Änderung
+- record: Aufruf an das echte Modell, Prompt + Antwort werden archiviert
+- replay: Antwort aus dem Archiv (kein Netzwerk), optional mit simulierter Latenz
+
+Das Archiv ist eine gzip-komprimierte JSONL-Datei pro Szenario
+(`<verzeichnis>/<scenario_id>.jsonl.gz`). Jeder Eintrag enthält den
+Prompt-Hash, den gerenderten Prompt, Modell und Parameter, die Antwort und
+die gemessene Latenz. Beim Replay werden Einträge über den Prompt-Hash
+gefunden; identische Prompts (z.B. Refine-Loops) liefern die Antworten in
+Aufnahme-Reihenfolge.
+
+Konfiguration über Umgebungsvariablen:
+- LLM_RECORD_MODE: off | record | replay
+- LLM_ARCHIVE_DIR: Archiv-Verzeichnis (Standard: logs/llm_archive)
+- LLM_REPLAY_LATENCY: Faktor auf die aufgezeichnete Latenz (Standard: 0 = volle Geschwindigkeit)
+"""
+
+import contextvars
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from utils.llm_cache import CachingChatModel, LLMResponseCache, get_llm_cache
+from utils.rate_limiter import RateLimitedChatModel, RateLimiter, get_rate_limiter, rate_limit_retries
+
+
+RECORD_MODES = ("off", "record", "replay")
+DEFAULT_ARCHIVE_DIR = "logs/llm_archive"
+
+# Szenario, dem LLM-Aufrufe im aktuellen Kontext zugeordnet werden
+_scenario_var: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("llm_scenario", default=None)
+
+
+class ReplayMiss(LookupError):
+    """Für den Prompt existiert keine Aufzeichnung im Archiv."""
+
+
+@contextmanager
+def llm_scenario_scope(scenario_id: Optional[str]):
+    """
+    Ordnet alle LLM-Aufrufe im aktuellen Kontext einem Szenario zu.
+
+    Verwendet contextvars: Threads, die über `contextvars.copy_context().run`
+    gestartet werden (LangGraph, spekulative Kandidaten), erben die Zuordnung.
+    """
+    token = _scenario_var.set(scenario_id)
+    try:
+        yield
+    finally:
+        _scenario_var.reset(token)
+
+
+def current_scenario() -> Optional[str]:
+    """Szenario-ID des aktuellen Kontexts (oder None)."""
+    return _scenario_var.get()
+
+
+def prompt_key(model: Optional[str], params: Dict[str, Any], messages: List[Dict[str, str]]) -> str:
+    """Stabiler Hash über Modell, Parameter und gerenderte Nachrichten."""
+    payload = json.dumps(
+        {"model": model, "params": params, "messages": messages}, sort_keys=True, ensure_ascii=False, default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def serialize_messages(messages: List[BaseMessage]) -> List[Dict[str, str]]:
+    """Gerenderte Nachrichten als Rolle/Inhalt (Grundlage des Prompt-Hashes)."""
+    return [
+        {"role": message.type, "content": message.content if isinstance(message.content, str) else json.dumps(message.content)}
+        for message in messages
+    ]
+
+
+class LLMArchive:
+    """Verwaltet das Archiv (Schreiben im Record-Modus, Index im Replay-Modus)."""
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self._lock = threading.Lock()
+        self._index: Optional[Dict[str, List[Dict[str, Any]]]] = None
+        self._cursors: Dict[str, int] = defaultdict(int)
+
+    def _path(self, scenario_id: Optional[str]) -> Path:
+        return self.directory / f"{scenario_id or 'unscoped'}.jsonl.gz"
+
+    def append(self, scenario_id: Optional[str], entry: Dict[str, Any]):
+        """Hängt einen Eintrag an das Archiv des Szenarios an (gzip-Member pro Zeile)."""
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with gzip.open(self._path(scenario_id), "at", encoding="utf-8") as f:
+                f.write(line)
+            if self._index is not None:
+                self._index.setdefault(entry["key"], []).append(entry)
+
+    def _load_unlocked(self) -> Dict[str, List[Dict[str, Any]]]:
+        if self._index is None:
+            self._index = {}
+            for path in sorted(self.directory.glob("*.jsonl.gz")):
+                with gzip.open(path, "rt", encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            entry = json.loads(line)
+                        except json.JSONDecodeError:
+                            continue  # Abgeschnittene letzte Zeile
+                        self._index.setdefault(entry["key"], []).append(entry)
+        return self._index
+
+    def lookup(self, key: str) -> Dict[str, Any]:
+        """
+        Liefert die nächste Aufzeichnung für einen Prompt-Hash.
+
+        Raises:
+            ReplayMiss: wenn der Prompt nicht aufgezeichnet wurde
+        """
+        with self._lock:
+            entries = self._load_unlocked().get(key)
+            if not entries:
+                raise ReplayMiss(f"Keine Aufzeichnung für Prompt {key[:12]} in {self.directory}")
+            # Wiederholte Prompts in Aufnahme-Reihenfolge, danach die letzte Antwort
+            index = min(self._cursors[key], len(entries) - 1)
+            self._cursors[key] += 1
+            return entries[index]
+
+
+class LLMRecorder:
+    """
+    Record/Replay-Logik, geteilt von allen RecordingChatModel-Instanzen.
+
+    Args:
+        mode: "off", "record" oder "replay"
+        archive_dir: Archiv-Verzeichnis
+        replay_latency: Faktor auf die aufgezeichnete Latenz beim Replay
+    """
+
+    def __init__(self, mode: str = "off", archive_dir: str = DEFAULT_ARCHIVE_DIR, replay_latency: float = 0.0):
+        if mode not in RECORD_MODES:
+            raise ValueError(f"Unbekannter LLM_RECORD_MODE '{mode}' (erlaubt: {', '.join(RECORD_MODES)})")
+        self.mode = mode
+        self.archive = LLMArchive(archive_dir)
+        self.replay_latency = replay_latency
+        self.stats = {"recorded": 0, "replayed": 0, "misses": 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, name: str):
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def generate(
+        self,
+        model: "RecordingChatModel",
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        """Beantwortet einen Aufruf je nach Modus (durchreichen, aufzeichnen, abspielen)."""
+        params = {"temperature": kwargs.get("temperature", model.temperature), "stop": stop}
+        serialized = serialize_messages(messages)
+        key = prompt_key(model.model_name, params, serialized)
+
+        if self.mode == "replay":
+            try:
+                entry = self.archive.lookup(key)
+            except ReplayMiss:
+                self._count("misses")
+                raise
+            self._count("replayed")
+            if self.replay_latency > 0:
+                time.sleep(entry.get("latency", 0.0) * self.replay_latency)
+            message = AIMessage(content=entry["response"], response_metadata=entry.get("response_metadata", {}))
+            return ChatResult(generations=[ChatGeneration(message=message)], llm_output=entry.get("llm_output"))
+
+        start = time.perf_counter()
+        result = model.inner._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+        latency = time.perf_counter() - start
+        if self.mode == "record":
+            message = result.generations[0].message
+            self.archive.append(current_scenario(), {
+                "key": key,
+                "agent": model.agent,
+                "model": model.model_name,
+                "params": params,
+                "prompt": serialized,
+                "response": message.content,
+                "response_metadata": dict(getattr(message, "response_metadata", {}) or {}),
+                "llm_output": result.llm_output,
+                "latency": round(latency, 4),
+                "recorded_at": time.time()
+            })
+            self._count("recorded")
+        return result
+
+
+class RecordingChatModel(BaseChatModel):
+    """Chat-Modell-Hülle, die Aufrufe über den LLMRecorder leitet."""
+
+    inner: BaseChatModel
+    recorder: Any
+    agent: str = "llm"
+    model_name: Optional[str] = None
+    temperature: Optional[float] = None
+
+    @property
+    def _llm_type(self) -> str:
+        return f"recording-{self.inner._llm_type}"
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        return self.recorder.generate(self, messages, stop=stop, run_manager=run_manager, **kwargs)
+
+
+# Globaler Recorder (aus Umgebungsvariablen, lazy)
+_recorder: Optional[LLMRecorder] = None
+_recorder_lock = threading.Lock()
+
+
+def get_recorder() -> LLMRecorder:
+    """Gibt den globalen Recorder zurück (thread-safe, lazy)."""
+    global _recorder
+    with _recorder_lock:
+        if _recorder is None:
+            _recorder = LLMRecorder(
+                mode=os.getenv("LLM_RECORD_MODE", "off").lower(),
+                archive_dir=os.getenv("LLM_ARCHIVE_DIR", DEFAULT_ARCHIVE_DIR),
+                replay_latency=float(os.getenv("LLM_REPLAY_LATENCY", "0"))
+            )
+        return _recorder
+
+
+def set_recorder(recorder: Optional[LLMRecorder]):
+    """Setzt den globalen Recorder (z.B. für Tests oder Benchmarks; None = neu aus Umgebung)."""
+    global _recorder
+    with _recorder_lock:
+        _recorder = recorder
+
+
+def wrap_llm(
+    llm: BaseChatModel,
+    agent: str,
+    recorder: Optional[LLMRecorder] = None,
+    cache: Optional[LLMResponseCache] = None,
+    limiter: Optional[RateLimiter] = None
+) -> BaseChatModel:
+    """
+    Hüllt ein Chat-Modell für Rate-Limit, Antwort-Cache und Record/Replay ein.
+
+    Der Rate-Limiter (utils/rate_limiter.py) liegt ganz innen, damit nur echte
+    Provider-Aufrufe Kontingent verbrauchen (keine Cache-Treffer, kein Replay).
+    Der Cache (utils/llm_cache.py) liegt darüber, damit auch Treffer im
+    Record-Modus archiviert werden. Ohne Limiter, ohne Cache und im Modus
+    "off" wird das Modell zurückgegeben (nur mit dem Agenten in den Metadaten
+    markiert).
+
+    Args:
+        llm: Chat-Modell (z.B. ChatOpenAI)
+        agent: Name des Agenten (für Archiv und Cache-Freischaltung)
+        recorder: Optional eigener Recorder (Standard: global aus Umgebung)
+        cache: Optional eigener Antwort-Cache (Standard: global aus Umgebung, LLM_CACHE)
+        limiter: Optional eigener Rate-Limiter (Standard: global aus Umgebung, LLM_RPM/LLM_TPM/LLM_MAX_CONCURRENCY)
+    """
+    recorder = recorder or get_recorder()
+    cache = cache or get_llm_cache()
+    limiter = limiter or get_rate_limiter()
+    # Agent-Name in den Metadaten ordnet Callbacks (z.B. Token-Erfassung) dem Agenten zu
+    llm.metadata = {**(llm.metadata or {}), "agent": agent}
+    if limiter is not None:
+        llm = RateLimitedChatModel(
+            inner=llm,
+            limiter=limiter,
+            agent=agent,
+            rate_limit_retries=rate_limit_retries(),
+            model_name=getattr(llm, "model_name", None),
+            temperature=getattr(llm, "temperature", None),
+            metadata=llm.metadata
+        )
+    if cache is not None and cache.enabled_for(agent):
+        llm = CachingChatModel(
+            inner=llm,
+            response_cache=cache,
+            agent=agent,
+            model_name=getattr(llm, "model_name", None),
+            temperature=getattr(llm, "temperature", None),
+            metadata=llm.metadata
+        )
+    if recorder.mode == "off":
+        return llm
+    return RecordingChatModel(
+        inner=llm,
+        recorder=recorder,
+        agent=agent,
+        model_name=getattr(llm, "model_name", None),
+        temperature=getattr(llm, "temperature", None),
+        metadata=llm.metadata
+    )
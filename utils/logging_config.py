@@ -0,0 +1,128 @@
+"""
+Zentrale Logging-Konfiguration.
+
+Workflow, Agenten und Clients loggen über Modul-Logger
+(`logging.getLogger(__name__)`) mit Lazy-Formatierung ("%s"-Argumente), die
+Nachricht wird also nur formatiert, wenn der Level aktiv ist. Die
+Detail-Ausgabe pro Node (State Check, Generator, Critic, Router) liegt auf
+DEBUG; Meilensteine (Start, Stopp-Grund, Ende) auf INFO; Fehler auf
+WARNING/ERROR.
+
+Jeder Log-Eintrag erhält `scenario_id` und `node` aus dem aktuellen Kontext
+(siehe llm_scenario_scope / llm_node_scope), sodass sich Einträge paralleler
+Szenarien im JSON-Format zuordnen lassen.
+
+Konfiguration:
+- LOG_LEVEL: Basis-Level (Standard: INFO)
+- LOG_FORMAT: "text" (Standard) oder "json" (eine JSON-Zeile pro Eintrag)
+- LOG_LEVELS: Levels pro Modul, z.B. "workflows=DEBUG,agents.critic_agent=WARNING"
+- SCENARIO_VERBOSE: "1" aktiviert die Detail-Ausgabe pro Node (DEBUG für
+  workflows und agents), z.B. zum Debuggen im Batch- oder API-Betrieb
+"""
+
+import json
+import logging
+import os
+import sys
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from utils.llm_recorder import current_scenario
+from utils.token_usage import current_node
+
+
+# Logger mit Detail-Ausgabe pro Node (werden von set_verbose umgeschaltet)
+VERBOSE_LOGGERS = ("workflows", "agents")
+
+TEXT_FORMAT = "%(asctime)s | %(levelname)-8s | %(name)-28s | %(message)s"
+
+# Standard-Attribute eines LogRecords (alles andere sind Zusatzfelder über extra=)
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_HANDLER_NAME = "dora-gen"
+
+
+class ContextFilter(logging.Filter):
+    """Ergänzt scenario_id und node aus dem aktuellen Kontext (falls nicht per extra gesetzt)."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if getattr(record, "scenario_id", None) is None:
+            record.scenario_id = current_scenario()
+        if getattr(record, "node", None) is None:
+            record.node = current_node()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """Formatiert Log-Einträge als einzelne JSON-Zeile (inkl. Zusatzfeldern)."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and value is not None:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def _parse_module_levels(spec: Optional[str]) -> Dict[str, str]:
+    """Parst "modul=LEVEL,modul2=LEVEL" (ungültige Einträge werden ignoriert)."""
+    levels = {}
+    for item in (spec or "").split(","):
+        name, _, level = item.partition("=")
+        if name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def set_verbose(enabled: bool):
+    """Schaltet die Detail-Ausgabe pro Node ein (DEBUG) oder aus (Level erbt vom Root-Logger)."""
+    for name in VERBOSE_LOGGERS:
+        logging.getLogger(name).setLevel(logging.DEBUG if enabled else logging.NOTSET)
+
+
+def configure_logging(
+    level: Optional[str] = None,
+    json_format: Optional[bool] = None,
+    module_levels: Optional[Dict[str, str]] = None,
+    verbose: Optional[bool] = None,
+    stream=None
+) -> logging.Handler:
+    """
+    Konfiguriert das Logging für Entry Points (API, Batch, Benchmark).
+
+    Mehrfache Aufrufe ersetzen den zuvor installierten Handler. Nicht gesetzte
+    Parameter werden aus der Umgebung gelesen (siehe Modul-Docstring).
+
+    Returns:
+        Der installierte Handler
+    """
+    level = (level or os.getenv("LOG_LEVEL", "INFO")).upper()
+    if json_format is None:
+        json_format = os.getenv("LOG_FORMAT", "text").lower() == "json"
+    if verbose is None:
+        verbose = os.getenv("SCENARIO_VERBOSE", "0").lower() in ("1", "true", "yes", "on")
+
+    root = logging.getLogger()
+    for handler in [h for h in root.handlers if h.get_name() == _HANDLER_NAME]:
+        root.removeHandler(handler)
+
+    handler = logging.StreamHandler(stream or sys.stderr)
+    handler.set_name(_HANDLER_NAME)
+    handler.addFilter(ContextFilter())
+    handler.setFormatter(JsonFormatter() if json_format else logging.Formatter(TEXT_FORMAT))
+    root.addHandler(handler)
+    root.setLevel(level)
+
+    set_verbose(verbose)
+    levels = _parse_module_levels(os.getenv("LOG_LEVELS"))
+    levels.update(module_levels or {})
+    for name, module_level in levels.items():
+        logging.getLogger(name).setLevel(module_level)
+    return handler
@@ -0,0 +1,433 @@
+"""
+Prozessweiter Rate-Limiter und Concurrency-Governor für LLM-Aufrufe.
+
+Ohne gemeinsame Drosselung starten parallel laufende Szenarien ihre Aufrufe
+unabhängig voneinander, laufen gemeinsam in 429-Fehler und warten danach
+gemeinsam (Retry-Sturm). `wrap_llm` (siehe utils/llm_recorder.py) hüllt
+deshalb jedes Chat-Modell in ein RateLimitedChatModel, das vor dem Aufruf
+beim globalen RateLimiter ansteht:
+
+- Token-Buckets für Requests und Tokens pro Minute (Tokens werden vor dem
+  Aufruf geschätzt und danach mit der tatsächlichen Nutzung verrechnet)
+- Semaphore für die Anzahl gleichzeitiger Aufrufe
+- Prioritätsklassen: Wartende werden streng nach Priorität bedient
+  (INTERACTIVE vor NORMAL vor BATCH), innerhalb einer Klasse nach Ankunft
+- Adaptives Backoff: Rate-Limit-Header (x-ratelimit-remaining-*, reset,
+  retry-after) gleichen die Buckets mit dem Stand beim Provider ab; ein 429
+  pausiert alle Aufrufe gemeinsam und halbiert die Rate, die mit jedem
+  erfolgreichen Aufruf wieder steigt (AIMD)
+
+Die Priorität wird per `llm_priority_scope` an den aktuellen Kontext
+gebunden (contextvars, wie die Szenario-Zuordnung in utils/llm_recorder.py).
+
+Konfiguration über Umgebungsvariablen (der Limiter ist aktiv, sobald eine
+der drei Grenzen gesetzt ist):
+- LLM_RPM: Requests pro Minute
+- LLM_TPM: Tokens pro Minute
+- LLM_MAX_CONCURRENCY: Maximale Anzahl gleichzeitiger Aufrufe
+- LLM_RATE_LIMIT_RETRIES: Wiederholungen nach einem 429 (Standard: 5)
+"""
+
+import contextvars
+import heapq
+import itertools
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from enum import IntEnum
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TypeVar
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatResult
+from openai import RateLimitError
+
+from utils.cancellation import check_cancelled
+
+T = TypeVar("T")
+
+DEFAULT_RATE_LIMIT_RETRIES = 5
+# Geschätzte Antwortlänge, solange die tatsächliche Nutzung noch nicht bekannt ist
+DEFAULT_COMPLETION_TOKENS = 800
+MIN_RATE_FACTOR = 0.1
+RATE_FACTOR_STEP = 0.05
+MAX_BACKOFF_SECONDS = 60.0
+# Wartende prüfen spätestens nach dieser Zeit erneut (Abbruch, Uhr)
+WAIT_SLICE_SECONDS = 0.5
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+
+
+class Priority(IntEnum):
+    """Prioritätsklassen (kleiner = früher bedient)."""
+
+    INTERACTIVE = 0
+    NORMAL = 1
+    BATCH = 2
+
+
+_priority_var: contextvars.ContextVar[Priority] = contextvars.ContextVar("llm_priority", default=Priority.NORMAL)
+
+
+@contextmanager
+def llm_priority_scope(priority: Priority):
+    """Bindet die Priorität aller LLM-Aufrufe im aktuellen Kontext."""
+    token = _priority_var.set(Priority(priority))
+    try:
+        yield
+    finally:
+        _priority_var.reset(token)
+
+
+def current_priority() -> Priority:
+    """Priorität des aktuellen Kontexts (Standard: NORMAL)."""
+    return _priority_var.get()
+
+
+def prioritized(iterable: Iterable[T], priority: Priority) -> Iterator[T]:
+    """
+    Iteriert mit der Priorität gebunden um jeden einzelnen Schritt.
+
+    Für Generatoren, die schrittweise aus wechselnden Threads weitergeführt
+    werden (z.B. StreamingResponse im Threadpool), wo ein äußerer Scope
+    nicht greift.
+    """
+    iterator = iter(iterable)
+    while True:
+        with llm_priority_scope(priority):
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+        yield item
+
+
+def parse_duration(value: Any) -> Optional[float]:
+    """Dauer aus Rate-Limit-Headern in Sekunden ("20ms", "1s", "6m0s", "1.5"), None wenn unlesbar."""
+    if value is None:
+        return None
+    text = str(value).strip()
+    try:
+        return float(text)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(text)
+    if not parts:
+        return None
+    factors = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+    return sum(float(amount) * factors[unit] for amount, unit in parts)
+
+
+def _header(headers: Dict[str, Any], name: str) -> Optional[str]:
+    for key, value in headers.items():
+        if key.lower() == name:
+            return value
+    return None
+
+
+class RateLimiter:
+    """
+    Thread-sicherer Token-Bucket-Limiter mit Semaphore, Prioritäten und AIMD-Backoff.
+
+    Args:
+        requests_per_minute: Requests pro Minute (None = unbegrenzt)
+        tokens_per_minute: Tokens pro Minute (None = unbegrenzt)
+        max_concurrency: Gleichzeitige Aufrufe (None = unbegrenzt)
+        max_backoff: Obergrenze der gemeinsamen Pause nach 429 ohne Retry-After
+        clock: Zeitquelle (monoton, für Tests austauschbar)
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_concurrency: Optional[int] = None,
+        max_backoff: float = MAX_BACKOFF_SECONDS,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.requests_per_minute = float(requests_per_minute) if requests_per_minute else None
+        self.tokens_per_minute = float(tokens_per_minute) if tokens_per_minute else None
+        self.max_concurrency = int(max_concurrency) if max_concurrency else None
+        self.max_backoff = max_backoff
+        self._clock = clock
+        self._condition = threading.Condition()
+        # Buckets starten voll (Kapazität = Grenze pro Minute)
+        self._requests = self.requests_per_minute or 0.0
+        self._tokens = self.tokens_per_minute or 0.0
+        self._last_refill = clock()
+        self._rate_factor = 1.0
+        self._paused_until = 0.0
+        self._consecutive_limits = 0
+        self._active = 0
+        self._waiting: List[tuple] = []
+        self._sequence = itertools.count()
+        self._stats = {
+            "acquired": {priority.name.lower(): 0 for priority in Priority},
+            "wait_seconds": {priority.name.lower(): 0.0 for priority in Priority},
+            "rate_limited": 0,
+            "header_syncs": 0
+        }
+
+    def _refill(self, now: float):
+        elapsed = max(0.0, now - self._last_refill)
+        self._last_refill = now
+        if self.requests_per_minute:
+            rate = self.requests_per_minute * self._rate_factor / 60
+            self._requests = min(self.requests_per_minute, self._requests + elapsed * rate)
+        if self.tokens_per_minute:
+            rate = self.tokens_per_minute * self._rate_factor / 60
+            self._tokens = min(self.tokens_per_minute, self._tokens + elapsed * rate)
+
+    def _wait_time(self, tokens: int, now: float) -> float:
+        """Sekunden, bis ein Aufruf mit `tokens` Tokens starten darf (0 = sofort)."""
+        waits = [self._paused_until - now]
+        if self.requests_per_minute and self._requests < 1:
+            waits.append((1 - self._requests) / (self.requests_per_minute * self._rate_factor / 60))
+        if self.tokens_per_minute:
+            # Aufrufe größer als die Kapazität warten nur auf einen vollen Bucket
+            needed = min(tokens, self.tokens_per_minute)
+            if self._tokens < needed:
+                waits.append((needed - self._tokens) / (self.tokens_per_minute * self._rate_factor / 60))
+        return max(0.0, *waits)
+
+    def acquire(self, tokens: int = 0, priority: Optional[Priority] = None) -> float:
+        """
+        Wartet auf einen Slot (Priorität, Semaphore, Buckets, Pause) und belegt ihn.
+
+        Args:
+            tokens: Geschätzte Tokens des Aufrufs
+            priority: Prioritätsklasse (Standard: aus dem Kontext)
+
+        Returns:
+            Wartezeit in Sekunden
+
+        Raises:
+            OperationCancelled: Wenn der Vorgang während des Wartens abgebrochen wird
+        """
+        priority = Priority(priority if priority is not None else current_priority())
+        entry = (int(priority), next(self._sequence))
+        start = self._clock()
+        with self._condition:
+            heapq.heappush(self._waiting, entry)
+            try:
+                while True:
+                    check_cancelled()
+                    now = self._clock()
+                    self._refill(now)
+                    wait = WAIT_SLICE_SECONDS
+                    if self._waiting[0] == entry and (not self.max_concurrency or self._active < self.max_concurrency):
+                        wait = self._wait_time(tokens, now)
+                        if wait <= 0:
+                            break
+                    self._condition.wait(min(wait, WAIT_SLICE_SECONDS))
+            except BaseException:
+                self._waiting.remove(entry)
+                heapq.heapify(self._waiting)
+                self._condition.notify_all()
+                raise
+            heapq.heappop(self._waiting)
+            self._active += 1
+            if self.requests_per_minute:
+                self._requests -= 1
+            if self.tokens_per_minute:
+                self._tokens -= tokens
+            waited = self._clock() - start
+            self._stats["acquired"][priority.name.lower()] += 1
+            self._stats["wait_seconds"][priority.name.lower()] += waited
+            # Nächster Wartender ist jetzt an der Spitze
+            self._condition.notify_all()
+        return waited
+
+    def release(
+        self,
+        estimated_tokens: int = 0,
+        used_tokens: Optional[int] = None,
+        headers: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Gibt den Slot frei und verrechnet die tatsächliche Token-Nutzung.
+
+        Args:
+            estimated_tokens: Beim acquire geschätzte Tokens
+            used_tokens: Tatsächliche Tokens (None = Schätzung bleibt stehen)
+            headers: Antwort-Header des Providers (Rate-Limit-Stand); bei
+                     Angabe gilt der Aufruf als erfolgreich (Rate steigt)
+        """
+        with self._condition:
+            self._active = max(0, self._active - 1)
+            if self.tokens_per_minute and used_tokens is not None:
+                self._tokens -= used_tokens - estimated_tokens
+            if headers is not None:
+                self._consecutive_limits = 0
+                self._rate_factor = min(1.0, self._rate_factor + RATE_FACTOR_STEP)
+                self._sync_headers(headers)
+            self._condition.notify_all()
+
+    def _sync_headers(self, headers: Dict[str, Any]):
+        """Gleicht die Buckets mit dem Rate-Limit-Stand des Providers ab."""
+        now = self._clock()
+        for kind, limit in (("requests", self.requests_per_minute), ("tokens", self.tokens_per_minute)):
+            remaining = _header(headers, f"x-ratelimit-remaining-{kind}")
+            if remaining is None:
+                continue
+            try:
+                remaining = float(remaining)
+            except ValueError:
+                continue
+            self._stats["header_syncs"] += 1
+            if limit:
+                if kind == "requests":
+                    self._requests = min(self._requests, remaining)
+                else:
+                    self._tokens = min(self._tokens, remaining)
+            if remaining <= 0:
+                reset = parse_duration(_header(headers, f"x-ratelimit-reset-{kind}"))
+                if reset:
+                    self._paused_until = max(self._paused_until, now + reset)
+
+    def record_rate_limit(self, headers: Optional[Dict[str, Any]] = None) -> float:
+        """
+        Verarbeitet einen 429: gemeinsame Pause für alle Aufrufe und halbierte Rate.
+
+        Die Pause folgt retry-after(-ms) bzw. den Reset-Headern, sonst
+        exponentiell über aufeinanderfolgende 429 (1s, 2s, 4s, ... max_backoff).
+
+        Returns:
+            Pause in Sekunden
+        """
+        headers = headers or {}
+        retry_after = parse_duration(_header(headers, "retry-after-ms"))
+        retry_after = retry_after / 1000 if retry_after is not None else parse_duration(_header(headers, "retry-after"))
+        if retry_after is None:
+            resets = [
+                parse_duration(_header(headers, f"x-ratelimit-reset-{kind}")) for kind in ("requests", "tokens")
+            ]
+            resets = [reset for reset in resets if reset is not None]
+            retry_after = max(resets) if resets else None
+        with self._condition:
+            self._consecutive_limits += 1
+            if retry_after is None:
+                retry_after = min(self.max_backoff, 2.0 ** (self._consecutive_limits - 1))
+            self._paused_until = max(self._paused_until, self._clock() + retry_after)
+            self._rate_factor = max(MIN_RATE_FACTOR, self._rate_factor / 2)
+            self._stats["rate_limited"] += 1
+            self._condition.notify_all()
+        return retry_after
+
+    def stats(self) -> Dict[str, Any]:
+        """Grenzen, aktueller Zustand und Wartezeiten pro Priorität."""
+        with self._condition:
+            now = self._clock()
+            self._refill(now)
+            return {
+                "requests_per_minute": self.requests_per_minute,
+                "tokens_per_minute": self.tokens_per_minute,
+                "max_concurrency": self.max_concurrency,
+                "active": self._active,
+                "waiting": len(self._waiting),
+                "rate_factor": round(self._rate_factor, 3),
+                "paused_for": round(max(0.0, self._paused_until - now), 3),
+                "acquired": dict(self._stats["acquired"]),
+                "wait_seconds": {name: round(value, 3) for name, value in self._stats["wait_seconds"].items()},
+                "rate_limited": self._stats["rate_limited"],
+                "header_syncs": self._stats["header_syncs"]
+            }
+
+
+def estimate_tokens(messages: List[BaseMessage], max_tokens: Optional[int] = None) -> int:
+    """Grobe Token-Schätzung (4 Zeichen pro Token) plus erwartete Antwortlänge."""
+    characters = sum(
+        len(message.content if isinstance(message.content, str) else json.dumps(message.content))
+        for message in messages
+    )
+    return characters // 4 + (max_tokens or DEFAULT_COMPLETION_TOKENS)
+
+
+class RateLimitedChatModel(BaseChatModel):
+    """Chat-Modell-Hülle, die jeden Aufruf über den RateLimiter führt und 429 gemeinsam abfängt."""
+
+    inner: BaseChatModel
+    limiter: Any
+    agent: str = "llm"
+    rate_limit_retries: int = DEFAULT_RATE_LIMIT_RETRIES
+    model_name: Optional[str] = None
+    temperature: Optional[float] = None
+
+    @property
+    def _llm_type(self) -> str:
+        return f"rate-limited-{self.inner._llm_type}"
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        estimated = estimate_tokens(messages, kwargs.get("max_tokens") or getattr(self.inner, "max_tokens", None))
+        for attempt in range(self.rate_limit_retries + 1):
+            self.limiter.acquire(estimated)
+            try:
+                result = self.inner._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+            except RateLimitError as error:
+                self.limiter.release(estimated)
+                response = getattr(error, "response", None)
+                self.limiter.record_rate_limit(dict(response.headers) if response is not None else None)
+                if attempt >= self.rate_limit_retries:
+                    raise
+                continue
+            except BaseException:
+                self.limiter.release(estimated)
+                raise
+            generation = result.generations[0]
+            metadata = getattr(generation.message, "response_metadata", None) or {}
+            usage = metadata.get("token_usage") or (result.llm_output or {}).get("token_usage") or {}
+            headers = metadata.get("headers") or (generation.generation_info or {}).get("headers") or {}
+            self.limiter.release(estimated, usage.get("total_tokens"), headers)
+            return result
+
+
+# Globaler Limiter (aus Umgebungsvariablen, lazy; None = deaktiviert)
+_limiter: Optional[RateLimiter] = None
+_limiter_configured = False
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> Optional[RateLimiter]:
+    """Gibt den globalen Limiter zurück (None, wenn keine Grenze konfiguriert ist)."""
+    global _limiter, _limiter_configured
+    with _limiter_lock:
+        if not _limiter_configured:
+            limits = (os.getenv("LLM_RPM"), os.getenv("LLM_TPM"), os.getenv("LLM_MAX_CONCURRENCY"))
+            if any(limits):
+                _limiter = RateLimiter(
+                    requests_per_minute=float(limits[0]) if limits[0] else None,
+                    tokens_per_minute=float(limits[1]) if limits[1] else None,
+                    max_concurrency=int(limits[2]) if limits[2] else None
+                )
+            _limiter_configured = True
+        return _limiter
+
+
+def set_rate_limiter(limiter: Optional[RateLimiter]):
+    """Setzt den globalen Limiter (z.B. für Tests oder Benchmarks; None = deaktiviert)."""
+    global _limiter, _limiter_configured
+    with _limiter_lock:
+        _limiter = limiter
+        _limiter_configured = True
+
+
+def rate_limit_retries() -> int:
+    """Wiederholungen nach einem 429 (LLM_RATE_LIMIT_RETRIES)."""
+    return int(os.getenv("LLM_RATE_LIMIT_RETRIES", DEFAULT_RATE_LIMIT_RETRIES))
+
+
+def get_rate_limiter_stats() -> Dict[str, Any]:
+    """Statistik des globalen Limiters ({"enabled": False} ohne Limiter)."""
+    limiter = get_rate_limiter()
+    if limiter is None:
+        return {"enabled": False}
+    return {"enabled": True, **limiter.stats()}
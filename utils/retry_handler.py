@@ -18,6 +18,8 @@ from tenacity import (
 )
 import logging
 from openai import RateLimitError, APIError, APIConnectionError, APITimeoutError
+from utils.cancellation import OperationCancelled, check_cancelled
+from utils.rate_limiter import get_rate_limiter
 
 logger = logging.getLogger(__name__)
 
@@ -94,17 +96,24 @@ def safe_llm_call(
     last_exception = None
     
     for attempt in range(1, max_attempts + 1):
+        # Kein (weiterer) LLM-Call, wenn der aktuelle Vorgang abgebrochen wurde
+        check_cancelled()
         try:
             return func(*args, **kwargs)
         except OPENAI_RETRYABLE_ERRORS as e:
             last_exception = e
             if attempt < max_attempts:
                 wait_time = min(2.0 ** attempt, 60.0)  # Exponential backoff, max 60s
+                if isinstance(e, RateLimitError) and get_rate_limiter() is not None:
+                    # Gemeinsame Pause im Rate-Limiter statt eigenem Backoff pro Aufruf
+                    wait_time = 0.0
                 logger.warning(f"LLM-Call Versuch {attempt}/{max_attempts} fehlgeschlagen: {e}. Warte {wait_time:.1f}s...")
                 import time
                 time.sleep(wait_time)
             else:
                 logger.error(f"LLM-Call fehlgeschlagen nach {max_attempts} Versuchen: {e}")
+        except OperationCancelled:
+            raise
         except Exception as e:
             # Nicht-retryable Fehler
             logger.error(f"LLM-Call Fehler (nicht retryable): {e}")
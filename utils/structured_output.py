@@ -0,0 +1,259 @@
+"""
+Strukturierte LLM-Ausgaben (JSON-Modus + toleranter Parser).
+
+Die Agenten deklarieren ein Pydantic-Antwortschema. Bei OpenAI-Modellen wird
+der JSON-Modus des Providers aktiviert (response_format=json_object), sodass
+die Antwort ein einzelnes JSON-Objekt ist. Andere Modelle (Fake, Replay)
+bleiben unverändert. Geparst wird immer über parse_structured():
+
+1. Direktes json.loads (Markdown-Fences werden entfernt)
+2. Inkrementelle Suche nach dem ersten vollständigen JSON-Objekt im Text
+3. Reparatur abgeschnittener Antworten (offene Strings/Klammern schließen,
+   überzählige Kommas entfernen)
+
+Anschließend validiert das Schema die Daten. Fehlschläge werden pro Agent
+gezählt (get_parse_stats), damit sich die Rate malformierter Antworten
+beobachten lässt.
+
+Konfiguration:
+- LLM_JSON_MODE: "on" (Standard) oder "off"
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+from typing import Any, Dict, List, Optional, Tuple, Type, TypeVar
+
+from langchain_openai import ChatOpenAI
+from pydantic import BaseModel, ValidationError
+
+from utils.llm_cache import CachingChatModel
+from utils.llm_recorder import RecordingChatModel
+from utils.rate_limiter import RateLimitedChatModel
+
+
+logger = logging.getLogger(__name__)
+
+SchemaT = TypeVar("SchemaT", bound=BaseModel)
+
+PARSE_OUTCOMES = ("direct", "extracted", "repaired", "failures")
+
+_FENCE_PATTERN = re.compile(r"^```(?:json)?\s*|\s*```$", re.IGNORECASE)
+_TRAILING_COMMA_PATTERN = re.compile(r",\s*([}\]])")
+_INCOMPLETE_MEMBER_PATTERN = re.compile(r',?\s*"[^"]*"\s*:\s*[^,{}\[\]"]*$')
+
+
+def json_mode(llm: Any) -> Any:
+    """
+    Aktiviert den JSON-Modus des Providers, falls das Modell ihn unterstützt.
+
+    Wird bei jedem Aufruf angewendet (nicht im Konstruktor), damit später
+    ausgetauschte Modelle (z.B. in Tests oder im Benchmark) erhalten bleiben.
+    """
+    if os.getenv("LLM_JSON_MODE", "on").lower() == "off":
+        return llm
+    # RecordingChatModel/CachingChatModel/RateLimitedChatModel hüllen das eigentliche Modell ein
+    inner = llm
+    while isinstance(inner, (RecordingChatModel, CachingChatModel, RateLimitedChatModel)):
+        inner = inner.inner
+    if isinstance(inner, ChatOpenAI):
+        return llm.bind(response_format={"type": "json_object"})
+    return llm
+
+
+class JsonChain:
+    """
+    Wiederverwendbare Kette `prompt | json_mode(llm)` eines Agenten.
+
+    Die Prompt-Vorlage wird einmal (auf Modulebene) kompiliert; die Kette
+    entsteht beim ersten Aufruf und wird wiederverwendet, solange Modell und
+    JSON-Modus unverändert sind. Ausgetauschte Modelle (Tests, Benchmark)
+    führen zu einem Neuaufbau. Ketten mit abweichender Temperature werden pro
+    Wert vorgehalten.
+    """
+
+    def __init__(self, prompt: Any):
+        self.prompt = prompt
+        # (Modell, JSON-Modus aktiv, Temperature -> Kette); als Tupel ersetzt, damit parallele Aufrufe konsistent lesen
+        self._compiled: Optional[Tuple[Any, bool, Dict[Optional[float], Any]]] = None
+
+    def for_llm(self, llm: Any, temperature: Optional[float] = None) -> Any:
+        """Kette für das aktuelle Modell (optional mit abweichender Temperature)."""
+        json_enabled = os.getenv("LLM_JSON_MODE", "on").lower() != "off"
+        compiled = self._compiled
+        if compiled is None or compiled[0] is not llm or compiled[1] != json_enabled:
+            compiled = (llm, json_enabled, {})
+            self._compiled = compiled
+        chains = compiled[2]
+        chain = chains.get(temperature)
+        if chain is None:
+            model = json_mode(llm)
+            if temperature is not None:
+                model = model.bind(temperature=temperature)
+            chain = chains.setdefault(temperature, self.prompt | model)
+        return chain
+
+
+def _scan_object(text: str, start: int) -> Tuple[Optional[int], List[str], bool]:
+    """
+    Läuft einmal ab text[start] == '{' über den Text.
+
+    Merkt sich offene Strings und Klammern und liefert (Ende des Objekts oder
+    None, noch offene schließende Klammern, ob ein String offen ist). Bei
+    falsch verschachtelten Klammern ist das Ende None und nichts offen.
+    """
+    stack: List[str] = []
+    in_string = False
+    escaped = False
+    for index in range(start, len(text)):
+        char = text[index]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+            continue
+        if char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append("}" if char == "{" else "]")
+        elif char in "}]":
+            if not stack or stack[-1] != char:
+                return None, [], False
+            stack.pop()
+            if not stack:
+                return index + 1, [], False
+    return None, stack, in_string
+
+
+def _repair_candidates(fragment: str, open_brackets: List[str], in_string: bool) -> List[str]:
+    """
+    Schließt ein abgeschnittenes Objekt (offene Strings/Klammern in umgekehrter
+    Reihenfolge). Liefert Kandidaten ohne und mit entferntem unvollständigem
+    letzten Element.
+    """
+    if in_string:
+        fragment += '"'
+    closing = "".join(reversed(open_brackets))
+    # Unvollständiges letztes Element (z.B. '"key":' oder '"key": tr') entfernen
+    truncated = _INCOMPLETE_MEMBER_PATTERN.sub("", fragment)
+    return [
+        _TRAILING_COMMA_PATTERN.sub(r"\1", re.sub(r",\s*$", "", body) + closing)
+        for body in (fragment, truncated)
+    ]
+
+
+def _loads_object(text: str) -> Optional[Dict[str, Any]]:
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def parse_json_object(content: str) -> Tuple[Optional[Dict[str, Any]], str]:
+    """
+    Parst das erste JSON-Objekt aus einer LLM-Antwort.
+
+    Returns:
+        (Daten oder None, Ergebnis: "direct", "extracted", "repaired" oder "failures")
+    """
+    if not isinstance(content, str):
+        return None, "failures"
+    text = _FENCE_PATTERN.sub("", content.strip())
+    data = _loads_object(text)
+    if data is not None:
+        return data, "direct"
+
+    # Inkrementell über Objekt-Anfänge auf oberster Ebene (verschachtelte Objekte werden übersprungen)
+    decoder = json.JSONDecoder()
+    index = text.find("{")
+    while index >= 0:
+        try:
+            data, _ = decoder.raw_decode(text, index)
+            if isinstance(data, dict):
+                return data, "extracted"
+        except ValueError:
+            pass
+        end, open_brackets, in_string = _scan_object(text, index)
+        if open_brackets:
+            # Abgeschnitten: der Rest der Antwort gehört zu diesem Objekt
+            for repaired in _repair_candidates(text[index:], open_brackets, in_string):
+                data = _loads_object(repaired)
+                if data is not None:
+                    return data, "repaired"
+            break
+        if end is not None:
+            data = _loads_object(_TRAILING_COMMA_PATTERN.sub(r"\1", text[index:end]))
+            if data is not None:
+                return data, "repaired"
+        index = text.find("{", end if end is not None else index + 1)
+    return None, "failures"
+
+
+class ParseStats:
+    """Thread-sichere Zähler für Parse-Ergebnisse pro Agent."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: Dict[str, Dict[str, int]] = {}
+
+    def record(self, agent: str, outcome: str):
+        with self._lock:
+            counts = self._counts.setdefault(agent, {name: 0 for name in PARSE_OUTCOMES})
+            counts[outcome] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            counts = {agent: dict(values) for agent, values in self._counts.items()}
+        for values in counts.values():
+            responses = sum(values.values())
+            values["responses"] = responses
+            values["failure_rate"] = values["failures"] / responses if responses else 0.0
+        return counts
+
+    def reset(self):
+        with self._lock:
+            self._counts.clear()
+
+
+_parse_stats = ParseStats()
+
+
+def get_parse_stats() -> Dict[str, Dict[str, Any]]:
+    """Gibt die Parse-Statistik pro Agent zurück (inkl. failure_rate)."""
+    return _parse_stats.snapshot()
+
+
+def reset_parse_stats():
+    """Setzt die Parse-Statistik zurück (z.B. zwischen Benchmark-Läufen)."""
+    _parse_stats.reset()
+
+
+def parse_structured(content: str, schema: Type[SchemaT], agent: str) -> Optional[SchemaT]:
+    """
+    Parst und validiert eine LLM-Antwort gegen ein Pydantic-Schema.
+
+    Args:
+        content: Text der LLM-Antwort
+        schema: Pydantic-Antwortschema des Agenten
+        agent: Name des Agenten (für die Parse-Statistik)
+
+    Returns:
+        Schema-Instanz oder None (Fehlschlag wird gezählt)
+    """
+    data, outcome = parse_json_object(content)
+    if data is not None:
+        try:
+            parsed = schema.model_validate(data)
+        except ValidationError as e:
+            logger.warning("⚠️  [%s] Antwort passt nicht zum Schema %s: %s Fehler", agent, schema.__name__, e.error_count())
+            parsed, outcome = None, "failures"
+    else:
+        parsed = None
+    _parse_stats.record(agent, outcome)
+    return parsed
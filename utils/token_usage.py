@@ -0,0 +1,220 @@
+"""
+Token- und Kosten-Erfassung für LLM-Aufrufe.
+
+Ein globaler LangChain-Callback (über `register_configure_hook` für jeden
+Lauf aktiv) erfasst pro Chat-Modell-Aufruf Prompt-/Completion-Tokens,
+Latenz und geschätzte Kosten. Die Aufrufe werden dem Szenario
+(`llm_scenario_scope`, siehe utils/llm_recorder.py) und dem Workflow-Node
+(`llm_node_scope`) des aktuellen Kontexts zugeordnet; der Agent stammt aus
+den Metadaten des Modells (gesetzt von `wrap_llm`).
+
+Pro Szenario wird aggregiert: gesamt, pro Node und pro Agent. Aufrufe
+außerhalb eines Szenarios werden nicht erfasst.
+
+Konfiguration:
+- LLM_PRICE_PER_1K: Optional eigener Preis "input,output" in USD pro 1000 Tokens
+  (überschreibt die Preistabelle für alle Modelle)
+"""
+
+import contextvars
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Optional, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from langchain_core.tracers.context import register_configure_hook
+
+from utils.llm_recorder import current_scenario
+
+
+# USD pro 1000 Tokens (input, output); Präfix-Match auf den Modellnamen
+MODEL_PRICES_PER_1K: Dict[str, Tuple[float, float]] = {
+    "gpt-4o-mini": (0.00015, 0.0006),
+    "gpt-4o": (0.0025, 0.01),
+    "gpt-4.1-mini": (0.0004, 0.0016),
+    "gpt-4.1": (0.002, 0.008),
+}
+
+# Maximale Anzahl Szenarien im Speicher (nicht abgeschlossene Läufe werden verdrängt)
+MAX_TRACKED_SCENARIOS = 256
+
+# Node, dem LLM-Aufrufe im aktuellen Kontext zugeordnet werden
+_node_var: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("llm_node", default=None)
+
+
+@contextmanager
+def llm_node_scope(node: Optional[str]):
+    """Ordnet alle LLM-Aufrufe im aktuellen Kontext einem Workflow-Node zu."""
+    token = _node_var.set(node)
+    try:
+        yield
+    finally:
+        _node_var.reset(token)
+
+
+def current_node() -> Optional[str]:
+    """Node des aktuellen Kontexts (None außerhalb eines Workflow-Nodes)."""
+    return _node_var.get()
+
+
+def estimate_cost(model_name: Optional[str], prompt_tokens: int, completion_tokens: int) -> float:
+    """Geschätzte Kosten in USD (0.0 für unbekannte Modelle)."""
+    override = os.getenv("LLM_PRICE_PER_1K")
+    if override:
+        input_price, output_price = (float(part) for part in override.split(","))
+    else:
+        prices = next(
+            (price for prefix, price in sorted(MODEL_PRICES_PER_1K.items(), key=lambda item: -len(item[0]))
+             if model_name and model_name.startswith(prefix)),
+            None
+        )
+        if prices is None:
+            return 0.0
+        input_price, output_price = prices
+    return (prompt_tokens * input_price + completion_tokens * output_price) / 1000
+
+
+def _empty_bucket() -> Dict[str, Any]:
+    return {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0, "cost_usd": 0.0, "llm_seconds": 0.0}
+
+
+def _add(bucket: Dict[str, Any], prompt_tokens: int, completion_tokens: int, cost: float, latency: float):
+    bucket["calls"] += 1
+    bucket["prompt_tokens"] += prompt_tokens
+    bucket["completion_tokens"] += completion_tokens
+    bucket["total_tokens"] += prompt_tokens + completion_tokens
+    bucket["cost_usd"] += cost
+    bucket["llm_seconds"] += latency
+
+
+class UsageLedger:
+    """Thread-sichere Aggregation der Token-Nutzung pro Szenario."""
+
+    def __init__(self, max_scenarios: int = MAX_TRACKED_SCENARIOS):
+        self.max_scenarios = max_scenarios
+        self._lock = threading.Lock()
+        self._scenarios: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    def record(
+        self,
+        scenario_id: str,
+        node: Optional[str],
+        agent: Optional[str],
+        prompt_tokens: int,
+        completion_tokens: int,
+        cost: float,
+        latency: float
+    ):
+        with self._lock:
+            usage = self._scenarios.get(scenario_id)
+            if usage is None:
+                usage = {"total": _empty_bucket(), "nodes": {}, "agents": {}}
+                self._scenarios[scenario_id] = usage
+                while len(self._scenarios) > self.max_scenarios:
+                    self._scenarios.popitem(last=False)
+            _add(usage["total"], prompt_tokens, completion_tokens, cost, latency)
+            _add(usage["nodes"].setdefault(node or "unknown", _empty_bucket()), prompt_tokens, completion_tokens, cost, latency)
+            _add(usage["agents"].setdefault(agent or "unknown", _empty_bucket()), prompt_tokens, completion_tokens, cost, latency)
+
+    def get(self, scenario_id: Optional[str]) -> Dict[str, Any]:
+        """Kopie der Nutzung eines Szenarios (leer, wenn noch nichts erfasst wurde)."""
+        with self._lock:
+            usage = self._scenarios.get(scenario_id)
+            if usage is None:
+                return {"total": _empty_bucket(), "nodes": {}, "agents": {}}
+            return {
+                "total": dict(usage["total"]),
+                "nodes": {name: dict(bucket) for name, bucket in usage["nodes"].items()},
+                "agents": {name: dict(bucket) for name, bucket in usage["agents"].items()}
+            }
+
+    def pop(self, scenario_id: Optional[str]) -> Dict[str, Any]:
+        """Gibt die Nutzung zurück und entfernt das Szenario aus dem Speicher."""
+        usage = self.get(scenario_id)
+        with self._lock:
+            self._scenarios.pop(scenario_id, None)
+        return usage
+
+
+class TokenUsageHandler(BaseCallbackHandler):
+    """Callback, der Token, Latenz und Kosten jedes Chat-Modell-Aufrufs erfasst."""
+
+    def __init__(self, ledger: UsageLedger):
+        self.ledger = ledger
+        self._runs: Dict[UUID, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages: Any, *, run_id: UUID, metadata: Optional[Dict[str, Any]] = None, **kwargs: Any):
+        scenario_id = current_scenario()
+        if scenario_id is None:
+            return
+        metadata = metadata or {}
+        with self._lock:
+            self._runs[run_id] = {
+                "scenario_id": scenario_id,
+                "node": _node_var.get(),
+                "agent": metadata.get("agent"),
+                "model": metadata.get("ls_model_name"),
+                "start": time.perf_counter()
+            }
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any):
+        with self._lock:
+            run = self._runs.pop(run_id, None)
+        if run is None:
+            return
+        prompt_tokens, completion_tokens, model_name = self._extract_usage(response)
+        self.ledger.record(
+            scenario_id=run["scenario_id"],
+            node=run["node"],
+            agent=run["agent"] or run["node"],
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            cost=estimate_cost(run["model"] or model_name, prompt_tokens, completion_tokens),
+            latency=time.perf_counter() - run["start"]
+        )
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any):
+        with self._lock:
+            self._runs.pop(run_id, None)
+
+    @staticmethod
+    def _extract_usage(response: LLMResult) -> Tuple[int, int, Optional[str]]:
+        """Prompt-/Completion-Tokens aus usage_metadata oder token_usage (OpenAI-Format)."""
+        message = None
+        if response.generations and response.generations[0]:
+            message = getattr(response.generations[0][0], "message", None)
+        response_metadata = getattr(message, "response_metadata", None) or {}
+        model_name = response_metadata.get("model_name")
+        usage_metadata = getattr(message, "usage_metadata", None)
+        if usage_metadata:
+            return usage_metadata.get("input_tokens", 0), usage_metadata.get("output_tokens", 0), model_name
+        token_usage = (response.llm_output or {}).get("token_usage") or response_metadata.get("token_usage") or {}
+        return token_usage.get("prompt_tokens", 0) or 0, token_usage.get("completion_tokens", 0) or 0, model_name
+
+
+_ledger = UsageLedger()
+_handler_var: contextvars.ContextVar[Optional[TokenUsageHandler]] = contextvars.ContextVar(
+    "token_usage_handler", default=TokenUsageHandler(_ledger)
+)
+register_configure_hook(_handler_var, inheritable=True)
+
+
+def get_scenario_usage(scenario_id: Optional[str]) -> Dict[str, Any]:
+    """Bisherige Token-Nutzung eines Szenarios (total, nodes, agents)."""
+    return _ledger.get(scenario_id)
+
+
+def pop_scenario_usage(scenario_id: Optional[str]) -> Dict[str, Any]:
+    """Token-Nutzung eines abgeschlossenen Szenarios (wird aus dem Speicher entfernt)."""
+    return _ledger.pop(scenario_id)
+
+
+def reset_scenario_usage(scenario_id: Optional[str]):
+    """Verwirft die Nutzung eines Szenarios (z.B. beim Neustart mit gleicher ID)."""
+    _ledger.pop(scenario_id)
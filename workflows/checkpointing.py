@@ -0,0 +1,80 @@
+"""
+Checkpointing für den interaktiven Workflow-Modus.
+
+Stellt einen LangGraph-Checkpointer bereit, der pausierte Sessions (an
+Decision-Points) pro Szenario-ID (thread_id) persistiert. Bevorzugt wird
+ein lokaler SQLite-Checkpointer (Paket `langgraph-checkpoint-sqlite`), damit
+Sessions einen Prozess-Neustart überleben; ohne das Paket wird auf einen
+In-Memory-Checkpointer zurückgefallen.
+"""
+
+import logging
+import os
+import sqlite3
+from pathlib import Path
+from typing import Optional
+
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+try:
+    from langgraph.checkpoint.sqlite import SqliteSaver
+    CHECKPOINT_SQLITE_AVAILABLE = True
+except ImportError:
+    CHECKPOINT_SQLITE_AVAILABLE = False
+    SqliteSaver = None
+
+logger = logging.getLogger(__name__)
+
+
+# Standard-Pfad für die Checkpoint-Datenbank (überschreibbar via SCENARIO_CHECKPOINT_DB)
+DEFAULT_CHECKPOINT_PATH = Path(__file__).parent.parent / "checkpoints" / "interactive_sessions.sqlite"
+
+# Eigene Typen im Workflow-State, die der Serializer wiederherstellen darf
+STATE_MODEL_TYPES = [
+    ("state_models", name)
+    for name in (
+        "Inject",
+        "TechnicalMetadata",
+        "ValidationResult",
+        "CrisisPhase",
+        "ScenarioType",
+        "InjectModality",
+        "ScenarioEndCondition",
+        "UserDecision",
+    )
+]
+
+
+def _create_serializer() -> JsonPlusSerializer:
+    """Serializer mit explizit erlaubten State-Model-Typen (ältere LangGraph-Versionen: Default)."""
+    try:
+        return JsonPlusSerializer(allowed_msgpack_modules=STATE_MODEL_TYPES)
+    except TypeError:
+        return JsonPlusSerializer()
+
+
+def create_checkpointer(checkpoint_path: Optional[str] = None):
+    """
+    Erstellt den Checkpointer für interaktive Sessions.
+
+    Args:
+        checkpoint_path: Pfad zur SQLite-Datei (Standard: SCENARIO_CHECKPOINT_DB
+                         oder checkpoints/interactive_sessions.sqlite);
+                         ":memory:" erzwingt den In-Memory-Checkpointer
+
+    Returns:
+        SqliteSaver (persistent) oder MemorySaver (Fallback)
+    """
+    serde = _create_serializer()
+    path = checkpoint_path or os.getenv("SCENARIO_CHECKPOINT_DB") or str(DEFAULT_CHECKPOINT_PATH)
+
+    if path == ":memory:" or not CHECKPOINT_SQLITE_AVAILABLE:
+        if path != ":memory:":
+            logger.warning("⚠️  langgraph-checkpoint-sqlite nicht installiert - interaktive Sessions nur im Speicher")
+        return MemorySaver(serde=serde)
+
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    # check_same_thread=False: Streamlit/FastAPI rufen aus wechselnden Threads auf
+    connection = sqlite3.connect(path, check_same_thread=False)
+    return SqliteSaver(connection, serde=serde)
@@ -0,0 +1,234 @@
+"""
+Fragment-Cache für vom Critic validierte Inject-Sequenzen.
+
+Szenarien desselben Typs gegen dieselbe Infrastruktur beginnen in den frühen
+Phasen (NORMAL_OPERATION, SUSPICIOUS_ACTIVITY) nahezu austauschbar. Der Cache
+speichert angenommene Injects unter dem Schlüssel
+
+    (Szenario-Typ, Phase, Validierung, Hash der Asset-Status, Digest der vorherigen Injects)
+
+Da der Digest die gesamte bisherige Sequenz abdeckt, ergeben die Einträge
+einen Baum validierter Eröffnungen: ein Treffer setzt nur eine Sequenz fort,
+die selbst so schon einmal validiert wurde. Bei Wiederverwendung werden
+Inject-ID und Zeitversatz an das laufende Szenario angepasst (der zeitliche
+Abstand zum Vorgänger bleibt erhalten), Generator und Critic entfallen.
+
+Pro Schlüssel werden mehrere Varianten gehalten; `diversity` ist der Anteil
+der Lookups, die trotz Treffer frisch generieren lassen (neue Varianten
+werden bis `max_variants` ergänzt). Verdrängt wird nach LRU.
+
+Konfiguration:
+- SCENARIO_FRAGMENT_CACHE: "1" aktiviert die Wiederverwendung im Workflow (Standard: aus)
+- SCENARIO_FRAGMENT_CACHE_SIZE: Maximale Anzahl Schlüssel (Standard: 512)
+- SCENARIO_FRAGMENT_DIVERSITY: Anteil frischer Generierungen trotz Treffer, 0..1 (Standard: 0.2)
+"""
+
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from state_models import CrisisPhase, Inject, ValidationResult
+
+# Phasen, deren Injects zwischen Szenarien austauschbar sind
+DEFAULT_CACHEABLE_PHASES = (CrisisPhase.NORMAL_OPERATION, CrisisPhase.SUSPICIOUS_ACTIVITY)
+DEFAULT_MAX_ENTRIES = 512
+DEFAULT_MAX_VARIANTS = 3
+DEFAULT_DIVERSITY = 0.2
+
+FragmentKey = Tuple[str, str, str, str, str]
+
+_TIME_OFFSET = re.compile(r"^T\+(\d{2}):(\d{2})(?::(\d{2}))?$")
+
+
+def parse_time_offset(time_offset: Optional[str]) -> int:
+    """Zeitversatz "T+HH:MM[:SS]" in Sekunden (0 bei unbekanntem Format)."""
+    match = _TIME_OFFSET.match(time_offset or "")
+    if not match:
+        return 0
+    hours, minutes, seconds = match.groups()
+    return int(hours) * 3600 + int(minutes) * 60 + int(seconds or 0)
+
+
+def format_time_offset(seconds: int) -> str:
+    """Sekunden als Zeitversatz "T+HH:MM" bzw. "T+HH:MM:SS" (Sekunden nur wenn nötig)."""
+    hours, rest = divmod(max(0, int(seconds)), 3600)
+    minutes, secs = divmod(rest, 60)
+    if secs:
+        return f"T+{hours:02d}:{minutes:02d}:{secs:02d}"
+    return f"T+{hours:02d}:{minutes:02d}"
+
+
+def _digest(payload: Any) -> str:
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:16]
+
+
+def inject_digest(injects: Iterable[Inject]) -> str:
+    """Digest einer Inject-Sequenz ohne ID und Zeitversatz (bleibt beim Umnummerieren gleich)."""
+    return _digest([
+        [
+            inject.phase.value,
+            inject.source,
+            inject.target,
+            inject.modality.value,
+            inject.content,
+            inject.technical_metadata.mitre_id,
+            sorted(inject.technical_metadata.affected_assets)
+        ]
+        for inject in injects
+    ])
+
+
+class FragmentCache:
+    """Thread-sicherer LRU-Cache validierter Injects mit mehreren Varianten pro Schlüssel."""
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        diversity: Optional[float] = None,
+        max_variants: int = DEFAULT_MAX_VARIANTS,
+        phases: Iterable[CrisisPhase] = DEFAULT_CACHEABLE_PHASES,
+        seed: Optional[int] = None
+    ):
+        """
+        Args:
+            max_entries: Maximale Anzahl Schlüssel (Standard: SCENARIO_FRAGMENT_CACHE_SIZE)
+            diversity: Anteil der Lookups, die trotz Treffer frisch generieren (0 = immer
+                       wiederverwenden, 1 = nie; Standard: SCENARIO_FRAGMENT_DIVERSITY)
+            max_variants: Maximale Varianten pro Schlüssel (älteste wird ersetzt)
+            phases: Phasen, deren Injects gecacht werden
+            seed: Optional - Seed für Diversitäts-Entscheidung und Variantenwahl
+        """
+        self.max_entries = max(1, int(max_entries or os.getenv("SCENARIO_FRAGMENT_CACHE_SIZE", DEFAULT_MAX_ENTRIES)))
+        if diversity is None:
+            diversity = float(os.getenv("SCENARIO_FRAGMENT_DIVERSITY", DEFAULT_DIVERSITY))
+        self.diversity = min(1.0, max(0.0, float(diversity)))
+        self.max_variants = max(1, int(max_variants))
+        self.phases = frozenset(phases)
+        self._random = random.Random(seed)
+        self._entries: "OrderedDict[FragmentKey, List[Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"lookups": 0, "hits": 0, "diversity_skips": 0, "stores": 0, "evictions": 0}
+
+    def key(
+        self,
+        scenario_type: Any,
+        phase: CrisisPhase,
+        validator: str,
+        asset_states: Dict[str, Any],
+        previous_injects: List[Inject]
+    ) -> Optional[FragmentKey]:
+        """
+        Cache-Schlüssel für den nächsten Inject (None, wenn die Phase nicht gecacht wird).
+
+        Args:
+            scenario_type: Szenario-Typ
+            phase: Aktuelle Phase
+            validator: Beschreibung der Validierung (Modus, Compliance-Standards)
+            asset_states: Asset-ID -> Status
+            previous_injects: Bisher akzeptierte Injects des Szenarios
+        """
+        if phase not in self.phases:
+            return None
+        return (
+            str(getattr(scenario_type, "value", scenario_type)),
+            phase.value,
+            validator,
+            _digest(sorted(asset_states.items())),
+            inject_digest(previous_injects)
+        )
+
+    def lookup(
+        self,
+        key: Optional[FragmentKey],
+        inject_id: str,
+        previous_injects: List[Inject]
+    ) -> Optional[Tuple[Inject, ValidationResult]]:
+        """
+        Liefert eine gecachte Variante, umnummeriert auf `inject_id` und den
+        Zeitversatz nach dem letzten Inject, oder None (Fehlschlag bzw. Diversität).
+        """
+        if key is None:
+            return None
+        with self._lock:
+            self._stats["lookups"] += 1
+            variants = self._entries.get(key)
+            if not variants:
+                return None
+            self._entries.move_to_end(key)
+            if self._random.random() < self.diversity:
+                self._stats["diversity_skips"] += 1
+                return None
+            variant = self._random.choice(variants)
+            self._stats["hits"] += 1
+        start = parse_time_offset(previous_injects[-1].time_offset) if previous_injects else 0
+        inject = variant["inject"].model_copy(
+            update={"inject_id": inject_id, "time_offset": format_time_offset(start + variant["time_gap"])},
+            deep=True
+        )
+        return inject, variant["validation"].model_copy(deep=True)
+
+    def store(
+        self,
+        key: Optional[FragmentKey],
+        inject: Inject,
+        validation: ValidationResult,
+        previous_injects: List[Inject]
+    ):
+        """Speichert einen validierten Inject als Fortsetzung der Sequenz `previous_injects`."""
+        if key is None or not validation.is_valid:
+            return
+        content_digest = inject_digest([inject])
+        previous_offset = parse_time_offset(previous_injects[-1].time_offset) if previous_injects else 0
+        with self._lock:
+            variants = self._entries.setdefault(key, [])
+            self._entries.move_to_end(key)
+            if any(variant["digest"] == content_digest for variant in variants):
+                return  # Bereits bekannt (z.B. selbst aus dem Cache übernommen)
+            variants.append({
+                "digest": content_digest,
+                "inject": inject.model_copy(deep=True),
+                "validation": validation.model_copy(deep=True),
+                "time_gap": max(0, parse_time_offset(inject.time_offset) - previous_offset)
+            })
+            if len(variants) > self.max_variants:
+                variants.pop(0)
+            self._stats["stores"] += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Treffer, Diversitäts-Fehlschläge, Einträge und Trefferquote."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+            stats["variants"] = sum(len(variants) for variants in self._entries.values())
+        stats["hit_ratio"] = round(stats["hits"] / stats["lookups"], 3) if stats["lookups"] else 0.0
+        return stats
+
+
+_fragment_cache: Optional[FragmentCache] = None
+_fragment_cache_lock = threading.Lock()
+
+
+def get_fragment_cache() -> FragmentCache:
+    """Prozessweiter Fragment-Cache (geteilt von allen Workflow-Instanzen)."""
+    global _fragment_cache
+    with _fragment_cache_lock:
+        if _fragment_cache is None:
+            _fragment_cache = FragmentCache()
+        return _fragment_cache
+
+
+def fragment_cache_enabled() -> bool:
+    """Ob die Wiederverwendung per SCENARIO_FRAGMENT_CACHE aktiviert ist."""
+    return os.getenv("SCENARIO_FRAGMENT_CACHE", "").lower() in ("1", "true", "yes")
@@ -0,0 +1,261 @@
+"""
+Persistente Job-Queue für die Szenario-Generierung im Hintergrund.
+
+Jobs werden in einer lokalen SQLite-Datenbank abgelegt und von einer
+begrenzten Anzahl Worker-Threads abgearbeitet. Der Aufrufer erhält sofort
+eine Job-ID und fragt Status, Fortschritt (Injects fertig/gesamt) und
+Ergebnis über `get()` ab. Die eigentliche Generierung übernimmt ein
+`runner(job, report_progress, cancel_event)`, den die API bereitstellt.
+
+Beim Start werden Jobs, die bei einem Neustart noch liefen, wieder
+eingereiht; wartende Jobs bleiben erhalten.
+
+Konfiguration:
+- SCENARIO_JOB_DB: Pfad der SQLite-Datei (Standard: checkpoints/scenario_jobs.sqlite)
+- SCENARIO_JOB_WORKERS: Anzahl paralleler Jobs (Standard: 2)
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from utils.json_encoder import DateTimeEncoder
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_JOB_DB_PATH = Path(__file__).parent.parent / "checkpoints" / "scenario_jobs.sqlite"
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+FINAL_STATUSES = (JOB_COMPLETED, JOB_FAILED, JOB_CANCELLED)
+
+JobRunner = Callable[[Dict[str, Any], Callable[[int], None], threading.Event], Dict[str, Any]]
+
+_COLUMNS = (
+    "job_id", "status", "request", "progress_done", "progress_total",
+    "result", "error", "created_at", "started_at", "finished_at"
+)
+
+
+class ScenarioJobQueue:
+    """SQLite-gestützte Job-Queue mit begrenztem Worker-Pool."""
+
+    def __init__(self, runner: JobRunner, path: Optional[str] = None, workers: Optional[int] = None):
+        """
+        Args:
+            runner: Führt einen Job aus; meldet Fortschritt über report_progress(injects_fertig)
+                    und prüft cancel_event zwischen den Nodes
+            path: SQLite-Datei (Standard: SCENARIO_JOB_DB bzw. DEFAULT_JOB_DB_PATH; ":memory:" möglich)
+            workers: Anzahl paralleler Jobs (Standard: SCENARIO_JOB_WORKERS bzw. 2)
+        """
+        self.runner = runner
+        self.path = str(path or os.getenv("SCENARIO_JOB_DB") or DEFAULT_JOB_DB_PATH)
+        self.workers = max(1, int(workers or os.getenv("SCENARIO_JOB_WORKERS", "2")))
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        # check_same_thread=False: API-Handler und Worker greifen aus verschiedenen Threads zu
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition()
+        self._cancel_events: Dict[str, threading.Event] = {}
+        self._threads: List[threading.Thread] = []
+        self._stopped = threading.Event()
+        with self._lock, self._connection:
+            self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    job_id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    request TEXT NOT NULL,
+                    progress_done INTEGER NOT NULL DEFAULT 0,
+                    progress_total INTEGER NOT NULL DEFAULT 0,
+                    result TEXT,
+                    error TEXT,
+                    created_at TEXT NOT NULL,
+                    started_at TEXT,
+                    finished_at TEXT
+                )
+            """)
+            # Bei einem Neustart unterbrochene Jobs erneut ausführen
+            requeued = self._connection.execute(
+                "UPDATE jobs SET status = ?, progress_done = 0, started_at = NULL WHERE status = ?",
+                (JOB_QUEUED, JOB_RUNNING)
+            ).rowcount
+        if requeued:
+            logger.info("🔁 %s unterbrochene Jobs wieder eingereiht", requeued)
+
+    # ------------------------------------------------------------------
+    # Öffentliche API
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """Startet die Worker-Threads (idempotent)."""
+        if self._threads:
+            return
+        self._stopped.clear()
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"scenario-job-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: Optional[float] = None):
+        """
+        Stoppt die Worker. Laufende Jobs werden nach dem aktuellen Node
+        abgebrochen und wieder eingereiht (Neustart beim nächsten start()).
+        """
+        self._stopped.set()
+        with self._lock:
+            for event in self._cancel_events.values():
+                event.set()
+        with self._wakeup:
+            self._wakeup.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def submit(self, request: Dict[str, Any], total: int = 0) -> str:
+        """Reiht einen Job ein und gibt die Job-ID zurück."""
+        job_id = f"JOB-{uuid.uuid4().hex[:12].upper()}"
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT INTO jobs (job_id, status, request, progress_total, created_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id, JOB_QUEUED, json.dumps(request), total, datetime.now().isoformat())
+            )
+        with self._wakeup:
+            self._wakeup.notify()
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Status, Fortschritt, Ergebnis und Fehler eines Jobs (None wenn unbekannt)."""
+        with self._lock:
+            row = self._connection.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        return self._to_job(row) if row else None
+
+    def list(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Neueste Jobs zuerst (ohne Ergebnis, das kann groß sein)."""
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM jobs ORDER BY rowid DESC LIMIT ?", (limit,)
+            ).fetchall()
+        jobs = [self._to_job(row) for row in rows]
+        for job in jobs:
+            job.pop("result", None)
+        return jobs
+
+    def cancel(self, job_id: str) -> Optional[str]:
+        """
+        Bricht einen Job ab. Wartende Jobs werden sofort storniert, laufende nach
+        dem aktuellen Node.
+
+        Returns:
+            Neuer Status bzw. unveränderter Endstatus, None wenn der Job unbekannt ist
+        """
+        with self._lock, self._connection:
+            row = self._connection.execute("SELECT status FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+            if row is None:
+                return None
+            status = row[0]
+            if status == JOB_QUEUED:
+                self._connection.execute(
+                    "UPDATE jobs SET status = ?, finished_at = ? WHERE job_id = ?",
+                    (JOB_CANCELLED, datetime.now().isoformat(), job_id)
+                )
+                return JOB_CANCELLED
+            if status == JOB_RUNNING and job_id in self._cancel_events:
+                self._cancel_events[job_id].set()
+                return "cancelling"
+        return status
+
+    def stats(self) -> Dict[str, Any]:
+        """Anzahl Jobs pro Status und konfigurierte Worker."""
+        with self._lock:
+            rows = self._connection.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {"workers": self.workers, "jobs": dict(rows)}
+
+    # ------------------------------------------------------------------
+    # Worker
+    # ------------------------------------------------------------------
+
+    def _claim_next(self) -> Optional[Dict[str, Any]]:
+        """Übernimmt den ältesten wartenden Job (atomar, ein Worker pro Job)."""
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM jobs WHERE status = ? ORDER BY rowid LIMIT 1",
+                (JOB_QUEUED,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._connection.execute(
+                "UPDATE jobs SET status = ?, started_at = ? WHERE job_id = ?",
+                (JOB_RUNNING, datetime.now().isoformat(), row[0])
+            )
+            # Abbruch-Signal im selben Lock registrieren, damit cancel() keinen Job verpasst
+            self._cancel_events[row[0]] = threading.Event()
+        job = self._to_job(row)
+        job["status"] = JOB_RUNNING
+        return job
+
+    def _work(self):
+        while not self._stopped.is_set():
+            job = self._claim_next()
+            if job is None:
+                with self._wakeup:
+                    self._wakeup.wait(timeout=1.0)
+                continue
+            self._run(job)
+
+    def _run(self, job: Dict[str, Any]):
+        job_id = job["job_id"]
+        cancel_event = self._cancel_events[job_id]
+        logger.info("▶️  Job %s gestartet", job_id)
+
+        def report_progress(done: int):
+            self._update(job_id, progress_done=done)
+
+        try:
+            result = self.runner(job, report_progress, cancel_event)
+        except Exception as e:
+            logger.error("❌ Job %s fehlgeschlagen: %s", job_id, e, exc_info=True)
+            self._update(job_id, status=JOB_FAILED, error=str(e), finished_at=datetime.now().isoformat())
+        else:
+            if self._stopped.is_set() and cancel_event.is_set():
+                # Durch stop() unterbrochen, nicht vom Benutzer: beim nächsten Start erneut ausführen
+                self._update(job_id, status=JOB_QUEUED, progress_done=0, started_at=None)
+                logger.info("⏸️  Job %s unterbrochen und wieder eingereiht", job_id)
+                return
+            status = JOB_CANCELLED if cancel_event.is_set() else JOB_COMPLETED
+            self._update(
+                job_id,
+                status=status,
+                result=json.dumps(result, cls=DateTimeEncoder),
+                finished_at=datetime.now().isoformat()
+            )
+            logger.info("✅ Job %s beendet: %s", job_id, status)
+        finally:
+            with self._lock:
+                self._cancel_events.pop(job_id, None)
+
+    def _update(self, job_id: str, **fields: Any):
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock, self._connection:
+            self._connection.execute(
+                f"UPDATE jobs SET {assignments} WHERE job_id = ?", (*fields.values(), job_id)
+            )
+
+    @staticmethod
+    def _to_job(row: tuple) -> Dict[str, Any]:
+        job = dict(zip(_COLUMNS, row))
+        job["request"] = json.loads(job["request"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        job["progress"] = {"done": job.pop("progress_done"), "total": job.pop("progress_total")}
+        return job
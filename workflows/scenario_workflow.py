@@ -11,12 +11,19 @@ Orchestriert alle Agenten im Multi-Agenten-System:
 7. State Update (Neo4j)
 """
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Iterator, Callable
 from langgraph.graph import StateGraph, END
 from datetime import datetime, timedelta
 import uuid
+import os
+import logging
 import sys
 import time
+import threading
+import copy
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout, as_completed
 from pathlib import Path
 
 # Ensure current directory is in path for compliance module
@@ -25,6 +32,13 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from workflows.state_schema import WorkflowState
 from workflows.fsm import CrisisFSM
 from workflows.workflow_optimizations import WorkflowOptimizer, WorkflowPerformanceMonitor
+from workflows.checkpointing import create_checkpointer
+from utils.cancellation import cancellation_scope, check_cancelled, remaining_time, OperationCancelled
+from utils.llm_recorder import llm_scenario_scope
+from utils.rate_limiter import Priority, llm_priority_scope
+from utils.token_usage import llm_node_scope, get_scenario_usage, pop_scenario_usage, reset_scenario_usage
+from workflows.trace_sink import TraceSink, get_trace_sink, TRACE_LOGS, TRACE_DECISIONS
+from workflows.fragment_cache import FragmentCache, FragmentKey, get_fragment_cache, fragment_cache_enabled
 from agents.manager_agent import ManagerAgent
 from agents.intel_agent import IntelAgent
 from agents.generator_agent import GeneratorAgent
@@ -40,6 +54,8 @@ from state_models import (
 )
 from forensic_logger import get_forensic_logger
 
+logger = logging.getLogger(__name__)
+
 
 class ScenarioWorkflow:
     """
@@ -50,25 +66,129 @@ class ScenarioWorkflow:
     Generator → Critic → State Update → (Loop oder End)
     """
     
+    # Temperatur-Abstand zwischen spekulativen Draft-Kandidaten
+    SPECULATIVE_TEMPERATURE_STEP = 0.15
+    # Obergrenze für parallele Draft-Kandidaten (Threads + parallele LLM-Calls)
+    MAX_SPECULATIVE_CANDIDATES = 5
+    # Standard-Länge eines Manager-Plans (Injects pro Phase, ein Manager-Aufruf pro Plan)
+    DEFAULT_PHASE_PLAN_STEPS = 4
+    # Spekulativ vorberechnete Entscheidungs-Zweige pro Decision-Point (interaktiver Modus)
+    DEFAULT_DECISION_BRANCHES = 2
+    MAX_DECISION_BRANCHES = 3
+    
     def __init__(
         self,
         neo4j_client: Neo4jClient,
         max_iterations: int = 10,
         interactive_mode: bool = False,
-        compliance_standards: Optional[List] = None
+        compliance_standards: Optional[List] = None,
+        speculative_candidates: int = 1,
+        state_refresh_interval: int = 5,
+        checkpoint_path: Optional[str] = None,
+        trace_sink: Optional[TraceSink] = None,
+        pipelined: bool = False,
+        phase_plan_steps: int = DEFAULT_PHASE_PLAN_STEPS,
+        batch_drafts: int = 1,
+        token_budget: Optional[int] = None,
+        cost_budget: Optional[float] = None,
+        deadline_seconds: Optional[float] = None,
+        node_timeout: Optional[float] = None,
+        decision_branches: int = DEFAULT_DECISION_BRANCHES,
+        fragment_cache: Optional[FragmentCache] = None
     ):
         """
         Initialisiert den Workflow.
         
         Args:
             neo4j_client: Neo4j Client für State Management
-            max_iterations: Maximale Anzahl Injects
+            max_iterations: Maximale Anzahl Injects (Standard pro Lauf, über
+                            generate_scenario/stream_scenario pro Aufruf überschreibbar)
             interactive_mode: Ob interaktiver Modus mit Benutzer-Entscheidungen aktiviert ist
             compliance_standards: Liste von Compliance-Standards (Standard: [DORA])
+            speculative_candidates: Anzahl parallel erzeugter Draft-Kandidaten pro Inject
+                                    (1 = klassischer sequentieller Generator → Critic Ablauf)
+            state_refresh_interval: Vollständiges Neu-Laden des Systemzustands aus Neo4j
+                                    nur alle N Iterationen (dazwischen werden die Deltas
+                                    aus dem State Update übernommen; 1 = immer neu laden)
+            checkpoint_path: Optional - SQLite-Datei für pausierte interaktive Sessions
+                             (Standard: checkpoints/interactive_sessions.sqlite)
+            trace_sink: Optional - Sink für Workflow-Logs und Agenten-Entscheidungen
+                        (Standard: globaler Sink, siehe SCENARIO_TRACE_SINK)
+            pipelined: Ob die nächste Iteration (Manager → Intel → Action → Generator)
+                       bereits während der Critic-Validierung spekulativ vorbereitet wird
+            phase_plan_steps: Anzahl Injects, die ein Manager-Plan abdeckt; der Manager wird
+                              nur bei Phasenwechsel, abgearbeitetem Plan, plan-bezogener
+                              Critic-Ablehnung oder Benutzer-Entscheidung erneut gefragt
+                              (1 = Manager-Aufruf pro Inject)
+            batch_drafts: Anzahl Injects, die der Generator in einem LLM-Aufruf als
+                          Sequenz entwirft; die Drafts werden einzeln vom Critic geprüft,
+                          ab der ersten Ablehnung wird der Rest verworfen (1 = aus;
+                          nur ohne spekulative Kandidaten)
+            token_budget: Optional - maximale Tokens pro Szenario (Standard: SCENARIO_TOKEN_BUDGET);
+                          bei Überschreitung wird nicht mehr verfeinert und das Szenario endet
+                          nach dem aktuellen Inject (End-Bedingung BUDGET_EXCEEDED)
+            cost_budget: Optional - maximale geschätzte Kosten in USD pro Szenario
+                         (Standard: SCENARIO_COST_BUDGET), Verhalten wie token_budget
+            deadline_seconds: Optional - Wandzeit-Limit pro Szenario in Sekunden (Standard:
+                              SCENARIO_DEADLINE_SECONDS, pro Aufruf überschreibbar); danach
+                              endet das Szenario mit den bis dahin akzeptierten Injects
+                              (End-Bedingung TIMEOUT, nur nicht-interaktiver Modus)
+            node_timeout: Optional - maximale Laufzeit eines Nodes (LLM-Aufrufe, Graph-Abfragen)
+                          in Sekunden (Standard: SCENARIO_NODE_TIMEOUT); ein überfälliger Node
+                          wird kooperativ abgebrochen und das Szenario endet wie bei der Deadline
+            decision_branches: Anzahl wahrscheinlichster Optionen, für die während der
+                               Bedenkzeit am Decision-Point die nächste Iteration
+                               (Manager → Intel → Action → Generator) spekulativ
+                               vorberechnet wird (0 = aus, max. MAX_DECISION_BRANCHES)
+            fragment_cache: Optional - Cache validierter Injects der frühen Phasen; Treffer
+                            ersetzen Generator und Critic (Standard: prozessweiter Cache,
+                            falls SCENARIO_FRAGMENT_CACHE gesetzt ist, sonst aus)
         """
         self.neo4j_client = neo4j_client
         self.max_iterations = max_iterations
         self.interactive_mode = interactive_mode
+        self.speculative_candidates = self._clamp_candidates(speculative_candidates)
+        self.state_refresh_interval = max(1, int(state_refresh_interval))
+        self.phase_plan_steps = max(1, int(phase_plan_steps))
+        self.batch_drafts = max(1, int(batch_drafts))
+        if token_budget is None and os.getenv("SCENARIO_TOKEN_BUDGET"):
+            token_budget = int(os.getenv("SCENARIO_TOKEN_BUDGET"))
+        if cost_budget is None and os.getenv("SCENARIO_COST_BUDGET"):
+            cost_budget = float(os.getenv("SCENARIO_COST_BUDGET"))
+        self.token_budget = token_budget
+        self.cost_budget = cost_budget
+        if deadline_seconds is None and os.getenv("SCENARIO_DEADLINE_SECONDS"):
+            deadline_seconds = float(os.getenv("SCENARIO_DEADLINE_SECONDS"))
+        if node_timeout is None and os.getenv("SCENARIO_NODE_TIMEOUT"):
+            node_timeout = float(os.getenv("SCENARIO_NODE_TIMEOUT"))
+        self.deadline_seconds = deadline_seconds
+        self.node_timeout = node_timeout
+        
+        # Checkpointer nur im interaktiven Modus: Sessions pausieren an Decision-Points
+        self.checkpointer = create_checkpointer(checkpoint_path) if interactive_mode else None
+        
+        # Traces liegen außerhalb des Graph-States, im State stehen nur Zähler
+        self.trace_sink = trace_sink or get_trace_sink()
+        # Während spekulativer Schritte puffert _record_trace thread-lokal statt zu schreiben
+        self._trace_buffer = threading.local()
+        
+        # Pipelining: spekulative Folge-Iteration pro Szenario (scenario_id -> Eintrag)
+        self.pipelined = pipelined
+        self._speculations: Dict[str, Dict[str, Any]] = {}
+        self._speculation_lock = threading.Lock()
+        self._pipeline_executor: Optional[ThreadPoolExecutor] = None
+        self._speculation_context = threading.local()
+        self.pipeline_stats = {"started": 0, "adopted": 0, "discarded": 0}
+        
+        # Entscheidungs-Zweige: scenario_id -> {choice_id: Spekulation}; Häufigkeit gewählter Optionen
+        self.decision_branches = max(0, min(self.MAX_DECISION_BRANCHES, int(decision_branches)))
+        self._decision_branches: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._choice_counts: Dict[str, int] = {}
+        self.branch_stats = {"started": 0, "committed": 0, "discarded": 0}
+        
+        if fragment_cache is None and fragment_cache_enabled():
+            fragment_cache = get_fragment_cache()
+        self.fragment_cache = fragment_cache
         
         # Import Compliance-Standards (mit Fallback)
         # CriticAgent hat bereits einen Fallback, daher können wir None übergeben
@@ -90,22 +210,125 @@ class ScenarioWorkflow:
         # Erstelle Graph
         self.graph = self._create_graph()
     
+    def _scoped_node(self, node: Callable[[WorkflowState], Dict[str, Any]]) -> Callable[[WorkflowState], Dict[str, Any]]:
+        """
+        Ordnet die LLM-Aufrufe eines Nodes dem Szenario und dem Node zu
+        (Record & Replay, siehe utils/llm_recorder.py; Token-Erfassung, siehe utils/token_usage.py).
+        
+        Setzt außerdem Deadline und Node-Timeout durch: Nach Ablauf der Deadline
+        werden Nodes übersprungen, mit Zeitlimit läuft der Node in einem eigenen
+        Thread und wird bei Überschreitung kooperativ abgebrochen.
+        """
+        node_name = node.__name__.strip("_").replace("_node", "")
+        
+        def scoped(state: WorkflowState) -> Dict[str, Any]:
+            with llm_scenario_scope(state.get("scenario_id")), llm_node_scope(node_name):
+                return node(state)
+        
+        @functools.wraps(node)
+        def run(state: WorkflowState) -> Dict[str, Any]:
+            if self._deadline_exceeded(state):
+                if not self._is_pending_commit(node_name, state):
+                    return self._skip_node(state, node_name)
+                # Vom Critic angenommenen Inject noch übernehmen (kein LLM-Aufruf)
+                time_limit = self.node_timeout
+            else:
+                time_limit = self._node_time_limit(state)
+            if time_limit is None:
+                return scoped(state)
+            return self._run_with_time_limit(scoped, state, node_name, time_limit)
+        return run
+    
+    def _node_time_limit(self, state: WorkflowState) -> Optional[float]:
+        """Zeitlimit für den nächsten Node: Node-Timeout bzw. Restzeit bis zur Deadline."""
+        limits = [] if self.node_timeout is None else [self.node_timeout]
+        if state.get("deadline"):
+            limits.append(max(0.0, state["deadline"] - time.time()))
+        return min(limits) if limits else None
+    
+    def _run_with_time_limit(
+        self,
+        scoped: Callable[[WorkflowState], Dict[str, Any]],
+        state: WorkflowState,
+        node_name: str,
+        time_limit: float
+    ) -> Dict[str, Any]:
+        """
+        Führt einen Node mit Zeitlimit aus.
+        
+        Der Node läuft in einem Daemon-Thread mit eigenem Cancel-Event und
+        Frist. Neo4j-Abfragen des Nodes erhalten die Restzeit als
+        Transaktions-Timeout; bei Überschreitung wird das Event gesetzt (der
+        nächste LLM-Aufruf bzw. Neo4j-Write bricht mit OperationCancelled ab)
+        und der Node ohne Ergebnis beendet.
+        """
+        cancel_event = threading.Event()
+        outcome: Dict[str, Any] = {}
+        context = contextvars.copy_context()
+        deadline = time.time() + time_limit
+        
+        def target():
+            with cancellation_scope(cancel_event, deadline=deadline):
+                try:
+                    outcome["update"] = context.run(scoped, state)
+                except BaseException as e:
+                    outcome["error"] = e
+        
+        worker = threading.Thread(target=target, name=f"node-{node_name}", daemon=True)
+        worker.start()
+        worker.join(time_limit)
+        if worker.is_alive():
+            cancel_event.set()
+            if self.node_timeout is not None and time_limit >= self.node_timeout:
+                reason = f"Node-Timeout: {node_name} nach {time_limit:.1f}s abgebrochen"
+            else:
+                reason = f"Szenario-Deadline während {node_name} abgelaufen"
+            # Das Szenario endet - vorberechnete Iterationen werden nicht mehr gebraucht
+            self._discard_pending_iterations(state.get("scenario_id"), reason)
+            return self._skip_node(state, node_name, reason)
+        if "error" in outcome:
+            raise outcome["error"]
+        return outcome["update"]
+    
+    def _skip_node(self, state: WorkflowState, node_name: str, reason: Optional[str] = None) -> Dict[str, Any]:
+        """Beendet einen Node ohne Ergebnis, weil Deadline oder Node-Timeout erreicht sind."""
+        # Kopie: ein abgebrochener Node-Thread kann das ursprüngliche Dict noch verändern
+        metadata = dict(state.get("metadata", {}))
+        if reason:
+            metadata.setdefault("deadline_exceeded", reason)
+        # Erster nicht (vollständig) ausgeführter Node: Drafts/Validierung danach sind veraltet
+        metadata.setdefault("deadline_node", node_name)
+        logger.info("⏱️  %s übersprungen: %s", node_name, metadata.get("deadline_exceeded"))
+        return {"metadata": metadata}
+    
+    @staticmethod
+    def _is_pending_commit(node_name: str, state: WorkflowState) -> bool:
+        """Ob State Update einen vollständig validierten, angenommenen Draft übernehmen würde."""
+        validation = state.get("validation_result")
+        return (
+            node_name == "state_update"
+            and not state.get("metadata", {}).get("deadline_node")
+            and state.get("draft_inject") is not None
+            and validation is not None
+            and validation.is_valid
+        )
+    
     def _create_graph(self) -> StateGraph:
         """Erstellt den LangGraph Workflow."""
         workflow = StateGraph(WorkflowState)
         
         # Nodes hinzufügen
-        workflow.add_node("state_check", self._state_check_node)
-        workflow.add_node("manager", self._manager_node)
-        workflow.add_node("intel", self._intel_node)
-        workflow.add_node("action_selection", self._action_selection_node)
-        workflow.add_node("generator", self._generator_node)
-        workflow.add_node("critic", self._critic_node)
-        workflow.add_node("state_update", self._state_update_node)
+        workflow.add_node("state_check", self._scoped_node(self._state_check_node))
+        workflow.add_node("manager", self._scoped_node(self._manager_node))
+        workflow.add_node("intel", self._scoped_node(self._intel_node))
+        workflow.add_node("action_selection", self._scoped_node(self._action_selection_node))
+        workflow.add_node("generator", self._scoped_node(self._generator_node))
+        workflow.add_node("critic", self._scoped_node(self._critic_node))
+        workflow.add_node("state_update", self._scoped_node(self._state_update_node))
         
         # Decision-Point Node (nur im interaktiven Modus)
         if self.interactive_mode:
-            workflow.add_node("decision_point", self._decision_point_node)
+            workflow.add_node("decision_point", self._scoped_node(self._decision_point_node))
         
         # Edges definieren
         workflow.set_entry_point("state_check")
@@ -151,6 +374,12 @@ class ScenarioWorkflow:
                 }
             )
         
+        if self.interactive_mode:
+            # Pausiert nach jedem Decision-Point; Fortsetzung über den Checkpoint (thread_id = scenario_id)
+            return workflow.compile(
+                checkpointer=self.checkpointer,
+                interrupt_after=["decision_point"]
+            )
         return workflow.compile()
     
     def _state_check_node(self, state: WorkflowState) -> Dict[str, Any]:
@@ -159,8 +388,8 @@ class ScenarioWorkflow:
         
         iteration = state.get('iteration', 0)
         injects_count = len(state.get('injects', []))
-        print(f"🔍 [State Check] Iteration {iteration}, Injects: {injects_count}, Phase: {state.get('current_phase', 'N/A')}")
-        print(f"   🔧 Hole Systemzustand aus Neo4j...")
+        logger.debug("🔍 [State Check] Iteration %s, Injects: %s, Phase: %s", iteration, injects_count, state.get('current_phase', 'N/A'))
+        logger.debug("🔧 Hole Systemzustand aus Neo4j...")
         
         log_entry = {
             "timestamp": datetime.now().isoformat(),
@@ -171,6 +400,27 @@ class ScenarioWorkflow:
         }
         
         try:
+            # Deltas aus dem State Update sind bereits im State - Neo4j nur bei Bedarf neu lesen
+            metadata = state.get("metadata", {})
+            current_version = self._get_state_version()
+            refresh_reason = self._state_refresh_reason(state, current_version)
+            if refresh_reason is None:
+                system_state_dict = state["system_state"]
+                logger.debug("✅ [State Check] Systemzustand aus lokalen Deltas: %s Assets", len(system_state_dict))
+                
+                log_entry["details"] = {
+                    "source": "deltas",
+                    "assets_after_filter": len(system_state_dict),
+                    "asset_ids": list(system_state_dict.keys())[:10],
+                    "status": "success"
+                }
+                trace = self._record_trace(state, log_entry)
+                self.performance_monitor.end_node("state_check", node_start_time, success=True)
+                
+                return trace
+            
+            logger.debug("🔄 Vollständiges Neu-Laden: %s", refresh_reason)
+            
             # Hole aktuellen Systemzustand
             entities = self.neo4j_client.get_current_state()
             
@@ -189,14 +439,8 @@ class ScenarioWorkflow:
                 # Prüfe Entity-Type
                 entity_type = entity.get("entity_type", "").lower() if entity.get("entity_type") else ""
                 
-                # Akzeptiere nur echte Assets:
-                # 1. Entity-Type ist gesetzt UND ist ein Asset-Typ
-                # 2. ODER ID beginnt mit Asset-Präfix (SRV-, APP-, DB-, SVC-)
-                is_valid_asset_type = entity_type in ["server", "application", "database", "service", "asset", "system"]
-                has_asset_prefix = any(entity_id.startswith(prefix) for prefix in ["SRV-", "APP-", "DB-", "SVC-", "SYS-"])
-                
-                if not (is_valid_asset_type or has_asset_prefix):
-                    # Überspringe wenn weder Typ noch Präfix passt
+                # Akzeptiere nur echte Assets (Asset-Typ oder Asset-Präfix)
+                if not self._is_asset_entity(entity_id, entity_type):
                     continue
                 
                 system_state_dict[entity_id] = {
@@ -204,12 +448,14 @@ class ScenarioWorkflow:
                     "entity_type": entity.get("entity_type", "Asset"),
                     "name": entity.get("name", entity_id),
                     "criticality": entity.get("properties", {}).get("criticality", "standard"),
-                    **entity.get("properties", {})
+                    **entity.get("properties", {}),
+                    # Abhängigkeiten für die Relevanz-Auswahl in den Agenten-Prompts (k-Hop-Nachbarschaft)
+                    "dependencies": [rel["target"] for rel in entity.get("relationships", []) if rel.get("target")]
                 }
             
             # Falls keine Assets gefunden, erstelle Standard-Assets
             if not system_state_dict:
-                print("⚠️  Keine Assets im Systemzustand gefunden. Erstelle Standard-Assets...")
+                logger.warning("⚠️  Keine Assets im Systemzustand gefunden. Erstelle Standard-Assets...")
                 system_state_dict = {
                     "SRV-001": {
                         "status": "online",
@@ -224,33 +470,38 @@ class ScenarioWorkflow:
                         "criticality": "standard"
                     }
                 }
-                print(f"✅ Standard-Assets erstellt: {list(system_state_dict.keys())}")
+                logger.debug("✅ Standard-Assets erstellt: %s", list(system_state_dict.keys()))
             
-            print(f"✅ [State Check] Systemzustand geladen: {len(system_state_dict)} Assets")
-            print(f"   Asset-IDs: {list(system_state_dict.keys())[:10]}")
+            logger.debug("✅ [State Check] Systemzustand geladen: %s Assets", len(system_state_dict))
+            logger.debug("Asset-IDs: %s", list(system_state_dict.keys())[:10])
             
             log_entry["details"] = {
+                "source": "neo4j",
+                "refresh_reason": refresh_reason,
                 "entities_found": len(entities),
                 "assets_after_filter": len(system_state_dict),
                 "asset_ids": list(system_state_dict.keys())[:10],
                 "status": "success"
             }
             
-            logs = state.get("workflow_logs", [])
-            logs.append(log_entry)
+            trace = self._record_trace(state, log_entry)
             
             # Performance-Monitoring
             self.performance_monitor.end_node("state_check", node_start_time, success=True)
             
             return {
                 "system_state": system_state_dict,
-                "workflow_logs": logs
+                "metadata": {
+                    **metadata,
+                    "state_last_full_read": iteration,
+                    "state_version": current_version
+                },
+                **trace
             }
         except Exception as e:
-            print(f"⚠️  Fehler bei State Check: {e}")
+            logger.warning("⚠️  Fehler bei State Check: %s", e)
             log_entry["details"] = {"error": str(e), "status": "error"}
-            logs = state.get("workflow_logs", [])
-            logs.append(log_entry)
+            trace = self._record_trace(state, log_entry)
             
             # Performance-Monitoring
             self.performance_monitor.end_node("state_check", node_start_time, success=False)
@@ -264,25 +515,104 @@ class ScenarioWorkflow:
             )
             
             if should_exit:
-                print(f"🛑 Early Exit: {reason}")
+                logger.info("🛑 Early Exit: %s", reason)
                 return {
                     "system_state": {},
                     "errors": errors,
-                    "workflow_logs": logs,
+                    **trace,
                     "end_condition": "FATAL"
                 }
             
             return {
                 "system_state": {},
                 "errors": errors,
-                "workflow_logs": logs
+                **trace
             }
     
+    @staticmethod
+    def _is_asset_entity(entity_id: str, entity_type: Optional[str]) -> bool:
+        """
+        Prüft, ob eine Entität ein echtes Asset ist (keine Inject-/Szenario-ID).
+        
+        Akzeptiert werden Entitäten mit Asset-Typ (Server, Application, ...)
+        oder mit Asset-Präfix (SRV-, APP-, DB-, SVC-, SYS-).
+        """
+        if not entity_id or entity_id.startswith("INJ-") or entity_id.startswith("SCEN-"):
+            return False
+        is_valid_asset_type = (entity_type or "").lower() in ["server", "application", "database", "service", "asset", "system"]
+        has_asset_prefix = any(entity_id.startswith(prefix) for prefix in ["SRV-", "APP-", "DB-", "SVC-", "SYS-"])
+        return is_valid_asset_type or has_asset_prefix
+    
+    def _get_state_version(self) -> Optional[str]:
+        """
+        Liest die Zustandsversion des Knowledge Graphs (falls vom Client unterstützt).
+        
+        Returns:
+            Versions-Token oder None, wenn nicht verfügbar
+        """
+        get_version = getattr(self.neo4j_client, "get_state_version", None)
+        if not callable(get_version):
+            return None
+        try:
+            return get_version()
+        except Exception as e:
+            logger.warning("⚠️  Zustandsversion nicht lesbar: %s", e)
+            return None
+    
+    @staticmethod
+    def _advance_state_version(version: Optional[str], writes: int) -> Optional[str]:
+        """
+        Berechnet die erwartete Zustandsversion nach eigenen Schreibzugriffen.
+        
+        Jeder Aufruf von update_entity_status erhöht den Zähler im Token
+        "<präfix>:<zähler>" um genau 1. Statt die Version nach den eigenen
+        Writes neu zu lesen (und dabei gleichzeitige externe Writes zu
+        übernehmen), wird sie lokal fortgeschrieben; weicht sie im nächsten
+        State Check ab, hat jemand anderes geschrieben.
+        
+        Returns:
+            Erwartetes Versions-Token oder None, wenn unbekannt
+        """
+        if version is None:
+            return None
+        prefix, _, counter = str(version).rpartition(":")
+        try:
+            return f"{prefix}:{int(counter) + writes}"
+        except ValueError:
+            return None
+    
+    def _state_refresh_reason(self, state: WorkflowState, current_version: Optional[str]) -> Optional[str]:
+        """
+        Entscheidet, ob der Systemzustand vollständig aus Neo4j gelesen werden muss.
+        
+        Returns:
+            Grund für das Neu-Laden oder None, wenn die lokalen Deltas ausreichen
+        """
+        metadata = state.get("metadata", {})
+        last_full_read = metadata.get("state_last_full_read")
+        
+        if not state.get("system_state") or last_full_read is None:
+            return "initial"
+        if state.get("iteration", 0) - last_full_read >= self.state_refresh_interval:
+            return "interval"
+        if current_version is not None and current_version != metadata.get("state_version"):
+            return "external_change"
+        return None
+    
     def _manager_node(self, state: WorkflowState) -> Dict[str, Any]:
         """Node: Manager Agent - Storyline-Planung."""
+        speculative = self._adopt_speculation("manager", state)
+        if speculative is not None:
+            return speculative
+        
         iteration = state.get('iteration', 0)
         injects_count = len(state.get('injects', []))
-        print(f"📋 [Manager] Iteration {iteration}, Injects: {injects_count} - Erstelle Storyline-Plan...")
+        
+        phase_plan = state.get("phase_plan")
+        replan_reason = self._replan_reason(state, phase_plan)
+        if replan_reason is None:
+            return self._continue_phase_plan(state, phase_plan)
+        logger.debug("📋 [Manager] Iteration %s, Injects: %s - Erstelle Storyline-Plan (%s)...", iteration, injects_count, replan_reason)
         
         log_entry = {
             "timestamp": datetime.now().isoformat(),
@@ -323,11 +653,14 @@ class ScenarioWorkflow:
                         elif status == "suspicious":
                             system_state_summary["suspicious_assets"].append(entity_id)
             
+            remaining = state.get("max_iterations", self.max_iterations) - len(state["injects"])
             plan = self.manager_agent.create_storyline(
                 scenario_type=state["scenario_type"],
                 current_phase=state["current_phase"],
                 inject_count=len(state["injects"]),
-                system_state=state["system_state"]
+                system_state=state["system_state"],
+                planned_steps=max(1, min(self.phase_plan_steps, remaining)),
+                intended_phase=(phase_plan or {}).get("exit_phase") if replan_reason == "Plan abgearbeitet" else None
             )
             
             # Aktualisiere Phase wenn nötig
@@ -343,9 +676,23 @@ class ScenarioWorkflow:
             else:
                 next_phase = state["current_phase"]
             
+            steps = plan.get("steps") or []
+            new_phase_plan = {
+                "plan": plan,
+                "phase": next_phase,
+                "exit_phase": plan.get("exit_phase"),
+                "steps": steps,
+                "step_index": 1,
+                "decision_count": len(state.get("user_decisions") or []),
+                "invalidated": None
+            }
+            planning_stats = self._count_planning(state, replan_reason=replan_reason)
+            
             log_entry["details"] = {
                 "next_phase": next_phase.value,
                 "narrative": plan.get("narrative", "")[:100] + "..." if plan.get("narrative") else "",
+                "plan_steps": len(steps),
+                "replan_reason": replan_reason,
                 "status": "success"
             }
             
@@ -362,25 +709,21 @@ class ScenarioWorkflow:
                 "reasoning": plan.get("narrative", "")[:200] if plan.get("narrative") else "Automatische Phasen-Übergang"
             }
             
-            logs = state.get("workflow_logs", [])
-            logs.append(log_entry)
-            decisions = state.get("agent_decisions", [])
-            decisions.append(decision_entry)
+            trace = self._record_trace(state, log_entry, decision_entry)
             
             return {
-                "manager_plan": plan,
+                "manager_plan": self._plan_step(plan, steps, 0),
+                "phase_plan": new_phase_plan,
+                "planning_stats": planning_stats,
                 "current_phase": next_phase,
-                "workflow_logs": logs,
-                "agent_decisions": decisions
+                **trace
             }
         except Exception as e:
             import traceback
             error_trace = traceback.format_exc()
-            print(f"⚠️  Fehler bei Manager: {e}")
-            print(f"   Traceback: {error_trace}")
+            logger.warning("⚠️  Fehler bei Manager: %s", e, exc_info=True)
             log_entry["details"] = {"error": str(e), "traceback": error_trace, "status": "error"}
-            logs = state.get("workflow_logs", [])
-            logs.append(log_entry)
+            trace = self._record_trace(state, log_entry)
             
             # Fallback: Verwende aktuelle Phase und erstelle minimalen Plan
             fallback_plan = {
@@ -394,16 +737,101 @@ class ScenarioWorkflow:
             
             return {
                 "manager_plan": fallback_plan,
+                "phase_plan": None,  # Nächste Iteration plant neu
                 "current_phase": state["current_phase"],  # Behalte aktuelle Phase
                 "errors": state.get("errors", []) + [f"Manager Fehler: {e}"],
-                "workflow_logs": logs
+                **trace
             }
     
+    def _replan_reason(self, state: WorkflowState, phase_plan: Optional[Dict[str, Any]]) -> Optional[str]:
+        """
+        Prüft, ob der Manager einen neuen Plan erstellen muss.
+        
+        Returns:
+            Grund für die Neuplanung oder None (nächster Schritt des bestehenden Plans)
+        """
+        if not phase_plan:
+            return "kein Plan"
+        if phase_plan.get("invalidated"):
+            return phase_plan["invalidated"]
+        if state["current_phase"] != phase_plan["phase"]:
+            return "Phasenwechsel"
+        if phase_plan["step_index"] >= len(phase_plan["steps"]):
+            return "Plan abgearbeitet"
+        if len(state.get("user_decisions") or []) != phase_plan["decision_count"]:
+            return "Benutzer-Entscheidung"
+        return None
+    
+    @staticmethod
+    def _plan_step(plan: Dict[str, Any], steps: List[Dict[str, Any]], index: int) -> Dict[str, Any]:
+        """Storyline-Plan für einen einzelnen Inject (Schritt `index` des Phasen-Plans)."""
+        if not steps:
+            return plan
+        step = steps[index]
+        return {
+            **plan,
+            "key_events": [step["event"]],
+            "affected_assets": step.get("assets") or plan.get("affected_assets", []),
+            "plan_step": index + 1,
+            "plan_steps": len(steps)
+        }
+    
+    @staticmethod
+    def _count_planning(state: WorkflowState, replan_reason: Optional[str] = None) -> Dict[str, Any]:
+        """Aktualisiert die Planungs-Statistik (Manager-Aufrufe vs. übernommene Plan-Schritte)."""
+        stats = state.get("planning_stats") or {}
+        stats = {
+            "manager_calls": stats.get("manager_calls", 0),
+            "plan_steps_reused": stats.get("plan_steps_reused", 0),
+            "replan_reasons": dict(stats.get("replan_reasons", {}))
+        }
+        if replan_reason is None:
+            stats["plan_steps_reused"] += 1
+        else:
+            stats["manager_calls"] += 1
+            stats["replan_reasons"][replan_reason] = stats["replan_reasons"].get(replan_reason, 0) + 1
+        return stats
+    
+    def _continue_phase_plan(self, state: WorkflowState, phase_plan: Dict[str, Any]) -> Dict[str, Any]:
+        """Übernimmt den nächsten Schritt des bestehenden Phasen-Plans (ohne LLM-Aufruf)."""
+        index = phase_plan["step_index"]
+        steps = phase_plan["steps"]
+        logger.debug(
+            "📋 [Manager] Iteration %s - Phasen-Plan Schritt %s/%s (ohne Neuplanung)",
+            state.get('iteration', 0), index + 1, len(steps)
+        )
+        
+        log_entry = {
+            "timestamp": datetime.now().isoformat(),
+            "node": "Manager Agent",
+            "iteration": state['iteration'],
+            "action": "Phasen-Plan fortsetzen",
+            "details": {
+                "phase": phase_plan["phase"].value,
+                "plan_step": index + 1,
+                "plan_steps": len(steps),
+                "event": steps[index]["event"][:100],
+                "status": "success"
+            }
+        }
+        trace = self._record_trace(state, log_entry)
+        
+        return {
+            "manager_plan": self._plan_step(phase_plan["plan"], steps, index),
+            "phase_plan": {**phase_plan, "step_index": index + 1},
+            "planning_stats": self._count_planning(state),
+            **trace
+        }
+    
     def _intel_node(self, state: WorkflowState) -> Dict[str, Any]:
         """Node: Intel Agent - TTP-Abfrage."""
+        speculative = self._adopt_speculation("intel", state)
+        if speculative is not None:
+            return speculative
+        
         iteration = state.get('iteration', 0)
         injects_count = len(state.get('injects', []))
-        print(f"🔎 [Intel] Iteration {iteration}, Injects: {injects_count} - Hole relevante TTPs...")
+        logger.debug("🔎 [Intel] Iteration %s, Injects: %s - Hole relevante TTPs...", iteration, injects_count)
         
         log_entry = {
             "timestamp": datetime.now().isoformat(),
@@ -425,32 +853,34 @@ class ScenarioWorkflow:
                 "status": "success"
             }
             
-            logs = state.get("workflow_logs", [])
-            logs.append(log_entry)
+            trace = self._record_trace(state, log_entry)
             
             return {
                 "available_ttps": ttps,
-                "workflow_logs": logs
+                **trace
             }
         except Exception as e:
-            print(f"⚠️  Fehler bei Intel: {e}")
+            logger.warning("⚠️  Fehler bei Intel: %s", e)
             log_entry["details"] = {"error": str(e), "status": "error"}
-            logs = state.get("workflow_logs", [])
-            logs.append(log_entry)
+            trace = self._record_trace(state, log_entry)
             
             return {
                 "available_ttps": [],
                 "errors": state.get("errors", []) + [f"Intel Fehler: {e}"],
-                "workflow_logs": logs
+                **trace
             }
     
     def _action_selection_node(self, state: WorkflowState) -> Dict[str, Any]:
         """Node: Action Selection - Auswahl des nächsten logischen Angriffsschritts."""
+        speculative = self._adopt_speculation("action_selection", state)
+        if speculative is not None:
+            return speculative
+        
         iteration = state.get('iteration', 0)
         injects_count = len(state.get('injects', []))
         available_ttps = state.get("available_ttps", [])
-        print(f"🎯 [Action Selection] Iteration {iteration}, Injects: {injects_count} - Wähle nächste Aktion...")
-        print(f"   Verfügbare TTPs: {len(available_ttps)}")
+        logger.debug("🎯 [Action Selection] Iteration %s, Injects: %s - Wähle nächste Aktion...", iteration, injects_count)
+        logger.debug("Verfügbare TTPs: %s", len(available_ttps))
         
         log_entry = {
             "timestamp": datetime.now().isoformat(),
@@ -507,40 +937,39 @@ class ScenarioWorkflow:
                 "reasoning": f"Gewählt basierend auf Phase {state['current_phase'].value}"
             }
             
-            logs = state.get("workflow_logs", [])
-            logs.append(log_entry)
-            decisions = state.get("agent_decisions", [])
-            decisions.append(decision_entry)
+            trace = self._record_trace(state, log_entry, decision_entry)
             
             return {
                 "selected_action": {
                     "ttp": selected_ttp,
                     "reasoning": f"Gewählt basierend auf Phase {state['current_phase'].value}"
                 },
-                "workflow_logs": logs,
-                "agent_decisions": decisions
+                **trace
             }
         except Exception as e:
-            print(f"⚠️  Fehler bei Action Selection: {e}")
+            logger.warning("⚠️  Fehler bei Action Selection: %s", e)
             log_entry["details"] = {"error": str(e), "status": "error"}
-            logs = state.get("workflow_logs", [])
-            logs.append(log_entry)
+            trace = self._record_trace(state, log_entry)
             
             return {
                 "selected_action": {"error": str(e)},
                 "errors": state.get("errors", []) + [f"Action Selection Fehler: {e}"],
-                "workflow_logs": logs
+                **trace
             }
     
     def _generator_node(self, state: WorkflowState) -> Dict[str, Any]:
         """Node: Generator Agent - Drafting."""
+        speculative = self._adopt_speculation("generator", state)
+        if speculative is not None:
+            return speculative
+        
         iteration = state.get('iteration', 0)
         injects_count = len(state.get('injects', []))
         manager_plan = state.get("manager_plan")
         selected_action = state.get("selected_action")
-        print(f"✍️  [Generator] Iteration {iteration}, Injects: {injects_count} - Erstelle Inject...")
-        print(f"   Manager Plan vorhanden: {manager_plan is not None}")
-        print(f"   Selected Action vorhanden: {selected_action is not None}")
+        logger.debug("✍️  [Generator] Iteration %s, Injects: %s - Erstelle Inject...", iteration, injects_count)
+        logger.debug("Manager Plan vorhanden: %s", manager_plan is not None)
+        logger.debug("Selected Action vorhanden: %s", selected_action is not None)
         
         log_entry = {
             "timestamp": datetime.now().isoformat(),
@@ -562,9 +991,7 @@ class ScenarioWorkflow:
         try:
             inject_count = len(state["injects"])
             inject_id = f"INJ-{inject_count + 1:03d}"
-            
-            hours = (inject_count + 1) * 0.5
-            time_offset = f"T+{int(hours):02d}:{int((hours % 1) * 60):02d}"
+            time_offset = self._default_time_offset(inject_count)
             
             manager_plan = state.get("manager_plan", {})
             selected_action = state.get("selected_action", {})
@@ -599,28 +1026,67 @@ class ScenarioWorkflow:
                         "dora_compliance": validation_result.dora_compliance,
                         "causal_validity": validation_result.causal_validity
                     }
-                    print(f"   🔄 Refine-Modus: Verwende Feedback vom Critic Agent")
+                    logger.debug("🔄 Refine-Modus: Verwende Feedback vom Critic Agent")
             
             # Hole user_feedback aus State (Human-in-the-Loop)
             user_feedback = state.get("user_feedback")
             
-            inject = self.generator_agent.generate_inject(
-                scenario_type=state["scenario_type"],
-                phase=state["current_phase"],
-                inject_id=inject_id,
-                time_offset=time_offset,
-                manager_plan=manager_plan,
-                selected_ttp=selected_ttp,
-                system_state=state["system_state"],
-                previous_injects=state["injects"],
-                validation_feedback=validation_feedback,
-                user_feedback=user_feedback
-            )
+            generate_kwargs = {
+                "scenario_type": state["scenario_type"],
+                "phase": state["current_phase"],
+                "inject_id": inject_id,
+                "time_offset": time_offset,
+                "manager_plan": manager_plan,
+                "selected_ttp": selected_ttp,
+                "system_state": state["system_state"],
+                "previous_injects": state["injects"],
+                "validation_feedback": validation_feedback,
+                "user_feedback": user_feedback
+            }
+            
+            # Spekulatives Drafting: K Kandidaten parallel erzeugen und validieren
+            candidate_count = self._clamp_candidates(state.get("speculative_candidates") or self.speculative_candidates)
+            draft_validation = None
+            draft_batch = None
+            draft_source = "llm"
+            batched = None if validation_feedback else self._take_batched_draft(state, inject_id)
+            fragment = None if validation_feedback or batched else self._reuse_fragment(state, inject_id)
+            if batched is not None:
+                # Nächster Draft der zuvor erzeugten Sequenz (kein LLM-Aufruf)
+                inject, draft_batch = batched
+                draft_source = "batch"
+            elif fragment is not None:
+                # Bereits validierter Inject aus einem früheren Szenario (kein Generator/Critic)
+                inject, validation = fragment
+                draft_validation = {
+                    "inject_id": inject.inject_id,
+                    "validation_result": validation,
+                    "candidate_index": None,
+                    "candidates": 1
+                }
+                draft_source = "fragment_cache"
+            elif candidate_count == 1 and self.batch_drafts > 1 and not validation_feedback:
+                inject, draft_batch = self._draft_batch(state, generate_kwargs)
+            elif candidate_count > 1:
+                inject, validation, winner_index = self._draft_and_validate_candidates(
+                    generate_kwargs, candidate_count, state
+                )
+                draft_validation = {
+                    "inject_id": inject.inject_id,
+                    "validation_result": validation,
+                    "candidate_index": winner_index,
+                    "candidates": candidate_count
+                }
+            else:
+                inject = self.generator_agent.generate_inject(**generate_kwargs)
             
             log_entry["details"] = {
                 "inject_id": inject_id,
                 "phase": inject.phase.value,
                 "mitre_id": inject.technical_metadata.mitre_id or "N/A",
+                "candidates": candidate_count,
+                "draft_source": draft_source,
+                "batched_remaining": len(draft_batch["injects"]) if draft_batch else 0,
                 "status": "success"
             }
             
@@ -636,40 +1102,247 @@ class ScenarioWorkflow:
                 "reasoning": f"Generiert basierend auf Phase {state['current_phase'].value} und TTP {selected_ttp.get('mitre_id', 'N/A')}"
             }
             
-            logs = state.get("workflow_logs", [])
-            logs.append(log_entry)
-            decisions = state.get("agent_decisions", [])
-            decisions.append(decision_entry)
+            trace = self._record_trace(state, log_entry, decision_entry)
             
             return {
                 "draft_inject": inject,
-                "workflow_logs": logs,
-                "agent_decisions": decisions
+                "draft_validation": draft_validation,
+                "draft_batch": draft_batch,
+                **trace
             }
         except Exception as e:
             import traceback
             error_trace = traceback.format_exc()
-            print(f"⚠️  Fehler bei Generator: {e}")
-            print(f"   Traceback: {error_trace}")
+            logger.warning("⚠️  Fehler bei Generator: %s", e, exc_info=True)
             log_entry["details"] = {"error": str(e), "traceback": error_trace, "status": "error"}
-            logs = state.get("workflow_logs", [])
-            logs.append(log_entry)
+            trace = self._record_trace(state, log_entry)
             
             return {
                 "draft_inject": None,
+                "draft_validation": None,
+                "draft_batch": None,
                 "errors": state.get("errors", []) + [f"Generator Fehler: {e}"],
-                "workflow_logs": logs
+                **trace
             }
     
+    def _fragment_key(self, state: WorkflowState) -> Optional[FragmentKey]:
+        """Fragment-Cache-Schlüssel für den nächsten Inject (None ohne Cache bzw. in späten Phasen)."""
+        if self.fragment_cache is None:
+            return None
+        standards = sorted(str(getattr(standard, "value", standard)) for standard in self.critic_agent.compliance_frameworks)
+        asset_states = {
+            entity_id: entity.get("status")
+            for entity_id, entity in state.get("system_state", {}).items()
+            if isinstance(entity, dict) and self._is_asset_entity(entity_id, entity.get("entity_type"))
+        }
+        return self.fragment_cache.key(
+            state["scenario_type"],
+            state["current_phase"],
+            f"{state.get('mode', 'thesis')}:{','.join(standards)}",
+            asset_states,
+            state["injects"]
+        )
+    
+    def _reuse_fragment(self, state: WorkflowState, inject_id: str) -> Optional[tuple]:
+        """Gecachter, umnummerierter Inject samt Validierung oder None."""
+        key = self._fragment_key(state)
+        if key is None:
+            return None
+        fragment = self.fragment_cache.lookup(key, inject_id, state["injects"])
+        if fragment is not None:
+            logger.debug("♻️  Fragment-Cache: %s aus validierter Sequenz übernommen", inject_id)
+        return fragment
+    
+    @staticmethod
+    def _default_time_offset(inject_count: int) -> str:
+        """Vorgeschlagener Zeitversatz für den Inject nach `inject_count` Injects (30 Minuten Abstand)."""
+        hours = (inject_count + 1) * 0.5
+        return f"T+{int(hours):02d}:{int((hours % 1) * 60):02d}"
+    
+    def _take_batched_draft(self, state: WorkflowState, inject_id: str) -> Optional[tuple]:
+        """
+        Liefert den nächsten Draft aus der zuvor erzeugten Inject-Sequenz.
+        
+        Die Sequenz gilt nur, solange Inject-ID, Phase und Benutzer-Entscheidungen
+        zum Zeitpunkt der Erzeugung passen.
+        
+        Returns:
+            (Draft, restliche Sequenz oder None) oder None, wenn kein passender Draft vorliegt
+        """
+        draft_batch = state.get("draft_batch")
+        if not draft_batch or not draft_batch["injects"]:
+            return None
+        head = draft_batch["injects"][0]
+        if (head.inject_id != inject_id or head.phase != state["current_phase"]
+                or len(state.get("user_decisions") or []) != draft_batch["decision_count"]):
+            logger.debug("⏪ Inject-Sequenz verworfen (%s Drafts, State geändert)", len(draft_batch['injects']))
+            return None
+        rest = draft_batch["injects"][1:]
+        logger.debug("📦 Draft %s aus Inject-Sequenz übernommen (%s verbleibend)", inject_id, len(rest))
+        return head, ({**draft_batch, "injects": rest} if rest else None)
+    
+    def _draft_batch(self, state: WorkflowState, generate_kwargs: Dict[str, Any]) -> tuple:
+        """
+        Erzeugt eine Inject-Sequenz in einem Generator-Aufruf.
+        
+        Die Länge ist durch batch_drafts, die verbleibenden Injects und die
+        verbleibenden Schritte des Phasen-Plans begrenzt (keine Sequenz über
+        einen Phasenwechsel hinweg). Schlägt die Sequenz fehl, wird ein
+        einzelner Inject erzeugt.
+        
+        Returns:
+            (erster Draft, restliche Sequenz oder None)
+        """
+        inject_count = len(state["injects"])
+        size = min(self.batch_drafts, state.get("max_iterations", self.max_iterations) - inject_count)
+        plan_steps = None
+        phase_plan = state.get("phase_plan")
+        if phase_plan and phase_plan.get("steps"):
+            # Der Manager-Node hat den aktuellen Schritt bereits übernommen (step_index zeigt dahinter)
+            plan_steps = phase_plan["steps"][phase_plan["step_index"] - 1:]
+            size = min(size, len(plan_steps))
+            plan_steps = plan_steps[:size]
+        if size <= 1:
+            return self.generator_agent.generate_inject(**generate_kwargs), None
+        
+        kwargs = {k: v for k, v in generate_kwargs.items() if k not in ("inject_id", "time_offset", "validation_feedback")}
+        injects = self.generator_agent.generate_injects(
+            inject_ids=[f"INJ-{inject_count + i + 1:03d}" for i in range(size)],
+            time_offsets=[self._default_time_offset(inject_count + i) for i in range(size)],
+            plan_steps=plan_steps,
+            **kwargs
+        )
+        if not injects:
+            return self.generator_agent.generate_inject(**generate_kwargs), None
+        rest = injects[1:]
+        draft_batch = {"injects": rest, "decision_count": len(state.get("user_decisions") or [])} if rest else None
+        return injects[0], draft_batch
+    
+    def _candidate_temperatures(self, candidate_count: int) -> List[Optional[float]]:
+        """
+        Liefert die Temperaturen für spekulative Draft-Kandidaten.
+        
+        Der erste Kandidat verwendet die Standard-Temperature des Generators,
+        weitere Kandidaten streuen in festen Schritten darüber (max. 1.3).
+        """
+        base = getattr(self.generator_agent.llm, "temperature", None)
+        if not isinstance(base, (int, float)):
+            base = 0.8
+        temperatures: List[Optional[float]] = [None]
+        for index in range(1, candidate_count):
+            temperatures.append(round(min(1.3, base + self.SPECULATIVE_TEMPERATURE_STEP * index), 2))
+        return temperatures
+    
+    def _clamp_candidates(self, candidate_count: int) -> int:
+        """Begrenzt die Anzahl spekulativer Kandidaten auf 1..MAX_SPECULATIVE_CANDIDATES."""
+        return max(1, min(self.MAX_SPECULATIVE_CANDIDATES, int(candidate_count)))
+    
+    def _draft_and_validate(
+        self,
+        generate_kwargs: Dict[str, Any],
+        temperature: Optional[float],
+        state: WorkflowState,
+        mode: str,
+        cancel_event: threading.Event
+    ) -> tuple:
+        """
+        Erzeugt einen Kandidaten und validiert ihn direkt (ohne forensisches Logging).
+        
+        Vor jedem LLM-Call wird das Cancel-Event geprüft (siehe utils/cancellation.py).
+        
+        Returns:
+            Tuple (Inject, ValidationResult)
+        """
+        with cancellation_scope(cancel_event):
+            inject = self.generator_agent.generate_inject(
+                **generate_kwargs,
+                **({"temperature": temperature} if temperature is not None else {})
+            )
+            check_cancelled()
+            validation = self.critic_agent.validate_inject(
+                inject=inject,
+                previous_injects=state["injects"],
+                current_phase=state["current_phase"],
+                system_state=state["system_state"],
+                mode=mode
+            )
+            # Ergebnisse nach einem Abbruch sind unvollständig (LLM-Calls übersprungen)
+            check_cancelled()
+        return inject, validation
+    
+    def _draft_and_validate_candidates(
+        self,
+        generate_kwargs: Dict[str, Any],
+        candidate_count: int,
+        state: WorkflowState
+    ) -> tuple:
+        """
+        Erzeugt und validiert K Kandidaten parallel; der erste valide gewinnt.
+        
+        Jeder Kandidat läuft als eigener Generate→Validate-Auftrag, die Latenz
+        hängt also am schnellsten validen Kandidaten statt am langsamsten Draft.
+        Sobald ein Kandidat valide ist, wird das Cancel-Event gesetzt: die
+        übrigen Kandidaten machen keine weiteren LLM-Calls. Besteht kein
+        Kandidat, wird der mit den wenigsten Fehlern zurückgegeben, damit der
+        Refine-Loop dessen Feedback verwenden kann.
+        
+        Args:
+            generate_kwargs: Argumente für GeneratorAgent.generate_inject
+            candidate_count: Anzahl Kandidaten (K)
+            state: Aktueller Workflow-State
+        
+        Returns:
+            Tuple (ausgewählter Inject, ValidationResult, Index des Kandidaten)
+        """
+        temperatures = self._candidate_temperatures(candidate_count)
+        mode = state.get("mode", "thesis")
+        logger.debug("🔀 Spekulatives Drafting: %s Kandidaten (Temperaturen: %s)", candidate_count, temperatures)
+        
+        cancel_event = threading.Event()
+        results: Dict[int, tuple] = {}
+        executor = ThreadPoolExecutor(max_workers=candidate_count)
+        try:
+            futures = {
+                # Eigener Kontext pro Kandidat: Szenario-Zuordnung der LLM-Aufrufe bleibt erhalten
+                executor.submit(
+                    contextvars.copy_context().run,
+                    self._draft_and_validate, generate_kwargs, temperature, state, mode, cancel_event
+                ): index
+                for index, temperature in enumerate(temperatures)
+            }
+            for future in as_completed(futures):
+                index = futures[future]
+                try:
+                    inject, validation = future.result()
+                except OperationCancelled:
+                    continue
+                except Exception as e:
+                    logger.warning("⚠️  Fehler bei Kandidat %s: %s", index, e)
+                    continue
+                results[index] = (inject, validation)
+                if validation.is_valid:
+                    logger.debug("🏁 Kandidat %s/%s zuerst valide - breche restliche Kandidaten ab", index + 1, candidate_count)
+                    return inject, validation, index
+        finally:
+            cancel_event.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        if not results:
+            raise RuntimeError("Keiner der spekulativen Kandidaten konnte erzeugt und validiert werden")
+        
+        best_index = min(results, key=lambda i: (len(results[i][1].errors or []), i))
+        inject, validation = results[best_index]
+        return inject, validation, best_index
+    
     def _critic_node(self, state: WorkflowState) -> Dict[str, Any]:
         """Node: Critic Agent - Validation."""
         iteration = state.get('iteration', 0)
         injects_count = len(state.get('injects', []))
         draft_inject = state.get("draft_inject")
-        print(f"🔍 [Critic] Iteration {iteration}, Injects: {injects_count} - Validiere Inject...")
-        print(f"   Draft Inject vorhanden: {draft_inject is not None}")
+        logger.debug("🔍 [Critic] Iteration %s, Injects: %s - Validiere Inject...", iteration, injects_count)
+        logger.debug("Draft Inject vorhanden: %s", draft_inject is not None)
         if draft_inject:
-            print(f"   Draft Inject ID: {draft_inject.inject_id if hasattr(draft_inject, 'inject_id') else 'N/A'}")
+            logger.debug("Draft Inject ID: %s", draft_inject.inject_id if hasattr(draft_inject, 'inject_id') else 'N/A')
         
         log_entry = {
             "timestamp": datetime.now().isoformat(),
@@ -693,8 +1366,7 @@ class ScenarioWorkflow:
             
             if not draft_inject:
                 log_entry["details"] = {"error": "Kein Draft-Inject", "status": "error"}
-                logs = state.get("workflow_logs", [])
-                logs.append(log_entry)
+                trace = self._record_trace(state, log_entry)
                 
                 return {
                     "validation_result": ValidationResult(
@@ -704,47 +1376,32 @@ class ScenarioWorkflow:
                         causal_validity=False,
                         errors=["Kein Draft-Inject vorhanden"]
                     ),
-                    "workflow_logs": logs
+                    **trace
                 }
             
             # Hole Mode aus State (Default: 'thesis')
             mode = state.get("mode", "thesis")
             
-            # Forensisches Logging: DRAFT Inject (vor Validierung)
-            scenario_id = state.get("scenario_id", "UNKNOWN")
-            iteration = state.get("iteration", 0)
+            # Refine-Zähler für forensisches Logging (DRAFT + CRITIC)
             metadata = state.get("metadata", {})
             current_inject_id = draft_inject.inject_id if draft_inject else None
             refine_key = f"refine_count_{current_inject_id}"
             refine_count = metadata.get(refine_key, 0)
             
-            # Logge DRAFT nur wenn im Thesis Mode
-            if mode == 'thesis':
-                forensic_logger = get_forensic_logger(scenario_id)
-                forensic_logger.log_draft(
-                    scenario_id=scenario_id,
-                    inject=draft_inject,
-                    iteration=iteration,
-                    refine_count=refine_count
-                )
-            
-            validation = self.critic_agent.validate_inject(
-                inject=draft_inject,
-                previous_injects=state["injects"],
-                current_phase=state["current_phase"],
-                system_state=state["system_state"],
-                mode=mode
-            )
-            
-            # Forensisches Logging: CRITIC Validierungsergebnis
-            if mode == 'thesis':
-                forensic_logger.log_critic(
-                    scenario_id=scenario_id,
-                    inject_id=draft_inject.inject_id,
-                    validation_result=validation,
-                    iteration=iteration,
-                    refine_count=refine_count
-                )
+            draft_validation = state.get("draft_validation")
+            if draft_validation and draft_validation.get("inject_id") == draft_inject.inject_id:
+                # Spekulatives Drafting hat den Draft bereits validiert - nur noch forensisch loggen
+                validation = draft_validation["validation_result"]
+                winner_index = draft_validation["candidate_index"]
+                self._log_forensic_draft(draft_inject, state, mode, refine_count)
+                self._log_forensic_critic(draft_inject, validation, state, mode, refine_count)
+            else:
+                if self.pipelined:
+                    # Pipelining: nächste Iteration startet, während dieser Draft validiert wird
+                    self._start_speculation(state)
+                draft_validation = None
+                winner_index = None
+                validation = self._validate_draft(draft_inject, state, mode, refine_count)
             
             log_entry["details"] = {
                 "inject_id": draft_inject.inject_id,
@@ -754,6 +1411,9 @@ class ScenarioWorkflow:
                 "causal_validity": validation.causal_validity,
                 "status": "success"
             }
+            if draft_validation:
+                log_entry["details"]["candidates"] = draft_validation["candidates"]
+                log_entry["details"]["selected_candidate"] = winner_index
             
             # Erweitertes Input für Audit-Trail - Self-Contained!
             decision_entry["input"] = {
@@ -781,25 +1441,31 @@ class ScenarioWorkflow:
             }
             
             if validation.is_valid:
-                print(f"✅ Inject validiert: {draft_inject.inject_id}")
+                logger.debug("✅ Inject validiert: %s", draft_inject.inject_id)
             else:
-                print(f"❌ Inject nicht valide: {validation.errors}")
+                logger.info("❌ Inject nicht valide: %s", validation.errors)
+                self._discard_speculation(state["scenario_id"], "Critic hat Draft abgelehnt")
             
-            logs = state.get("workflow_logs", [])
-            logs.append(log_entry)
-            decisions = state.get("agent_decisions", [])
-            decisions.append(decision_entry)
+            trace = self._record_trace(state, log_entry, decision_entry)
             
-            return {
+            update = {
+                "draft_inject": draft_inject,
+                "draft_validation": None,
                 "validation_result": validation,
-                "workflow_logs": logs,
-                "agent_decisions": decisions
+                **trace
             }
+            if not validation.is_valid and state.get("draft_batch"):
+                # Folgende Drafts der Sequenz bauen auf dem abgelehnten Draft auf
+                update["draft_batch"] = None
+            phase_plan = state.get("phase_plan")
+            if phase_plan and not (validation.logical_consistency and validation.causal_validity):
+                # Storyline-Fehler (Logik/Kausalität) → Manager plant in der nächsten Iteration neu
+                update["phase_plan"] = {**phase_plan, "invalidated": "Critic-Ablehnung (Storyline)"}
+            return update
         except Exception as e:
-            print(f"⚠️  Fehler bei Critic: {e}")
+            logger.warning("⚠️  Fehler bei Critic: %s", e)
             log_entry["details"] = {"error": str(e), "status": "error"}
-            logs = state.get("workflow_logs", [])
-            logs.append(log_entry)
+            trace = self._record_trace(state, log_entry)
             
             return {
                 "validation_result": ValidationResult(
@@ -809,13 +1475,397 @@ class ScenarioWorkflow:
                     causal_validity=False,
                     errors=[f"Critic Fehler: {e}"]
                 ),
-                "workflow_logs": logs
+                **trace
+            }
+    
+    def _log_forensic_draft(self, draft_inject: Inject, state: WorkflowState, mode: str, refine_count: int):
+        """Forensisches Logging: DRAFT (nur im Thesis Mode)."""
+        if mode != 'thesis':
+            return
+        scenario_id = state.get("scenario_id", "UNKNOWN")
+        get_forensic_logger(scenario_id).log_draft(
+            scenario_id=scenario_id,
+            inject=draft_inject,
+            iteration=state.get("iteration", 0),
+            refine_count=refine_count
+        )
+    
+    def _log_forensic_critic(
+        self,
+        draft_inject: Inject,
+        validation: ValidationResult,
+        state: WorkflowState,
+        mode: str,
+        refine_count: int
+    ):
+        """Forensisches Logging: CRITIC Validierungsergebnis (nur im Thesis Mode)."""
+        if mode != 'thesis':
+            return
+        scenario_id = state.get("scenario_id", "UNKNOWN")
+        get_forensic_logger(scenario_id).log_critic(
+            scenario_id=scenario_id,
+            inject_id=draft_inject.inject_id,
+            validation_result=validation,
+            iteration=state.get("iteration", 0),
+            refine_count=refine_count
+        )
+    
+    def _validate_draft(
+        self,
+        draft_inject: Inject,
+        state: WorkflowState,
+        mode: str,
+        refine_count: int
+    ) -> ValidationResult:
+        """
+        Validiert einen einzelnen Draft inkl. forensischem Logging (DRAFT + CRITIC).
+        
+        Args:
+            draft_inject: Zu validierender Inject
+            state: Aktueller Workflow-State
+            mode: 'legacy' oder 'thesis'
+            refine_count: Aktuelle Anzahl Refine-Versuche für diesen Inject
+        
+        Returns:
+            ValidationResult vom Critic Agent
+        """
+        self._log_forensic_draft(draft_inject, state, mode, refine_count)
+        
+        validation = self.critic_agent.validate_inject(
+            inject=draft_inject,
+            previous_injects=state["injects"],
+            current_phase=state["current_phase"],
+            system_state=state["system_state"],
+            mode=mode
+        )
+        
+        self._log_forensic_critic(draft_inject, validation, state, mode, refine_count)
+        return validation
+    
+    def _project_accepted_state(self, state: WorkflowState) -> Dict[str, Any]:
+        """
+        Projiziert den State der nächsten Iteration unter der Annahme, dass der
+        aktuelle Draft akzeptiert wird (direkte Asset-Status wie im State Update,
+        ohne Kaskadierung).
+        """
+        draft_inject = state["draft_inject"]
+        new_status = self._determine_asset_status(draft_inject.phase, draft_inject.technical_metadata.mitre_id)
+        deltas = {asset_id: (new_status, None) for asset_id in draft_inject.technical_metadata.affected_assets}
+        return {
+            **state,
+            "injects": state["injects"] + [draft_inject],
+            "iteration": state.get("iteration", 0) + 1,
+            "system_state": self._apply_state_deltas(state.get("system_state", {}), deltas),
+            "metadata": copy.deepcopy(state.get("metadata", {})),
+            "errors": list(state.get("errors", [])),
+            "draft_inject": None,
+            "draft_validation": None,
+            "validation_result": None
+        }
+    
+    def _run_speculative_iteration(self, projected_state: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """
+        Führt Manager → Intel → Action Selection → Generator auf dem projizierten State aus.
+        
+        Traces werden gepuffert und erst bei Übernahme in den Sink geschrieben.
+        
+        Returns:
+            node -> {"update": State-Update, "traces": [(log_entry, decision_entry), ...]}
+        """
+        self._speculation_context.active = True
+        try:
+            return self._run_speculative_nodes(projected_state)
+        finally:
+            self._speculation_context.active = False
+    
+    def _run_speculative_nodes(self, projected_state: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Führt die Nodes der spekulativen Iteration nacheinander aus (Traces gepuffert)."""
+        steps = {}
+        state = projected_state
+        for node, run in (
+            ("manager", self._manager_node),
+            ("intel", self._intel_node),
+            ("action_selection", self._action_selection_node),
+            ("generator", self._generator_node)
+        ):
+            self._trace_buffer.entries = []
+            try:
+                with llm_node_scope(node):
+                    update = run(state)
+            finally:
+                traces = self._trace_buffer.entries
+                self._trace_buffer.entries = None
+            steps[node] = {"update": update, "traces": traces}
+            state = {**state, **update}
+        return steps
+    
+    def _start_speculation(self, state: WorkflowState):
+        """Startet die spekulative Folge-Iteration für den Draft, der gerade validiert wird."""
+        draft_inject = state.get("draft_inject")
+        max_iterations = state.get("max_iterations", self.max_iterations)
+        if not draft_inject or len(state.get("injects", [])) + 1 >= max_iterations:
+            return  # Letzter Inject - keine Folge-Iteration
+        
+        projected_state = self._project_accepted_state(state)
+        cancel_event = threading.Event()
+        with self._speculation_lock:
+            self._speculations[state["scenario_id"]] = {
+                "base_inject": draft_inject,
+                "projected_state": projected_state,
+                "future": self._get_pipeline_executor().submit(
+                    contextvars.copy_context().run, self._run_pipelined_iteration, projected_state, cancel_event
+                ),
+                "cancel_event": cancel_event,
+                "steps": None
             }
+            self.pipeline_stats["started"] += 1
+        logger.debug("⏩ Pipelining: Iteration %s startet spekulativ", projected_state['iteration'])
+    
+    def _run_pipelined_iteration(self, projected_state: Dict[str, Any], cancel_event: threading.Event) -> Dict[str, Dict[str, Any]]:
+        """Führt die spekulative Folge-Iteration aus (abbrechbar über cancel_event, z.B. bei Node-Timeout)."""
+        with cancellation_scope(cancel_event):
+            return self._run_speculative_iteration(projected_state)
+    
+    def _get_pipeline_executor(self) -> ThreadPoolExecutor:
+        """Thread-Pool für spekulative Iterationen (lazy, nur unter _speculation_lock aufrufen)."""
+        if self._pipeline_executor is None:
+            self._pipeline_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="pipeline")
+        return self._pipeline_executor
+    
+    def _discard_pending_iterations(self, scenario_id: Optional[str], reason: str):
+        """Verwirft Spekulation und Entscheidungs-Zweige eines Szenarios (keine weiteren LLM-Aufrufe)."""
+        self._discard_speculation(scenario_id, reason)
+        self._discard_decision_branches(scenario_id)
+    
+    def close(self):
+        """
+        Gibt die Instanz frei: verwirft alle laufenden Spekulationen und
+        Entscheidungs-Zweige und beendet den Thread-Pool für Pipelining.
+        """
+        with self._speculation_lock:
+            scenario_ids = set(self._speculations) | set(self._decision_branches)
+        for scenario_id in scenario_ids:
+            self._discard_pending_iterations(scenario_id, "Workflow geschlossen")
+        with self._speculation_lock:
+            executor, self._pipeline_executor = self._pipeline_executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _discard_speculation(self, scenario_id: str, reason: str):
+        """Verwirft eine laufende/fertige Spekulation (Ergebnis wird ignoriert)."""
+        with self._speculation_lock:
+            entry = self._speculations.pop(scenario_id, None)
+            if entry is None:
+                return
+            self.pipeline_stats["discarded"] += 1
+        entry["future"].cancel()
+        if entry.get("cancel_event"):
+            entry["cancel_event"].set()
+        logger.debug("⏪ Pipelining: Spekulation verworfen (%s)", reason)
+    
+    def _rank_decision_options(self, options: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Sortiert Optionen nach bisheriger Wahlhäufigkeit (bei Gleichstand Reihenfolge der Optionen)."""
+        with self._speculation_lock:
+            counts = dict(self._choice_counts)
+        ranked = sorted(enumerate(options), key=lambda item: (-counts.get(item[1].get("id"), 0), item[0]))
+        return [option for _, option in ranked]
+    
+    def _start_decision_branches(self, state: Dict[str, Any]):
+        """
+        Berechnet während der Bedenkzeit am Decision-Point die nächste Iteration
+        für die wahrscheinlichsten Optionen spekulativ vor.
+        
+        Jeder Zweig arbeitet auf einer eigenen Kopie des States mit bereits
+        angewendeter Entscheidung; geschrieben wird nichts (Traces gepuffert,
+        keine Neo4j-Updates). resume_scenario übernimmt den gewählten Zweig
+        als Pipelining-Spekulation und verwirft die übrigen.
+        """
+        pending_decision = state.get("pending_decision") or {}
+        injects = state.get("injects", [])
+        if (
+            not self.decision_branches
+            or not injects
+            or len(injects) >= state.get("max_iterations", self.max_iterations)
+        ):
+            return
+        
+        scenario_id = state["scenario_id"]
+        self._discard_decision_branches(scenario_id)
+        branches = {}
+        for option in self._rank_decision_options(pending_decision.get("options", []))[:self.decision_branches]:
+            decision = {
+                "decision_id": pending_decision.get("decision_id"),
+                "choice_id": option.get("id"),
+                "decision_type": option.get("type", "general")
+            }
+            # Eigene Kopie: _apply_user_decision ändert System-State und Entscheidungsliste in-place
+            branch_state = self._apply_user_decision({
+                **state,
+                "system_state": copy.deepcopy(state.get("system_state", {})),
+                "user_decisions": list(state.get("user_decisions") or []),
+                "metadata": copy.deepcopy(state.get("metadata", {})),
+                "errors": list(state.get("errors", []))
+            }, decision)
+            branch_state["pending_decision"] = None
+            cancel_event = threading.Event()
+            with self._speculation_lock:
+                future = self._get_pipeline_executor().submit(
+                    contextvars.copy_context().run, self._run_decision_branch, branch_state, cancel_event
+                )
+            branches[decision["choice_id"]] = {
+                "base_inject": injects[-1],
+                "projected_state": branch_state,
+                "future": future,
+                "cancel_event": cancel_event,
+                "steps": None
+            }
+        with self._speculation_lock:
+            self._decision_branches[scenario_id] = branches
+            self.branch_stats["started"] += len(branches)
+        logger.debug("🌿 Entscheidungs-Zweige gestartet: %s", list(branches))
+    
+    def _run_decision_branch(self, branch_state: Dict[str, Any], cancel_event: threading.Event) -> Dict[str, Dict[str, Any]]:
+        """
+        Führt die spekulative Iteration eines Zweigs aus (abbrechbar über cancel_event).
+
+        Zweige sind reine Vorberechnung und stehen beim Rate-Limiter hinter allen übrigen Aufrufen an.
+        """
+        with llm_scenario_scope(branch_state.get("scenario_id")), cancellation_scope(cancel_event), \
+                llm_priority_scope(Priority.BATCH):
+            return self._run_speculative_iteration(branch_state)
+    
+    def _commit_decision_branch(self, scenario_id: str, choice_id: Optional[str]):
+        """
+        Übernimmt den Zweig der gewählten Option als Spekulation für die nächste
+        Iteration (Prüfung gegen den tatsächlichen State im Manager-Node) und
+        verwirft die übrigen Zweige.
+        """
+        with self._speculation_lock:
+            if choice_id:
+                self._choice_counts[choice_id] = self._choice_counts.get(choice_id, 0) + 1
+            branches = self._decision_branches.pop(scenario_id, {})
+            chosen = branches.pop(choice_id, None)
+            if chosen is not None:
+                self.branch_stats["committed"] += 1
+        self._discard_branch_entries(branches)
+        if chosen is None:
+            return
+        self._discard_speculation(scenario_id, "Entscheidungs-Zweig übernommen")
+        with self._speculation_lock:
+            self._speculations[scenario_id] = chosen
+            self.pipeline_stats["started"] += 1
+        logger.debug("🌿 Entscheidungs-Zweig '%s' übernommen", choice_id)
+    
+    def _discard_decision_branches(self, scenario_id: str):
+        """Verwirft alle Zweige eines Szenarios (neuer Decision-Point oder Szenario-Ende)."""
+        with self._speculation_lock:
+            branches = self._decision_branches.pop(scenario_id, {})
+        self._discard_branch_entries(branches)
+    
+    def _discard_branch_entries(self, branches: Dict[str, Dict[str, Any]]):
+        if not branches:
+            return
+        with self._speculation_lock:
+            self.branch_stats["discarded"] += len(branches)
+        for entry in branches.values():
+            entry["future"].cancel()
+            entry["cancel_event"].set()
+    
+    def _speculation_mismatch(self, entry: Dict[str, Any], steps: Dict[str, Dict[str, Any]], state: WorkflowState) -> Optional[str]:
+        """
+        Prüft, ob die Spekulation zum tatsächlichen State passt.
+        
+        Returns:
+            Grund für das Verwerfen oder None, wenn die Spekulation gültig ist
+        """
+        projected = entry["projected_state"]
+        injects = state.get("injects", [])
+        base_inject = entry["base_inject"]
+        if not injects or injects[-1].inject_id != base_inject.inject_id or injects[-1].content != base_inject.content:
+            return "anderer Inject akzeptiert"
+        if state.get("iteration") != projected["iteration"] or len(injects) != len(projected["injects"]):
+            return "Iteration weicht ab"
+        if state.get("current_phase") != projected["current_phase"]:
+            return "Phase geändert"
+        if len(state.get("errors", [])) != len(projected["errors"]) or len(state.get("user_decisions") or []) != len(projected.get("user_decisions") or []):
+            return "State zwischenzeitlich geändert"
+        if any("errors" in step["update"] for step in steps.values()):
+            return "Fehler im spekulativen Schritt"
+        
+        # Von der Spekulation genutzte Assets müssen im tatsächlichen State unverändert sein
+        speculative_draft = steps["generator"]["update"].get("draft_inject")
+        used_assets = set(speculative_draft.technical_metadata.affected_assets) if speculative_draft else set()
+        plan_assets = steps["manager"]["update"].get("manager_plan", {}).get("affected_assets", [])
+        used_assets.update(asset for asset in plan_assets if isinstance(asset, str))
+        actual_state = state.get("system_state", {})
+        projected_system_state = projected["system_state"]
+        changed = [
+            asset_id for asset_id in used_assets
+            if (actual_state.get(asset_id) or {}).get("status") != (projected_system_state.get(asset_id) or {}).get("status")
+        ]
+        if changed:
+            return f"genutzte Assets geändert: {changed[:5]}"
+        return None
+    
+    def _adopt_speculation(self, node: str, state: WorkflowState) -> Optional[Dict[str, Any]]:
+        """
+        Übernimmt das spekulative Ergebnis eines Nodes, falls vorhanden und gültig.
+        
+        Der Manager-Node wartet auf die Spekulation und prüft sie gegen den
+        tatsächlichen State; Intel, Action Selection und Generator übernehmen
+        danach ihre bereits berechneten Ergebnisse.
+        
+        Returns:
+            State-Update des Nodes oder None (Node normal ausführen)
+        """
+        if getattr(self._speculation_context, "active", False):
+            return None  # Innerhalb der Spekulation selbst (würde auf eigenes Future warten)
+        
+        scenario_id = state.get("scenario_id")
+        with self._speculation_lock:
+            entry = self._speculations.get(scenario_id)
+        if entry is None:
+            return None
+        
+        if node == "manager":
+            try:
+                # Höchstens bis zum Zeitlimit des Nodes bzw. zur Deadline warten (None = ohne Limit)
+                steps = entry["future"].result(timeout=remaining_time())
+            except FuturesTimeout:
+                self._discard_speculation(scenario_id, "Zeitlimit beim Warten auf die Spekulation")
+                return None
+            except Exception as e:
+                self._discard_speculation(scenario_id, f"Fehler: {e}")
+                return None
+            reason = self._speculation_mismatch(entry, steps, state)
+            if reason:
+                self._discard_speculation(scenario_id, reason)
+                return None
+            entry["steps"] = steps
+            with self._speculation_lock:
+                self.pipeline_stats["adopted"] += 1
+            logger.debug("⏩ Pipelining: Spekulative Iteration %s übernommen", state.get('iteration'))
+        elif entry["steps"] is None:
+            return None
+        
+        step = entry["steps"][node]
+        if node == "generator":
+            with self._speculation_lock:
+                self._speculations.pop(scenario_id, None)
+        
+        # Gepufferte Traces jetzt schreiben (Zähler passend zum tatsächlichen State)
+        update = dict(step["update"])
+        trace_state = dict(state)
+        for log_entry, decision_entry in step["traces"]:
+            trace = self._record_trace(trace_state, log_entry, decision_entry)
+            trace_state.update(trace)
+            update.update(trace)
+        return update
     
     def _state_update_node(self, state: WorkflowState) -> Dict[str, Any]:
         """Node: State Update - Schreiben der Auswirkungen in Neo4j."""
         current_iteration = state.get("iteration", 0)
-        print(f"💾 [State Update] Iteration {current_iteration} - Aktualisiere Systemzustand...")
+        logger.debug("💾 [State Update] Iteration %s - Aktualisiere Systemzustand...", current_iteration)
         
         log_entry = {
             "timestamp": datetime.now().isoformat(),
@@ -830,21 +1880,29 @@ class ScenarioWorkflow:
             
             if not draft_inject:
                 # Auch ohne Inject: Iteration erhöhen um Endlosschleife zu vermeiden
-                print(f"⚠️  Kein Draft-Inject vorhanden, erhöhe Iteration von {current_iteration} auf {current_iteration + 1}")
+                logger.warning("⚠️  Kein Draft-Inject vorhanden, erhöhe Iteration von %s auf %s", current_iteration, current_iteration + 1)
                 new_iteration = current_iteration + 1
-                logs = state.get("workflow_logs", [])
-                logs.append(log_entry)
+                trace = self._record_trace(state, log_entry)
                 return {
                     "iteration": new_iteration,
-                    "workflow_logs": logs
+                    **trace
                 }
             
             # Füge Inject zu Liste hinzu
             new_injects = state["injects"] + [draft_inject]
+            validation = state.get("validation_result")
+            if validation is not None and validation.is_valid:
+                fragment_key = self._fragment_key(state)
+                if fragment_key is not None:
+                    self.fragment_cache.store(fragment_key, draft_inject, validation, state["injects"])
             
             updated_assets = []
             second_order_effects = []
             cascading_impacts = []
+            # Tatsächlich geschriebene Status-Änderungen (entity_id -> (status, entity_type))
+            state_deltas: Dict[str, tuple] = {}
+            # Anzahl eigener update_entity_status-Aufrufe (je +1 auf die Zustandsversion)
+            version_writes = 0
             
             # Update Neo4j: Status der betroffenen Assets
             for asset_id in draft_inject.technical_metadata.affected_assets:
@@ -855,12 +1913,16 @@ class ScenarioWorkflow:
                         draft_inject.technical_metadata.mitre_id
                     )
                     
+                    # Abgebrochener Node (Timeout/Deadline) schreibt nichts mehr
+                    check_cancelled()
                     self.neo4j_client.update_entity_status(
                         entity_id=asset_id,
                         new_status=new_status,
                         inject_id=draft_inject.inject_id
                     )
+                    version_writes += 1
                     updated_assets.append({"asset": asset_id, "status": new_status})
+                    state_deltas[asset_id] = (new_status, None)
                     
                     # Erweiterte Second-Order Effects mit Kaskadierungsanalyse
                     cascading_impact = self.neo4j_client.calculate_cascading_impact(
@@ -886,65 +1948,109 @@ class ScenarioWorkflow:
                             # Indirekte Abhängigkeit - schwächerer Impact
                             affected_status = "degraded"
                         
+                        check_cancelled()
                         try:
                             self.neo4j_client.update_entity_status(
                                 entity_id=affected_id,
                                 new_status=affected_status,
                                 inject_id=draft_inject.inject_id
                             )
+                            version_writes += 1
                             second_order_effects.append({
                                 "entity_id": affected_id,
                                 "depth": affected_entity["depth"],
                                 "status": affected_status
                             })
+                            state_deltas[affected_id] = (affected_status, affected_entity.get("entity_type"))
                         except Exception as e:
-                            print(f"⚠️  Fehler beim Update von {affected_id}: {e}")
+                            logger.warning("⚠️  Fehler beim Update von %s: %s", affected_id, e)
                     
                     # Logge kritische Pfade
                     if cascading_impact["critical_paths"]:
-                        print(f"⚠️  Kritische Abhängigkeitspfade gefunden: {len(cascading_impact['critical_paths'])}")
-                        print(f"   Impact-Schweregrad: {cascading_impact['impact_severity']}")
-                        print(f"   Geschätzte Recovery-Zeit: {cascading_impact['estimated_recovery_time']}")
+                        logger.info("⚠️  Kritische Abhängigkeitspfade gefunden: %s", len(cascading_impact['critical_paths']))
+                        logger.debug("Impact-Schweregrad: %s", cascading_impact['impact_severity'])
+                        logger.debug("Geschätzte Recovery-Zeit: %s", cascading_impact['estimated_recovery_time'])
                     
+                except OperationCancelled:
+                    raise
                 except Exception as e:
-                    print(f"⚠️  Fehler beim Update von {asset_id}: {e}")
+                    logger.warning("⚠️  Fehler beim Update von %s: %s", asset_id, e)
+            
+            # Deltas lokal in den Systemzustand übernehmen (spart das Neu-Laden im State Check)
+            system_state = self._apply_state_deltas(state.get("system_state", {}), state_deltas)
+            metadata = dict(state.get("metadata", {}))
+            if version_writes:
+                # Eigene Schreibzugriffe sind kein externer Change - erwartete Version lokal
+                # fortschreiben statt neu lesen (ein Re-Read würde parallele externe Writes verschlucken)
+                metadata["state_version"] = self._advance_state_version(metadata.get("state_version"), version_writes)
             
             log_entry["details"] = {
                 "inject_id": draft_inject.inject_id,
                 "assets_updated": len(updated_assets),
                 "second_order_effects": len(second_order_effects),
+                "state_deltas": len(state_deltas),
                 "status": "success"
             }
             
-            logs = state.get("workflow_logs", [])
-            logs.append(log_entry)
+            trace = self._record_trace(state, log_entry)
             
             new_iteration = current_iteration + 1
-            print(f"✅ Inject {draft_inject.inject_id} hinzugefügt. Iteration: {current_iteration} → {new_iteration}")
-            print(f"   Gesamt Injects: {len(new_injects)}")
+            logger.debug("✅ Inject %s hinzugefügt. Iteration: %s → %s", draft_inject.inject_id, current_iteration, new_iteration)
+            logger.debug("Gesamt Injects: %s", len(new_injects))
             
             return {
                 "injects": new_injects,
                 "iteration": new_iteration,
-                "workflow_logs": logs
+                "system_state": system_state,
+                "metadata": metadata,
+                **trace
             }
+        except OperationCancelled:
+            raise
         except Exception as e:
             import traceback
             error_trace = traceback.format_exc()
-            print(f"⚠️  Fehler bei State Update: {e}")
-            print(f"   Traceback: {error_trace}")
+            logger.warning("⚠️  Fehler bei State Update: %s", e, exc_info=True)
             log_entry["details"] = {"error": str(e), "traceback": error_trace, "status": "error"}
-            logs = state.get("workflow_logs", [])
-            logs.append(log_entry)
+            trace = self._record_trace(state, log_entry)
             
             # WICHTIG: Auch bei Fehlern Iteration erhöhen, um Endlosschleife zu vermeiden
             # Und versuche, vorhandene Injects zu behalten
             return {
                 "iteration": state.get("iteration", 0) + 1,
                 "errors": state.get("errors", []) + [f"State Update Fehler: {e}"],
-                "workflow_logs": logs
+                **trace
             }
     
+    def _apply_state_deltas(
+        self,
+        system_state: Dict[str, Any],
+        state_deltas: Dict[str, tuple]
+    ) -> Dict[str, Any]:
+        """
+        Übernimmt im State Update geschriebene Status-Änderungen in den lokalen Systemzustand.
+        
+        Args:
+            system_state: Bisheriger Systemzustand (wird nicht verändert)
+            state_deltas: entity_id -> (neuer Status, Entity-Typ oder None)
+        
+        Returns:
+            Neuer Systemzustand mit angewendeten Deltas
+        """
+        merged = dict(system_state)
+        for entity_id, (status, entity_type) in state_deltas.items():
+            if entity_id in merged:
+                merged[entity_id] = {**merged[entity_id], "status": status}
+            elif self._is_asset_entity(entity_id, entity_type):
+                # Neu betroffenes Asset (z.B. Second-Order Effect), gleiche Struktur wie im State Check
+                merged[entity_id] = {
+                    "status": status,
+                    "entity_type": entity_type or "Asset",
+                    "name": entity_id,
+                    "criticality": "standard"
+                }
+        return merged
+    
     def _generate_decision_aids(self, state: WorkflowState) -> Dict[str, Any]:
         """Generiert Entscheidungshilfen für das generierte Szenario."""
         injects = state.get("injects", [])
@@ -1087,8 +2193,8 @@ class ScenarioWorkflow:
                 "total_iterations": state.get("iteration", 0),
                 "max_iterations": state.get("max_iterations", 0),
                 "workflow_duration_estimate": len(logs) * 2,  # Geschätzte Sekunden
-                "agent_decisions_count": len(decisions),
-                "workflow_logs_count": len(logs)
+                "agent_decisions_count": state.get("agent_decision_count", len(decisions)),
+                "workflow_logs_count": state.get("workflow_log_count", len(logs))
             },
             "agent_statistics": agent_stats,
             "workflow_statistics": node_stats,
@@ -1099,82 +2205,177 @@ class ScenarioWorkflow:
             }
         }
     
+    def _record_trace(
+        self,
+        state: WorkflowState,
+        log_entry: Optional[Dict[str, Any]] = None,
+        decision_entry: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, int]:
+        """
+        Schreibt Log-Eintrag und/oder Agenten-Entscheidung in den Trace-Sink.
+        
+        Returns:
+            State-Update mit den aktuellen Zählern (workflow_log_count, agent_decision_count)
+        """
+        buffer = getattr(self._trace_buffer, "entries", None)
+        if buffer is not None:
+            buffer.append((log_entry, decision_entry))
+            return {}
+        
+        scenario_id = state.get("scenario_id", "unknown")
+        update = {}
+        if log_entry is not None:
+            update["workflow_log_count"] = self.trace_sink.append(scenario_id, TRACE_LOGS, log_entry)
+        if decision_entry is not None:
+            update["agent_decision_count"] = self.trace_sink.append(scenario_id, TRACE_DECISIONS, decision_entry)
+        return update
+    
+    def get_workflow_logs(self, scenario_id: str, offset: int = 0, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Liest die Workflow-Logs eines Szenarios aus dem Trace-Sink."""
+        return self.trace_sink.read(scenario_id, TRACE_LOGS, offset=offset, limit=limit)
+    
+    def get_agent_decisions(self, scenario_id: str, offset: int = 0, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Liest die Agenten-Entscheidungen eines Szenarios aus dem Trace-Sink."""
+        return self.trace_sink.read(scenario_id, TRACE_DECISIONS, offset=offset, limit=limit)
+    
+    def _attach_traces(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Hängt die Traces aus dem Sink an ein Ergebnis an (nur für Rückgaben, nicht im Graph-State)."""
+        state["workflow_logs"] = self.get_workflow_logs(state["scenario_id"])
+        state["agent_decisions"] = self.get_agent_decisions(state["scenario_id"])
+        return state
+    
+    def _thread_config(self, scenario_id: str, recursion_limit: Optional[int] = None) -> Dict[str, Any]:
+        """Erstellt die LangGraph-Config für eine interaktive Session (thread_id = scenario_id)."""
+        if recursion_limit is None:
+            recursion_limit = self._recursion_limit()
+        return {
+            "configurable": {"thread_id": scenario_id},
+            "recursion_limit": recursion_limit
+        }
+    
     def _execute_interactive_workflow(self, initial_state: WorkflowState, recursion_limit: int) -> Dict[str, Any]:
-        """Führt Workflow im interaktiven Modus aus mit Pausen für Benutzer-Entscheidungen."""
-        current_state = initial_state
-        max_steps = recursion_limit
-        
-        # Prüfe ob bereits eine Entscheidung getroffen wurde
-        pending_decision = current_state.get("pending_decision")
-        user_decisions = current_state.get("user_decisions", [])
-        
-        if pending_decision and pending_decision.get("required"):
-            # Prüfe ob Entscheidung bereits getroffen wurde
-            if user_decisions:
-                last_decision = user_decisions[-1]
-                if last_decision.get("decision_id") == pending_decision.get("decision_id"):
-                    # Entscheidung wurde getroffen, wende sie an
-                    current_state = self._apply_user_decision(current_state, last_decision)
-                    current_state["pending_decision"] = None
-                else:
-                    # Noch keine Entscheidung, pausiere Workflow
-                    print(f"⏸️  Workflow pausiert - warte auf Benutzer-Entscheidung: {pending_decision.get('decision_id')}")
-                    return current_state
-        
-        # Führe Workflow-Schritte aus bis zum nächsten Decision-Point oder Ende
-        for step in range(max_steps):
-            # Prüfe ob End-Bedingung erreicht
-            end_condition = current_state.get("end_condition")
-            if end_condition and end_condition != ScenarioEndCondition.CONTINUE.value:
-                print(f"🏁 End-Bedingung erreicht: {end_condition}")
-                break
-            
-            # Debug: Zeige aktuellen State vor invoke
-            iteration_before = current_state.get("iteration", 0)
-            injects_before = len(current_state.get("injects", []))
-            print(f"🔄 [Interactive Workflow] Schritt {step+1}/{max_steps}: Iteration {iteration_before}, Injects: {injects_before}")
-            
-            # Führe Workflow-Schritte aus (bis zum nächsten Decision-Point)
-            try:
-                # Führe Workflow durch alle Nodes, bis ein Decision-Point oder Ende erreicht wird
-                # Ein vollständiger Zyklus benötigt ~7 Nodes (State Check → Manager → Intel → Action → Generator → Critic → State Update)
-                # Plus mögliche Refine-Loops (max 2) = 9 Nodes pro Inject
-                # Setze recursion_limit hoch genug, um mindestens einen vollständigen Zyklus zu ermöglichen
-                current_state = self.graph.invoke(
-                    current_state,
-                    config={"recursion_limit": 20}  # Genug für mindestens 2 vollständige Zyklen
-                )
-                
-                # Debug: Zeige State nach invoke
-                iteration_after = current_state.get("iteration", 0)
-                injects_after = len(current_state.get("injects", []))
-                print(f"✅ [Interactive Workflow] Nach invoke: Iteration {iteration_after}, Injects: {injects_after}")
-                if iteration_after != iteration_before:
-                    print(f"   → Iteration erhöht: {iteration_before} → {iteration_after}")
-                if injects_after != injects_before:
-                    print(f"   → Injects hinzugefügt: {injects_before} → {injects_after}")
-                
-                # Prüfe ob Decision-Point erreicht wurde
-                if current_state.get("pending_decision") and current_state.get("pending_decision", {}).get("required"):
-                    print(f"⏸️  Decision-Point erreicht: {current_state.get('pending_decision', {}).get('decision_id')}")
-                    print(f"   Final State: Iteration {current_state.get('iteration', 0)}, Injects: {len(current_state.get('injects', []))}")
-                    return current_state
-                
-                # Prüfe End-Bedingung
-                end_condition = current_state.get("end_condition")
-                if end_condition and end_condition != ScenarioEndCondition.CONTINUE.value:
-                    print(f"🏁 End-Bedingung erreicht: {end_condition}")
-                    break
-                    
-            except Exception as e:
-                import traceback
-                error_trace = traceback.format_exc()
-                print(f"⚠️  Fehler im interaktiven Workflow: {e}")
-                print(f"   Traceback: {error_trace}")
-                break
+        """
+        Führt Workflow im interaktiven Modus aus mit Pausen für Benutzer-Entscheidungen.
+        
+        Der Graph läuft bis zum nächsten Decision-Point (Interrupt) oder Ende; der
+        Zustand liegt im Checkpoint. Ist die Session bereits pausiert, werden nur
+        die Entscheidungs-relevanten Felder aus dem übergebenen State übernommen
+        und ab dem Checkpoint fortgesetzt.
+        """
+        config = self._thread_config(initial_state["scenario_id"], recursion_limit)
+        checkpoint = self.graph.get_state(config)
+        
+        if checkpoint.next:
+            # Übergebener State trägt die (bereits angewendete) Entscheidung - solange
+            # pending_decision gesetzt ist, wurde noch nicht entschieden
+            if initial_state.get("pending_decision"):
+                pending_decision = checkpoint.values.get("pending_decision") or {}
+                logger.info("⏸️  Workflow pausiert - warte auf Benutzer-Entscheidung: %s", pending_decision.get('decision_id'))
+                return dict(checkpoint.values)
+            
+            user_decisions = initial_state.get("user_decisions") or []
+            self._commit_decision_branch(
+                initial_state["scenario_id"], user_decisions[-1].get("choice_id") if user_decisions else None
+            )
+            self.graph.update_state(
+                config,
+                {
+                    "current_phase": initial_state.get("current_phase", checkpoint.values.get("current_phase")),
+                    "system_state": initial_state.get("system_state", checkpoint.values.get("system_state")),
+                    "user_decisions": initial_state.get("user_decisions", []),
+                    "pending_decision": None
+                },
+                as_node="decision_point"
+            )
+            return self._run_until_pause(None, config)
         
-        print(f"🏁 [Interactive Workflow] Beendet. Final State: Iteration {current_state.get('iteration', 0)}, Injects: {len(current_state.get('injects', []))}")
-        return current_state
+        return self._run_until_pause(initial_state, config)
+    
+    def _run_until_pause(self, graph_input: Optional[Dict[str, Any]], config: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Führt den Graph bis zum nächsten Interrupt oder Ende aus.
+        
+        Args:
+            graph_input: Initialer State oder None (Fortsetzung ab Checkpoint)
+            config: Thread-Config
+        
+        Returns:
+            Aktueller State aus dem Checkpoint
+        """
+        try:
+            self.graph.invoke(graph_input, config=config)
+        except Exception as e:
+            logger.warning("⚠️  Fehler im interaktiven Workflow: %s", e, exc_info=True)
+        
+        checkpoint = self.graph.get_state(config)
+        state = dict(checkpoint.values)
+        if checkpoint.next:
+            logger.info("⏸️  Decision-Point erreicht: %s", (state.get('pending_decision') or {}).get('decision_id'))
+            self._start_decision_branches(state)
+        else:
+            logger.info(
+                "🏁 [Interactive Workflow] Beendet. Iteration %s, Injects: %s",
+                state.get('iteration', 0), len(state.get('injects', []))
+            )
+        return state
+    
+    def get_paused_session(self, scenario_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Lädt eine an einem Decision-Point pausierte Session aus dem Checkpoint.
+        
+        Args:
+            scenario_id: ID des Szenarios (thread_id)
+        
+        Returns:
+            State der Session oder None, wenn keine pausierte Session existiert
+        """
+        if not self.checkpointer:
+            return None
+        checkpoint = self.graph.get_state(self._thread_config(scenario_id))
+        if not checkpoint.next:
+            return None
+        return self._attach_traces(dict(checkpoint.values))
+    
+    def resume_scenario(self, scenario_id: str, decision: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Wendet eine Benutzer-Entscheidung an und setzt die pausierte Session fort.
+        
+        Der Zustand wird aus dem Checkpoint geladen - der Aufrufer muss den
+        State nicht selbst vorhalten (überlebt auch Prozess-Neustarts mit SQLite).
+        
+        Args:
+            scenario_id: ID des pausierten Szenarios
+            decision: Entscheidung ({"decision_id", "choice_id", "decision_type", ...})
+        
+        Returns:
+            State am nächsten Decision-Point oder finaler State
+        """
+        if not self.checkpointer:
+            raise RuntimeError("Fortsetzen ist nur im interaktiven Modus möglich")
+        
+        config = self._thread_config(scenario_id)
+        checkpoint = self.graph.get_state(config)
+        if not checkpoint.next:
+            raise ValueError(f"Keine pausierte Session für Szenario {scenario_id} gefunden")
+        config["recursion_limit"] = self._recursion_limit(checkpoint.values.get("max_iterations"))
+        
+        state = self._apply_user_decision(dict(checkpoint.values), decision)
+        self._commit_decision_branch(scenario_id, decision.get("choice_id"))
+        self.graph.update_state(
+            config,
+            {
+                "current_phase": state["current_phase"],
+                "system_state": state["system_state"],
+                "user_decisions": state["user_decisions"],
+                "pending_decision": None
+            },
+            as_node="decision_point"
+        )
+        
+        final_state = self._attach_traces(self._run_until_pause(None, config))
+        final_state['decision_aids'] = self._generate_decision_aids(final_state)
+        final_state['additional_info'] = self._generate_additional_info(final_state)
+        return final_state
     
     def _apply_user_decision(self, state: WorkflowState, decision: Dict[str, Any]) -> Dict[str, Any]:
         """Wendet eine Benutzer-Entscheidung auf den State an und generiert entsprechende Events."""
@@ -1195,7 +2396,7 @@ class ScenarioWorkflow:
         if impact.get("phase_change"):
             from state_models import CrisisPhase
             state["current_phase"] = CrisisPhase(impact["phase_change"])
-            print(f"🔄 Phase geändert zu: {impact['phase_change']}")
+            logger.debug("🔄 Phase geändert zu: %s", impact['phase_change'])
         
         # Aktualisiere System State basierend auf Entscheidung
         system_state = state.get("system_state", {})
@@ -1209,7 +2410,7 @@ class ScenarioWorkflow:
                     if isinstance(entity_data, dict) and entity_data.get("status") == "compromised":
                         entity_data["status"] = "isolated"
                         protected_count += 1
-                print(f"🛡️  {protected_count} Assets isoliert durch Entscheidung")
+                logger.debug("🛡️  %s Assets isoliert durch Entscheidung", protected_count)
             
             elif "shutdown" in choice_id.lower():
                 # Kritische Systeme herunterfahren
@@ -1217,7 +2418,7 @@ class ScenarioWorkflow:
                     if isinstance(entity_data, dict) and entity_data.get("criticality") == "critical":
                         entity_data["status"] = "offline"
                         protected_count += 1
-                print(f"⛔ {protected_count} kritische Systeme heruntergefahren")
+                logger.debug("⛔ %s kritische Systeme heruntergefahren", protected_count)
         
         elif decision_type == "resource_allocation":
             # Ressourcen-Allokation verbessert Response-Effektivität
@@ -1226,7 +2427,7 @@ class ScenarioWorkflow:
                 for entity_id, entity_data in system_state.items():
                     if isinstance(entity_data, dict) and "backup" in entity_id.lower():
                         entity_data["status"] = "online"
-                print(f"💾 Backup-Systeme aktiviert")
+                logger.debug("💾 Backup-Systeme aktiviert")
         
         elif decision_type == "recovery_action":
             # Recovery-Aktionen starten Wiederherstellung
@@ -1235,7 +2436,7 @@ class ScenarioWorkflow:
                 for entity_id, entity_data in system_state.items():
                     if isinstance(entity_data, dict) and entity_data.get("status") in ["compromised", "isolated"]:
                         entity_data["status"] = "recovering"
-                print(f"🔄 Recovery-Prozess gestartet")
+                logger.debug("🔄 Recovery-Prozess gestartet")
         
         # Speichere Entscheidung mit Impact
         user_decisions = state.get("user_decisions", [])
@@ -1248,7 +2449,7 @@ class ScenarioWorkflow:
         state["user_decisions"] = user_decisions
         state["system_state"] = system_state
         
-        print(f"✅ Entscheidung '{choice_id}' angewendet")
+        logger.debug("✅ Entscheidung '%s' angewendet", choice_id)
         
         return state
     
@@ -1279,31 +2480,39 @@ class ScenarioWorkflow:
         max_iterations = state.get("max_iterations", self.max_iterations)
         current_phase = state.get("current_phase", CrisisPhase.NORMAL_OPERATION)
         
-        print(f"🤔 [Should Ask Decision] Iteration {iteration}, Injects: {injects_count}/{max_iterations}, Phase: {current_phase.value}")
-        print(f"   Interactive Mode: {self.interactive_mode}, State Interactive Mode: {state.get('interactive_mode', False)}")
+        logger.debug(
+            "🤔 [Should Ask Decision] Iteration %s, Injects: %s/%s, Phase: %s",
+            iteration, injects_count, max_iterations, current_phase.value
+        )
+        logger.debug("Interactive Mode: %s, State Interactive Mode: %s", self.interactive_mode, state.get('interactive_mode', False))
         
         if not self.interactive_mode or not state.get("interactive_mode", False):
             # Nicht-interaktiver Modus: Normale Continue/End-Logik
-            print(f"   → Nicht-interaktiver Modus, verwende _should_continue")
+            logger.debug("→ Nicht-interaktiver Modus, verwende _should_continue")
             return self._should_continue(state)
         
+        budget_reason = self._budget_exceeded(state) or self._deadline_exceeded(state)
+        if budget_reason:
+            logger.debug("→ %s (end)", budget_reason)
+            return "end"
+        
         # WICHTIG: Wenn noch keine Injects vorhanden sind, immer "continue" zurückgeben
         # um mindestens die ersten Injects zu generieren
         if injects_count == 0:
-            print(f"   → Noch keine Injects, generiere ersten Inject (continue)")
+            logger.debug("→ Noch keine Injects, generiere ersten Inject (continue)")
             return "continue"
         
         # Prüfe End-Bedingungen ZUERST
         end_condition = self._check_end_conditions(state)
         if end_condition != ScenarioEndCondition.CONTINUE:
             state["end_condition"] = end_condition.value
-            print(f"   → End-Bedingung erreicht: {end_condition.value} (end)")
+            logger.debug("→ End-Bedingung erreicht: %s (end)", end_condition.value)
             return "end"
         
         # Entscheidung erforderlich nach jedem 2. Inject oder bei kritischen Phasen
         decision_points = [2, 4, 6, 8, 10, 12, 14, 16, 18, 20]  # Nach jedem 2. Inject
         if injects_count in decision_points:
-            print(f"   → Decision-Point: Nach {injects_count} Injects (decision)")
+            logger.debug("→ Decision-Point: Nach %s Injects (decision)", injects_count)
             return "decision"
         
         # Entscheidung bei kritischen Phasen (aber nur wenn bereits mindestens 1 Inject vorhanden ist)
@@ -1312,15 +2521,15 @@ class ScenarioWorkflow:
             user_decisions = state.get("user_decisions", [])
             phase_decisions = [d for d in user_decisions if d.get("situation", {}).get("current_phase") == current_phase.value]
             if len(phase_decisions) == 0:  # Noch keine Entscheidung für diese Phase
-                print(f"   → Decision-Point: Kritische Phase {current_phase.value} (decision)")
+                logger.debug("→ Decision-Point: Kritische Phase %s (decision)", current_phase.value)
                 return "decision"
         
         # Normale Continue-Logik
         if injects_count >= max_iterations:
-            print(f"   → Max Iterations erreicht: {injects_count}/{max_iterations} (end)")
+            logger.debug("→ Max Iterations erreicht: %s/%s (end)", injects_count, max_iterations)
             return "end"
         
-        print(f"   → Weiter mit nächstem Zyklus (continue)")
+        logger.debug("→ Weiter mit nächstem Zyklus (continue)")
         return "continue"
     
     def _check_end_conditions(self, state: WorkflowState) -> ScenarioEndCondition:
@@ -1343,7 +2552,7 @@ class ScenarioWorkflow:
         total_critical = sum(1 for e in system_state.values() 
                             if isinstance(e, dict) and e.get("criticality") == "critical")
         if total_critical > 0 and critical_compromised / total_critical > 0.6:
-            print(f"💀 FATAL: {critical_compromised}/{total_critical} kritische Assets kompromittiert (>60%)")
+            logger.info("💀 FATAL: %s/%s kritische Assets kompromittiert (>60%%)", critical_compromised, total_critical)
             return ScenarioEndCondition.FATAL
         
         # FATAL: Zu viele High/Critical Injects ohne erfolgreiche Gegenmaßnahmen
@@ -1354,7 +2563,10 @@ class ScenarioWorkflow:
                                   and dec.get("choice_id", "").lower() not in ["no_action", "monitor", "investigate"])
         
         if high_critical_injects >= 6 and successful_responses < 2:
-            print(f"💀 FATAL: {high_critical_injects} High/Critical Injects, nur {successful_responses} erfolgreiche Gegenmaßnahmen")
+            logger.info(
+                "💀 FATAL: %s High/Critical Injects, nur %s erfolgreiche Gegenmaßnahmen",
+                high_critical_injects, successful_responses
+            )
             return ScenarioEndCondition.FATAL
         
         # VICTORY: Recovery-Phase erreicht mit erfolgreichen Gegenmaßnahmen
@@ -1364,7 +2576,7 @@ class ScenarioWorkflow:
                                       and dec.get("choice_id", "").lower() not in ["no_action", "monitor"])
             
             if successful_responses >= 3 and len(injects) >= 5:
-                print(f"🏆 VICTORY: Recovery erreicht mit {successful_responses} erfolgreichen Maßnahmen")
+                logger.info("🏆 VICTORY: Recovery erreicht mit %s erfolgreichen Maßnahmen", successful_responses)
                 return ScenarioEndCondition.VICTORY
         
         # VICTORY: Bedrohung erfolgreich eingedämmt
@@ -1377,7 +2589,7 @@ class ScenarioWorkflow:
             recent_compromises = sum(1 for inj in injects[-3:] 
                                     if any("compromised" in str(a).lower() for a in inj.technical_metadata.affected_assets))
             if recent_compromises == 0:
-                print(f"🏆 VICTORY: Bedrohung erfolgreich eingedämmt mit {len(containment_decisions)} Containment-Entscheidungen")
+                logger.info("🏆 VICTORY: Bedrohung erfolgreich eingedämmt mit %s Containment-Entscheidungen", len(containment_decisions))
                 return ScenarioEndCondition.VICTORY
         
         # NORMAL_END: Recovery abgeschlossen
@@ -1392,7 +2604,7 @@ class ScenarioWorkflow:
     
     def _decision_point_node(self, state: WorkflowState) -> Dict[str, Any]:
         """Node: Decision Point - Generiert Entscheidungsoptionen für Benutzer."""
-        print(f"🎯 [Decision Point] Erstelle Entscheidungsoptionen...")
+        logger.debug("🎯 [Decision Point] Erstelle Entscheidungsoptionen...")
         
         injects = state.get("injects", [])
         current_phase = state.get("current_phase", CrisisPhase.NORMAL_OPERATION)
@@ -1434,14 +2646,13 @@ class ScenarioWorkflow:
             }
         }
         
-        logs = state.get("workflow_logs", [])
-        logs.append(log_entry)
+        trace = self._record_trace(state, log_entry)
         
-        print(f"📋 Entscheidungsoptionen generiert: {len(options)} Optionen")
+        logger.debug("📋 Entscheidungsoptionen generiert: %s Optionen", len(options))
         
         return {
             "pending_decision": pending_decision,
-            "workflow_logs": logs
+            **trace
         }
     
     def _generate_decision_options(self, state: WorkflowState, phase: CrisisPhase, critical_compromised: int) -> List[Dict[str, Any]]:
@@ -1626,53 +2837,6 @@ class ScenarioWorkflow:
         
         return options
     
-    def _decision_point_node(self, state: WorkflowState) -> Dict[str, Any]:
-        """Node: Decision Point - Wartet auf Benutzer-Entscheidung."""
-        print(f"🤔 [Decision Point] Warte auf Benutzer-Entscheidung...")
-        
-        injects = state.get("injects", [])
-        current_phase = state.get("current_phase", CrisisPhase.NORMAL_OPERATION)
-        system_state = state.get("system_state", {})
-        
-        # Generiere Decision-Optionen basierend auf aktueller Situation
-        decision_options = self._generate_decision_options(state)
-        
-        # Speichere pending decision im State
-        pending_decision = {
-            "decision_id": f"DEC-{len(state.get('user_decisions', [])) + 1:03d}",
-            "timestamp": datetime.now().isoformat(),
-            "situation": {
-                "current_phase": current_phase.value,
-                "inject_count": len(injects),
-                "recent_inject": injects[-1].inject_id if injects else None,
-                "critical_assets_compromised": sum(1 for e in system_state.values() 
-                                                  if isinstance(e, dict) and e.get("status") == "compromised" 
-                                                  and e.get("criticality") == "critical")
-            },
-            "options": decision_options,
-            "required": True
-        }
-        
-        log_entry = {
-            "timestamp": datetime.now().isoformat(),
-            "node": "Decision Point",
-            "iteration": state['iteration'],
-            "action": "Warte auf Benutzer-Entscheidung",
-            "details": {
-                "decision_id": pending_decision["decision_id"],
-                "options_count": len(decision_options),
-                "status": "pending"
-            }
-        }
-        
-        logs = state.get("workflow_logs", [])
-        logs.append(log_entry)
-        
-        return {
-            "pending_decision": pending_decision,
-            "workflow_logs": logs
-        }
-    
     def _generate_decision_options_old(self, state: WorkflowState) -> List[Dict[str, Any]]:
         """DEPRECATED: Alte Version - wird nicht mehr verwendet."""
         # Diese Funktion wird nicht mehr verwendet
@@ -1685,14 +2849,19 @@ class ScenarioWorkflow:
         validation = state.get("validation_result")
         draft_inject = state.get("draft_inject")
         
-        print(f"🔀 [Should Refine] Iteration {iteration}, Injects: {injects_count}")
-        print(f"   Validation vorhanden: {validation is not None}")
-        print(f"   Draft Inject vorhanden: {draft_inject is not None}")
+        logger.debug("🔀 [Should Refine] Iteration %s, Injects: %s", iteration, injects_count)
+        logger.debug("Validation vorhanden: %s", validation is not None)
+        logger.debug("Draft Inject vorhanden: %s", draft_inject is not None)
         
         if not validation:
-            print(f"   → Keine Validierung, gehe zu State Update")
+            logger.debug("→ Keine Validierung, gehe zu State Update")
             return "update"  # Weiter auch ohne Validierung
         
+        if state.get("metadata", {}).get("deadline_node"):
+            # Generator/Critic wegen Deadline nicht ausgeführt: Validierung ist veraltet
+            logger.debug("→ Deadline erreicht, gehe zu State Update")
+            return "update"
+        
         # Refine wenn nicht valide (max. 2 Versuche pro Inject)
         if not validation.is_valid:
             metadata = state.get("metadata", {})
@@ -1702,13 +2871,25 @@ class ScenarioWorkflow:
             refine_key = f"refine_count_{current_inject_id}"
             refine_count = metadata.get(refine_key, 0)
             
-            print(f"   ❌ Validation nicht valide")
-            print(f"   Fehler: {validation.errors[:2] if validation.errors else 'Keine Details'}")
-            print(f"   Refine-Versuche für {current_inject_id}: {refine_count}/2")
+            logger.debug("❌ Validation nicht valide")
+            logger.debug("Fehler: %s", validation.errors[:2] if validation.errors else 'Keine Details')
+            logger.debug("Refine-Versuche für %s: %s/2", current_inject_id, refine_count)
+            
+            budget_reason = self._budget_exceeded(state)
+            if budget_reason:
+                # Kein weiterer LLM-Aufruf: Draft wie nach ausgeschöpften Refine-Versuchen übernehmen
+                logger.info("💸 %s - kein Refine, gehe zu State Update", budget_reason)
+                return "update"
+            
+            deadline_reason = self._deadline_exceeded(state)
+            if deadline_reason:
+                # Kein Refine mehr; der abgelehnte Draft wird nicht übernommen
+                logger.info("⏱️  %s - kein Refine, Szenario endet", deadline_reason)
+                return "update"
             
             if refine_count < 2:  # Max. 2 Refine-Versuche
                 metadata[refine_key] = refine_count + 1
-                print(f"   → Gehe zurück zu Generator (Refine-Versuch {refine_count + 1})")
+                logger.debug("→ Gehe zurück zu Generator (Refine-Versuch %s)", refine_count + 1)
                 return "refine"
             else:
                 # Nach 2 Versuchen: Akzeptiere trotzdem (mit Warnung)
@@ -1725,8 +2906,8 @@ class ScenarioWorkflow:
                         was_refined=True
                     )
                 
-                print(f"⚠️  Inject nach {refine_count} Refine-Versuchen akzeptiert (mit Warnungen)")
-                print(f"   → Gehe zu State Update trotzdem")
+                logger.warning("⚠️  Inject nach %s Refine-Versuchen akzeptiert (mit Warnungen)", refine_count)
+                logger.debug("→ Gehe zu State Update trotzdem")
                 return "update"
         
         # Forensisches Logging: REFINED Inject (erfolgreich validiert)
@@ -1747,9 +2928,53 @@ class ScenarioWorkflow:
                 was_refined=(refine_count > 0)
             )
         
-        print(f"   ✅ Validation valide → Gehe zu State Update")
+        logger.debug("✅ Validation valide → Gehe zu State Update")
         return "update"
     
+    def _budget_exceeded(self, state: WorkflowState) -> Optional[str]:
+        """
+        Prüft das Token-/Kosten-Budget des Szenarios.
+        
+        Der Grund wird in metadata["budget_exceeded"] festgehalten (die
+        Metadaten werden wie die Refine-Zähler direkt im State geändert).
+        
+        Returns:
+            Grund als Text, falls das Budget erschöpft ist, sonst None
+        """
+        if self.token_budget is None and self.cost_budget is None:
+            return None
+        total = get_scenario_usage(state.get("scenario_id"))["total"]
+        reason = None
+        if self.token_budget is not None and total["total_tokens"] >= self.token_budget:
+            reason = f"Token-Budget erschöpft ({total['total_tokens']}/{self.token_budget} Tokens)"
+        elif self.cost_budget is not None and total["cost_usd"] >= self.cost_budget:
+            reason = f"Kosten-Budget erschöpft ({total['cost_usd']:.4f}/{self.cost_budget:.4f} USD)"
+        if reason:
+            state.get("metadata", {}).setdefault("budget_exceeded", reason)
+        return reason
+    
+    def _deadline_exceeded(self, state: WorkflowState) -> Optional[str]:
+        """
+        Prüft Szenario-Deadline und abgebrochene Nodes.
+        
+        Der Grund wird wie beim Budget in metadata["deadline_exceeded"]
+        festgehalten (auch von _run_with_time_limit bei Node-Timeouts).
+        Beim Erreichen der Deadline werden Spekulation und
+        Entscheidungs-Zweige abgebrochen.
+        
+        Returns:
+            Grund als Text, falls die Deadline erreicht ist, sonst None
+        """
+        metadata = state.get("metadata", {})
+        if metadata.get("deadline_exceeded"):
+            return metadata["deadline_exceeded"]
+        deadline = state.get("deadline")
+        if deadline and time.time() >= deadline:
+            metadata["deadline_exceeded"] = "Szenario-Deadline erreicht"
+            self._discard_pending_iterations(state.get("scenario_id"), metadata["deadline_exceeded"])
+            return metadata["deadline_exceeded"]
+        return None
+    
     def _should_continue(self, state: WorkflowState) -> str:
         """Entscheidet, ob Workflow fortgesetzt werden soll."""
         iteration = state.get("iteration", 0)
@@ -1761,36 +2986,51 @@ class ScenarioWorkflow:
         # Stoppe wenn:
         # 1. Anzahl generierter Injects erreicht (HAUPTPRÜFUNG)
         if len(injects) >= max_iterations:
-            print(f"🛑 Stoppe: Anzahl Injects erreicht ({len(injects)}/{max_iterations})")
+            logger.info("🛑 Stoppe: Anzahl Injects erreicht (%s/%s)", len(injects), max_iterations)
+            return "end"
+        
+        # 1b. Deadline oder Node-Timeout erreicht (Teilergebnis mit bisherigen Injects)
+        deadline_reason = self._deadline_exceeded(state)
+        if deadline_reason:
+            logger.info("🛑 Stoppe: %s (%s/%s Injects)", deadline_reason, len(injects), max_iterations)
             return "end"
         
         # 2. Maximale Iterationen erreicht (Fallback)
         if iteration >= max_iterations * 2:  # Erlaube mehr Iterationen für Refine-Loops
-            print(f"🛑 Stoppe: Maximale Iterationen erreicht ({iteration}/{max_iterations * 2})")
+            logger.info("🛑 Stoppe: Maximale Iterationen erreicht (%s/%s)", iteration, max_iterations * 2)
             return "end"
         
         # 3. Zu viele Fehler (verhindert Endlosschleife)
         if len(errors) > 20:  # Erhöht von 10 auf 20
-            print(f"🛑 Stoppe: Zu viele Fehler ({len(errors)})")
+            logger.info("🛑 Stoppe: Zu viele Fehler (%s)", len(errors))
             return "end"
         
-        # 4. Recovery-Phase erreicht und genug Injects generiert (mindestens 80% von max_iterations)
+        # 4. Token-/Kosten-Budget des Szenarios erschöpft
+        budget_reason = self._budget_exceeded(state)
+        if budget_reason:
+            logger.info("🛑 Stoppe: %s", budget_reason)
+            return "end"
+        
+        # 5. Recovery-Phase erreicht und genug Injects generiert (mindestens 80% von max_iterations)
         if current_phase == CrisisPhase.RECOVERY:
             min_injects_for_recovery = max(3, int(max_iterations * 0.8))
             if len(injects) >= min_injects_for_recovery:
-                print(f"🛑 Stoppe: Recovery-Phase erreicht mit {len(injects)} Injects (Minimum: {min_injects_for_recovery})")
+                logger.info("🛑 Stoppe: Recovery-Phase erreicht mit %s Injects (Minimum: %s)", len(injects), min_injects_for_recovery)
                 return "end"
         
-        # 5. Sicherheits-Stop: Zu viele Workflow-Logs (dynamisch basierend auf max_iterations)
+        # 6. Sicherheits-Stop: Zu viele Workflow-Logs (dynamisch basierend auf max_iterations)
         # Jeder Inject benötigt ~7 Nodes + mögliche Refine-Loops (2 pro Inject) = ~9 Nodes pro Inject
-        workflow_logs = state.get("workflow_logs", [])
+        workflow_log_count = state.get("workflow_log_count", 0)
         max_logs = max_iterations * 15  # 15 Logs pro Inject (7 Nodes + 2 Refine + Puffer)
-        if len(workflow_logs) > max_logs:
-            print(f"🛑 Stoppe: Sicherheitsgrenze erreicht ({len(workflow_logs)}/{max_logs} Logs)")
+        if workflow_log_count > max_logs:
+            logger.info("🛑 Stoppe: Sicherheitsgrenze erreicht (%s/%s Logs)", workflow_log_count, max_logs)
             return "end"
         
         # Weiter mit nächster Iteration
-        print(f"➡️  Weiter: Iteration {iteration}/{max_iterations}, Injects: {len(injects)}/{max_iterations}, Logs: {len(workflow_logs)}")
+        logger.debug(
+            "➡️  Weiter: Iteration %s/%s, Injects: %s/%s, Logs: %s",
+            iteration, max_iterations, len(injects), max_iterations, workflow_log_count
+        )
         return "continue"
     
     def _determine_asset_status(
@@ -1808,35 +3048,32 @@ class ScenarioWorkflow:
         else:
             return "degraded"
     
-    def generate_scenario(
+    def _build_initial_state(
         self,
         scenario_type: ScenarioType,
-        scenario_id: Optional[str] = None,
-        mode: str = 'thesis'
-    ) -> Dict[str, Any]:
-        """
-        Generiert ein vollständiges Szenario.
-        
-        Args:
-            scenario_type: Typ des Szenarios
-            scenario_id: Optional - ID für das Szenario
-        
-        Returns:
-            Dictionary mit generiertem Szenario
-        """
-        if not scenario_id:
-            scenario_id = f"SCEN-{uuid.uuid4().hex[:8].upper()}"
-        
-        # Initialisiere State
-        initial_state: WorkflowState = {
+        scenario_id: str,
+        mode: str,
+        speculative_candidates: Optional[int],
+        max_iterations: Optional[int] = None,
+        deadline_seconds: Optional[float] = None
+    ) -> WorkflowState:
+        """Erstellt den initialen Workflow-State für einen neuen Lauf."""
+        deadline_seconds = deadline_seconds if deadline_seconds is not None else self.deadline_seconds
+        # Interaktive Sessions pausieren beliebig lange an Decision-Points: dort keine Wandzeit-Deadline
+        deadline = None
+        if deadline_seconds is not None and not self.interactive_mode:
+            deadline = time.time() + deadline_seconds
+        return {
             "scenario_id": scenario_id,
             "scenario_type": scenario_type,
             "current_phase": CrisisPhase.NORMAL_OPERATION,
             "injects": [],
             "system_state": {},
             "iteration": 0,
-            "max_iterations": self.max_iterations,
+            "max_iterations": max_iterations or self.max_iterations,
             "manager_plan": None,
+            "phase_plan": None,
+            "planning_stats": {"manager_calls": 0, "plan_steps_reused": 0, "replan_reasons": {}},
             "selected_action": None,
             "draft_inject": None,
             "validation_result": None,
@@ -1846,31 +3083,150 @@ class ScenarioWorkflow:
             "warnings": [],
             "start_time": datetime.now(),
             "metadata": {},
-            "workflow_logs": [],
-            "agent_decisions": [],
+            "workflow_log_count": 0,
+            "agent_decision_count": 0,
             "pending_decision": None,
             "user_decisions": [],
             "end_condition": None,
             "interactive_mode": self.interactive_mode,
-            "mode": mode  # 'legacy' oder 'thesis'
+            "mode": mode,  # 'legacy' oder 'thesis'
+            "speculative_candidates": self._clamp_candidates(speculative_candidates or self.speculative_candidates),
+            "draft_validation": None,
+            "draft_batch": None,
+            "deadline": deadline
         }
+    
+    def _recursion_limit(self, max_iterations: Optional[int] = None) -> int:
+        """
+        Berechnet das Recursion Limit basierend auf max_iterations des Laufs
+        (Standard: Workflow-Default).
+        
+        Jede Iteration benötigt ~7 Nodes (State Check → Manager → Intel → Action → Generator → Critic → State Update)
+        Plus Refine-Loops (max 2 pro Inject) = zusätzlich 2 Nodes
+        Plus Decision Points im interaktiven Modus = zusätzlich 1 Node pro Decision
+        """
+        base_nodes = 7
+        refine_nodes = 2
+        decision_nodes = 1 if self.interactive_mode else 0
+        return ((max_iterations or self.max_iterations) * (base_nodes + refine_nodes + decision_nodes)) + 30
+    
+    def _release_scenario(self, scenario_id: str, reason: str):
+        """
+        Räumt einen Lauf auf, der nicht über _finalize_scenario endet (Abbruch,
+        Fehler, Client-Disconnect): Spekulation und Entscheidungs-Zweige werden
+        verworfen (keine weiteren LLM-Aufrufe), die Token-Erfassung freigegeben.
+        """
+        self._discard_pending_iterations(scenario_id, reason)
+        pop_scenario_usage(scenario_id)
+    
+    def _finalize_scenario(self, final_state: Dict[str, Any]) -> Dict[str, Any]:
+        """Ergänzt Entscheidungshilfen/Zusatzinfos und speichert das fertige Szenario in Neo4j."""
+        # Nicht mehr benötigte Spekulation (Szenario vorzeitig beendet) verwerfen
+        self._discard_pending_iterations(final_state["scenario_id"], "Szenario beendet")
+        
+        # Token-Nutzung (gesamt, pro Node, pro Agent) in die Metadaten übernehmen
+        metadata = final_state.setdefault("metadata", {})
+        metadata["token_usage"] = pop_scenario_usage(final_state["scenario_id"])
+        self.performance_monitor.record_llm_usage(metadata["token_usage"]["nodes"])
+        if metadata.get("budget_exceeded") and not final_state.get("end_condition"):
+            final_state["end_condition"] = ScenarioEndCondition.BUDGET_EXCEEDED.value
+        if metadata.get("deadline_exceeded") and not final_state.get("end_condition"):
+            final_state["end_condition"] = ScenarioEndCondition.TIMEOUT.value
+        
+        # Prüfe End-Bedingung
+        end_condition = final_state.get("end_condition")
+        if end_condition:
+            if end_condition == ScenarioEndCondition.FATAL.value:
+                logger.info("💀 FATAL ENDE: System vollständig kompromittiert")
+            elif end_condition == ScenarioEndCondition.VICTORY.value:
+                logger.info("🏆 SIEG: Bedrohung erfolgreich abgewehrt")
+            elif end_condition == ScenarioEndCondition.NORMAL_END.value:
+                logger.info("✅ NORMALES ENDE: Recovery abgeschlossen")
+            elif end_condition == ScenarioEndCondition.BUDGET_EXCEEDED.value:
+                logger.info("💸 BUDGET-ENDE: %s", metadata['budget_exceeded'])
+            elif end_condition == ScenarioEndCondition.TIMEOUT.value:
+                logger.info("⏱️  TIMEOUT-ENDE: %s (%s Injects)", metadata['deadline_exceeded'], len(final_state['injects']))
+        
+        logger.info(
+            "✅ Szenario-Generierung abgeschlossen: %s Injects, finale Phase %s, %s Benutzer-Entscheidungen",
+            len(final_state['injects']), final_state['current_phase'].value, len(final_state.get('user_decisions') or []),
+            extra={"scenario_id": final_state["scenario_id"]}
+        )
+        
+        # Generiere Entscheidungshilfen und Zusatzinfos
+        self._attach_traces(final_state)
+        decision_aids = self._generate_decision_aids(final_state)
+        final_state['decision_aids'] = decision_aids
+        final_state['additional_info'] = self._generate_additional_info(final_state)
+        
+        # Speichere Szenario in Neo4j
+        try:
+            from state_models import ScenarioState
+            scenario_state = ScenarioState(
+                scenario_id=final_state['scenario_id'],
+                scenario_type=final_state['scenario_type'],
+                current_phase=final_state['current_phase'],
+                injects=final_state['injects'],
+                start_time=final_state['start_time'],
+                metadata=final_state.get('metadata', {})
+            )
+            saved_id = self.neo4j_client.save_scenario(scenario_state)
+            logger.info("💾 Szenario in Neo4j gespeichert: %s", saved_id)
+        except Exception as e:
+            logger.warning("⚠️  Fehler beim Speichern in Neo4j: %s", e)
+            # Füge Warnung hinzu, aber breche nicht ab
+            if 'warnings' not in final_state:
+                final_state['warnings'] = []
+            final_state['warnings'].append(f"Szenario konnte nicht in Neo4j gespeichert werden: {e}")
+        
+        return final_state
+    
+    def generate_scenario(
+        self,
+        scenario_type: ScenarioType,
+        scenario_id: Optional[str] = None,
+        mode: str = 'thesis',
+        speculative_candidates: Optional[int] = None,
+        max_iterations: Optional[int] = None,
+        deadline_seconds: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Generiert ein vollständiges Szenario.
         
-        print(f"🚀 Starte Szenario-Generierung: {scenario_id}")
-        print(f"   Typ: {scenario_type.value}")
-        print(f"   Max. Iterationen: {self.max_iterations}")
-        print()
+        Args:
+            scenario_type: Typ des Szenarios
+            scenario_id: Optional - ID für das Szenario
+            mode: 'legacy' oder 'thesis'
+            speculative_candidates: Optional - Anzahl paralleler Draft-Kandidaten
+                                    für diesen Lauf (überschreibt den Workflow-Default)
+            max_iterations: Optional - maximale Anzahl Injects für diesen Lauf
+                            (überschreibt den Workflow-Default, Instanz bleibt unverändert)
+            deadline_seconds: Optional - Wandzeit-Limit für diesen Lauf; bei Ablauf werden
+                              die bis dahin akzeptierten Injects mit End-Bedingung TIMEOUT
+                              zurückgegeben
         
-            # Führe Workflow aus
+        Returns:
+            Dictionary mit generiertem Szenario
+        """
+        if not scenario_id:
+            scenario_id = f"SCEN-{uuid.uuid4().hex[:8].upper()}"
+        # Token-Erfassung startet bei jedem Lauf neu (auch bei wiederverwendeter ID)
+        reset_scenario_usage(scenario_id)
+        
+        # Initialisiere State
+        initial_state = self._build_initial_state(
+            scenario_type, scenario_id, mode, speculative_candidates, max_iterations, deadline_seconds
+        )
+        
+        logger.info(
+            "🚀 Starte Szenario-Generierung: %s (Typ: %s, Max. Iterationen: %s)",
+            scenario_id, scenario_type.value, initial_state["max_iterations"],
+            extra={"scenario_id": scenario_id}
+        )
+        
+        # Führe Workflow aus
         try:
-            # Berechne Recursion Limit basierend auf max_iterations
-            # Jede Iteration benötigt ~7 Nodes (State Check → Manager → Intel → Action → Generator → Critic → State Update)
-            # Plus Refine-Loops (max 2 pro Inject) = zusätzlich 2 Nodes
-            # Plus Decision Points im interaktiven Modus = zusätzlich 1 Node pro Decision
-            # Sicherheitspuffer: 2x
-            base_nodes = 7
-            refine_nodes = 2
-            decision_nodes = 1 if self.interactive_mode else 0
-            recursion_limit = (self.max_iterations * (base_nodes + refine_nodes + decision_nodes)) + 30
+            recursion_limit = self._recursion_limit(initial_state["max_iterations"])
             
             # Im interaktiven Modus: Schrittweise Ausführung mit Pausen für Entscheidungen
             if self.interactive_mode:
@@ -1881,64 +3237,153 @@ class ScenarioWorkflow:
                     config={"recursion_limit": recursion_limit}
                 )
             
-            print()
             
             # Prüfe ob Decision-Point erreicht wurde (im interaktiven Modus)
             if self.interactive_mode and final_state.get("pending_decision"):
-                print(f"⏸️  Decision-Point erreicht: {final_state.get('pending_decision', {}).get('decision_id')}")
+                logger.info("⏸️  Decision-Point erreicht: %s", final_state.get('pending_decision', {}).get('decision_id'))
                 # Generiere Entscheidungshilfen auch für pausierten State
+                self._attach_traces(final_state)
                 decision_aids = self._generate_decision_aids(final_state)
                 final_state['decision_aids'] = decision_aids
                 final_state['additional_info'] = self._generate_additional_info(final_state)
                 return final_state  # Pausiere hier für Benutzer-Entscheidung
             
-            # Prüfe End-Bedingung
-            end_condition = final_state.get("end_condition")
-            if end_condition:
-                if end_condition == ScenarioEndCondition.FATAL.value:
-                    print(f"💀 FATAL ENDE: System vollständig kompromittiert")
-                elif end_condition == ScenarioEndCondition.VICTORY.value:
-                    print(f"🏆 SIEG: Bedrohung erfolgreich abgewehrt")
-                elif end_condition == ScenarioEndCondition.NORMAL_END.value:
-                    print(f"✅ NORMALES ENDE: Recovery abgeschlossen")
-            
-            print(f"✅ Szenario-Generierung abgeschlossen!")
-            print(f"   Generierte Injects: {len(final_state['injects'])}")
-            print(f"   Finale Phase: {final_state['current_phase'].value}")
-            if final_state.get("user_decisions"):
-                print(f"   Benutzer-Entscheidungen: {len(final_state['user_decisions'])}")
-            
-            # Generiere Entscheidungshilfen und Zusatzinfos
-            decision_aids = self._generate_decision_aids(final_state)
-            final_state['decision_aids'] = decision_aids
-            final_state['additional_info'] = self._generate_additional_info(final_state)
-            
-            # Speichere Szenario in Neo4j
-            try:
-                from state_models import ScenarioState
-                scenario_state = ScenarioState(
-                    scenario_id=final_state['scenario_id'],
-                    scenario_type=final_state['scenario_type'],
-                    current_phase=final_state['current_phase'],
-                    injects=final_state['injects'],
-                    start_time=final_state['start_time'],
-                    metadata=final_state.get('metadata', {})
-                )
-                saved_id = self.neo4j_client.save_scenario(scenario_state)
-                print(f"💾 Szenario in Neo4j gespeichert: {saved_id}")
-            except Exception as e:
-                print(f"⚠️  Fehler beim Speichern in Neo4j: {e}")
-                # Füge Warnung hinzu, aber breche nicht ab
-                if 'warnings' not in final_state:
-                    final_state['warnings'] = []
-                final_state['warnings'].append(f"Szenario konnte nicht in Neo4j gespeichert werden: {e}")
-            
-            return final_state
+            return self._finalize_scenario(final_state)
             
         except Exception as e:
-            print(f"❌ Fehler bei Szenario-Generierung: {e}")
+            logger.error("❌ Fehler bei Szenario-Generierung: %s", e, exc_info=True)
+            self._release_scenario(scenario_id, "Fehler bei Szenario-Generierung")
             return {
                 **initial_state,
                 "errors": [str(e)]
             }
-
+    
+    def stream_scenario(
+        self,
+        scenario_type: ScenarioType,
+        scenario_id: Optional[str] = None,
+        mode: str = 'thesis',
+        speculative_candidates: Optional[int] = None,
+        cancel_event: Optional[threading.Event] = None,
+        max_iterations: Optional[int] = None,
+        deadline_seconds: Optional[float] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Generiert ein Szenario und liefert den Fortschritt als Event-Stream.
+        
+        Treibt den Graphen über `graph.stream(stream_mode="updates")` an und
+        erzeugt pro Node-Übergang ein Event, zusätzlich Events für Drafts,
+        Critic-Urteile, Refine-Schleifen und akzeptierte Injects. Der erste
+        Inject ist damit verfügbar, sobald er akzeptiert wurde - nicht erst
+        nach dem gesamten Lauf. Nur für den nicht-interaktiven Modus.
+        
+        Args:
+            scenario_type: Typ des Szenarios
+            scenario_id: Optional - ID für das Szenario
+            mode: 'legacy' oder 'thesis'
+            speculative_candidates: Optional - Anzahl paralleler Draft-Kandidaten
+            cancel_event: Optional - wird zwischen den Nodes geprüft; ist es gesetzt,
+                          endet der Lauf mit einem "cancelled"-Event
+            max_iterations: Optional - maximale Anzahl Injects für diesen Lauf
+            deadline_seconds: Optional - Wandzeit-Limit für diesen Lauf (siehe generate_scenario);
+                              das "complete"-Event trägt dann end_condition TIMEOUT
+        
+        Yields:
+            Event-Dictionaries mit Schlüssel "event" (start, node, draft, critic,
+            refine, inject, cancelled, complete, error); Injects als Inject-Objekte
+        """
+        if self.interactive_mode:
+            raise ValueError("stream_scenario ist nur im nicht-interaktiven Modus verfügbar")
+        
+        if not scenario_id:
+            scenario_id = f"SCEN-{uuid.uuid4().hex[:8].upper()}"
+        # Token-Erfassung startet bei jedem Lauf neu (auch bei wiederverwendeter ID)
+        reset_scenario_usage(scenario_id)
+        
+        state = self._build_initial_state(
+            scenario_type, scenario_id, mode, speculative_candidates, max_iterations, deadline_seconds
+        )
+        
+        logger.info("📡 Starte Szenario-Stream: %s", scenario_id)
+        yield {
+            "event": "start",
+            "scenario_id": scenario_id,
+            "scenario_type": scenario_type.value,
+            "max_iterations": state["max_iterations"]
+        }
+        
+        last_verdict = None
+        # Nur ein vollständig durchlaufener Graph wird über _finalize_scenario abgeschlossen
+        graph_finished = False
+        updates = self.graph.stream(
+            state,
+            config={"recursion_limit": self._recursion_limit(state["max_iterations"])},
+            stream_mode="updates"
+        )
+        try:
+            for chunk in updates:
+                for node, update in chunk.items():
+                    update = update or {}
+                    previous_injects = len(state.get("injects", []))
+                    state.update(update)
+                    
+                    yield {
+                        "event": "node",
+                        "node": node,
+                        "iteration": state.get("iteration", 0),
+                        "inject_count": len(state.get("injects", []))
+                    }
+                    
+                    if node == "generator" and update.get("draft_inject"):
+                        draft = update["draft_inject"]
+                        if last_verdict is not None and not last_verdict.is_valid:
+                            yield {"event": "refine", "inject_id": draft.inject_id, "errors": last_verdict.errors}
+                        yield {
+                            "event": "draft",
+                            "inject": draft,
+                            "candidates": (update.get("draft_validation") or {}).get("candidates", 1)
+                        }
+                    elif node == "critic" and update.get("validation_result"):
+                        last_verdict = update["validation_result"]
+                        draft = state.get("draft_inject")
+                        yield {
+                            "event": "critic",
+                            "inject_id": draft.inject_id if draft else None,
+                            "is_valid": last_verdict.is_valid,
+                            "errors": last_verdict.errors,
+                            "warnings": last_verdict.warnings
+                        }
+                    elif node == "state_update":
+                        last_verdict = None
+                        for inject in state.get("injects", [])[previous_injects:]:
+                            yield {"event": "inject", "inject": inject}
+                
+                if cancel_event is not None and cancel_event.is_set():
+                    logger.info("🛑 Szenario-Stream abgebrochen: %s", scenario_id)
+                    yield {
+                        "event": "cancelled",
+                        "scenario_id": scenario_id,
+                        "inject_count": len(state.get("injects", []))
+                    }
+                    return
+            graph_finished = True
+        except Exception as e:
+            logger.error("❌ Fehler bei Szenario-Stream: %s", e, exc_info=True)
+            yield {"event": "error", "scenario_id": scenario_id, "error": str(e)}
+            return
+        finally:
+            # Beendet den Graph-Lauf auch bei Abbruch durch den Client
+            updates.close()
+            if not graph_finished:
+                # Abbruch, Fehler oder Client-Disconnect (GeneratorExit)
+                self._release_scenario(scenario_id, "Stream beendet")
+        
+        final_state = self._finalize_scenario(state)
+        yield {
+            "event": "complete",
+            "scenario_id": scenario_id,
+            "inject_count": len(final_state.get("injects", [])),
+            "current_phase": final_state["current_phase"].value,
+            "end_condition": final_state.get("end_condition"),
+            "warnings": final_state.get("warnings", [])
+        }
@@ -37,11 +37,16 @@ class WorkflowState(TypedDict):
     # Workflow-Kontrolle
     iteration: int  # Aktuelle Iteration
     max_iterations: int  # Maximale Anzahl Injects
+    deadline: Optional[float]  # Epoch-Sekunden, ab denen keine Nodes mehr starten (None = ohne Deadline)
     
     # Agenten-Outputs
-    manager_plan: Optional[Dict[str, Any]]  # Storyline vom Manager Agent
+    manager_plan: Optional[Dict[str, Any]]  # Storyline vom Manager Agent (aktueller Schritt)
+    phase_plan: Optional[Dict[str, Any]]  # Mehrschrittiger Plan der Phase (Schritte, Fortschritt, Phasen-Ausgang)
+    planning_stats: Dict[str, Any]  # Manager-Aufrufe vs. übernommene Plan-Schritte
     selected_action: Optional[Dict[str, Any]]  # Ausgewählte Aktion (MITRE TTP)
     draft_inject: Optional[Inject]  # Roher Inject vom Generator
+    draft_validation: Optional[Dict[str, Any]]  # Vorab-Validierung des spekulativen Gewinners (None bei K=1)
+    draft_batch: Optional[Dict[str, Any]]  # Noch nicht validierte Drafts einer Inject-Sequenz (batch_drafts > 1)
     validation_result: Optional[ValidationResult]  # Validierung vom Critic
     
     # Intel & Kontext
@@ -56,9 +61,9 @@ class WorkflowState(TypedDict):
     start_time: datetime
     metadata: Dict[str, Any]
     
-    # Workflow-Logs für Dashboard
-    workflow_logs: List[Dict[str, Any]]  # Logs von jedem Node
-    agent_decisions: List[Dict[str, Any]]  # Entscheidungen der Agenten
+    # Workflow-Logs für Dashboard (Einträge liegen im Trace-Sink, siehe workflows/trace_sink.py)
+    workflow_log_count: int  # Anzahl geschriebener Node-Logs
+    agent_decision_count: int  # Anzahl geschriebener Agenten-Entscheidungen
     
     # Interaktive Entscheidungen
     pending_decision: Optional[Dict[str, Any]]  # Aktuell ausstehende Benutzer-Entscheidung
@@ -69,6 +74,9 @@ class WorkflowState(TypedDict):
     # Mode für A/B Testing
     mode: Literal['legacy', 'thesis']  # 'legacy' = Skip Validation, 'thesis' = Full Validation (Default)
     
+    # Spekulatives Drafting
+    speculative_candidates: int  # Anzahl paralleler Draft-Kandidaten pro Inject (1 = aus)
+    
     # Human-in-the-Loop Feedback
     user_feedback: Optional[str]  # Letzte Response Action vom Benutzer (z.B. "Shutdown SRV-001")
 
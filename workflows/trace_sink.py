@@ -0,0 +1,348 @@
+"""
+Trace-Sinks für Workflow-Logs und Agenten-Entscheidungen.
+
+Die Nodes schreiben ihre Log-Einträge (`workflow_logs`) und Entscheidungen
+(`agent_decisions`) nicht mehr in den LangGraph-State, sondern in einen Sink,
+adressiert über die Szenario-ID. Im State bleiben nur Zähler, damit die
+State-Größe pro Node-Übergang konstant bleibt. API und Dashboard lesen die
+Traces bei Bedarf aus dem Sink.
+
+Verfügbare Sinks:
+- MemoryTraceSink: Ringpuffer im Prozess, LRU-begrenzt auf Szenarien (Standard)
+- JsonlTraceSink: eine JSONL-Datei pro Szenario
+- SqliteTraceSink: lokale SQLite-Datenbank
+
+Auswahl über `create_trace_sink("memory" | "memory:<max>" | "jsonl:<dir>" | "sqlite:<pfad>")`
+oder die Umgebungsvariable SCENARIO_TRACE_SINK.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict, deque
+from enum import Enum
+from pathlib import Path
+from typing import Dict, Any, Optional, List
+
+from utils.json_encoder import DateTimeEncoder
+
+
+# Trace-Arten (entsprechen den früheren State-Feldern)
+TRACE_LOGS = "workflow_logs"
+TRACE_DECISIONS = "agent_decisions"
+TRACE_KINDS = (TRACE_LOGS, TRACE_DECISIONS)
+
+# Standard-Kapazität des Ringpuffers pro Szenario und Trace-Art
+DEFAULT_MAX_ENTRIES = 2000
+# Standard-Anzahl Szenarien im Speicher (älteste werden verdrängt)
+DEFAULT_MAX_SCENARIOS = 200
+
+
+class _TraceEncoder(DateTimeEncoder):
+    """JSON-Encoder für Trace-Einträge (Enums, Pydantic-Modelle, Rest als String)."""
+
+    def default(self, obj: Any) -> Any:
+        if isinstance(obj, Enum):
+            return obj.value
+        if hasattr(obj, "model_dump"):
+            return obj.model_dump(mode="json")
+        try:
+            return super().default(obj)
+        except TypeError:
+            return str(obj)
+
+
+def _dumps(entry: Dict[str, Any]) -> str:
+    return json.dumps(entry, cls=_TraceEncoder, ensure_ascii=False)
+
+
+class TraceSink:
+    """
+    Basisklasse für Trace-Sinks.
+
+    Einträge werden pro (scenario_id, kind) in Schreibreihenfolge abgelegt;
+    `offset` in `read` bezieht sich auf die Gesamtzahl geschriebener Einträge.
+    """
+
+    def append(self, scenario_id: str, kind: str, entry: Dict[str, Any]) -> int:
+        """
+        Schreibt einen Eintrag.
+
+        Returns:
+            Anzahl der Einträge dieser Art für das Szenario (inkl. des neuen)
+        """
+        raise NotImplementedError
+
+    def read(
+        self,
+        scenario_id: str,
+        kind: str,
+        offset: int = 0,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Liest Einträge ab `offset` (höchstens `limit`)."""
+        raise NotImplementedError
+
+    def count(self, scenario_id: str, kind: str) -> int:
+        """Anzahl bisher geschriebener Einträge."""
+        raise NotImplementedError
+
+    def clear(self, scenario_id: str):
+        """Entfernt alle Traces eines Szenarios."""
+        raise NotImplementedError
+
+
+class MemoryTraceSink(TraceSink):
+    """
+    Ringpuffer im Speicher; ältere Einträge werden bei voller Kapazität verworfen.
+
+    Zusätzlich ist die Anzahl der Szenarien begrenzt: beim Überschreiten von
+    `max_scenarios` werden die Traces des am längsten nicht mehr genutzten
+    Szenarios entfernt (LRU), damit ein langlebiger API-Prozess nicht wächst.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_scenarios: int = DEFAULT_MAX_SCENARIOS):
+        self.max_entries = max_entries
+        self.max_scenarios = max_scenarios
+        # scenario_id -> kind -> (Ringpuffer, Gesamtzahl geschriebener Einträge)
+        self._scenarios: "OrderedDict[str, Dict[str, List[Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _touch_unlocked(self, scenario_id: str, create: bool = False) -> Optional[Dict[str, List[Any]]]:
+        """Markiert ein Szenario als zuletzt genutzt (legt es optional an und verdrängt das älteste)."""
+        scenario = self._scenarios.get(scenario_id)
+        if scenario is None:
+            if not create:
+                return None
+            scenario = self._scenarios[scenario_id] = {
+                kind: [deque(maxlen=self.max_entries), 0] for kind in TRACE_KINDS
+            }
+            while len(self._scenarios) > self.max_scenarios:
+                self._scenarios.popitem(last=False)
+        else:
+            self._scenarios.move_to_end(scenario_id)
+        return scenario
+
+    def append(self, scenario_id: str, kind: str, entry: Dict[str, Any]) -> int:
+        with self._lock:
+            scenario = self._touch_unlocked(scenario_id, create=True)
+            slot = scenario.setdefault(kind, [deque(maxlen=self.max_entries), 0])
+            slot[0].append(entry)
+            slot[1] += 1
+            return slot[1]
+
+    def read(
+        self,
+        scenario_id: str,
+        kind: str,
+        offset: int = 0,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        with self._lock:
+            scenario = self._touch_unlocked(scenario_id)
+            if scenario is None or kind not in scenario:
+                return []
+            buffer, total = scenario[kind]
+            buffer = list(buffer)
+        dropped = total - len(buffer)
+        start = max(0, offset - dropped)
+        end = None if limit is None else start + limit
+        return buffer[start:end]
+
+    def count(self, scenario_id: str, kind: str) -> int:
+        with self._lock:
+            scenario = self._scenarios.get(scenario_id)
+            if scenario is None or kind not in scenario:
+                return 0
+            return scenario[kind][1]
+
+    def clear(self, scenario_id: str):
+        with self._lock:
+            self._scenarios.pop(scenario_id, None)
+
+
+class JsonlTraceSink(TraceSink):
+    """
+    Eine JSONL-Datei pro Szenario (`<directory>/<scenario_id>.jsonl`).
+
+    Pro Szenario wird ein Index der Zeilen-Offsets je Trace-Art gehalten und
+    nur um neu hinzugekommene Zeilen erweitert; `read` springt direkt zu den
+    angefragten Zeilen, statt die Datei bei jedem Aufruf komplett zu parsen.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # scenario_id -> kind -> Byte-Offsets der Zeilen
+        self._index: Dict[str, Dict[str, List[int]]] = {}
+        # scenario_id -> bis zu welcher Byte-Position indiziert wurde
+        self._indexed_size: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, scenario_id: str) -> Path:
+        return self.directory / f"{scenario_id}.jsonl"
+
+    def _refresh_index_unlocked(self, scenario_id: str) -> Dict[str, List[int]]:
+        """Indiziert Zeilen, die seit dem letzten Aufruf hinzugekommen sind (z.B. von anderen Prozessen)."""
+        index = self._index.setdefault(scenario_id, {kind: [] for kind in TRACE_KINDS})
+        path = self._path(scenario_id)
+        position = self._indexed_size.get(scenario_id, 0)
+        if not path.exists() or path.stat().st_size == position:
+            return index
+
+        with open(path, "rb") as f:
+            f.seek(position)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # Abgeschnittene letzte Zeile (Abbruch beim Schreiben)
+                try:
+                    kind = json.loads(line).get("kind")
+                except json.JSONDecodeError:
+                    kind = None
+                if kind is not None:
+                    index.setdefault(kind, []).append(position)
+                position += len(line)
+        self._indexed_size[scenario_id] = position
+        return index
+
+    def append(self, scenario_id: str, kind: str, entry: Dict[str, Any]) -> int:
+        line = (_dumps({"kind": kind, "entry": entry}) + "\n").encode("utf-8")
+        with self._lock:
+            index = self._refresh_index_unlocked(scenario_id)
+            with open(self._path(scenario_id), "ab") as f:
+                position = f.tell()
+                f.write(line)
+            offsets = index.setdefault(kind, [])
+            if position == self._indexed_size.get(scenario_id, 0):
+                offsets.append(position)
+                self._indexed_size[scenario_id] = position + len(line)
+            else:
+                self._refresh_index_unlocked(scenario_id)
+            return len(offsets)
+
+    def read(
+        self,
+        scenario_id: str,
+        kind: str,
+        offset: int = 0,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        with self._lock:
+            offsets = self._refresh_index_unlocked(scenario_id).get(kind, [])
+            offsets = offsets[offset:] if limit is None else offsets[offset:offset + limit]
+        if not offsets:
+            return []
+
+        entries = []
+        with open(self._path(scenario_id), "rb") as f:
+            for position in offsets:
+                f.seek(position)
+                entries.append(json.loads(f.readline())["entry"])
+        return entries
+
+    def count(self, scenario_id: str, kind: str) -> int:
+        with self._lock:
+            return len(self._refresh_index_unlocked(scenario_id).get(kind, []))
+
+    def clear(self, scenario_id: str):
+        with self._lock:
+            self._path(scenario_id).unlink(missing_ok=True)
+            self._index.pop(scenario_id, None)
+            self._indexed_size.pop(scenario_id, None)
+
+
+class SqliteTraceSink(TraceSink):
+    """Traces in einer lokalen SQLite-Datenbank (eine Zeile pro Eintrag)."""
+
+    def __init__(self, path: str):
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        # check_same_thread=False: Streamlit/FastAPI rufen aus wechselnden Threads auf
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._connection:
+            self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS traces (
+                    scenario_id TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    seq INTEGER NOT NULL,
+                    entry TEXT NOT NULL,
+                    PRIMARY KEY (scenario_id, kind, seq)
+                )
+            """)
+
+    def append(self, scenario_id: str, kind: str, entry: Dict[str, Any]) -> int:
+        with self._lock, self._connection:
+            seq = self._count_unlocked(scenario_id, kind)
+            self._connection.execute(
+                "INSERT INTO traces (scenario_id, kind, seq, entry) VALUES (?, ?, ?, ?)",
+                (scenario_id, kind, seq, _dumps(entry))
+            )
+            return seq + 1
+
+    def read(
+        self,
+        scenario_id: str,
+        kind: str,
+        offset: int = 0,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT entry FROM traces WHERE scenario_id = ? AND kind = ? AND seq >= ? ORDER BY seq LIMIT ?",
+                (scenario_id, kind, offset, -1 if limit is None else limit)
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def _count_unlocked(self, scenario_id: str, kind: str) -> int:
+        row = self._connection.execute(
+            "SELECT COALESCE(MAX(seq) + 1, 0) FROM traces WHERE scenario_id = ? AND kind = ?",
+            (scenario_id, kind)
+        ).fetchone()
+        return row[0]
+
+    def count(self, scenario_id: str, kind: str) -> int:
+        with self._lock:
+            return self._count_unlocked(scenario_id, kind)
+
+    def clear(self, scenario_id: str):
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM traces WHERE scenario_id = ?", (scenario_id,))
+
+
+def create_trace_sink(spec: Optional[str] = None) -> TraceSink:
+    """
+    Erstellt einen Trace-Sink aus einer Spezifikation.
+
+    Args:
+        spec: "memory", "memory:<max_entries>", "jsonl:<verzeichnis>" oder
+              "sqlite:<pfad>" (Standard: SCENARIO_TRACE_SINK oder "memory")
+
+    Returns:
+        TraceSink-Instanz
+    """
+    spec = spec or os.getenv("SCENARIO_TRACE_SINK") or "memory"
+    backend, _, argument = spec.partition(":")
+
+    if backend == "memory":
+        return MemoryTraceSink(int(argument) if argument else DEFAULT_MAX_ENTRIES)
+    if backend == "jsonl":
+        return JsonlTraceSink(argument or "logs/traces")
+    if backend == "sqlite":
+        return SqliteTraceSink(argument or "logs/traces.sqlite")
+    raise ValueError(f"Unbekannter Trace-Sink: {spec}. Verfügbar: memory, jsonl:<dir>, sqlite:<pfad>")
+
+
+# Globaler Sink (geteilt von allen Workflow-Instanzen eines Prozesses)
+_trace_sink: Optional[TraceSink] = None
+_trace_sink_lock = threading.Lock()
+
+
+def get_trace_sink() -> TraceSink:
+    """Gibt den globalen Trace-Sink zurück (thread-safe, lazy)."""
+    global _trace_sink
+    with _trace_sink_lock:
+        if _trace_sink is None:
+            _trace_sink = create_trace_sink()
+        return _trace_sink
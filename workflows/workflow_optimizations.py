@@ -11,8 +11,11 @@ Implementiert:
 from typing import Dict, Any, Optional, List
 from functools import lru_cache
 from datetime import datetime, timedelta
+import logging
 import time
 
+logger = logging.getLogger(__name__)
+
 
 class WorkflowOptimizer:
     """
@@ -61,11 +64,11 @@ class WorkflowOptimizer:
             age = datetime.now() - cached_timestamp
             
             if age < self.cache_ttl:
-                print(f"   💾 Cache-Hit: State aus Cache (Alter: {age.total_seconds():.1f}s)")
+                logger.debug("💾 Cache-Hit: State aus Cache (Alter: %.1fs)", age.total_seconds())
                 return cached_data
         
         # Cache-Miss oder abgelaufen: Neu laden
-        print(f"   🔄 Cache-Miss: Lade State neu...")
+        logger.debug("🔄 Cache-Miss: Lade State neu...")
         start_time = time.time()
         data = fetch_function()
         fetch_time = time.time() - start_time
@@ -95,7 +98,7 @@ class WorkflowOptimizer:
             self.state_cache.pop(cache_key, None)
         else:
             self.state_cache.clear()
-        print(f"   🗑️  Cache gelöscht: {cache_key or 'Alle'}")
+        logger.debug("🗑️  Cache gelöscht: %s", cache_key or 'Alle')
     
     def should_early_exit(
         self,
@@ -207,6 +210,7 @@ class WorkflowPerformanceMonitor:
         self.node_timings: Dict[str, List[float]] = {}
         self.node_errors: Dict[str, int] = {}
         self.node_successes: Dict[str, int] = {}
+        self.node_llm_usage: Dict[str, Dict[str, Any]] = {}
     
     def start_node(self, node_name: str) -> float:
         """
@@ -240,6 +244,27 @@ class WorkflowPerformanceMonitor:
         else:
             self.node_errors[node_name] += 1
     
+    def record_llm_usage(self, node_usage: Dict[str, Dict[str, Any]]):
+        """
+        Summiert die Token-Nutzung eines Szenarios pro Node auf.
+        
+        Args:
+            node_usage: Node -> {calls, prompt_tokens, completion_tokens, total_tokens, cost_usd, llm_seconds}
+        """
+        for node_name, usage in node_usage.items():
+            totals = self.node_llm_usage.setdefault(node_name, {key: 0 for key in usage})
+            for key, value in usage.items():
+                totals[key] = totals.get(key, 0) + value
+    
+    def get_llm_usage_statistics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Gibt die aufsummierte Token-Nutzung pro Node zurück.
+        
+        Returns:
+            Dictionary von Node -> Token-/Kosten-Summen
+        """
+        return {node_name: dict(usage) for node_name, usage in self.node_llm_usage.items()}
+    
     def get_node_statistics(self, node_name: str) -> Dict[str, Any]:
         """
         Gibt Statistiken für einen Node zurück.
@@ -0,0 +1,220 @@
+"""
+Pool vorgewärmter Workflow-Instanzen.
+
+Der Aufbau eines ScenarioWorkflow ist teuer (LLM-Clients, ChromaDB-Client,
+Compliance-Frameworks, kompilierter Graph). Der Pool hält Instanzen pro
+Konfiguration (Compliance-Standards, interaktiver Modus) vor und verleiht sie
+exklusiv: eine Instanz bearbeitet immer nur eine Anfrage, die Anzahl Injects
+wird pro Aufruf übergeben (`generate_scenario(max_iterations=...)`) statt auf
+der Instanz gespeichert.
+
+Konfiguration:
+- WORKFLOW_POOL_SIZE: Maximale Instanzen pro Konfiguration (Standard: 2)
+- WORKFLOW_POOL_TIMEOUT: Wartezeit in Sekunden auf eine freie Instanz (Standard: 60)
+
+Job-Worker warten ohne Zeitlimit (timeout=math.inf) und brechen das Warten
+über ihr Cancel-Event ab, statt bei ausgelasteter API fehlzuschlagen.
+"""
+
+import logging
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from utils.cancellation import OperationCancelled
+
+logger = logging.getLogger(__name__)
+
+# Compliance-Standards, die der Critic ohne Angabe prüft
+DEFAULT_STANDARDS: Tuple[str, ...] = ("DORA",)
+
+PoolKey = Tuple[Tuple[str, ...], bool]
+
+# Prüfintervall für das Cancel-Event wartender acquire()-Aufrufe (Sekunden)
+CANCEL_POLL_INTERVAL = 0.5
+
+
+class PoolExhausted(RuntimeError):
+    """Keine Instanz innerhalb der Wartezeit frei geworden."""
+
+
+def pool_key(compliance_standards: Optional[Iterable[Any]] = None, interactive: bool = False) -> PoolKey:
+    """Normalisierter Schlüssel (Reihenfolge und Groß-/Kleinschreibung der Standards egal)."""
+    standards = tuple(sorted({str(getattr(s, "value", s)).upper() for s in (compliance_standards or ())}))
+    return standards or DEFAULT_STANDARDS, bool(interactive)
+
+
+class WorkflowPool:
+    """Thread-sicherer Pool von Workflow-Instanzen pro Konfiguration."""
+
+    def __init__(
+        self,
+        factory: Callable[[Tuple[str, ...], bool], Any],
+        max_per_key: Optional[int] = None,
+        timeout: Optional[float] = None
+    ):
+        """
+        Args:
+            factory: Erzeugt eine Instanz für (Standards, interaktiv)
+            max_per_key: Maximale Instanzen pro Konfiguration (Standard: WORKFLOW_POOL_SIZE)
+            timeout: Wartezeit auf eine freie Instanz (Standard: WORKFLOW_POOL_TIMEOUT)
+        """
+        self.factory = factory
+        self.max_per_key = max(1, int(max_per_key or os.getenv("WORKFLOW_POOL_SIZE", "2")))
+        self.timeout = float(timeout if timeout is not None else os.getenv("WORKFLOW_POOL_TIMEOUT", "60"))
+        self._condition = threading.Condition()
+        self._idle: Dict[PoolKey, List[Any]] = {}
+        self._created: Dict[PoolKey, int] = {}
+        self._keys: Dict[int, PoolKey] = {}
+        self._instances: List[Any] = []
+        self._stats: Dict[PoolKey, Dict[str, Any]] = {}
+
+    def _key_stats(self, key: PoolKey) -> Dict[str, Any]:
+        return self._stats.setdefault(key, {"borrows": 0, "created": 0, "waits": 0, "wait_seconds": 0.0})
+
+    def acquire(
+        self,
+        compliance_standards: Optional[Iterable[Any]] = None,
+        interactive: bool = False,
+        timeout: Optional[float] = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> Any:
+        """
+        Leiht eine Instanz exklusiv aus (mit release() zurückgeben).
+
+        Ist keine Instanz frei und das Limit erreicht, wird gewartet; nach
+        Ablauf der Wartezeit wird PoolExhausted ausgelöst.
+
+        Args:
+            timeout: Wartezeit in Sekunden (Standard: self.timeout, math.inf = unbegrenzt)
+            cancel_event: Bricht das Warten mit OperationCancelled ab
+        """
+        key = pool_key(compliance_standards, interactive)
+        deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+        waited_since = None
+        with self._condition:
+            stats = self._key_stats(key)
+            while not self._idle.get(key) and self._created.get(key, 0) >= self.max_per_key:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise OperationCancelled(f"Warten auf Workflow-Instanz für {key} abgebrochen")
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolExhausted(f"Keine freie Workflow-Instanz für {key} (Limit {self.max_per_key})")
+                if waited_since is None:
+                    waited_since = time.monotonic()
+                    stats["waits"] += 1
+                if cancel_event is not None:
+                    remaining = min(remaining, CANCEL_POLL_INTERVAL)
+                self._condition.wait(None if math.isinf(remaining) else remaining)
+            if waited_since is not None:
+                stats["wait_seconds"] += time.monotonic() - waited_since
+            stats["borrows"] += 1
+            if self._idle.get(key):
+                return self._idle[key].pop()
+            # Platz reservieren, Aufbau außerhalb des Locks
+            self._created[key] = self._created.get(key, 0) + 1
+            stats["created"] += 1
+
+        try:
+            instance = self._create(key)
+        except Exception:
+            with self._condition:
+                self._created[key] -= 1
+                self._condition.notify()
+            raise
+        return instance
+
+    def release(self, instance: Any):
+        """Gibt eine ausgeliehene Instanz zurück (fremde Objekte werden ignoriert)."""
+        with self._condition:
+            key = self._keys.get(id(instance))
+            if key is None:
+                return
+            self._idle.setdefault(key, []).append(instance)
+            self._condition.notify()
+
+    @contextmanager
+    def borrow(
+        self,
+        compliance_standards: Optional[Iterable[Any]] = None,
+        interactive: bool = False,
+        timeout: Optional[float] = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> Iterator[Any]:
+        """Context-Manager um acquire()/release()."""
+        instance = self.acquire(compliance_standards, interactive, timeout, cancel_event)
+        try:
+            yield instance
+        finally:
+            self.release(instance)
+
+    def warm_up(self, keys: Iterable[PoolKey], count: int = 1):
+        """Erzeugt vorab bis zu `count` Instanzen pro Konfiguration (Fehler werden geloggt)."""
+        for standards, interactive in keys:
+            key = pool_key(standards, interactive)
+            for _ in range(min(count, self.max_per_key)):
+                with self._condition:
+                    if self._created.get(key, 0) >= min(count, self.max_per_key):
+                        break
+                    self._created[key] = self._created.get(key, 0) + 1
+                    self._key_stats(key)["created"] += 1
+                try:
+                    instance = self._create(key)
+                except Exception as e:
+                    with self._condition:
+                        self._created[key] -= 1
+                    logger.warning("⚠️  Warm-up für %s fehlgeschlagen: %s", key, e)
+                    break
+                self.release(instance)
+                logger.info("🔥 Workflow-Instanz vorgewärmt: %s", key)
+
+    def instances(self) -> List[Any]:
+        """Alle erzeugten Instanzen, frei oder ausgeliehen (z.B. für aggregierte Statistiken)."""
+        with self._condition:
+            return list(self._instances)
+
+    def stats(self) -> Dict[str, Any]:
+        """Instanzen und Ausleihen pro Konfiguration."""
+        with self._condition:
+            keys = set(self._created) | set(self._stats)
+            return {
+                "max_per_key": self.max_per_key,
+                "pools": [
+                    {
+                        "compliance_standards": list(key[0]),
+                        "interactive": key[1],
+                        "instances": self._created.get(key, 0),
+                        "idle": len(self._idle.get(key, [])),
+                        "in_use": self._created.get(key, 0) - len(self._idle.get(key, [])),
+                        **self._key_stats(key)
+                    }
+                    for key in sorted(keys)
+                ]
+            }
+
+    def close(self):
+        """Gibt alle Instanzen frei (close(), z.B. Thread-Pools für Pipelining) und leert den Pool."""
+        with self._condition:
+            instances = list(self._instances)
+            self._instances.clear()
+            self._idle.clear()
+            self._created.clear()
+            self._keys.clear()
+        for instance in instances:
+            close = getattr(instance, "close", None)
+            if close is None:
+                continue
+            try:
+                close()
+            except Exception as e:
+                logger.warning("⚠️  Fehler beim Schließen einer Workflow-Instanz: %s", e)
+
+    def _create(self, key: PoolKey) -> Any:
+        instance = self.factory(*key)
+        with self._condition:
+            self._keys[id(instance)] = key
+            self._instances.append(instance)
+        return instance